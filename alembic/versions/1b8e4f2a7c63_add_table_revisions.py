@@ -0,0 +1,33 @@
+"""add_table_revisions
+
+Revision ID: 1b8e4f2a7c63
+Revises: c8f2d4a6e917
+Create Date: 2026-10-19 18:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '1b8e4f2a7c63'
+down_revision: Union[str, None] = 'c8f2d4a6e917'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Строки появляются при первом изменении таблицы (матч с победителем или пересчёт)
+    op.create_table('table_revisions',
+    sa.Column('table_name', sa.String(length=64), nullable=False),
+    sa.Column('revision', sa.Integer(), server_default='0', nullable=False),
+    sa.PrimaryKeyConstraint('table_name')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('table_revisions')
@@ -0,0 +1,37 @@
+"""add_player_ratings
+
+Revision ID: a3d9e6b2c514
+Revises: f5c7a1e3d902
+Create Date: 2026-10-19 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3d9e6b2c514'
+down_revision: Union[str, None] = 'f5c7a1e3d902'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Таблица заполняется командой: python -m src.tennis_score.manage recompute-ratings
+    op.create_table('player_ratings',
+    sa.Column('player_id', sa.Integer(), nullable=False),
+    sa.Column('rating', sa.Float(), nullable=False),
+    sa.Column('rated_matches', sa.Integer(), server_default='0', nullable=False),
+    sa.ForeignKeyConstraint(['player_id'], ['players.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('player_id')
+    )
+    op.create_index(op.f('ix_player_ratings_rating'), 'player_ratings', ['rating'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_player_ratings_rating'), table_name='player_ratings')
+    op.drop_table('player_ratings')
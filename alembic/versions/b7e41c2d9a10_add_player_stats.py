@@ -0,0 +1,42 @@
+"""add_player_stats
+
+Revision ID: b7e41c2d9a10
+Revises: 843559b80c4c
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7e41c2d9a10'
+down_revision: Union[str, None] = '843559b80c4c'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Таблица заполняется командой: python -m src.tennis_score.manage backfill-player-stats
+    op.create_table('player_stats',
+    sa.Column('player_id', sa.Integer(), nullable=False),
+    sa.Column('matches_played', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('wins', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('losses', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('sets_won', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('sets_lost', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('games_won', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('games_lost', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('tiebreaks_won', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('tiebreaks_lost', sa.Integer(), server_default='0', nullable=False),
+    sa.ForeignKeyConstraint(['player_id'], ['players.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('player_id')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('player_stats')
@@ -0,0 +1,35 @@
+"""add_active_matches
+
+Revision ID: c8f2d4a6e917
+Revises: a3d9e6b2c514
+Create Date: 2026-10-19 18:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c8f2d4a6e917'
+down_revision: Union[str, None] = 'a3d9e6b2c514'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Используется только при ACTIVE_MATCH_STORE=db (несколько процессов-воркеров)
+    op.create_table('active_matches',
+    sa.Column('match_uuid', sa.Uuid(as_uuid=False), nullable=False),
+    sa.Column('state', sa.JSON(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False),
+    sa.PrimaryKeyConstraint('match_uuid')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('active_matches')
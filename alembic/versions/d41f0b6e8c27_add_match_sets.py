@@ -0,0 +1,38 @@
+"""add_match_sets
+
+Revision ID: d41f0b6e8c27
+Revises: b7e41c2d9a10
+Create Date: 2026-10-19 13:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd41f0b6e8c27'
+down_revision: Union[str, None] = 'b7e41c2d9a10'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Таблица заполняется командой: python -m src.tennis_score.manage backfill-set-scores
+    op.create_table('match_sets',
+    sa.Column('match_id', sa.Integer(), nullable=False),
+    sa.Column('set_number', sa.Integer(), nullable=False),
+    sa.Column('player1_games', sa.Integer(), nullable=False),
+    sa.Column('player2_games', sa.Integer(), nullable=False),
+    sa.Column('player1_tiebreak', sa.Integer(), nullable=True),
+    sa.Column('player2_tiebreak', sa.Integer(), nullable=True),
+    sa.ForeignKeyConstraint(['match_id'], ['matches.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('match_id', 'set_number')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('match_sets')
@@ -0,0 +1,34 @@
+"""add_match_points
+
+Revision ID: e92a5d3f1b48
+Revises: d41f0b6e8c27
+Create Date: 2026-10-19 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e92a5d3f1b48'
+down_revision: Union[str, None] = 'd41f0b6e8c27'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('match_points',
+    sa.Column('match_uuid', sa.Uuid(as_uuid=False), nullable=False),
+    sa.Column('seq', sa.Integer(), nullable=False),
+    sa.Column('player2_won', sa.Boolean(), nullable=False),
+    sa.Column('scored_at', sa.DateTime(timezone=True), nullable=False),
+    sa.PrimaryKeyConstraint('match_uuid', 'seq')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('match_points')
@@ -0,0 +1,42 @@
+"""add_head_to_head
+
+Revision ID: f5c7a1e3d902
+Revises: e92a5d3f1b48
+Create Date: 2026-10-19 15:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f5c7a1e3d902'
+down_revision: Union[str, None] = 'e92a5d3f1b48'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Таблица заполняется командой: python -m src.tennis_score.manage backfill-head-to-head
+    op.create_table('head_to_head',
+    sa.Column('player_low_id', sa.Integer(), nullable=False),
+    sa.Column('player_high_id', sa.Integer(), nullable=False),
+    sa.Column('matches_played', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('low_wins', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('high_wins', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('low_sets_won', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('high_sets_won', sa.Integer(), server_default='0', nullable=False),
+    sa.ForeignKeyConstraint(['player_low_id'], ['players.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['player_high_id'], ['players.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('player_low_id', 'player_high_id')
+    )
+    op.create_index('ix_matches_player1_id_player2_id', 'matches', ['player1_id', 'player2_id'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_matches_player1_id_player2_id', table_name='matches')
+    op.drop_table('head_to_head')
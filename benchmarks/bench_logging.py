@@ -0,0 +1,158 @@
+"""Бенчмарк стоимости логирования на время обработки запроса.
+
+Прогоняет одинаковый набор запросов через WSGI-приложение (без сокетов, SQLite в памяти)
+при разных конфигурациях логирования и сравнивает время запроса в рабочем потоке:
+
+- ``sync`` — прежняя схема: StreamHandler + FileHandler прямо в потоке запроса;
+- ``queue`` — QueueHandler + фоновый поток (``setup_logging``);
+- ``queue-sampled`` — то же, с прореживанием DEBUG-записей 1 из 10;
+- ``queue-limited`` — настройки по умолчанию: не более 200 DEBUG-записей в секунду;
+- ``queue-info`` — уровень INFO, как в docker-окружении (``LOG_LEVEL=INFO``).
+
+Запуск::
+
+    python benchmarks/bench_logging.py --requests 2000
+"""
+
+import argparse
+import contextlib
+import io
+import logging
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+# Все запросы идут с одного адреса: лимит по IP отклонял бы их с 429 (как в harness)
+os.environ.setdefault("RATE_LIMIT_RPS", "0")
+
+from src.tennis_score.logging_setup import (  # noqa: E402
+    LOG_DATEFMT,
+    LOG_FORMAT,
+    setup_logging,
+    stop_logging,
+)
+
+
+def _configure_sync(log_dir: str, console) -> None:
+    """Прежняя синхронная конфигурация из main.py."""
+    root_logger = logging.getLogger()
+    for handler in root_logger.handlers[:]:
+        root_logger.removeHandler(handler)
+    formatter = logging.Formatter(LOG_FORMAT, LOG_DATEFMT)
+    for handler in (
+        logging.StreamHandler(console),
+        logging.FileHandler(os.path.join(log_dir, "sync.log"), encoding="utf-8"),
+    ):
+        handler.setFormatter(formatter)
+        root_logger.addHandler(handler)
+    root_logger.setLevel(logging.DEBUG)
+
+
+def _make_app():
+    from src.tennis_score.core.app_orchestrator import AppOrchestrator
+
+    return AppOrchestrator().create_app()
+
+
+def _reset_db() -> None:
+    """Пустая схема и никаких активных матчей — у каждой конфигурации одинаковые условия."""
+    from src.tennis_score.model.orm_models import Base
+    from src.tennis_score.services.match_service import get_match_service
+
+    repository = get_match_service().repository
+    Base.metadata.drop_all(repository.engine)
+    Base.metadata.create_all(repository.engine)
+    for match in repository.active_matches.values():
+        repository.release_active_match(match.match_uid)
+
+
+def _request(app, method: str, path: str, body: bytes = b"") -> None:
+    environ = {
+        "REQUEST_METHOD": method,
+        "PATH_INFO": path,
+        "QUERY_STRING": "",
+        "CONTENT_LENGTH": str(len(body)),
+        "wsgi.input": io.BytesIO(body),
+        "REMOTE_ADDR": "127.0.0.1",
+    }
+    result = app(environ, lambda status, headers, exc_info=None: None)
+    for _ in result:
+        pass
+    if hasattr(result, "close"):
+        result.close()
+
+
+def _run(app, n_requests: int) -> list[float]:
+    """Смешанная нагрузка: новые матчи, очки, список матчей и главная страница."""
+    timings = []
+    match_no = 0
+    while len(timings) < n_requests:
+        match_no += 1
+        body = f"playerOne=Bench{match_no}A&playerTwo=Bench{match_no}B".encode()
+        start = time.perf_counter()
+        _request(app, "POST", "/new-match", body)
+        timings.append(time.perf_counter() - start)
+
+        from src.tennis_score.services.match_service import get_match_service
+
+        match_uuid = get_match_service().repository.active_matches.values()[-1].match_uid
+        for i in range(8):
+            point = f"match_uuid={match_uuid}&player=player{i % 2 + 1}".encode()
+            start = time.perf_counter()
+            _request(app, "POST", "/match-score", point)
+            timings.append(time.perf_counter() - start)
+        for method, path in (("GET", "/matches"), ("GET", "/")):
+            start = time.perf_counter()
+            _request(app, method, path)
+            timings.append(time.perf_counter() - start)
+    return timings[:n_requests]
+
+
+def main() -> None:
+    """Прогоняет нагрузку для каждой конфигурации и печатает сравнение."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=2000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as log_dir, open(os.devnull, "w") as console:
+        configs = {
+            "sync": lambda: _configure_sync(log_dir, console),
+            "queue": lambda: setup_logging("DEBUG", os.path.join(log_dir, "queue.log"), 1, 0),
+            "queue-sampled": lambda: setup_logging("DEBUG", os.path.join(log_dir, "sampled.log"), 10, 0),
+            "queue-limited": lambda: setup_logging("DEBUG", os.path.join(log_dir, "limited.log"), 1, 200),
+            "queue-info": lambda: setup_logging("INFO", os.path.join(log_dir, "info.log"), 1, 0),
+        }
+        app = None
+        results = {}
+        for name, configure in configs.items():
+            # StreamHandler запоминает поток при создании — подменяем stdout на время настройки
+            with contextlib.redirect_stdout(console):
+                configure()
+            if app is None:
+                app = _make_app()
+            _reset_db()
+            _run(app, 200)  # прогрев
+            _reset_db()
+            results[name] = _run(app, args.requests)
+
+        stop_logging()
+        logging.getLogger().handlers.clear()
+
+    baseline = statistics.fmean(results["sync"])
+    print(f"{'config':<15}{'mean, ms':>10}{'p50, ms':>10}{'p99, ms':>10}{'vs sync':>10}")  # noqa: T201
+    for name, timings in results.items():
+        timings.sort()
+        mean = statistics.fmean(timings)
+        p50 = timings[len(timings) // 2]
+        p99 = timings[int(len(timings) * 0.99) - 1]
+        print(  # noqa: T201
+            f"{name:<15}{mean * 1e3:>10.3f}{p50 * 1e3:>10.3f}{p99 * 1e3:>10.3f}{mean / baseline:>9.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
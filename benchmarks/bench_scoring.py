@@ -0,0 +1,241 @@
+"""Микробенчмарки горячих путей подсчёта очков и подготовки DTO.
+
+Замеряются функции, которые выполняются на каждое очко:
+
+- ``score_point`` — ``ScoreHandler.update_regular_score``/``update_tiebreak_score``
+  с той же диспетчеризацией, что в ``MatchService.update_match_score``;
+- ``to_live_dto`` — ``Match.to_live_dto``;
+- ``final_score_str`` — ``Match.get_final_score_str``;
+- ``view_data`` — ``ViewDataHandler.prepare_match_view_data``.
+
+Последовательности очков фиксированы (``--seed``) и воспроизводят три профиля матча:
+``deuce_heavy`` (почти каждый гейм через «ровно»), ``tiebreaks`` (каждый сет до тай-брейка)
+и ``five_set`` (матч до трёх выигранных сетов, все пять сетов).
+
+Замер в стиле ``timeit``: сборщик мусора выключен, ``--repeat`` повторов по ``--loops``
+проходов, в результат идёт медиана и минимум наносекунд на очко. Память на очко
+измеряется отдельным проходом через tracemalloc.
+
+Запуск::
+
+    python benchmarks/bench_scoring.py --output benchmarks/results/scoring.json
+    python benchmarks/bench_scoring.py --baseline benchmarks/results/scoring-baseline.json
+"""
+
+import argparse
+import copy
+import gc
+import itertools
+import random
+import statistics
+import sys
+import time
+from collections.abc import Callable
+
+from harness import compare_results, environment_info, measure_allocations, write_results
+
+from src.tennis_score.core.presentation import ViewDataHandler
+from src.tennis_score.model.match import Match
+from src.tennis_score.services.score_handler import ScoreHandler
+
+_score_handler = ScoreHandler()
+_view_handler = ViewDataHandler()
+
+
+def play_point(match: Match, player: str) -> None:
+    """Засчитывает очко так же, как ``MatchService.update_match_score``, без репозитория."""
+    opponent = "player2" if player == "player1" else "player1"
+    if match.is_tiebreak:
+        _score_handler.update_tiebreak_score(match, player, match.scores[player], match.scores[opponent])
+    else:
+        _score_handler.update_regular_score(match, player, match.scores[player], match.scores[opponent])
+
+
+def new_match(sets_to_win: int) -> Match:
+    """Новый матч с известными ID игроков (без обращения к базе)."""
+    match = Match("Bench One", "Bench Two")
+    match.set_player_ids(1, 2)
+    match.SETS_TO_WIN = sets_to_win  # ScoreHandler читает атрибут через getattr, по умолчанию 2
+    return match
+
+
+def _deuce_heavy(match: Match, rng: random.Random) -> str:
+    """Отстающий в гейме выигрывает очко с вероятностью 0.75 — геймы застревают на «ровно»."""
+    p1, p2 = match.scores["player1"], match.scores["player2"]
+    if match.is_tiebreak:
+        return rng.choice(("player1", "player2"))
+    if p1["advantage"] or p2["advantage"]:
+        trailing = "player2" if p1["advantage"] else "player1"
+    elif p1["points"] != p2["points"]:
+        trailing = "player1" if p1["points"] < p2["points"] else "player2"
+    else:
+        return rng.choice(("player1", "player2"))
+    leading = "player2" if trailing == "player1" else "player1"
+    return trailing if rng.random() < 0.75 else leading
+
+
+def _tiebreaks(match: Match, rng: random.Random) -> str:
+    """Геймы выигрываются по очереди «под ноль», поэтому каждый сет доходит до 6:6."""
+    if match.is_tiebreak:
+        return rng.choice(("player1", "player2"))
+    games = match.scores["player1"]["games"] + match.scores["player2"]["games"]
+    return "player1" if games % 2 == 0 else "player2"
+
+
+def _five_set(match: Match, rng: random.Random) -> str:
+    """Сеты по очереди достаются игрокам (вероятность очка 0.65), решающий сет — 50/50."""
+    set_no = len(match.set_scores_history)
+    if set_no == 4:
+        return rng.choice(("player1", "player2"))
+    favourite, underdog = ("player1", "player2") if set_no % 2 == 0 else ("player2", "player1")
+    return favourite if rng.random() < 0.65 else underdog
+
+
+PROFILES: dict[str, tuple[Callable[[Match, random.Random], str], int]] = {
+    "deuce_heavy": (_deuce_heavy, 2),
+    "tiebreaks": (_tiebreaks, 2),
+    "five_set": (_five_set, 3),
+}
+
+
+def build_points(profile: str, seed: int) -> tuple[list[str], list[Match]]:
+    """Разыгрывает матч профиля и возвращает последовательность очков и состояние после каждого."""
+    policy, sets_to_win = PROFILES[profile]
+    rng = random.Random(seed)
+    match = new_match(sets_to_win)
+    points, states = [], []
+    while not match.winner:
+        player = policy(match, rng)
+        play_point(match, player)
+        points.append(player)
+        states.append(copy.deepcopy(match))
+    return points, states
+
+
+def time_per_op(run_once: Callable[[], int], loops: int, repeat: int) -> dict:
+    """Повторяет ``run_once`` и возвращает наносекунды на операцию (медиана и минимум).
+
+    Args:
+        run_once: Функция одного прохода; возвращает число выполненных операций
+        loops: Проходов в одном повторе
+        repeat: Число повторов
+    """
+    per_op = []
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            operations = 0
+            start = time.perf_counter_ns()
+            for _ in range(loops):
+                operations += run_once()
+            per_op.append((time.perf_counter_ns() - start) / operations)
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+    median = statistics.median(per_op)
+    return {
+        "ns_per_point": round(median, 1),
+        "ns_min": round(min(per_op), 1),
+        "stdev_pct": round(statistics.pstdev(per_op) / median * 100, 1) if median else 0.0,
+    }
+
+
+def make_benchmarks(points: list[str], states: list[Match], sets_to_win: int) -> dict:
+    """Функции одного прохода по всему матчу и одной операции (для замера памяти)."""
+    dtos = [state.to_live_dto() for state in states]
+
+    def score_point_pass() -> int:
+        match = new_match(sets_to_win)
+        for player in points:
+            play_point(match, player)
+        return len(points)
+
+    def to_live_dto_pass() -> int:
+        for state in states:
+            state.to_live_dto()
+        return len(states)
+
+    def final_score_pass() -> int:
+        for state in states:
+            state.get_final_score_str()
+        return len(states)
+
+    def view_data_pass() -> int:
+        for dto in dtos:
+            _view_handler.prepare_match_view_data(dto)
+        return len(dtos)
+
+    # Для замера памяти — по одной операции за вызов, по кругу по состояниям матча
+    score_match = [new_match(sets_to_win)]
+    score_points = itertools.cycle(points)
+    cycled_states = itertools.cycle(states)
+    cycled_dtos = itertools.cycle(dtos)
+
+    def score_point_once() -> None:
+        if score_match[0].winner:
+            score_match[0] = new_match(sets_to_win)
+        play_point(score_match[0], next(score_points))
+
+    return {
+        "score_point": (score_point_pass, score_point_once),
+        "to_live_dto": (to_live_dto_pass, lambda: next(cycled_states).to_live_dto()),
+        "final_score_str": (final_score_pass, lambda: next(cycled_states).get_final_score_str()),
+        "view_data": (view_data_pass, lambda: _view_handler.prepare_match_view_data(next(cycled_dtos))),
+    }
+
+
+def main() -> int:
+    """Запускает микробенчмарки, сохраняет JSON и сравнивает с базовой линией."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--profiles", nargs="*", choices=sorted(PROFILES), default=list(PROFILES))
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--loops", type=int, default=20, help="проходов по матчу в одном повторе")
+    parser.add_argument("--repeat", type=int, default=15)
+    parser.add_argument("--alloc-repeat", type=int, default=500, help="операций в проходе tracemalloc")
+    parser.add_argument("--output", default="benchmarks/results/scoring.json")
+    parser.add_argument("--baseline", help="JSON предыдущего прогона для сравнения")
+    parser.add_argument("--tolerance", type=float, default=0.10, help="допустимое ухудшение, доля")
+    args = parser.parse_args()
+
+    results = {"meta": {**environment_info(), "seed": args.seed}, "profiles": {}, "scenarios": {}}
+    print(f"{'benchmark':<30}{'ns/point':>12}{'min ns':>12}{'stdev %':>10}{'peak B':>10}")  # noqa: T201
+    for profile in args.profiles:
+        points, states = build_points(profile, args.seed)
+        final = states[-1]
+        results["profiles"][profile] = {
+            "points": len(points),
+            "sets": len(final.set_scores_history),
+            "tiebreaks": sum(1 for s in final.set_scores_history if s[2] is not None),
+            "final_score": final.get_final_score_str(),
+        }
+        sets_to_win = PROFILES[profile][1]
+        for name, (run_once, op) in make_benchmarks(points, states, sets_to_win).items():
+            run_once()  # прогрев
+            stats = time_per_op(run_once, args.loops, args.repeat)
+            allocations = measure_allocations(op, args.alloc_repeat)
+            stats["alloc_b_per_point"] = round(allocations["alloc_peak_kib"] * 1024)
+            key = f"{profile}/{name}"
+            results["scenarios"][key] = stats
+            print(  # noqa: T201
+                f"{key:<30}{stats['ns_per_point']:>12}{stats['ns_min']:>12}{stats['stdev_pct']:>10}"
+                f"{stats['alloc_b_per_point']:>10}"
+            )
+
+    print()  # noqa: T201
+    for profile, info in results["profiles"].items():
+        print(f"{profile}: {info['points']} points, {info['final_score']}")  # noqa: T201
+
+    write_results(args.output, results)
+    print(f"\nResults written to {args.output}")  # noqa: T201
+
+    if args.baseline:
+        regressions = compare_results(results, args.baseline, args.tolerance)
+        if regressions:
+            print("\nRegressions:\n  " + "\n  ".join(regressions))  # noqa: T201
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,248 @@
+"""Подбор числа потоков waitress под размер пула соединений БД.
+
+Для каждой комбинации потоков (``WEB_THREADS``) и размера пула (``DB_POOL_SIZE``,
+временных соединений сверх него нет) запускается настоящий сервер ``main.py`` на
+свободном порту, и ``--concurrency`` клиентов с постоянными соединениями нагружают его
+``--duration`` секунд смесью запросов: очки матчей (60%), страницы истории (25%),
+главная страница (15%). Для комбинации выводятся запросы/с, p50/p95/p99 и ошибки,
+в конце — лучшая комбинация без ошибок.
+
+Клиенты работают в потоках этого процесса на той же машине, что и сервер: абсолютные
+числа занижены, сравнивать стоит комбинации между собой.
+
+Профили (``--profile``):
+
+- ``quick`` — потоки 2, 4, 8 × пул 2, 5;
+- ``threads-vs-pool`` — потоки 1, 2, 4, 8, 16, 32 × пул 1, 2, 5, 10, 20.
+
+Запуск::
+
+    python benchmarks/bench_server.py --profile quick --duration 5
+    python benchmarks/bench_server.py --db-url postgresql+psycopg2://... --concurrency 64
+"""
+
+import argparse
+import contextlib
+import http.client
+import itertools
+import os
+import random
+import re
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+from harness import ROOT_DIR, environment_info, summarize, write_results
+
+_UUID_RE = re.compile(rb'name="match_uuid" value="([0-9a-f-]{36})"')
+
+PROFILES = {
+    "quick": {"threads": (2, 4, 8), "pool_sizes": (2, 5)},
+    "threads-vs-pool": {"threads": (1, 2, 4, 8, 16, 32), "pool_sizes": (1, 2, 5, 10, 20)},
+}
+
+FORM_HEADERS = {"Content-Type": "application/x-www-form-urlencoded"}
+
+
+def free_port() -> int:
+    """Свободный TCP-порт на локальном адресе."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@contextlib.contextmanager
+def running_server(threads: int, pool_size: int, concurrency: int):
+    """Запускает ``main.py`` с заданными потоками и пулом; отдаёт порт, когда сервер готов."""
+    port = free_port()
+    env = {
+        **os.environ,
+        "WEB_HOST": "127.0.0.1",
+        "WEB_PORT": str(port),
+        "WEB_THREADS": str(threads),
+        # Все клиенты держат соединения открытыми: лимит не должен их отсекать
+        "WEB_CONNECTION_LIMIT": str(max(100, concurrency * 2)),
+        "DB_POOL_SIZE": str(pool_size),
+        "DB_MAX_OVERFLOW": "0",
+        "APP_WARMUP": "1",
+        "LOG_LEVEL": "WARNING",
+        "LOG_FILE": "",
+    }
+    process = subprocess.Popen([sys.executable, "main.py"], cwd=ROOT_DIR, env=env, stdout=subprocess.DEVNULL)
+    try:
+        deadline = time.monotonic() + 30
+        while True:
+            if process.poll() is not None:
+                raise RuntimeError(f"Server exited with code {process.returncode}")
+            try:
+                connection = http.client.HTTPConnection("127.0.0.1", port, timeout=1)
+                connection.request("GET", "/healthz")
+                if connection.getresponse().status == 200:
+                    connection.close()
+                    break
+            except OSError:
+                if time.monotonic() > deadline:
+                    raise
+                time.sleep(0.1)
+        yield port
+    finally:
+        process.terminate()
+        process.wait(timeout=10)
+
+
+class LoadClient(threading.Thread):
+    """Клиент с постоянным соединением: играет свой матч и читает страницы."""
+
+    def __init__(self, port: int, client_id: int, seed: int, measure_from: float, stop_at: float):
+        super().__init__(daemon=True)
+        self.port = port
+        self.client_id = client_id
+        self.rng = random.Random(seed + client_id)
+        self.measure_from = measure_from
+        self.stop_at = stop_at
+        self.timings: list[float] = []
+        self.errors = 0
+        self.matches = 0
+        self.match_uuid = None
+        self.connection = None
+
+    def request(self, method: str, path: str, body: str | None = None) -> bytes:
+        if self.connection is None:
+            self.connection = http.client.HTTPConnection("127.0.0.1", self.port, timeout=60)
+        start = time.perf_counter()
+        try:
+            self.connection.request(method, path, body, FORM_HEADERS if body is not None else {})
+            response = self.connection.getresponse()
+            content = response.read()
+            failed = response.status >= 500
+        except (OSError, http.client.HTTPException):
+            self.connection.close()
+            self.connection = None
+            content, failed = b"", True
+        if time.perf_counter() >= self.measure_from:
+            self.timings.append(time.perf_counter() - start)
+            self.errors += failed
+        return content
+
+    def run(self) -> None:
+        while time.perf_counter() < self.stop_at:
+            roll = self.rng.random()
+            if roll < 0.6:
+                self.score_point()
+            elif roll < 0.85:
+                page = self.rng.randint(1, 5)
+                self.request("GET", f"/matches?page={page}")
+            else:
+                self.request("GET", "/")
+        if self.connection is not None:
+            self.connection.close()
+
+    def score_point(self) -> None:
+        if self.match_uuid is None:
+            self.matches += 1
+            name = f"Srv{self.client_id}_{self.matches}"
+            match = _UUID_RE.search(
+                self.request("POST", "/new-match", f"playerOne={name}A&playerTwo={name}B")
+            )
+            self.match_uuid = match.group(1).decode() if match else None
+            return
+        player = "player1" if self.rng.random() < 0.55 else "player2"
+        body = self.request("POST", "/match-score", f"match_uuid={self.match_uuid}&player={player}")
+        if b'data-match-completed="true"' in body or not body:
+            self.match_uuid = None
+
+
+def run_load(port: int, concurrency: int, duration: float, warmup: float, seed: int) -> dict:
+    """Нагружает сервер и возвращает сводку по замеряемому интервалу."""
+    start = time.perf_counter()
+    clients = [
+        LoadClient(port, client_id, seed, start + warmup, start + warmup + duration)
+        for client_id in range(concurrency)
+    ]
+    for client in clients:
+        client.start()
+    for client in clients:
+        client.join()
+
+    timings = [timing for client in clients for timing in client.timings]
+    stats = summarize(timings)
+    # summarize считает запросы/с по сумме длительностей; при параллельных клиентах — по времени замера
+    stats["ops_per_s"] = round(len(timings) / duration, 1)
+    stats["errors"] = sum(client.errors for client in clients)
+    return stats
+
+
+def main() -> int:
+    """Прогоняет сетку комбинаций потоков и пула, сохраняет JSON и печатает лучшую."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--profile", choices=sorted(PROFILES), default="threads-vs-pool")
+    parser.add_argument("--threads", type=int, nargs="*", help="переопределяет потоки профиля")
+    parser.add_argument("--pool-sizes", type=int, nargs="*", help="переопределяет размеры пула профиля")
+    parser.add_argument("--concurrency", type=int, default=32, help="одновременных клиентов")
+    parser.add_argument("--duration", type=float, default=10.0, help="секунд замера на комбинацию")
+    parser.add_argument("--warmup", type=float, default=2.0, help="секунд нагрузки до замера")
+    parser.add_argument("--history", type=int, default=500, help="завершённых матчей в истории")
+    parser.add_argument("--db-url", help="по умолчанию — временный файл SQLite")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", default="benchmarks/results/server.json")
+    args = parser.parse_args()
+
+    profile = PROFILES[args.profile]
+    thread_counts = args.threads or profile["threads"]
+    pool_sizes = args.pool_sizes or profile["pool_sizes"]
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        os.environ["DATABASE_URL"] = args.db_url or f"sqlite:///{os.path.join(tmp_dir, 'bench.db')}"
+
+        from bench_wsgi import seed_history
+
+        from src.tennis_score.model.orm_models import Base
+        from src.tennis_score.services.match_service import get_match_service
+
+        repository = get_match_service().repository
+        Base.metadata.create_all(repository.engine)
+        seed_history(repository, args.history, random.Random(args.seed))
+        repository.engine.dispose()
+
+        results = {
+            "meta": {
+                **environment_info(),
+                "db": os.environ["DATABASE_URL"].split(":")[0],
+                "profile": args.profile,
+                "concurrency": args.concurrency,
+                "duration_s": args.duration,
+                "cpu_count": os.cpu_count(),
+            },
+            "scenarios": {},
+        }
+        print(  # noqa: T201
+            f"{'threads':>8}{'pool':>6}{'req/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'errors':>8}"
+        )
+        for threads, pool_size in itertools.product(thread_counts, pool_sizes):
+            with running_server(threads, pool_size, args.concurrency) as port:
+                stats = run_load(port, args.concurrency, args.duration, args.warmup, args.seed)
+            stats.update(threads=threads, pool_size=pool_size)
+            results["scenarios"][f"threads={threads},pool={pool_size}"] = stats
+            print(  # noqa: T201
+                f"{threads:>8}{pool_size:>6}{stats['ops_per_s']:>10}{stats['p50_ms']:>10}"
+                f"{stats['p95_ms']:>10}{stats['p99_ms']:>10}{stats['errors']:>8}"
+            )
+
+    candidates = [stats for stats in results["scenarios"].values() if not stats["errors"]]
+    if candidates:
+        best = max(candidates, key=lambda stats: stats["ops_per_s"])
+        results["best"] = {"threads": best["threads"], "pool_size": best["pool_size"]}
+        print(  # noqa: T201
+            f"\nBest: WEB_THREADS={best['threads']} DB_POOL_SIZE={best['pool_size']} "
+            f"({best['ops_per_s']} req/s, p95 {best['p95_ms']} ms)"
+        )
+    write_results(args.output, results)
+    print(f"Results written to {args.output}")  # noqa: T201
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,265 @@
+"""Нагрузочный бенчмарк WSGI- и ASGI-приложения без сокетов.
+
+Приложение собирается через ``AppOrchestrator().create_app()`` (``--interface asgi`` —
+``create_asgi_app()``) и вызывается напрямую. Оба варианта прогоняют одни и те же
+сценарии, поэтому результаты сравнимы. По умолчанию используется временная
+SQLite-база (``--db-url`` позволяет указать, например, одноразовый PostgreSQL).
+
+Сценарии:
+
+- ``create_match`` — создание матча (POST /new-match);
+- ``score_point`` — розыгрыш полных матчей очко за очком (POST /match-score);
+- ``list_history`` — постраничный и отфильтрованный список матчей (GET /matches);
+- ``static`` — статика: отпечатанный CSS, условный запрос с 304, крупное изображение (потоковая отдача);
+- ``index`` — главная страница.
+
+Запуск::
+
+    python benchmarks/bench_wsgi.py --requests 2000 --output benchmarks/results/latest.json
+    python benchmarks/bench_wsgi.py --baseline benchmarks/results/baseline.json
+    python benchmarks/bench_wsgi.py --interface asgi --output benchmarks/results/asgi.json
+"""
+
+import argparse
+import contextlib
+import os
+import random
+import re
+import sys
+import tempfile
+import time
+
+from harness import (
+    AsgiClient,
+    WsgiClient,
+    compare_results,
+    environment_info,
+    measure_allocations,
+    summarize,
+    write_results,
+)
+
+_UUID_RE = re.compile(rb'name="match_uuid" value="([0-9a-f-]{36})"')
+_ASSET_RE = re.compile(rb'href="(/static/css/[^"]+)"')
+
+
+class Scenario:
+    """Сценарий нагрузки: ``before`` выполняется вне замера, ``op`` — замеряемый запрос."""
+
+    name = ""
+
+    def __init__(self, client: WsgiClient, rng: random.Random):
+        self.client = client
+        self.rng = rng
+
+    def before(self) -> None:
+        pass
+
+    def op(self) -> None:
+        raise NotImplementedError
+
+
+class CreateMatch(Scenario):
+    """Создание матча между двумя новыми игроками."""
+
+    name = "create_match"
+
+    def __init__(self, client, rng):
+        super().__init__(client, rng)
+        self.counter = 0
+
+    def op(self) -> None:
+        self.counter += 1
+        self.client.post("/new-match", f"playerOne=Create{self.counter}A&playerTwo=Create{self.counter}B")
+
+
+class ScorePoint(Scenario):
+    """Матчи играются до победы; игрок 1 выигрывает очко с вероятностью 0.55."""
+
+    name = "score_point"
+
+    def __init__(self, client, rng):
+        super().__init__(client, rng)
+        self.counter = 0
+        self.match_uuid = None
+        self.matches_finished = 0
+
+    def before(self) -> None:
+        if self.match_uuid is None:
+            self.counter += 1
+            _, _, body = self.client.post(
+                "/new-match", f"playerOne=Score{self.counter}A&playerTwo=Score{self.counter}B"
+            )
+            self.match_uuid = _UUID_RE.search(body).group(1).decode()
+
+    def op(self) -> None:
+        player = "player1" if self.rng.random() < 0.55 else "player2"
+        _, _, body = self.client.post("/match-score", f"match_uuid={self.match_uuid}&player={player}")
+        if b'data-match-completed="true"' in body:
+            self.match_uuid = None
+            self.matches_finished += 1
+
+
+class ListHistory(Scenario):
+    """Страницы истории матчей; каждый третий запрос — с фильтром по имени."""
+
+    name = "list_history"
+
+    def __init__(self, client, rng):
+        super().__init__(client, rng)
+        self.counter = 0
+
+    def op(self) -> None:
+        self.counter += 1
+        page = self.counter % 5 + 1
+        if self.counter % 3 == 0:
+            self.client.get(f"/matches?page={page}&filter_query=Player1")
+        else:
+            self.client.get(f"/matches?page={page}")
+
+
+class StaticHits(Scenario):
+    """Статика по очереди: CSS по отпечатку, условный запрос (304) и крупное изображение."""
+
+    name = "static"
+
+    def __init__(self, client, rng):
+        super().__init__(client, rng)
+        _, _, body = client.get("/")
+        self.css_url = _ASSET_RE.search(body).group(1).decode()
+        _, headers, _ = client.get(self.css_url)
+        self.etag = headers["ETag"]
+        self.counter = 0
+
+    def op(self) -> None:
+        self.counter += 1
+        if self.counter % 3 == 0:
+            self.client.get(self.css_url, headers={"If-None-Match": self.etag})
+        elif self.counter % 3 == 1:
+            self.client.get(self.css_url)
+        else:
+            self.client.get("/static/images/racket.png")
+
+
+class IndexPage(Scenario):
+    """Главная страница."""
+
+    name = "index"
+
+    def op(self) -> None:
+        self.client.get("/")
+
+
+SCENARIOS = {cls.name: cls for cls in (CreateMatch, ScorePoint, ListHistory, StaticHits, IndexPage)}
+
+
+def seed_history(repository, matches: int, rng: random.Random) -> None:
+    """Заполняет историю завершёнными матчами для сценария list_history."""
+    scores = ["6-4, 6-3", "7-6(7-4), 6-2", "4-6, 6-3, 7-5", "6-0, 6-1"]
+    player_ids = [repository.get_or_create_player_by_name(f"Player{i}") for i in range(50)]
+    for i in range(matches):
+        p1, p2 = rng.sample(player_ids, 2)
+        repository.add_match(f"seed-{i:06d}", p1, p2, rng.choice((p1, p2)), rng.choice(scores))
+
+
+def run_scenario(scenario: Scenario, requests: int, warmup: int) -> list[float]:
+    """Прогревает сценарий и возвращает длительности замеряемых запросов в секундах."""
+    for _ in range(warmup):
+        scenario.before()
+        scenario.op()
+    timings = []
+    for _ in range(requests):
+        scenario.before()
+        start = time.perf_counter()
+        scenario.op()
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def main() -> int:
+    """Запускает выбранные сценарии, сохраняет JSON и сравнивает с базовой линией."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=1000, help="замеряемых запросов на сценарий")
+    parser.add_argument("--warmup", type=int, default=50)
+    parser.add_argument("--alloc-repeat", type=int, default=50, help="запросов в проходе tracemalloc")
+    parser.add_argument("--history", type=int, default=500, help="завершённых матчей в истории")
+    parser.add_argument("--interface", choices=("wsgi", "asgi"), default="wsgi")
+    parser.add_argument("--scenarios", nargs="*", choices=sorted(SCENARIOS), default=list(SCENARIOS))
+    parser.add_argument("--db-url", help="по умолчанию — временный файл SQLite")
+    parser.add_argument("--log-level", default="WARNING")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", default="benchmarks/results/latest.json")
+    parser.add_argument("--baseline", help="JSON предыдущего прогона для сравнения")
+    parser.add_argument("--tolerance", type=float, default=0.10, help="допустимое ухудшение, доля")
+    args = parser.parse_args()
+
+    with contextlib.ExitStack() as stack:
+        tmp_dir = stack.enter_context(tempfile.TemporaryDirectory())
+        os.environ["DATABASE_URL"] = args.db_url or f"sqlite:///{os.path.join(tmp_dir, 'bench.db')}"
+
+        from src.tennis_score.logging_setup import setup_logging, stop_logging
+
+        # Консольный обработчик логов пишет в /dev/null, чтобы вывод не искажал замеры
+        devnull = stack.enter_context(open(os.devnull, "w"))
+        with contextlib.redirect_stdout(devnull):
+            setup_logging(args.log_level, log_file="")
+        stack.callback(stop_logging)
+
+        from src.tennis_score.core.app_orchestrator import AppOrchestrator
+        from src.tennis_score.model.orm_models import Base
+        from src.tennis_score.services.match_service import get_match_service
+
+        repository = get_match_service().repository
+        Base.metadata.create_all(repository.engine)
+        rng = random.Random(args.seed)
+        seed_history(repository, args.history, rng)
+        if args.interface == "asgi":
+            client = AsgiClient(AppOrchestrator().create_asgi_app())
+            stack.callback(client.close)
+        else:
+            client = WsgiClient(AppOrchestrator().create_app())
+
+        results = {
+            "meta": {
+                **environment_info(),
+                "db": os.environ["DATABASE_URL"].split(":")[0],
+                "interface": args.interface,
+                "history": args.history,
+                "seed": args.seed,
+            },
+            "scenarios": {},
+        }
+        print(  # noqa: T201
+            f"{'scenario':<16}{'req/s':>10}{'mean ms':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}"
+            f"{'peak KiB':>10}"
+        )
+        for name in args.scenarios:
+            scenario = SCENARIOS[name](client, random.Random(args.seed))
+            stats = summarize(run_scenario(scenario, args.requests, args.warmup))
+
+            def one_request(scenario=scenario):
+                scenario.before()
+                scenario.op()
+
+            stats.update(measure_allocations(one_request, args.alloc_repeat))
+            results["scenarios"][name] = stats
+            print(  # noqa: T201
+                f"{name:<16}{stats['ops_per_s']:>10}{stats['mean_ms']:>10}{stats['p50_ms']:>10}"
+                f"{stats['p95_ms']:>10}{stats['p99_ms']:>10}{stats['alloc_peak_kib']:>10}"
+            )
+
+        repository.engine.dispose()
+
+    write_results(args.output, results)
+    print(f"\nResults written to {args.output}")  # noqa: T201
+
+    if args.baseline:
+        regressions = compare_results(results, args.baseline, args.tolerance)
+        if regressions:
+            print("\nRegressions:\n  " + "\n  ".join(regressions))  # noqa: T201
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
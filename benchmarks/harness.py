@@ -0,0 +1,259 @@
+"""Общие инструменты бенчмарков: WSGI- и ASGI-клиенты без сокетов, статистика и сравнение с базовой линией.
+
+Модуль должен импортироваться до приложения: он добавляет корень репозитория в
+``sys.path``, по умолчанию направляет приложение на SQLite вместо PostgreSQL и
+отключает ограничение частоты запросов (все запросы бенчмарка идут с одного адреса).
+"""
+
+import asyncio
+import json
+import math
+import os
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from collections.abc import Callable
+from io import BytesIO
+from wsgiref.headers import Headers
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, ROOT_DIR)
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+os.environ.setdefault("RATE_LIMIT_RPS", "0")
+
+
+class WsgiClient:
+    """Вызывает WSGI-приложение напрямую, минуя сеть."""
+
+    def __init__(self, app, remote_addr: str = "127.0.0.1"):
+        self.app = app
+        self.remote_addr = remote_addr
+
+    def request(
+        self, method: str, path: str, body: bytes = b"", headers: dict[str, str] | None = None
+    ) -> tuple[str, dict[str, str], bytes]:
+        """Выполняет запрос и возвращает (статус, заголовки, тело)."""
+        path, _, query_string = path.partition("?")
+        environ = {
+            "REQUEST_METHOD": method,
+            "PATH_INFO": path,
+            "QUERY_STRING": query_string,
+            "SERVER_NAME": "bench",
+            "SERVER_PORT": "80",
+            "SERVER_PROTOCOL": "HTTP/1.1",
+            "REMOTE_ADDR": self.remote_addr,
+            "CONTENT_LENGTH": str(len(body)),
+            "CONTENT_TYPE": "application/x-www-form-urlencoded",
+            "wsgi.input": BytesIO(body),
+            "wsgi.url_scheme": "http",
+            "wsgi.errors": sys.stderr,
+            "wsgi.multithread": False,
+            "wsgi.multiprocess": False,
+            "wsgi.run_once": False,
+        }
+        for name, value in (headers or {}).items():
+            environ["HTTP_" + name.upper().replace("-", "_")] = value
+
+        response: dict = {}
+
+        def start_response(status, response_headers, exc_info=None):
+            response["status"] = status
+            response["headers"] = dict(response_headers)
+
+        result = self.app(environ, start_response)
+        try:
+            content = b"".join(result)
+        finally:
+            if hasattr(result, "close"):
+                result.close()
+        return response["status"], response["headers"], content
+
+    def get(self, path: str, headers: dict[str, str] | None = None):
+        return self.request("GET", path, headers=headers)
+
+    def post(self, path: str, body: bytes | str = b""):
+        return self.request("POST", path, body.encode() if isinstance(body, str) else body)
+
+
+class AsgiClient(WsgiClient):
+    """Вызывает ASGI-приложение напрямую, минуя сеть; API — как у ``WsgiClient``.
+
+    Все запросы выполняются в одном цикле событий, как под ASGI-сервером.
+    """
+
+    def __init__(self, app, remote_addr: str = "127.0.0.1"):
+        super().__init__(app, remote_addr)
+        self.loop = asyncio.new_event_loop()
+
+    def close(self) -> None:
+        self.loop.close()
+
+    def request(
+        self, method: str, path: str, body: bytes = b"", headers: dict[str, str] | None = None
+    ) -> tuple[str, dict[str, str], bytes]:
+        """Выполняет запрос и возвращает (статус, заголовки, тело)."""
+        return self.loop.run_until_complete(self._request(method, path, body, headers))
+
+    async def _request(self, method, path, body, headers):
+        path, _, query_string = path.partition("?")
+        raw_headers = [
+            (b"content-type", b"application/x-www-form-urlencoded"),
+            (b"content-length", str(len(body)).encode()),
+            *((name.lower().encode(), value.encode()) for name, value in (headers or {}).items()),
+        ]
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": method,
+            "scheme": "http",
+            "path": path,
+            "query_string": query_string.encode(),
+            "root_path": "",
+            "headers": raw_headers,
+            "client": (self.remote_addr, 50000),
+            "server": ("bench", 80),
+        }
+        request_messages = [{"type": "http.request", "body": body, "more_body": False}]
+        response: dict = {"body": []}
+
+        async def receive():
+            if request_messages:
+                return request_messages.pop()
+            return {"type": "http.disconnect"}
+
+        async def send(message):
+            if message["type"] == "http.response.start":
+                response["status"] = str(message["status"])
+                # ASGI передаёт имена заголовков в нижнем регистре; Headers ищет без учёта регистра
+                response["headers"] = Headers(
+                    [(name.decode("latin-1"), value.decode("latin-1")) for name, value in message["headers"]]
+                )
+            elif message["type"] == "http.response.body":
+                response["body"].append(message.get("body", b""))
+
+        await self.app(scope, receive, send)
+        return response["status"], response["headers"], b"".join(response["body"])
+
+
+def percentile(sorted_values: list[float], q: float) -> float:
+    """Перцентиль методом ближайшего ранга по отсортированной выборке."""
+    if not sorted_values:
+        return 0.0
+    index = max(0, min(len(sorted_values) - 1, math.ceil(q / 100 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def summarize(timings: list[float], operations: int | None = None) -> dict:
+    """Сводка по выборке длительностей (в секундах) одной операции."""
+    timings = sorted(timings)
+    total = sum(timings)
+    operations = operations or len(timings)
+    return {
+        "operations": operations,
+        "total_s": round(total, 6),
+        "ops_per_s": round(operations / total, 1) if total else 0.0,
+        "mean_ms": round(statistics.fmean(timings) * 1e3, 4) if timings else 0.0,
+        "p50_ms": round(percentile(timings, 50) * 1e3, 4),
+        "p95_ms": round(percentile(timings, 95) * 1e3, 4),
+        "p99_ms": round(percentile(timings, 99) * 1e3, 4),
+    }
+
+
+def measure_allocations(func: Callable[[], object], repeat: int) -> dict:
+    """Память на операцию по данным tracemalloc.
+
+    Выполняется отдельным проходом: трассировка заметно замедляет код,
+    поэтому её нельзя совмещать с замерами времени.
+
+    Returns:
+        alloc_peak_kib — средний пик выделенной за операцию памяти,
+        retained_kib — сколько памяти в среднем осталось занятым после операции.
+    """
+    tracemalloc.start()
+    try:
+        peak_total = 0
+        retained_total = 0
+        for _ in range(repeat):
+            before, _ = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+            func()
+            after, peak = tracemalloc.get_traced_memory()
+            peak_total += peak - before
+            retained_total += after - before
+    finally:
+        tracemalloc.stop()
+    return {
+        "alloc_peak_kib": round(peak_total / repeat / 1024, 2),
+        "retained_kib": round(retained_total / repeat / 1024, 3),
+    }
+
+
+def environment_info() -> dict:
+    """Описание окружения, в котором получены результаты."""
+    return {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+    }
+
+
+def write_results(path: str, results: dict) -> None:
+    """Сохраняет результаты в JSON, создавая каталог при необходимости."""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2, ensure_ascii=False)
+        f.write("\n")
+
+
+# Направление «лучше»: для времени меньше, для пропускной способности больше
+_LOWER_IS_BETTER = (
+    "mean_ms",
+    "p50_ms",
+    "p95_ms",
+    "p99_ms",
+    "alloc_peak_kib",
+    "ns_per_point",
+    "alloc_b_per_point",
+)
+_HIGHER_IS_BETTER = ("ops_per_s",)
+
+
+def compare_results(current: dict, baseline_path: str, tolerance: float) -> list[str]:
+    """Сравнивает результаты с сохранённой базовой линией и печатает таблицу изменений.
+
+    Args:
+        current: Результаты текущего прогона (ключ ``scenarios``)
+        baseline_path: JSON-файл с результатами предыдущего прогона
+        tolerance: Допустимое ухудшение в долях (0.1 — 10%)
+
+    Returns:
+        Список описаний регрессий, превысивших допуск.
+    """
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = json.load(f)
+
+    regressions = []
+    print(f"\nComparison with {baseline_path} (tolerance {tolerance:.0%}):")  # noqa: T201
+    for name, metrics in current["scenarios"].items():
+        base_metrics = baseline.get("scenarios", {}).get(name)
+        if not base_metrics:
+            print(f"  {name}: no baseline")  # noqa: T201
+            continue
+        for key in (*_HIGHER_IS_BETTER, *_LOWER_IS_BETTER):
+            if key not in metrics or not base_metrics.get(key):
+                continue
+            change = metrics[key] / base_metrics[key] - 1
+            worse = -change if key in _HIGHER_IS_BETTER else change
+            marker = "REGRESSION" if worse > tolerance else ""
+            print(  # noqa: T201
+                f"  {name:<30}{key:<18}{base_metrics[key]:>12}{metrics[key]:>12}{change:>+9.1%}  {marker}"
+            )
+            if marker:
+                regressions.append(f"{name}.{key}: {base_metrics[key]} -> {metrics[key]} ({change:+.1%})")
+    return regressions
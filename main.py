@@ -2,46 +2,23 @@
 
 # serve.py
 
-import logging
-import sys
-
 from waitress import serve
 
-from src.tennis_score.app import app
-
-# Настройка корневого логгера
-log_format = '[%(asctime)s] %(levelname)-8s %(name)-25s %(funcName)-25s %(message)s'
-log_datefmt = '%Y-%m-%d %H:%M:%S'
-logging.basicConfig(
-    level=logging.DEBUG,
-    format=log_format,
-    datefmt=log_datefmt,
-    handlers=[
-        logging.StreamHandler(sys.stdout),  # Вывод в консоль
-        logging.FileHandler('tennis_app.log')  # Дополнительно запись в файл
-    ]
-)
-# Явно задаём форматтер для всех обработчиков root-логгера
-root_logger = logging.getLogger()
-for handler in root_logger.handlers:
-    handler.setFormatter(logging.Formatter(log_format, log_datefmt))
+from src.tennis_score.logging_setup import setup_logging
+from src.tennis_score.server_config import load_server_config
 
-# Настройка логгеров для различных модулей
-for logger_name in ['controller', 'router', 'app']:
-    logger = logging.getLogger(logger_name)
-    logger.setLevel(logging.DEBUG)
+# Логирование настраивается до импорта приложения, чтобы записи, сделанные при
+# сборке приложения, тоже шли через очередь и фоновый поток записи
+setup_logging()
 
-# Отключим логи от wsgi и настроим уровень для waitress
-logging.getLogger('wsgi').setLevel(logging.WARNING)  # Только предупреждения и ошибки
-logging.getLogger('waitress').setLevel(logging.INFO)
+# Настройки сервера проверяются до сборки приложения: ошибка в них останавливает запуск сразу
+server_config = load_server_config()
 
-# Настроим также логи для сервисных слоев, инфраструктуры и репозиториев
-logging.getLogger('service').setLevel(logging.DEBUG)
-logging.getLogger('repository').setLevel(logging.DEBUG)
-logging.getLogger('core').setLevel(logging.DEBUG)
-logging.getLogger('presentation').setLevel(logging.DEBUG)
+from src.tennis_score.app import app  # noqa: E402
+from src.tennis_score.repositories.engine import pool_capacity  # noqa: E402
+from src.tennis_score.services.match_service import get_match_service  # noqa: E402
 
 if __name__ == "__main__":
+    server_config.report(db_pool_capacity=pool_capacity(get_match_service().repository.db_url))
     # Запуск приложения с помощью Waitress
-    serve(app, host='0.0.0.0', port=8080)
-
+    serve(app, **server_config.serve_kwargs())
@@ -9,20 +9,23 @@ from wsgiref.simple_server import make_server
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
 
 from src.tennis_score.core.app_orchestrator import AppOrchestrator
+from src.tennis_score.logging_setup import setup_logging
 
 
 def main():
     """Главная функция для запуска приложения."""
+    setup_logging()
+
     # Создание и настройка приложения с использованием оркестратора
     app_orchestrator = AppOrchestrator()
     app = app_orchestrator.create_app()
     
     port = 8000
-    logging.info(f"Starting tennis server on port {port}...")
+    logging.info("Starting tennis server on port %s...", port)
     
     try:
         with make_server("", port, app) as httpd:
-            logging.info(f"Tennis server is running on http://localhost:{port}")
+            logging.info("Tennis server is running on http://localhost:%s", port)
             httpd.serve_forever()
     except KeyboardInterrupt:
         logging.info("Server stopped by user")
@@ -16,7 +16,7 @@ if __name__ == "__main__":
     from wsgiref.simple_server import make_server
     
     port = 8000
-    logging.info(f"Starting server on port {port}...")
+    logging.info("Starting server on port %s...", port)
     with make_server("", port, app) as httpd:
-        logging.info(f"Server is running on port {port}")
+        logging.info("Server is running on port %s", port)
         httpd.serve_forever()
@@ -0,0 +1,15 @@
+"""Модуль asgi.
+
+Входная точка ASGI-приложения для теннисного скоринга::
+
+    uvicorn src.tennis_score.asgi:app
+"""
+
+from .core.app_orchestrator import AppOrchestrator
+from .logging_setup import setup_logging
+
+setup_logging()
+
+# Создание и настройка приложения с использованием оркестратора
+app_orchestrator = AppOrchestrator()
+app = app_orchestrator.create_asgi_app()
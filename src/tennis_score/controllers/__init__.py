@@ -6,6 +6,11 @@ from .match_controllers import (
     new_match_controller,
     reset_match_controller,
 )
+from .player_controllers import (
+    head_to_head_controller,
+    leaderboard_controller,
+    player_profile_controller,
+)
 from .view_controllers import TemplateViewController
 
 __all__ = [
@@ -13,5 +18,8 @@ __all__ = [
     "match_score_controller",
     "list_matches_controller",
     "reset_match_controller",
+    "player_profile_controller",
+    "head_to_head_controller",
+    "leaderboard_controller",
     "TemplateViewController",
 ]
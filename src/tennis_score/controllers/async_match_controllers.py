@@ -0,0 +1,40 @@
+"""Асинхронные контроллеры счёта матча для ASGI-приложения.
+
+Зрители и судьи опрашивают ``/match-score`` чаще всего; эти контроллеры ждут БД
+через ``AsyncMatchService`` и не занимают поток на время запроса. Разбор
+параметров и сборка ответа — общие с синхронными контроллерами.
+"""
+
+import logging
+
+from ..services.async_match_service import get_async_match_service
+from .match_controllers import (
+    active_match_response,
+    completed_match_response,
+    match_score_params,
+    no_match_response,
+)
+
+
+async def async_match_score_controller(params: dict) -> dict:
+    """Асинхронный двойник ``match_score_controller``: просмотр и обновление счёта матча."""
+    logger = logging.getLogger("controller")
+    logger.debug("async_match_score_controller: %s", params)
+    match_service = get_async_match_service()
+
+    match_uuid, player_param = match_score_params(params)
+    if not match_uuid:
+        return no_match_response()
+
+    completed_match = await match_service.get_completed_match_by_uuid(match_uuid)
+    if completed_match:
+        return completed_match_response(match_service, completed_match, match_uuid, player_param)
+
+    if player_param in ["player1", "player2"]:
+        logger.debug("Updating score for match %s, player %s", match_uuid, player_param)
+        match_dto = await match_service.update_match_score(match_uuid, player_param)
+    else:
+        logger.debug("Fetching score data for match %s", match_uuid)
+        match_dto = await match_service.get_match_data_by_uuid(match_uuid)
+
+    return active_match_response(match_service, match_dto, match_uuid)
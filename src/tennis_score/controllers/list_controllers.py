@@ -4,13 +4,13 @@
 import logging
 
 from ..core.response import make_response
-from .match_controllers import match_service
+from ..services.match_service import get_match_service
 
 
 def list_matches_controller(params: dict) -> dict:
     """Контроллер для отображения списка матчей с пагинацией."""
     logger = logging.getLogger("controller.list")
-    logger.debug(f"Processing list_matches request with params: {params}")
+    logger.debug("Processing list_matches request with params: %s", params)
 
     # Получаем параметры пагинации из params (например, ?page=2)
     # page = int(params.get("page", [1])[0]) if "page" in params else 1 # Старая версия
@@ -22,10 +22,10 @@ def list_matches_controller(params: dict) -> dict:
             if page_val >= 1:
                 page = page_val
             else:
-                logger.warning(f"Page number {page_val} is less than 1. Using page 1.")
+                logger.warning("Page number %s is less than 1. Using page 1.", page_val)
                 # page остается 1
         except ValueError:
-            logger.warning(f"Invalid page parameter: '{page_param_list[0]}'. Using page 1.")
+            logger.warning("Invalid page parameter: '%s'. Using page 1.", page_param_list[0])
             # page остается 1
     else:
         logger.debug("Page parameter not found. Using page 1.")
@@ -34,11 +34,12 @@ def list_matches_controller(params: dict) -> dict:
     filter_query_list = params.get("filter_query")
     filter_query = filter_query_list[0] if filter_query_list and filter_query_list[0].strip() else None
     if filter_query:
-        logger.debug(f"Applying filter: '{filter_query}'")
+        logger.debug("Applying filter: '%s'", filter_query)
     
-    logger.debug(f"Requesting matches for page: {page}, per_page: {per_page}, filter: '{filter_query}'")
+    logger.debug("Requesting matches for page: %s, per_page: %s, filter: '%s'", page, per_page, filter_query)
 
     # Получаем список матчей и общее количество страниц через сервис
+    match_service = get_match_service()
     matches, total_pages = match_service.data_handler.list_matches_paginated(page, per_page, filter_query)
 
     # Возвращаем контекст с данными о матчах и параметрами пагинации
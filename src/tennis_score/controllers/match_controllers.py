@@ -3,16 +3,14 @@
 import logging
 
 from ..core.response import make_response
-from ..services.match_service import MatchService
-
-# Создаем единый экземпляр сервиса для использования во всех контроллерах
-match_service = MatchService()
+from ..services.match_service import get_match_service
 
 
 def new_match_controller(params: dict) -> dict:
     """Контроллер для создания нового матча."""
     logger = logging.getLogger("controller")
-    logger.debug(f"new_match_controller: {params}")
+    logger.debug("new_match_controller: %s", params)
+    match_service = get_match_service()
 
     player_one = params.get("playerOne", [""])[0].strip()
     player_two = params.get("playerTwo", [""])[0].strip()
@@ -20,7 +18,7 @@ def new_match_controller(params: dict) -> dict:
     if not player_one or not player_two:
         return make_response("new-match.html", {"error": "Both player names are required"})
 
-    logger.info(f"New match: {player_one} vs {player_two}")
+    logger.info("New match: %s vs %s", player_one, player_two)
 
     # Используем сервис для создания матча
     match_dto = match_service.create_match(player_one, player_two)
@@ -37,46 +35,69 @@ def new_match_controller(params: dict) -> dict:
 def match_score_controller(params: dict) -> dict:
     """Контроллер для отображения и обновления счёта матча по UUID."""
     logger = logging.getLogger("controller")
-    logger.debug(f"match_score_controller: {params}")
-
-    match_uuid = params.get("match_uuid", [""])[0].strip()
-    player_param = params.get("player", [""])[0].strip()
+    logger.debug("match_score_controller: %s", params)
+    match_service = get_match_service()
 
+    match_uuid, player_param = match_score_params(params)
     if not match_uuid:
-        logger.warning("match_uuid not provided to match_score_controller")
-        return make_response(
-            "new-match.html", {"error": "No match specified. Please start a new match."}
-        )
+        return no_match_response()
 
     # Сначала проверяем завершенные матчи в базе данных
     completed_match = match_service.get_completed_match_by_uuid(match_uuid)
     if completed_match:
-        logger.info(f"Found completed match {match_uuid} in database")
-        
-        # Если пользователь пытается обновить счет завершенного матча
-        if player_param in ["player1", "player2"]:
-            logger.warning(f"Attempt to update completed match {match_uuid}")
-            view_data = match_service.prepare_completed_match_view_data(completed_match)
-            view_data["error"] = "Этот матч уже завершен. Обновление счета невозможно."
-            view_data["match_completed"] = True
-            return make_response("match-score.html", view_data)
-        
-        # Просто отображаем завершенный матч
-        view_data = match_service.prepare_completed_match_view_data(completed_match)
-        view_data["match_completed"] = True
-        return make_response("match-score.html", view_data)
+        return completed_match_response(match_service, completed_match, match_uuid, player_param)
 
     # Обработка активных матчей
     match_dto = None
     if player_param in ["player1", "player2"]:
-        logger.debug(f"Updating score for match {match_uuid}, player {player_param}")
+        logger.debug("Updating score for match %s, player %s", match_uuid, player_param)
         match_dto = match_service.update_match_score(match_uuid, player_param)
     else:
-        logger.debug(f"Fetching score data for match {match_uuid}")
+        logger.debug("Fetching score data for match %s", match_uuid)
         match_dto = match_service.get_match_data_by_uuid(match_uuid)
 
+    return active_match_response(match_service, match_dto, match_uuid)
+
+
+# Общие части match_score_controller и его асинхронного двойника (async_match_controllers)
+
+
+def match_score_params(params: dict) -> tuple[str, str]:
+    """UUID матча и игрок, которому засчитывается очко (пустая строка — только просмотр)."""
+    return params.get("match_uuid", [""])[0].strip(), params.get("player", [""])[0].strip()
+
+
+def no_match_response() -> dict:
+    """Ответ на запрос счёта без UUID матча."""
+    logging.getLogger("controller").warning("match_uuid not provided to match_score_controller")
+    return make_response(
+        "new-match.html", {"error": "No match specified. Please start a new match."}
+    )
+
+
+def completed_match_response(
+    match_service, completed_match: dict, match_uuid: str, player_param: str
+) -> dict:
+    """Страница завершённого матча; попытка засчитать очко отклоняется с сообщением."""
+    logger = logging.getLogger("controller")
+    logger.info("Found completed match %s in database", match_uuid)
+    view_data = match_service.prepare_completed_match_view_data(completed_match)
+
+    # Если пользователь пытается обновить счет завершенного матча
+    if player_param in ["player1", "player2"]:
+        logger.warning("Attempt to update completed match %s", match_uuid)
+        view_data["error"] = "Этот матч уже завершен. Обновление счета невозможно."
+
+    view_data["match_completed"] = True
+    return make_response("match-score.html", view_data)
+
+
+def active_match_response(match_service, match_dto, match_uuid: str) -> dict:
+    """Страница активного (или только что завершённого) матча либо 404, если матча нет."""
     if not match_dto:
-        logger.error(f"Match {match_uuid} not found in active matches or database")
+        logging.getLogger("controller").error(
+            "Match %s not found in active matches or database", match_uuid
+        )
         return make_response(
             "error.html",
             {
@@ -113,7 +134,8 @@ def reset_match_controller(params: dict) -> dict:
         dict: ответ с данными для шаблона match-score.html или error.html
     """
     logger = logging.getLogger("controller.reset")
-    logger.debug(f"Processing reset_match request with params: {params}")
+    logger.debug("Processing reset_match request with params: %s", params)
+    match_service = get_match_service()
 
     match_uuid = params.get("match_uuid", [""])[0].strip()
     
@@ -127,7 +149,7 @@ def reset_match_controller(params: dict) -> dict:
     # Проверяем, не завершен ли матч
     completed_match = match_service.get_completed_match_by_uuid(match_uuid)
     if completed_match:
-        logger.warning(f"Attempt to reset completed match {match_uuid}")
+        logger.warning("Attempt to reset completed match %s", match_uuid)
         return make_response(
             "error.html",
             {
@@ -142,9 +164,9 @@ def reset_match_controller(params: dict) -> dict:
     # Пытаемся сбросить активный матч
     try:
         match_service.reset_match_score(match_uuid)
-        logger.info(f"Match {match_uuid} has been reset")
+        logger.info("Match %s has been reset", match_uuid)
     except Exception as e:
-        logger.error(f"Failed to reset match {match_uuid}: {e}")
+        logger.error("Failed to reset match %s: %s", match_uuid, e)
         return make_response(
             "error.html",
             {
@@ -160,7 +182,7 @@ def reset_match_controller(params: dict) -> dict:
     match_dto = match_service.get_match_data_by_uuid(match_uuid)
 
     if not match_dto:
-        logger.error(f"Failed to get match_dto for UUID {match_uuid} after reset.")
+        logger.error("Failed to get match_dto for UUID %s after reset.", match_uuid)
         return make_response(
             "error.html",
             {
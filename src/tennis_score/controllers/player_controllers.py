@@ -0,0 +1,90 @@
+"""Контроллеры страниц игроков."""
+
+import logging
+
+from ..core.response import make_response
+from ..services.match_service import get_match_service
+
+# Размер таблицы рейтинга: по умолчанию и наибольший допустимый ?limit=
+LEADERBOARD_SIZE = 20
+LEADERBOARD_MAX_SIZE = 100
+
+
+def player_profile_controller(params: dict) -> dict:
+    """Контроллер профиля игрока: статистика из агрегированной строки ``player_stats``."""
+    logger = logging.getLogger("controller.player")
+    logger.debug("player_profile_controller: %s", params)
+
+    name = params.get("name", [""])[0].strip()
+    if not name:
+        return make_response(
+            "error.html",
+            {
+                "error_title": "Игрок не указан",
+                "error_message": "Укажите имя игрока в параметре name.",
+            },
+            status="400 Bad Request",
+        )
+
+    stats = get_match_service().get_player_stats(name)
+    if stats is None:
+        logger.info("Player not found: %s", name)
+        return make_response(
+            "error.html",
+            {
+                "error_title": "Игрок не найден",
+                "error_message": f"Игрок «{name}» ещё не сыграл ни одного матча.",
+            },
+            status="404 Not Found",
+        )
+
+    return make_response("player.html", {"player": stats})
+
+
+def head_to_head_controller(params: dict) -> dict:
+    """Контроллер итогов личных встреч двух игроков (``?player1=...&player2=...``)."""
+    logger = logging.getLogger("controller.player")
+    logger.debug("head_to_head_controller: %s", params)
+
+    name1 = params.get("player1", [""])[0].strip()
+    name2 = params.get("player2", [""])[0].strip()
+    if not name1 or not name2 or name1 == name2:
+        return make_response(
+            "error.html",
+            {
+                "error_title": "Игроки не указаны",
+                "error_message": "Укажите двух разных игроков в параметрах player1 и player2.",
+            },
+            status="400 Bad Request",
+        )
+
+    head_to_head = get_match_service().get_head_to_head(name1, name2)
+    if head_to_head is None:
+        return make_response(
+            "error.html",
+            {
+                "error_title": "Игрок не найден",
+                "error_message": f"Нет сыгранных матчей у «{name1}» или «{name2}».",
+            },
+            status="404 Not Found",
+        )
+
+    return make_response("head-to-head.html", {"h2h": head_to_head})
+
+
+def leaderboard_controller(params: dict) -> dict:
+    """Контроллер таблицы рейтинга: первые ``?limit=`` игроков (по умолчанию 20)."""
+    logger = logging.getLogger("controller.player")
+    limit = LEADERBOARD_SIZE
+    limit_param = params.get("limit", [""])[0]
+    if limit_param:
+        try:
+            limit = min(max(int(limit_param), 1), LEADERBOARD_MAX_SIZE)
+        except ValueError:
+            logger.warning("Invalid limit parameter: '%s'. Using %d.", limit_param, limit)
+
+    version, entries = get_match_service().get_leaderboard(limit)
+    # Страница зависит только от версии рейтинга и limit: HTML рендерится один раз на версию
+    return make_response(
+        "leaderboard.html", {"entries": entries}, cache_key=("leaderboard", version, limit)
+    )
@@ -24,5 +24,5 @@ class TemplateViewController:
         Returns:
             Ответ с шаблоном
         """
-        self.logger.debug(f"Rendering template: {self.template_name}")
+        self.logger.debug("Rendering template: %s", self.template_name)
         return make_response(self.template_name, self.default_context)
@@ -4,23 +4,62 @@
 и техническими аспектами реализации: маршрутизация, шаблоны, WSGI-совместимость и т.д.
 """
 
-# Импорт middleware для обработки CORS, логирования и статики
-# Импорт оркестратора приложения (создание WSGI-приложения)
-from .app_orchestrator import AppOrchestrator
-from .middleware import CORSMiddleware, LoggingMiddleware, StaticMiddleware
+from importlib import import_module
 
-# Импорт маршрутизатора и функции маршрутизации
-from .router import RoutesHandler, route_request
+# Импорт middleware для обработки CORS, логирования и статики
+from .middleware import (
+    AsgiCORSMiddleware,
+    AsgiLoggingMiddleware,
+    AsgiStaticMiddleware,
+    CORSMiddleware,
+    HealthMiddleware,
+    LoggingMiddleware,
+    MemoryMiddleware,
+    MetricsMiddleware,
+    ProfilingMiddleware,
+    QueryTrackingMiddleware,
+    RateLimitMiddleware,
+    StaticMiddleware,
+    UnitOfWorkMiddleware,
+)
 
 # Импорт шаблонизатора
 from .template import TemplateRenderer
 
+# Оркестратор и маршрутизатор импортируют контроллеры, сервисы и репозитории, а те — модули
+# core (metrics, unit_of_work и др.). Они загружаются при первом обращении, чтобы импорт
+# модуля core не замыкал цикл через сервисы
+_LAZY_EXPORTS = {
+    "AppOrchestrator": ".app_orchestrator",
+    "RoutesHandler": ".router",
+    "route_request": ".router",
+}
+
+
+def __getattr__(name: str):
+    module = _LAZY_EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = globals()[name] = getattr(import_module(module, __name__), name)
+    return value
+
+
 __all__ = [
+    "AsgiCORSMiddleware",  # ASGI-двойник CORSMiddleware
+    "AsgiLoggingMiddleware",  # ASGI-двойник LoggingMiddleware
+    "AsgiStaticMiddleware",  # ASGI-двойник StaticMiddleware
     "CORSMiddleware",      # Middleware для CORS
+    "HealthMiddleware",    # Пробы /healthz и /readyz
     "LoggingMiddleware",   # Middleware для логирования
+    "MemoryMiddleware",    # Учёт памяти и снимки tracemalloc на /admin/memory
+    "MetricsMiddleware",   # Middleware метрик и эндпоинт /metrics
+    "ProfilingMiddleware",  # Выборочное профилирование запросов и /admin/profiler
+    "QueryTrackingMiddleware",  # Учёт SQL-запросов по HTTP-запросам (N+1)
+    "RateLimitMiddleware",  # Лимит запросов по IP и сброс нагрузки (429/503)
     "StaticMiddleware",    # Middleware для отдачи статики
+    "UnitOfWorkMiddleware",  # Одна сессия и транзакция БД на запрос
     "TemplateRenderer",    # Рендеринг HTML-шаблонов
-    "AppOrchestrator",     # Оркестратор WSGI-приложения
+    "AppOrchestrator",     # Оркестратор WSGI- и ASGI-приложения
     "route_request",       # Универсальная функция маршрутизации
     "RoutesHandler",       # Класс-обработчик маршрутов
 ]
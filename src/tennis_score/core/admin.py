@@ -0,0 +1,57 @@
+"""Доступ к служебным эндпоинтам (``/admin/...``).
+
+Служебный эндпоинт отвечает только на запросы с заголовком
+``Authorization: Bearer <ADMIN_TOKEN>``. Пока ``ADMIN_TOKEN`` не задан, служебные
+эндпоинты отключены и отвечают 404, как несуществующий путь.
+"""
+
+import hmac
+import json
+import os
+from urllib.parse import parse_qs
+
+_NO_CACHE = ("Cache-Control", "no-store")
+
+
+def admin_token() -> str:
+    """Токен служебных эндпоинтов из ``ADMIN_TOKEN``; пустая строка — эндпоинты отключены."""
+    return os.getenv("ADMIN_TOKEN", "")
+
+
+def is_admin_request(environ: dict, token: str) -> bool:
+    """Предъявлен ли в запросе токен ``token`` (сравнение за постоянное время)."""
+    if not token:
+        return False
+    scheme, _, credentials = environ.get("HTTP_AUTHORIZATION", "").partition(" ")
+    return scheme.lower() == "bearer" and hmac.compare_digest(credentials.strip().encode(), token.encode())
+
+
+def deny_admin(environ: dict, start_response, token: str):
+    """Ответ на запрос к служебному эндпоинту без доступа; None, если доступ есть."""
+    if not token:
+        return json_response(start_response, "404 Not Found", {"error": "not found"})
+    if not is_admin_request(environ, token):
+        return json_response(
+            start_response, "401 Unauthorized", {"error": "unauthorized"}, [("WWW-Authenticate", "Bearer")]
+        )
+    return None
+
+
+def query_params(environ: dict) -> dict[str, str]:
+    """Параметры строки запроса служебного эндпоинта (последнее значение каждого)."""
+    return {name: values[-1] for name, values in parse_qs(environ.get("QUERY_STRING", "")).items()}
+
+
+def json_response(start_response, status: str, payload: object, headers: list[tuple[str, str]] = ()):
+    """Отправляет ``payload`` в JSON без кеширования."""
+    body = json.dumps(payload, ensure_ascii=False, indent=2).encode()
+    start_response(
+        status,
+        [
+            ("Content-Type", "application/json"),
+            ("Content-Length", str(len(body))),
+            _NO_CACHE,
+            *headers,
+        ],
+    )
+    return [body]
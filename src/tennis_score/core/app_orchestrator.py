@@ -1,12 +1,34 @@
-"""Оркестратор WSGI-приложения для теннисного скоринга."""
+"""Оркестратор WSGI- и ASGI-приложения для теннисного скоринга."""
 
 import logging
 import os
 from collections.abc import Callable, Iterable
 from typing import TypeAlias
 
-from .middleware import CORSMiddleware, LoggingMiddleware, StaticMiddleware
-from .router import route_request
+from ..logging_setup import log_queue
+from ..services.match_service import get_match_service
+from .admin import admin_token
+from .asgi import AsgiApplication
+from .memory import MEMORY, TracemallocSnapshots
+from .middleware import (
+    AsgiCORSMiddleware,
+    AsgiLoggingMiddleware,
+    AsgiStaticMiddleware,
+    CORSMiddleware,
+    HealthMiddleware,
+    LoggingMiddleware,
+    MemoryMiddleware,
+    MetricsMiddleware,
+    ProfilingMiddleware,
+    QueryTrackingMiddleware,
+    RateLimitMiddleware,
+    ReadinessCheck,
+    StaticMiddleware,
+    UnitOfWorkMiddleware,
+)
+from .profiling import StackSampler
+from .router import ROUTING_TABLE, route_request
+from .startup import StartupTimer
 from .template import TemplateRenderer
 
 Headers: TypeAlias = list[tuple[str, str]]
@@ -17,13 +39,15 @@ class AppOrchestrator:
     def __init__(self):
         """Инициализирует объект класса."""
         self.logger = logging.getLogger("core.app")
+        self.startup = StartupTimer()
         
         # Определяем базовую директорию приложения
         self.base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
         self.templates_dir = os.path.join(self.base_dir, "templates")
         
         # Инициализируем рендерер шаблонов
-        self.template_renderer = TemplateRenderer(self.templates_dir)
+        with self.startup.phase("templates"):
+            self.template_renderer = TemplateRenderer(self.templates_dir)
         self.logger.debug("AppOrchestrator initialized")
 
     def wsgi_app(
@@ -44,52 +68,181 @@ class AppOrchestrator:
         method: str = environ.get("REQUEST_METHOD", "GET")
         
         # Логируем каждый запрос
-        self.logger.info(f"Request: {method} {path}")
+        self.logger.info("Request: %s %s", method, path)
 
         # Передаем environ в router для обработки POST-данных
         route: dict[str, object] = route_request(path, method, environ=environ)
         
+        status, headers, body = self.respond(route)
+        self.logger.debug("Response: %s", status)
+        start_response(status, headers)
+        return body
+
+    def respond(self, route: dict[str, object] | None) -> tuple[str, Headers, Iterable[bytes]]:
+        """Рендерит ответ контроллера: статус, заголовки и тело (общая часть WSGI и ASGI).
+
+        Args:
+            route: Ответ контроллера (см. ``make_response``)
+
+        Returns:
+            Статус, заголовки и итерируемое тело ответа
+        """
+        # Большие страницы рендерятся потоком: сервер отправляет порции по мере готовности
+        if route and route["template"] and route.get("stream"):
+            return (
+                route["status"],
+                route["headers"],
+                self.template_renderer.stream(route["template"], route["context"]),
+            )
+
         # Если route не None и шаблон определен, рендерим шаблон
         if route and route["template"]:
-            content: bytes = self.template_renderer.render(
-                route["template"], route["context"]
-            )
-            status: str = route["status"]
-            headers: Headers = route["headers"]
-        else:
-            content = b"<h1>404 Not Found</h1>"
-            status = "404 Not Found"
-            headers = [("Content-Type", "text/html; charset=utf-8")]
-
-        self.logger.debug(f"Response: {status}")
-        start_response(status, headers)
-        return [content]
+            if route.get("cache_key") is not None:
+                # Страница определяется ключом (версией данных) — рендерится один раз на ключ
+                content: bytes = self.template_renderer.render_cached(
+                    route["template"], route["context"], route["cache_key"]
+                )
+            else:
+                content = self.template_renderer.render(route["template"], route["context"])
+            return route["status"], route["headers"], [content]
+        return "404 Not Found", [("Content-Type", "text/html; charset=utf-8")], [b"<h1>404 Not Found</h1>"]
+
+    def create_app(self, warmup: bool | None = None):
+        """Создает WSGI-приложение с необходимыми middleware.
+
+        Сервис матчей и движок БД здесь не создаются — это происходит при первом
+        запросе или в фазе прогрева.
 
-    def create_app(self):
-        """Создает WSGI-приложение с необходимыми middleware."""
+        Args:
+            warmup: Прогреть приложение перед возвратом (см. ``warmup``);
+                по умолчанию включается переменной окружения ``APP_WARMUP=1``
+        """
+        if warmup is None:
+            warmup = os.getenv("APP_WARMUP", "0") == "1"
         app = self.wsgi_app
 
+        # Одна сессия и транзакция БД на запрос; статика до неё не доходит
+        static_middleware = self._static_middleware(StaticMiddleware, UnitOfWorkMiddleware(app))
+
+        with self.startup.phase("middleware"):
+            app = static_middleware
+            route_paths = {path for path, _ in ROUTING_TABLE}
+            app = CORSMiddleware(app)
+            app = QueryTrackingMiddleware(
+                app,
+                route_paths=route_paths,
+                n_plus_one_threshold=int(os.getenv("N_PLUS_ONE_THRESHOLD", "3")),
+            )
+            app = LoggingMiddleware(app)
+            # Профилирует выбранные запросы (выключено, пока не включат PROFILE_ENABLED или /admin/profiler)
+            app = ProfilingMiddleware(
+                app,
+                StackSampler(interval=float(os.getenv("PROFILE_INTERVAL_MS", "5")) / 1000),
+                enabled=os.getenv("PROFILE_ENABLED", "0") == "1",
+                sample_rate=int(os.getenv("PROFILE_SAMPLE_RATE", "100")),
+                routes=[route for route in os.getenv("PROFILE_ROUTES", "").split(",") if route],
+                output_dir=os.getenv("PROFILE_DIR", "profiles"),
+                route_paths=route_paths,
+                admin_token=admin_token(),
+            )
+            # Размеры кешей и хранилищ, пул БД и снимки tracemalloc по запросу
+            MEMORY.track("log_queue", log_queue, lambda pending: pending.qsize())
+            app = MemoryMiddleware(
+                app,
+                TracemallocSnapshots(max_snapshots=int(os.getenv("TRACEMALLOC_MAX_SNAPSHOTS", "10"))),
+                pool_status=lambda: get_match_service().repository.pool_status(),
+                admin_token=admin_token(),
+            )
+            # Отклоняет лишние запросы до маршрутизации и БД; отказы видны в метриках как 429/503
+            app = RateLimitMiddleware(
+                app,
+                rate=float(os.getenv("RATE_LIMIT_RPS", "20")),
+                burst=int(os.getenv("RATE_LIMIT_BURST", "40")),
+                max_concurrent=int(os.getenv("MAX_CONCURRENT_REQUESTS", "0")),
+                idle_ttl=float(os.getenv("RATE_LIMIT_IDLE_TTL", "60")),
+                proxy_hops=int(os.getenv("FORWARDED_PROXY_HOPS", "0")),
+            )
+            # Измеряет полный путь запроса и отвечает на /metrics до логирования
+            app = MetricsMiddleware(app, route_paths=route_paths)
+            # Внешний слой: пробы /healthz и /readyz не попадают в метрики запросов и журнал
+            app = HealthMiddleware(app, readiness=self._readiness_check())
+
+        self.logger.info("WSGI-приложение собрано с middleware")
+        if warmup:
+            self.warmup()
+        self.startup.report()
+        return app
+
+    def create_asgi_app(self, warmup: bool | None = None):
+        """Создает ASGI-приложение (для uvicorn) с асинхронными двойниками middleware.
+
+        Маршруты, контроллеры и шаблоны — те же, что у WSGI-приложения (см. ``AsgiApplication``).
+        Пробы, метрики, ограничение частоты и учёт SQL-запросов есть только у WSGI-приложения.
+
+        Args:
+            warmup: Прогреть приложение перед возвратом (см. ``create_app``)
+        """
+        if warmup is None:
+            warmup = os.getenv("APP_WARMUP", "0") == "1"
+
+        # Единица работы открывается в AsgiApplication для каждого синхронного контроллера
+        static_middleware = self._static_middleware(AsgiStaticMiddleware, AsgiApplication(self))
+
+        with self.startup.phase("middleware"):
+            app = AsgiCORSMiddleware(static_middleware)
+            app = AsgiLoggingMiddleware(app)
+
+        self.logger.info("ASGI-приложение собрано с middleware")
+        if warmup:
+            self.warmup()
+        self.startup.report()
+        return app
+
+    def _static_middleware(self, middleware_class: type[StaticMiddleware], app) -> StaticMiddleware:
+        """Оборачивает ``app`` в middleware статики и передаёт шаблонам ``asset_url``."""
         # Путь к общей директории со статическими файлами
         static_dir = os.path.join(self.templates_dir, "static")
+        if not os.path.isdir(static_dir):
+            self.logger.warning("Статическая директория не найдена: %s", static_dir)
 
-        # Проверим существование директории
-        if os.path.exists(static_dir):
-            self.logger.debug(f"Статическая директория: {static_dir}")
-            for root, _, files in os.walk(static_dir):
-                rel_root = os.path.relpath(root, static_dir)
-                self.logger.debug(f"  [{rel_root}] → {files}")
-        else:
-            self.logger.warning(f"Статическая директория не найдена: {static_dir}")
-
-        # Используем StaticMiddleware 
-        app = StaticMiddleware(
-            app,
-            static_url='/static/',
-            static_dir=static_dir
+        # STATIC_AUTO_RELOAD=1 включает переиндексацию в разработке. Индекс статики строится в конструкторе
+        with self.startup.phase("static_index"):
+            static_middleware = middleware_class(
+                app,
+                static_url='/static/',
+                static_dir=static_dir,
+                auto_reload=os.getenv("STATIC_AUTO_RELOAD", "0") == "1",
+            )
+        # Шаблоны получают URL статики с хешем содержимого (immutable-кеширование)
+        self.template_renderer.env.globals["asset_url"] = static_middleware.asset_url
+        return static_middleware
+
+    def _readiness_check(self) -> ReadinessCheck:
+        """Проверки для /readyz: доступность пула соединений БД и хранилища активных матчей."""
+        return ReadinessCheck(
+            {
+                "database": lambda: get_match_service().repository.ping(),
+                "active_matches": lambda: get_match_service().repository.active_match_count(),
+            },
+            cache_ttl=float(os.getenv("READINESS_CACHE_TTL", "2")),
+            timeout=float(os.getenv("READINESS_TIMEOUT", "1")),
         )
-        app = CORSMiddleware(app)
-        app = LoggingMiddleware(app)
 
-        self.logger.info("WSGI-приложение собрано с middleware")
-        return app
+    def warmup(self) -> None:
+        """Прогревает приложение до приёма запросов.
 
+        Создаёт сервис матчей и движок БД, открывает соединения пула и компилирует
+        шаблоны. Ошибка прогрева БД не останавливает запуск: она пишется в журнал,
+        а соединение будет открыто при первом запросе.
+        """
+        with self.startup.phase("warmup_service"):
+            service = get_match_service()
+        with self.startup.phase("warmup_db_pool"):
+            try:
+                opened = service.repository.warm_pool()
+                self.logger.info("Открыто соединений с БД при прогреве: %d", opened)
+            except Exception as e:
+                self.logger.warning("Не удалось прогреть пул соединений БД: %s", e)
+        with self.startup.phase("warmup_templates"):
+            compiled = self.template_renderer.precompile()
+            self.logger.debug("Скомпилировано шаблонов: %d", compiled)
@@ -0,0 +1,117 @@
+"""ASGI-приложение теннисного скоринга поверх маршрутизации и контроллеров WSGI-версии.
+
+Маршруты из ``ASYNC_ROUTING_TABLE`` обрабатываются корутинами и ждут БД через
+асинхронный репозиторий. Остальные маршруты ``ROUTING_TABLE`` выполняются
+синхронными контроллерами в пуле потоков, каждый в своей единице работы, как под
+``UnitOfWorkMiddleware``. Ответ рендерится тем же ``AppOrchestrator.respond``.
+
+Если асинхронный доступ к БД недоступен (не установлен ``sqlalchemy[asyncio]`` с
+драйвером или база — SQLite в памяти) или активные матчи хранятся в БД
+(``ACTIVE_MATCH_STORE=db``: их блокировки живут в синхронной транзакции запроса),
+все маршруты выполняются в пуле потоков.
+"""
+
+import asyncio
+import logging
+from collections.abc import Awaitable, Callable
+
+from .asgi_environ import build_environ, read_body, send_response
+from .request_body import RequestBodyError
+from .router import route_request, routes_handler
+from .unit_of_work import RequestUnitOfWork, current_unit_of_work
+
+logger = logging.getLogger("core.asgi")
+
+AsyncRoutes = dict[tuple[str, str], Callable[[dict], Awaitable[dict]]]
+
+
+def load_async_routes() -> AsyncRoutes:
+    """Асинхронные маршруты, если асинхронный доступ к БД доступен, иначе пустая таблица."""
+    try:
+        from ..services.async_match_service import get_async_match_service
+        from .async_router import ASYNC_ROUTING_TABLE
+
+        service = get_async_match_service()
+    except (ImportError, ValueError) as e:
+        logger.warning("Асинхронный доступ к БД недоступен, все маршруты выполняются в потоках: %s", e)
+        return {}
+    if service.service.repository.active_matches.shared:
+        logger.warning("Активные матчи хранятся в БД, все маршруты выполняются в потоках")
+        return {}
+    return ASYNC_ROUTING_TABLE
+
+
+class AsgiApplication:
+    """ASGI-приложение: маршрутизация, вызов контроллера и отправка ответа."""
+
+    def __init__(self, orchestrator, async_routes: AsyncRoutes | None = None):
+        """Инициализирует объект класса.
+
+        Args:
+            orchestrator: ``AppOrchestrator``, рендерящий ответы контроллеров
+            async_routes: Асинхронные маршруты; по умолчанию ``load_async_routes()``
+                при первом запросе (сервис и движок БД не создаются при сборке)
+        """
+        self.orchestrator = orchestrator
+        self._async_routes = async_routes
+
+    @property
+    def async_routes(self) -> AsyncRoutes:
+        """Таблица асинхронных маршрутов; загружается при первом обращении."""
+        if self._async_routes is None:
+            self._async_routes = load_async_routes()
+        return self._async_routes
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "lifespan":
+            return await self._lifespan(receive, send)
+        if scope["type"] != "http":
+            return
+
+        path, method = scope["path"], scope["method"]
+        logger.info("Request: %s %s", method, path)
+        body = await read_body(receive, routes_handler.max_body_size) if method == "POST" else b""
+        environ = build_environ(scope, body)
+
+        controller = self.async_routes.get((path, method))
+        if controller is not None:
+            try:
+                params = routes_handler.request_params(method, environ)
+            except RequestBodyError as e:
+                route = routes_handler.body_error_response(path, e)
+            else:
+                route = await controller(params)
+        else:
+            route = await asyncio.to_thread(self._route_sync, path, method, environ)
+
+        status, headers, content = self.orchestrator.respond(route)
+        logger.debug("Response: %s", status)
+        await send_response(send, status, headers, content)
+
+    @staticmethod
+    def _route_sync(path: str, method: str, environ: dict) -> dict:
+        """Синхронный контроллер в единице работы; фиксация — если ответ не 5xx."""
+        uow = RequestUnitOfWork()
+        token = current_unit_of_work.set(uow)
+        commit = False
+        try:
+            route = route_request(path, method, environ=environ)
+            commit = not route["status"].startswith("5")
+            return route
+        finally:
+            current_unit_of_work.reset(token)
+            uow.finish(commit)
+
+    async def _lifespan(self, receive, send) -> None:
+        """Протокол lifespan: при остановке закрывает пул асинхронного движка."""
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                if self._async_routes:
+                    from ..services.async_match_service import get_async_match_service
+
+                    await get_async_match_service().repository.dispose()
+                await send({"type": "lifespan.shutdown.complete"})
+                return
@@ -0,0 +1,98 @@
+"""Преобразования между ASGI и WSGI-представлением запроса и ответа.
+
+ASGI-приложение переиспользует маршрутизацию, контроллеры и разбор тела, написанные
+для WSGI: по ``scope`` и прочитанному телу строится словарь в формате ``environ``,
+а ответ (статус-строка, заголовки, итерируемое тело) отправляется сообщениями
+``http.response.start`` / ``http.response.body``.
+"""
+
+import asyncio
+import sys
+from collections.abc import Iterable
+from io import BytesIO
+
+
+def build_environ(scope: dict, body: bytes = b"") -> dict:
+    """WSGI-окружение для HTTP-запроса ASGI с уже прочитанным телом."""
+    server = scope.get("server") or ("localhost", 80)
+    client = scope.get("client") or ("", 0)
+    environ = {
+        "REQUEST_METHOD": scope["method"],
+        "SCRIPT_NAME": scope.get("root_path", ""),
+        "PATH_INFO": scope["path"],
+        "QUERY_STRING": scope.get("query_string", b"").decode("latin-1"),
+        "SERVER_NAME": server[0],
+        "SERVER_PORT": str(server[1]),
+        "SERVER_PROTOCOL": f"HTTP/{scope.get('http_version', '1.1')}",
+        "REMOTE_ADDR": client[0],
+        "CONTENT_LENGTH": str(len(body)),
+        "wsgi.input": BytesIO(body),
+        "wsgi.url_scheme": scope.get("scheme", "http"),
+        "wsgi.errors": sys.stderr,
+        "wsgi.multithread": True,
+        "wsgi.multiprocess": False,
+        "wsgi.run_once": False,
+    }
+    for raw_name, raw_value in scope.get("headers", ()):
+        name = raw_name.decode("latin-1").upper().replace("-", "_")
+        value = raw_value.decode("latin-1")
+        if name == "CONTENT_TYPE":
+            environ["CONTENT_TYPE"] = value
+        elif name != "CONTENT_LENGTH":
+            key = "HTTP_" + name
+            # Повторяющиеся заголовки объединяются через запятую, как у WSGI-серверов
+            environ[key] = f"{environ[key]},{value}" if key in environ else value
+    return environ
+
+
+async def read_body(receive, max_size: int) -> bytes:
+    """Читает тело запроса, но не больше ``max_size + 1`` байт.
+
+    Лишний байт означает, что тело превышает лимит: разбор тела отклонит такой
+    запрос с 413, не дочитывая его.
+    """
+    chunks = []
+    total = 0
+    while True:
+        message = await receive()
+        if message["type"] == "http.disconnect":
+            break
+        chunk = message.get("body", b"")
+        if chunk:
+            chunks.append(chunk)
+            total += len(chunk)
+            if total > max_size:
+                break
+        if not message.get("more_body", False):
+            break
+    return b"".join(chunks)[: max_size + 1]
+
+
+async def send_response(
+    send, status: str, headers: list[tuple[str, str]], body: Iterable[bytes], blocking: bool = False
+) -> None:
+    """Отправляет ответ в формате WSGI (статус-строка, заголовки, тело) сообщениями ASGI.
+
+    Каждая порция тела уходит отдельным сообщением, так что потоковый рендеринг
+    остаётся потоковым. ``blocking=True`` — порции читаются в пуле потоков
+    (например, файл с диска), чтобы не блокировать цикл событий.
+    """
+    await send(
+        {
+            "type": "http.response.start",
+            "status": int(status.split(" ", 1)[0]),
+            "headers": [(name.lower().encode("latin-1"), value.encode("latin-1")) for name, value in headers],
+        }
+    )
+    iterator = iter(body)
+    try:
+        while True:
+            chunk = await asyncio.to_thread(next, iterator, None) if blocking else next(iterator, None)
+            if chunk is None:
+                break
+            if chunk:
+                await send({"type": "http.response.body", "body": chunk, "more_body": True})
+    finally:
+        if hasattr(body, "close"):
+            body.close()
+    await send({"type": "http.response.body", "body": b"", "more_body": False})
@@ -0,0 +1,16 @@
+"""Асинхронные маршруты для ASGI-приложения.
+
+Маршрут из ``ASYNC_ROUTING_TABLE`` обрабатывается корутиной в цикле событий;
+остальные маршруты ``ROUTING_TABLE`` ASGI-приложение выполняет синхронными
+контроллерами в пуле потоков. Модуль требует ``sqlalchemy[asyncio]`` и не
+импортируется WSGI-приложением.
+"""
+
+from collections.abc import Awaitable, Callable
+
+from ..controllers.async_match_controllers import async_match_score_controller
+
+ASYNC_ROUTING_TABLE: dict[tuple[str, str], Callable[[dict], Awaitable[dict]]] = {
+    ("/match-score", "GET"): async_match_score_controller,
+    ("/match-score", "POST"): async_match_score_controller,
+}
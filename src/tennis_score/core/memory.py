@@ -0,0 +1,271 @@
+"""Учёт памяти процесса: размеры кешей и хранилищ, снимки tracemalloc.
+
+Компоненты, держащие данные в памяти процесса (кеш страниц, индекс статики, корзины
+лимита запросов, буфер очков, активные матчи), регистрируют свои контейнеры в ``MEMORY``
+так же, как функции метрик: ``MEMORY.track("template_cache", lambda: self._cache)``.
+Отчёт считает для каждого число записей и приблизительный глубокий размер — сумму
+``sys.getsizeof`` всех достижимых объектов, без модулей, классов и функций. Объект,
+общий для нескольких контейнеров, учитывается в каждом из них.
+
+``TracemallocSnapshots`` снимает снимки ``tracemalloc`` по запросу и сравнивает два
+снимка по строкам (или файлам) кода, где выделена память.
+"""
+
+import gc
+import logging
+import os
+import resource
+import sys
+import threading
+import time
+import tracemalloc
+import types
+from collections import OrderedDict
+from collections.abc import Callable
+
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger("core.memory")
+
+# Общие для всего процесса объекты: их размер не относится к контейнеру
+_SKIP_TYPES = (
+    type,
+    types.ModuleType,
+    types.FunctionType,
+    types.BuiltinFunctionType,
+    types.MethodType,
+    types.CodeType,
+    types.FrameType,
+    logging.Logger,
+    threading.Thread,
+)
+
+
+def deep_sizeof(obj: object, limit: int = 1_000_000) -> tuple[int, bool]:
+    """Приблизительный размер ``obj`` вместе со всеми достижимыми из него объектами.
+
+    Args:
+        obj: Измеряемый объект
+        limit: Сколько объектов обойти не больше
+
+    Returns:
+        Размер в байтах и признак того, что обход остановлен по ``limit``
+    """
+    seen: set[int] = set()
+    pending = [obj]
+    size = 0
+    while pending:
+        if len(seen) >= limit:
+            return size, True
+        current = pending.pop()
+        if id(current) in seen or isinstance(current, _SKIP_TYPES):
+            continue
+        seen.add(id(current))
+        size += sys.getsizeof(current)
+        # Ссылки снимает C-код за один вызов: другие потоки не мешают обходу
+        pending.extend(gc.get_referents(current))
+    return size, False
+
+
+def current_rss() -> int | None:
+    """Текущий RSS процесса в байтах (Linux); None, если узнать нельзя."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def session_stats() -> dict[str, int]:
+    """Живые сессии SQLAlchemy и объекты в их identity map.
+
+    Сессия единицы работы закрывается в конце запроса, поэтому между запросами
+    живых сессий с объектами быть не должно: иначе сессия где-то удерживается.
+    """
+    sessions = [obj for obj in gc.get_objects() if isinstance(obj, Session)]
+    return {
+        "sessions": len(sessions),
+        "identity_map_objects": sum(len(session.identity_map) for session in sessions),
+    }
+
+
+class MemoryRegistry:
+    """Реестр контейнеров, размер которых показывается в отчёте о памяти."""
+
+    def __init__(self):
+        self._sources: dict[str, tuple[Callable[[], object], Callable[[object], int]]] = {}
+
+    def track(self, name: str, objects: Callable[[], object], count: Callable[[object], int] = len) -> None:
+        """Регистрирует контейнер ``name``; повторная регистрация заменяет прежнюю.
+
+        Args:
+            name: Имя контейнера в отчёте
+            objects: Функция, возвращающая контейнер (None — контейнера пока нет)
+            count: Число записей контейнера
+        """
+        self._sources[name] = (objects, count)
+
+    def report(self) -> dict[str, dict]:
+        """Число записей и глубокий размер каждого контейнера."""
+        report = {}
+        for name, (objects, count) in sorted(self._sources.items()):
+            try:
+                container = objects()
+                if container is None:
+                    report[name] = {"entries": 0, "bytes": 0}
+                    continue
+                size, truncated = deep_sizeof(container)
+                report[name] = {"entries": count(container), "bytes": size}
+                if truncated:
+                    report[name]["truncated"] = True
+            except Exception as e:  # Сломанный источник не должен ронять отчёт
+                report[name] = {"error": str(e)}
+        return report
+
+
+MEMORY = MemoryRegistry()
+
+
+class TracemallocSnapshots:
+    """Снимки ``tracemalloc`` по запросу и их сравнение."""
+
+    def __init__(self, max_snapshots: int = 10):
+        """Инициализирует объект класса.
+
+        Args:
+            max_snapshots: Сколько последних снимков хранить
+        """
+        self.max_snapshots = max_snapshots
+        # id -> (описание, снимок)
+        self._snapshots: OrderedDict[int, tuple[dict, tracemalloc.Snapshot]] = OrderedDict()
+        self._next_id = 1
+        self._lock = threading.Lock()
+
+    def start(self, frames: int = 1) -> dict:
+        """Включает трассировку (если выключена) и снимает базовый снимок."""
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(frames)
+            logger.info("tracemalloc включён, кадров стека: %d", frames)
+        return self.take()
+
+    def stop(self) -> None:
+        """Выключает трассировку и забывает снимки."""
+        tracemalloc.stop()
+        with self._lock:
+            self._snapshots.clear()
+        logger.info("tracemalloc выключен")
+
+    def take(self) -> dict:
+        """Снимает снимок и возвращает его описание.
+
+        Raises:
+            ValueError: Трассировка не включена
+        """
+        if not tracemalloc.is_tracing():
+            raise ValueError("tracemalloc is not started, use action=start")
+        snapshot = tracemalloc.take_snapshot().filter_traces(
+            (
+                tracemalloc.Filter(False, tracemalloc.__file__),
+                tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+                tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+            )
+        )
+        traced_bytes = sum(trace.size for trace in snapshot.traces)
+        with self._lock:
+            description = {
+                "id": self._next_id,
+                "taken_at": round(time.time(), 3),
+                "traced_bytes": traced_bytes,
+            }
+            self._next_id += 1
+            self._snapshots[description["id"]] = (description, snapshot)
+            while len(self._snapshots) > self.max_snapshots:
+                self._snapshots.popitem(last=False)
+        logger.info("Снимок tracemalloc %d: %d байт", description["id"], description["traced_bytes"])
+        return description
+
+    def snapshots(self) -> list[dict]:
+        """Описания хранимых снимков, от старых к новым."""
+        with self._lock:
+            return [description for description, _ in self._snapshots.values()]
+
+    def diff(
+        self, from_id: int | None = None, to_id: int | None = None, group: str = "lineno", top: int = 20
+    ) -> dict:
+        """Разница двух снимков: где выросла или освободилась память.
+
+        Args:
+            from_id: Ранний снимок (по умолчанию предпоследний)
+            to_id: Поздний снимок (по умолчанию последний)
+            group: Группировка — ``lineno`` (файл и строка) или ``filename``
+            top: Сколько мест с наибольшим изменением вернуть
+
+        Raises:
+            ValueError: Неизвестная группировка или снимок, меньше двух снимков
+        """
+        if group not in ("lineno", "filename"):
+            raise ValueError(f"Unknown group '{group}', expected 'lineno' or 'filename'")
+        with self._lock:
+            ids = list(self._snapshots)
+            if from_id is None or to_id is None:
+                if len(ids) < 2:
+                    raise ValueError("At least two snapshots are needed, use action=snapshot")
+                from_id = ids[-2] if from_id is None else from_id
+                to_id = ids[-1] if to_id is None else to_id
+            for snapshot_id in (from_id, to_id):
+                if snapshot_id not in self._snapshots:
+                    raise ValueError(f"Unknown snapshot {snapshot_id}, known: {ids}")
+            old = self._snapshots[from_id][1]
+            new = self._snapshots[to_id][1]
+        stats = new.compare_to(old, group)
+        return {
+            "from": from_id,
+            "to": to_id,
+            "group": group,
+            "size_diff_bytes": sum(stat.size_diff for stat in stats),
+            "top": [
+                {
+                    "location": f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}"
+                    if group == "lineno"
+                    else stat.traceback[0].filename,
+                    "size_diff_bytes": stat.size_diff,
+                    "size_bytes": stat.size,
+                    "count_diff": stat.count_diff,
+                    "count": stat.count,
+                }
+                for stat in stats[:top]
+            ],
+        }
+
+    def status(self) -> dict:
+        """Состояние трассировки и хранимые снимки."""
+        if not tracemalloc.is_tracing():
+            return {"tracing": False, "snapshots": self.snapshots()}
+        traced, peak = tracemalloc.get_traced_memory()
+        return {
+            "tracing": True,
+            "frames": tracemalloc.get_traceback_limit(),
+            "traced_bytes": traced,
+            "peak_bytes": peak,
+            "overhead_bytes": tracemalloc.get_tracemalloc_memory(),
+            "snapshots": self.snapshots(),
+        }
+
+
+def memory_report(pool_status: Callable[[], dict] | None = None) -> dict:
+    """Отчёт о памяти процесса: RSS, сборщик мусора, контейнеры ``MEMORY``, сессии и пул БД."""
+    report = {
+        "pid": os.getpid(),
+        "rss_bytes": current_rss(),
+        # ru_maxrss в Linux — в килобайтах
+        "max_rss_bytes": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024,
+        "gc": {"objects": len(gc.get_objects()), "counts": list(gc.get_count())},
+        "containers": MEMORY.report(),
+        "sqlalchemy": session_stats(),
+    }
+    if pool_status is not None:
+        try:
+            report["db_pool"] = pool_status()
+        except Exception as e:
+            report["db_pool"] = {"error": str(e)}
+    return report
@@ -0,0 +1,285 @@
+"""Внутрипроцессный реестр метрик в формате Prometheus.
+
+Запись метрики не берёт блокировок: каждый поток пишет в свой шард
+(``threading.local``), а шарды суммируются только при чтении ``/metrics``.
+Поэтому инструментирование можно держать включённым в production.
+"""
+
+import threading
+import time
+from bisect import bisect_left
+from collections.abc import Callable, Iterable
+
+# Границы корзин гистограмм задержек, в секундах
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+Labels = tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Iterable[str], values: Iterable[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(str(value))}"' for name, value in zip(names, values, strict=True)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    """Базовый класс метрики с потоковыми шардами."""
+
+    type_name = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Labels = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self._local = threading.local()
+        self._shards: list[dict] = []
+        self._shards_lock = threading.Lock()  # Берётся только при появлении нового потока
+
+    def _shard(self) -> dict:
+        try:
+            return self._local.data
+        except AttributeError:
+            data: dict = {}
+            with self._shards_lock:
+                self._shards.append(data)
+            self._local.data = data
+            return data
+
+    def _snapshot(self) -> list[dict]:
+        with self._shards_lock:
+            return [dict(shard) for shard in self._shards]
+
+    def reset(self) -> None:
+        """Обнуляет накопленные значения (для тестов и бенчмарков)."""
+        with self._shards_lock:
+            for shard in self._shards:
+                shard.clear()
+
+    def collect(self) -> list[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    """Монотонно растущий счётчик."""
+
+    type_name = "counter"
+
+    def inc(self, labels: Labels = (), amount: float = 1) -> None:
+        shard = self._shard()
+        shard[labels] = shard.get(labels, 0) + amount
+
+    def value(self, labels: Labels = ()) -> float:
+        return sum(shard.get(labels, 0) for shard in self._snapshot())
+
+    def collect(self) -> list[str]:
+        totals: dict[Labels, float] = {}
+        for shard in self._snapshot():
+            for labels, value in shard.items():
+                totals[labels] = totals.get(labels, 0) + value
+        return [
+            f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}"
+            for labels, value in sorted(totals.items())
+        ]
+
+
+class Gauge(_Metric):
+    """Мгновенное значение, вычисляемое функцией в момент чтения."""
+
+    type_name = "gauge"
+
+    def __init__(self, name: str, documentation: str, labelnames: Labels = ()):
+        super().__init__(name, documentation, labelnames)
+        self._functions: dict[Labels, Callable[[], float]] = {}
+
+    def set_function(self, func: Callable[[], float], labels: Labels = ()) -> None:
+        self._functions[labels] = func
+
+    def collect(self) -> list[str]:
+        lines = []
+        for labels, func in sorted(self._functions.items()):
+            try:
+                value = func()
+            except Exception:  # Сломанный источник не должен ронять /metrics
+                continue
+            lines.append(f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}")
+        return lines
+
+
+class Histogram(_Metric):
+    """Гистограмма с фиксированными корзинами."""
+
+    type_name = "histogram"
+
+    def __init__(
+        self, name: str, documentation: str, labelnames: Labels = (), buckets: tuple = DEFAULT_BUCKETS
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, labels: Labels = ()) -> None:
+        shard = self._shard()
+        series = shard.get(labels)
+        if series is None:
+            # [счётчики по корзинам..., +Inf, сумма]
+            series = shard[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+        series[bisect_left(self.buckets, value)] += 1
+        series[-1] += value
+
+    def time(self, labels: Labels = ()) -> "_Timer":
+        """Контекстный менеджер, измеряющий длительность блока."""
+        return _Timer(self, labels)
+
+    def collect(self) -> list[str]:
+        totals: dict[Labels, list] = {}
+        for shard in self._snapshot():
+            for labels, series in shard.items():
+                acc = totals.setdefault(labels, [0] * (len(self.buckets) + 1) + [0.0])
+                for i, value in enumerate(series):
+                    acc[i] += value
+
+        lines = []
+        for labels, series in sorted(totals.items()):
+            cumulative = 0
+            for bound, count in zip((*self.buckets, float("inf")), series[:-1], strict=True):
+                cumulative += count
+                le = _format_labels(self.labelnames, labels, f'le="{_format_value(bound)}"')
+                lines.append(f"{self.name}_bucket{le} {cumulative}")
+            label_str = _format_labels(self.labelnames, labels)
+            lines.append(f"{self.name}_sum{label_str} {_format_value(series[-1])}")
+            lines.append(f"{self.name}_count{label_str} {cumulative}")
+        return lines
+
+
+class _Timer:
+    __slots__ = ("histogram", "labels", "start")
+
+    def __init__(self, histogram: Histogram, labels: Labels):
+        self.histogram = histogram
+        self.labels = labels
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.histogram.observe(time.perf_counter() - self.start, self.labels)
+
+
+class MetricsRegistry:
+    """Реестр метрик процесса."""
+
+    def __init__(self):
+        self._metrics: dict[str, _Metric] = {}
+
+    def register(self, metric: _Metric) -> _Metric:
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric {metric.name} is already registered")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Labels = ()) -> Counter:
+        return self.register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Labels = ()) -> Gauge:
+        return self.register(Gauge(name, documentation, labelnames))
+
+    def histogram(
+        self, name: str, documentation: str, labelnames: Labels = (), buckets: tuple = DEFAULT_BUCKETS
+    ) -> Histogram:
+        return self.register(Histogram(name, documentation, labelnames, buckets))
+
+    def reset(self) -> None:
+        for metric in self._metrics.values():
+            metric.reset()
+
+    def render(self) -> bytes:
+        """Возвращает все метрики в текстовом формате Prometheus."""
+        lines = []
+        for metric in self._metrics.values():
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.type_name}")
+            lines.extend(metric.collect())
+        return ("\n".join(lines) + "\n").encode()
+
+
+REGISTRY = MetricsRegistry()
+
+# Метрики приложения
+HTTP_REQUESTS = REGISTRY.counter(
+    "tennis_http_requests_total", "HTTP requests by route, method and status", ("route", "method", "status")
+)
+HTTP_REQUEST_DURATION = REGISTRY.histogram(
+    "tennis_http_request_duration_seconds", "HTTP request latency by route and method", ("route", "method")
+)
+DB_QUERIES = REGISTRY.counter("tennis_db_queries_total", "SQL statements executed")
+DB_QUERY_DURATION = REGISTRY.histogram("tennis_db_query_duration_seconds", "SQL statement execution time")
+TEMPLATE_RENDER_DURATION = REGISTRY.histogram(
+    "tennis_template_render_duration_seconds", "Jinja template render time", ("template",)
+)
+POINTS_SCORED = REGISTRY.counter("tennis_points_scored_total", "Points scored in live matches")
+ACTIVE_MATCHES = REGISTRY.gauge("tennis_active_matches", "Matches currently kept in memory")
+DB_QUERIES_PER_REQUEST = REGISTRY.histogram(
+    "tennis_db_queries_per_request",
+    "SQL statements issued by a single HTTP request",
+    ("route",),
+    buckets=(0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 100),
+)
+DB_N_PLUS_ONE = REGISTRY.counter(
+    "tennis_db_n_plus_one_total", "Requests that repeated one SQL statement N+ times", ("route",)
+)
+DB_SLOW_QUERIES = REGISTRY.counter("tennis_db_slow_queries_total", "SQL statements over the slow threshold")
+REQUESTS_SHED = REGISTRY.counter(
+    "tennis_requests_shed_total", "Requests rejected before routing (rate_limit, overload)", ("reason",)
+)
+REQUESTS_IN_FLIGHT = REGISTRY.gauge(
+    "tennis_requests_in_flight", "Requests counted by the concurrency limiter"
+)
+READY = REGISTRY.gauge("tennis_ready", "Result of the last readiness check (1 - ready)")
+SERVER_SETTINGS = REGISTRY.gauge(
+    "tennis_server_setting", "Waitress runtime settings (booleans as 0/1)", ("setting",)
+)
+STARTUP_PHASE_DURATION = REGISTRY.gauge(
+    "tennis_startup_phase_seconds", "Duration of application startup phases", ("phase",)
+)
+POINT_LOG_PENDING = REGISTRY.gauge(
+    "tennis_point_log_pending", "Scored points buffered in memory and not yet written to match_points"
+)
+POINT_LOG_FLUSHED = REGISTRY.counter("tennis_point_log_flushed_total", "Points written to match_points")
+POINT_LOG_DROPPED = REGISTRY.counter(
+    "tennis_point_log_dropped_total",
+    "Buffered points dropped after a failed write over the buffer limit or at shutdown",
+)
+
+
+# Значения метки method; остальные методы (их присылает клиент) попадают в "other"
+HTTP_METHODS = frozenset({"GET", "HEAD", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"})
+
+
+def method_label(method: str) -> str:
+    """Значение метки method: стандартный метод HTTP или ``other``."""
+    return method if method in HTTP_METHODS else "other"
+
+
+def route_label(path: str, route_paths: frozenset[str], static_url: str = "/static/") -> str:
+    """Значение метки route: путь из таблицы маршрутов, ``/static`` или ``other``.
+
+    Ограничивает число временных рядов независимо от того, какие URL запрашивают клиенты.
+    """
+    if path in route_paths:
+        return path
+    if path.startswith(static_url):
+        return "/static"
+    return "other"
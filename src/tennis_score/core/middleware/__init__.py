@@ -3,12 +3,30 @@
 Middleware-компоненты обрабатывают HTTP-запросы и ответы на техническом уровне.
 """
 
-from .cors import CORSMiddleware
-from .logging import LoggingMiddleware
-from .static import StaticMiddleware
+from .cors import AsgiCORSMiddleware, CORSMiddleware
+from .health import HealthMiddleware, ReadinessCheck
+from .logging import AsgiLoggingMiddleware, LoggingMiddleware
+from .memory import MemoryMiddleware
+from .metrics import MetricsMiddleware
+from .profiling import ProfilingMiddleware
+from .query_tracking import QueryTrackingMiddleware
+from .rate_limit import RateLimitMiddleware
+from .static import AsgiStaticMiddleware, StaticMiddleware
+from .unit_of_work import UnitOfWorkMiddleware
 
 __all__ = [
+    "AsgiCORSMiddleware",
+    "AsgiLoggingMiddleware",
+    "AsgiStaticMiddleware",
     "CORSMiddleware",
+    "HealthMiddleware",
     "LoggingMiddleware",
+    "MemoryMiddleware",
+    "MetricsMiddleware",
+    "ProfilingMiddleware",
+    "QueryTrackingMiddleware",
+    "RateLimitMiddleware",
+    "ReadinessCheck",
     "StaticMiddleware",
+    "UnitOfWorkMiddleware",
 ]
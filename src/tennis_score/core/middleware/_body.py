@@ -0,0 +1,38 @@
+"""Действие после отдачи тела ответа: освобождение слота, замер времени, конец профиля."""
+
+from collections.abc import Iterable
+
+
+class ReleasingIterable:
+    """Тело ответа, вызывающее ``release`` после отдачи (``close``)."""
+
+    def __init__(self, result: Iterable[bytes], release):
+        self._result = result
+        self._release = release
+        self._released = False
+
+    def __iter__(self):
+        return iter(self._result)
+
+    def close(self):
+        try:
+            if hasattr(self._result, "close"):
+                self._result.close()
+        finally:
+            if not self._released:
+                self._released = True
+                self._release()
+
+
+def release_after_body(environ, result: Iterable[bytes], release) -> Iterable[bytes]:
+    """Вызывает ``release`` после отдачи тела ``result``.
+
+    Готовое тело (список) и ``wsgi.file_wrapper`` не оборачиваются: первое уже
+    сформировано, а обёртка над вторым лишила бы сервер отдачи файла через sendfile.
+    Для них ``release`` вызывается сразу.
+    """
+    file_wrapper = environ.get("wsgi.file_wrapper")
+    if isinstance(result, list) or (isinstance(file_wrapper, type) and isinstance(result, file_wrapper)):
+        release()
+        return result
+    return ReleasingIterable(result, release)
@@ -1,4 +1,11 @@
-"""CORS middleware для приложения теннисного скоринга."""
+"""CORS middleware для приложения теннисного скоринга (WSGI и ASGI)."""
+
+CORS_HEADERS = [
+    ('Access-Control-Allow-Origin', '*'),
+    ('Access-Control-Allow-Methods', 'GET, POST, PUT, DELETE, OPTIONS'),
+    ('Access-Control-Allow-Headers', 'Content-Type, Authorization'),
+]
+
 
 class CORSMiddleware:
     """Класс CORSMiddleware.
@@ -35,11 +42,31 @@ class CORSMiddleware:
             Returns:
                 Результат вызова оригинальной start_response функции
             """
-            cors_headers = [
-                ('Access-Control-Allow-Origin', '*'),
-                ('Access-Control-Allow-Methods', 'GET, POST, PUT, DELETE, OPTIONS'),
-                ('Access-Control-Allow-Headers', 'Content-Type, Authorization'),
-            ]
-            return start_response(status, headers + cors_headers, exc_info)
+            return start_response(status, headers + CORS_HEADERS, exc_info)
         
         return self.app(environ, custom_start_response)
+
+
+class AsgiCORSMiddleware:
+    """ASGI-двойник ``CORSMiddleware``: добавляет CORS-заголовки к каждому HTTP-ответу."""
+
+    _raw_headers = [(name.lower().encode(), value.encode()) for name, value in CORS_HEADERS]
+
+    def __init__(self, app):
+        """Инициализирует объект класса.
+
+        Args:
+            app: ASGI приложение, которое будет обернуто
+        """
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        async def cors_send(message):
+            if message["type"] == "http.response.start":
+                message = {**message, "headers": [*message.get("headers", ()), *self._raw_headers]}
+            await send(message)
+
+        await self.app(scope, receive, cors_send)
@@ -0,0 +1,144 @@
+"""Middleware проб живости (``/healthz``) и готовности (``/readyz``).
+
+Пробы отвечают до маршрутизации и остальных middleware, поэтому не рендерят
+шаблоны и не попадают в журнал запросов. Проверки готовности выполняются в
+отдельном потоке с ограничением по времени, а результат кешируется на
+``cache_ttl`` секунд: частые пробы нескольких балансировщиков не нагружают БД.
+"""
+
+import json
+import logging
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+
+from ..metrics import READY
+
+_NO_CACHE = ("Cache-Control", "no-store")
+
+
+class ReadinessCheck:
+    """Набор проверок готовности с кешированием результата и таймаутом.
+
+    Проверка — функция без аргументов; исключение означает «не готов», а
+    возвращённое значение (если не None) попадает в ответ ``/readyz``.
+    """
+
+    def __init__(
+        self,
+        checks: dict[str, Callable[[], object]],
+        cache_ttl: float = 2.0,
+        timeout: float = 1.0,
+    ):
+        """Инициализирует объект класса.
+
+        Args:
+            checks: Проверки по именам
+            cache_ttl: Сколько секунд использовать последний результат
+            timeout: Сколько секунд проба ждёт завершения проверок
+        """
+        self.checks = checks
+        self.cache_ttl = cache_ttl
+        self.timeout = timeout
+        self.logger = logging.getLogger("core.health")
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="readiness")
+        self._lock = threading.Lock()
+        self._in_flight: Future | None = None
+        self._result: tuple[bool, dict] | None = None
+        self._checked_at = 0.0
+        READY.set_function(self._last_ready)
+
+    def _last_ready(self) -> int:
+        if self._result is None:
+            raise LookupError("readiness has not been checked yet")
+        return int(self._result[0])
+
+    def _run_checks(self) -> tuple[bool, dict]:
+        details = {}
+        for name, check in self.checks.items():
+            start = time.perf_counter()
+            try:
+                value = check()
+            except Exception as e:
+                details[name] = {"ok": False, "error": str(e) or type(e).__name__}
+                continue
+            details[name] = {"ok": True, "latency_ms": round((time.perf_counter() - start) * 1000, 2)}
+            if value is not None:
+                details[name]["value"] = value
+        ready = all(entry["ok"] for entry in details.values())
+        if not ready:
+            self.logger.warning("Readiness check failed: %s", json.dumps(details, ensure_ascii=False))
+        return ready, details
+
+    def status(self) -> tuple[bool, dict]:
+        """Результат проверок: из кеша, из уже идущей проверки или новой проверки.
+
+        Одновременно выполняется не более одной проверки; если она не уложилась
+        в ``timeout``, проба получает «не готов», а проверка продолжается и её
+        результат достанется следующей пробе.
+        """
+        with self._lock:
+            if self._result is not None and time.monotonic() - self._checked_at < self.cache_ttl:
+                return self._result
+            if self._in_flight is None:
+                self._in_flight = self._executor.submit(self._run_checks)
+            future = self._in_flight
+
+        try:
+            result = future.result(timeout=self.timeout)
+        except FutureTimeoutError:
+            return False, {"timeout": f"checks did not finish in {self.timeout}s"}
+
+        with self._lock:
+            if self._in_flight is future:
+                self._in_flight = None
+                self._result = result
+                self._checked_at = time.monotonic()
+        return result
+
+
+class HealthMiddleware:
+    """WSGI middleware, отвечающий на пробы живости и готовности."""
+
+    def __init__(
+        self,
+        app,
+        readiness: ReadinessCheck,
+        healthz_path: str = "/healthz",
+        readyz_path: str = "/readyz",
+    ):
+        """Инициализирует объект класса.
+
+        Args:
+            app: WSGI приложение, которое будет обернуто
+            readiness: Проверки готовности
+            healthz_path: URL пробы живости
+            readyz_path: URL пробы готовности
+        """
+        self.app = app
+        self.readiness = readiness
+        self.healthz_path = healthz_path
+        self.readyz_path = readyz_path
+
+    def __call__(self, environ, start_response):
+        path = environ.get("PATH_INFO", "/")
+        if path == self.healthz_path:
+            # Процесс жив, пока способен ответить; зависимости здесь не проверяются
+            return self._respond(environ, start_response, "200 OK", b"ok", "text/plain; charset=utf-8")
+        if path == self.readyz_path:
+            ready, details = self.readiness.status()
+            body = json.dumps(
+                {"status": "ready" if ready else "unavailable", "checks": details}, ensure_ascii=False
+            ).encode()
+            status = "200 OK" if ready else "503 Service Unavailable"
+            return self._respond(environ, start_response, status, body, "application/json")
+        return self.app(environ, start_response)
+
+    @staticmethod
+    def _respond(environ, start_response, status: str, body: bytes, content_type: str):
+        start_response(
+            status, [("Content-Type", content_type), ("Content-Length", str(len(body))), _NO_CACHE]
+        )
+        return [b""] if environ.get("REQUEST_METHOD") == "HEAD" else [body]
@@ -1,8 +1,10 @@
-"""Middleware для логирования HTTP-запросов и ответов в приложении теннисного скоринга."""
+"""Middleware для логирования HTTP-запросов и ответов в приложении теннисного скоринга (WSGI и ASGI)."""
 
 import logging
 import time
 
+from ._body import release_after_body
+
 
 class LoggingMiddleware:
     """WSGI middleware для логирования HTTP-запросов и ответов."""
@@ -31,30 +33,76 @@ class LoggingMiddleware:
             user_agent = environ.get("HTTP_USER_AGENT", "-")
             
             self.logger.info(
-                f"Request: {method} {path}?{query_string} from {client_addr} "
-                f"with {user_agent}"
+                "Request: %s %s?%s from %s with %s", method, path, query_string, client_addr, user_agent
             )
         
         start_time = time.time()
 
         # Создаем обертку для start_response для захвата статуса ответа
         def custom_start_response(status, headers, exc_info=None):
-            if detailed_logging:
-                self.logger.debug(f"Response status: {status}")
-                for h, v in headers:
-                    self.logger.debug(f"Response header: {h}: {v}")
+            # Заголовки логируются одной записью и только при включённом DEBUG
+            if detailed_logging and self.logger.isEnabledFor(logging.DEBUG):
+                self.logger.debug("Response status: %s, headers: %s", status, headers)
             return start_response(status, headers, exc_info)
         
+        def log_processed():
+            # Время выполнения запроса — до окончания отдачи тела ответа
+            process_time = time.time() - start_time
+            if detailed_logging:
+                self.logger.info("Request %s %s processed in %.4fs", method, path, process_time)
+            else:
+                self.logger.debug("Request %s %s processed in %.4fs", method, path, process_time)
+
         # Вызываем приложение
         response = self.app(environ, custom_start_response)
-        
-        # Измеряем время выполнения запроса
-        end_time = time.time()
-        process_time = end_time - start_time
-        
+        return release_after_body(environ, response, log_processed)
+
+
+class AsgiLoggingMiddleware(LoggingMiddleware):
+    """ASGI-двойник ``LoggingMiddleware``: те же записи, время — до отправки всего тела ответа."""
+
+    def __init__(self, app):
+        super().__init__(app)
+        self.logger = logging.getLogger("asgi")
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        path = scope.get("path", "-")
+        method = scope.get("method", "-")
+        detailed_logging = self.should_log_detailed(path)
+
         if detailed_logging:
-            self.logger.info(f"Request {method} {path} processed in {process_time:.4f}s")
+            client_addr = (scope.get("client") or ("-",))[0]
+            headers = dict(scope.get("headers", ()))
+            user_agent = headers.get(b"user-agent", b"-").decode("latin-1")
+            self.logger.info(
+                "Request: %s %s?%s from %s with %s",
+                method,
+                path,
+                scope.get("query_string", b"").decode("latin-1"),
+                client_addr,
+                user_agent,
+            )
+
+        start_time = time.time()
+
+        async def logging_send(message):
+            if (
+                message["type"] == "http.response.start"
+                and detailed_logging
+                and self.logger.isEnabledFor(logging.DEBUG)
+            ):
+                self.logger.debug(
+                    "Response status: %s, headers: %s", message["status"], message.get("headers")
+                )
+            await send(message)
+
+        await self.app(scope, receive, logging_send)
+
+        process_time = time.time() - start_time
+        if detailed_logging:
+            self.logger.info("Request %s %s processed in %.4fs", method, path, process_time)
         else:
-            self.logger.debug(f"Request {method} {path} processed in {process_time:.4f}s")
-        
-        return response
+            self.logger.debug("Request %s %s processed in %.4fs", method, path, process_time)
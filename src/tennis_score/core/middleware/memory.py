@@ -0,0 +1,84 @@
+"""Служебный эндпоинт учёта памяти процесса (см. ``core.memory``).
+
+``/admin/memory`` (с токеном ``ADMIN_TOKEN``, см. ``core.admin``):
+
+- ``GET`` — RSS, размеры и число записей кешей и хранилищ, сессии SQLAlchemy, пул БД,
+  состояние tracemalloc;
+- ``POST ?action=start&frames=1`` — включает tracemalloc и снимает базовый снимок;
+- ``POST ?action=snapshot`` — снимает снимок;
+- ``POST ?action=diff&from=1&to=2&group=lineno&top=20`` — сравнивает два снимка
+  (по умолчанию два последних) по строкам или файлам кода;
+- ``POST ?action=stop`` — выключает tracemalloc.
+
+В нескольких воркерах ``prefork`` отвечает тот воркер, который принял запрос (см. ``pid``).
+"""
+
+from collections.abc import Callable
+
+from ..admin import deny_admin, json_response, query_params
+from ..memory import TracemallocSnapshots, memory_report
+
+
+class MemoryMiddleware:
+    """WSGI middleware, отвечающий на запросы к эндпоинту учёта памяти."""
+
+    def __init__(
+        self,
+        app,
+        snapshots: TracemallocSnapshots,
+        pool_status: Callable[[], dict] | None = None,
+        admin_token: str = "",
+        control_path: str = "/admin/memory",
+    ):
+        """Инициализирует объект класса.
+
+        Args:
+            app: WSGI приложение, которое будет обернуто
+            snapshots: Снимки tracemalloc
+            pool_status: Функция, возвращающая состояние пула соединений БД
+            admin_token: Токен служебных эндпоинтов; пустой — эндпоинт отключён
+            control_path: URL эндпоинта
+        """
+        self.app = app
+        self.snapshots = snapshots
+        self.pool_status = pool_status
+        self.admin_token = admin_token
+        self.control_path = control_path
+
+    def __call__(self, environ, start_response):
+        if environ.get("PATH_INFO", "/") != self.control_path:
+            return self.app(environ, start_response)
+        denied = deny_admin(environ, start_response, self.admin_token)
+        if denied is not None:
+            return denied
+        method = environ.get("REQUEST_METHOD", "GET")
+        if method == "GET":
+            report = memory_report(self.pool_status)
+            report["tracemalloc"] = self.snapshots.status()
+            return json_response(start_response, "200 OK", report)
+        if method != "POST":
+            return json_response(start_response, "405 Method Not Allowed", {"error": "use GET or POST"})
+        try:
+            payload = self._apply(query_params(environ))
+        except ValueError as e:
+            return json_response(start_response, "400 Bad Request", {"error": str(e)})
+        return json_response(start_response, "200 OK", payload)
+
+    def _apply(self, params: dict[str, str]) -> dict:
+        """Выполняет действие POST-запроса с tracemalloc."""
+        action = params.get("action")
+        if action == "start":
+            return self.snapshots.start(int(params.get("frames", "1")))
+        if action == "snapshot":
+            return self.snapshots.take()
+        if action == "diff":
+            return self.snapshots.diff(
+                int(params["from"]) if "from" in params else None,
+                int(params["to"]) if "to" in params else None,
+                group=params.get("group", "lineno"),
+                top=int(params.get("top", "20")),
+            )
+        if action == "stop":
+            self.snapshots.stop()
+            return self.snapshots.status()
+        raise ValueError(f"Unknown action '{action}', expected 'start', 'snapshot', 'diff' or 'stop'")
@@ -0,0 +1,73 @@
+"""Middleware сбора метрик HTTP-запросов и отдачи их по ``/metrics``."""
+
+import time
+from collections.abc import Iterable
+
+from ..metrics import (
+    CONTENT_TYPE,
+    HTTP_REQUEST_DURATION,
+    HTTP_REQUESTS,
+    REGISTRY,
+    method_label,
+    route_label,
+)
+from ._body import release_after_body
+
+
+class MetricsMiddleware:
+    """WSGI middleware: гистограммы задержек по маршрутам и эндпоинт ``/metrics``.
+
+    Метка ``route`` берётся из таблицы маршрутов (см. ``route_label``), ``method`` —
+    из фиксированного набора методов (см. ``method_label``). Длительность
+    запроса с потоковым телом измеряется до окончания его отдачи (``close``).
+    """
+
+    def __init__(
+        self,
+        app,
+        route_paths: Iterable[str] = (),
+        metrics_path: str = "/metrics",
+        static_url: str = "/static/",
+    ):
+        """Инициализирует объект класса.
+
+        Args:
+            app: WSGI приложение, которое будет обернуто
+            route_paths: Пути из ROUTING_TABLE, используемые как значения метки route
+            metrics_path: URL, по которому отдаются метрики
+            static_url: URL-префикс статических файлов
+        """
+        self.app = app
+        self.route_paths = frozenset(route_paths)
+        self.metrics_path = metrics_path
+        self.static_url = static_url
+
+    def __call__(self, environ, start_response):
+        path = environ.get("PATH_INFO", "/")
+        if path == self.metrics_path:
+            body = REGISTRY.render()
+            start_response(
+                "200 OK", [("Content-Type", CONTENT_TYPE), ("Content-Length", str(len(body)))]
+            )
+            return [body]
+
+        method = method_label(environ.get("REQUEST_METHOD", "GET"))
+        status_holder = ["500"]
+
+        def custom_start_response(status, headers, exc_info=None):
+            status_holder[0] = status[:3]
+            return start_response(status, headers, exc_info)
+
+        start_time = time.perf_counter()
+
+        def observe():
+            route = route_label(path, self.route_paths, self.static_url)
+            HTTP_REQUEST_DURATION.observe(time.perf_counter() - start_time, (route, method))
+            HTTP_REQUESTS.inc((route, method, status_holder[0]))
+
+        try:
+            result = self.app(environ, custom_start_response)
+        except BaseException:
+            observe()
+            raise
+        return release_after_body(environ, result, observe)
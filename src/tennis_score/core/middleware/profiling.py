@@ -0,0 +1,147 @@
+"""Middleware выборочного профилирования запросов и служебный эндпоинт управления им.
+
+Профилируется (см. ``StackSampler``):
+
+- каждый ``sample_rate``-й запрос, пока профилирование включено;
+- каждый запрос к маршрутам из ``routes``, пока профилирование включено;
+- запрос с заголовком ``trigger_header`` и токеном служебных эндпоинтов — всегда.
+
+``/admin/profiler`` (с токеном ``ADMIN_TOKEN``, см. ``core.admin``):
+
+- ``GET`` — состояние и сводка по маршрутам;
+- ``POST ?enabled=1&sample_rate=50&routes=/matches,/match-score`` — меняет настройки;
+- ``POST ?action=dump`` — записывает стеки в ``output_dir``; ``?action=reset`` — сбрасывает их.
+
+При выключении профилирования накопленные стеки записываются в файлы.
+"""
+
+import itertools
+import logging
+from collections.abc import Iterable
+
+from ..admin import deny_admin, is_admin_request, json_response, query_params
+from ..metrics import route_label
+from ..profiling import StackSampler
+from ._body import release_after_body
+
+
+class ProfilingMiddleware:
+    """WSGI middleware, профилирующий выбранные запросы сэмплером стеков."""
+
+    def __init__(
+        self,
+        app,
+        sampler: StackSampler,
+        enabled: bool = False,
+        sample_rate: int = 100,
+        routes: Iterable[str] = (),
+        trigger_header: str = "X-Profile",
+        output_dir: str = "profiles",
+        route_paths: Iterable[str] = (),
+        admin_token: str = "",
+        control_path: str = "/admin/profiler",
+    ):
+        """Инициализирует объект класса.
+
+        Args:
+            app: WSGI приложение, которое будет обернуто
+            sampler: Сэмплер, накапливающий стеки
+            enabled: Профилировать запросы по ``sample_rate`` и ``routes`` с момента запуска
+            sample_rate: Профилировать каждый N-й запрос (0 — только ``routes`` и заголовок)
+            routes: Маршруты, запросы к которым профилируются все
+            trigger_header: Заголовок, по которому профилируется запрос с токеном служебных эндпоинтов
+            output_dir: Каталог файлов со стеками
+            route_paths: Пути из ROUTING_TABLE, используемые как маршруты сводки и имена файлов
+            admin_token: Токен служебных эндпоинтов; пустой — управление и заголовок отключены
+            control_path: URL эндпоинта управления
+        """
+        self.app = app
+        self.sampler = sampler
+        self.enabled = enabled
+        self.sample_rate = sample_rate
+        self.routes = frozenset(routes)
+        self.trigger_key = "HTTP_" + trigger_header.upper().replace("-", "_")
+        self.output_dir = output_dir
+        self.route_paths = frozenset(route_paths)
+        self.admin_token = admin_token
+        self.control_path = control_path
+        self.logger = logging.getLogger("core.profiling")
+        self._counter = itertools.count(1)
+
+    def __call__(self, environ, start_response):
+        path = environ.get("PATH_INFO", "/")
+        if path == self.control_path:
+            return self._control(environ, start_response)
+
+        route = route_label(path, self.route_paths)
+        if not self._selected(environ, route):
+            return self.app(environ, start_response)
+
+        # Тело ответа может рендериться потоком при отдаче: профилирование — до close()
+        ident = self.sampler.begin(route)
+        try:
+            result = self.app(environ, start_response)
+        except BaseException:
+            self.sampler.end(ident)
+            raise
+        return release_after_body(environ, result, lambda: self.sampler.end(ident))
+
+    def _selected(self, environ, route: str) -> bool:
+        if self.trigger_key in environ and is_admin_request(environ, self.admin_token):
+            return True
+        if not self.enabled:
+            return False
+        if route in self.routes:
+            return True
+        return self.sample_rate > 0 and next(self._counter) % self.sample_rate == 0
+
+    def _control(self, environ, start_response):
+        denied = deny_admin(environ, start_response, self.admin_token)
+        if denied is not None:
+            return denied
+        method = environ.get("REQUEST_METHOD", "GET")
+        if method == "POST":
+            try:
+                self._apply(query_params(environ))
+            except ValueError as e:
+                return json_response(start_response, "400 Bad Request", {"error": str(e)})
+        elif method != "GET":
+            return json_response(start_response, "405 Method Not Allowed", {"error": "use GET or POST"})
+        return json_response(start_response, "200 OK", self.status())
+
+    def _apply(self, params: dict[str, str]) -> None:
+        """Применяет параметры POST-запроса к эндпоинту управления."""
+        action = params.get("action")
+        if action not in (None, "dump", "reset"):
+            raise ValueError(f"Unknown action '{action}', expected 'dump' or 'reset'")
+        was_enabled = self.enabled
+        if "sample_rate" in params:
+            sample_rate = int(params["sample_rate"])
+            if sample_rate < 0:
+                raise ValueError("sample_rate must not be negative")
+            self.sample_rate = sample_rate
+        if "routes" in params:
+            self.routes = frozenset(route for route in params["routes"].split(",") if route)
+        if "enabled" in params:
+            self.enabled = params["enabled"] in ("1", "true", "on")
+        if action == "dump" or (was_enabled and not self.enabled):
+            self.sampler.dump(self.output_dir)
+        if action == "reset":
+            self.sampler.reset()
+        self.logger.info(
+            "Профилирование %s: sample_rate=%d, routes=%s",
+            "включено" if self.enabled else "выключено",
+            self.sample_rate,
+            ",".join(sorted(self.routes)) or "-",
+        )
+
+    def status(self) -> dict:
+        """Настройки профилирования и сводка накопленных стеков."""
+        return {
+            "enabled": self.enabled,
+            "sample_rate": self.sample_rate,
+            "routes": sorted(self.routes),
+            "interval_ms": self.sampler.interval * 1000,
+            "output_dir": self.output_dir,
+            "routes_profiled": self.sampler.summary(),
+        }
@@ -0,0 +1,67 @@
+"""Middleware учёта SQL-запросов в рамках HTTP-запроса и обнаружения N+1."""
+
+import logging
+from collections.abc import Iterable
+
+from ..metrics import DB_N_PLUS_ONE, DB_QUERIES_PER_REQUEST, route_label
+from ..query_tracking import RequestQueries, current_request_queries, one_line_sql
+
+
+class QueryTrackingMiddleware:
+    """WSGI middleware, привязывающий SQL-операторы к текущему HTTP-запросу.
+
+    По завершении запроса записывает число запросов в метрики и предупреждает,
+    если один оператор повторился ``n_plus_one_threshold`` и более раз.
+    """
+
+    def __init__(self, app, route_paths: Iterable[str] = (), n_plus_one_threshold: int = 3):
+        """Инициализирует объект класса.
+
+        Args:
+            app: WSGI приложение, которое будет обернуто
+            route_paths: Пути из ROUTING_TABLE, используемые как значения метки route
+            n_plus_one_threshold: Сколько повторов одного оператора считать N+1
+        """
+        self.app = app
+        self.route_paths = frozenset(route_paths)
+        self.n_plus_one_threshold = n_plus_one_threshold
+        self.logger = logging.getLogger("core.sql")
+
+    def __call__(self, environ, start_response):
+        stats = RequestQueries()
+        token = current_request_queries.set(stats)
+        try:
+            return self.app(environ, start_response)
+        finally:
+            current_request_queries.reset(token)
+            self._report(environ, stats)
+
+    def _report(self, environ, stats: RequestQueries) -> None:
+        path = environ.get("PATH_INFO", "/")
+        route = route_label(path, self.route_paths)
+        if route == "/static":
+            return
+        DB_QUERIES_PER_REQUEST.observe(stats.count, (route,))
+        if not stats.count:
+            return
+
+        method = environ.get("REQUEST_METHOD", "GET")
+        self.logger.debug(
+            "%s %s: %d queries, %.4fs in DB, %d slow",
+            method,
+            path,
+            stats.count,
+            stats.total_time,
+            len(stats.slow),
+        )
+        repeated = stats.repeated(self.n_plus_one_threshold)
+        if repeated:
+            DB_N_PLUS_ONE.inc((route,))
+            for statement, times in repeated:
+                self.logger.warning(
+                    "Possible N+1 in %s %s: statement executed %d times: %s",
+                    method,
+                    path,
+                    times,
+                    one_line_sql(statement),
+                )
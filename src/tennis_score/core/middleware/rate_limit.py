@@ -0,0 +1,164 @@
+"""Ограничение частоты запросов по IP и сброс нагрузки при перегрузке.
+
+Запросы, превысившие лимит, отклоняются до маршрутизации и обращения к БД:
+
+- ``429 Too Many Requests`` — клиент исчерпал свой token bucket;
+- ``503 Service Unavailable`` — одновременно выполняется ``max_concurrent`` запросов.
+
+Оба ответа содержат ``Retry-After``.
+"""
+
+import logging
+import math
+import threading
+import time
+from collections import OrderedDict
+
+from ..memory import MEMORY
+from ..metrics import REQUESTS_IN_FLIGHT, REQUESTS_SHED
+from ._body import release_after_body
+
+
+class _Bucket:
+    __slots__ = ("tokens", "updated")
+
+    def __init__(self, tokens: float, updated: float):
+        self.tokens = tokens
+        self.updated = updated
+
+
+class RateLimitMiddleware:
+    """WSGI middleware с token bucket на IP-адрес клиента и глобальным лимитом конкурентности.
+
+    Состояние — один ``_Bucket`` на активного клиента в ``OrderedDict`` в порядке
+    последнего обращения; корзины, простаивающие дольше ``idle_ttl``, удаляются с
+    начала словаря при каждом запросе (амортизированно O(1)). Число корзин также
+    ограничено ``max_clients``.
+    """
+
+    def __init__(
+        self,
+        app,
+        rate: float = 20.0,
+        burst: int = 40,
+        max_concurrent: int = 0,
+        idle_ttl: float = 60.0,
+        max_clients: int = 100_000,
+        proxy_hops: int = 0,
+        exempt_prefixes: tuple[str, ...] = ("/static/", "/metrics"),
+    ):
+        """Инициализирует объект класса.
+
+        Args:
+            app: WSGI приложение, которое будет обернуто
+            rate: Пополнение корзины, запросов в секунду (0 — без ограничения по IP)
+            burst: Ёмкость корзины — сколько запросов подряд допускается
+            max_concurrent: Максимум одновременно выполняемых запросов (0 — без ограничения)
+            idle_ttl: Через сколько секунд простоя корзина клиента удаляется
+            max_clients: Максимум хранимых корзин
+            proxy_hops: Сколько доверенных прокси добавляют адрес в ``X-Forwarded-For``
+                (0 — заголовок игнорируется, используется ``REMOTE_ADDR``). Без прокси
+                заголовок присылает сам клиент, поэтому доверять ему нельзя
+            exempt_prefixes: Префиксы путей, на которые ограничения не распространяются
+        """
+        self.app = app
+        self.rate = rate
+        self.burst = burst
+        self.max_concurrent = max_concurrent
+        self.idle_ttl = idle_ttl
+        self.max_clients = max_clients
+        self.proxy_hops = proxy_hops
+        self.exempt_prefixes = exempt_prefixes
+        self.logger = logging.getLogger("core.rate_limit")
+        self._buckets: OrderedDict[str, _Bucket] = OrderedDict()
+        self._buckets_lock = threading.Lock()
+        self._in_flight = 0
+        self._in_flight_lock = threading.Lock()
+        REQUESTS_IN_FLIGHT.set_function(lambda: self._in_flight)
+        MEMORY.track("rate_limit_buckets", lambda: self._buckets)
+
+    def client_ip(self, environ) -> str:
+        """Адрес клиента: запись доверенного прокси в ``X-Forwarded-For`` или ``REMOTE_ADDR``."""
+        forwarded = environ.get("HTTP_X_FORWARDED_FOR")
+        if forwarded and self.proxy_hops:
+            hops = [part.strip() for part in forwarded.split(",")]
+            # Правые записи добавлены доверенными прокси; левее — то, что прислал сам клиент
+            return hops[max(0, len(hops) - self.proxy_hops)]
+        return environ.get("REMOTE_ADDR", "")
+
+    def _take_token(self, client: str) -> float:
+        """Списывает токен клиента. Возвращает 0 или через сколько секунд появится токен."""
+        now = time.monotonic()
+        with self._buckets_lock:
+            bucket = self._buckets.get(client)
+            if bucket is None:
+                bucket = self._buckets[client] = _Bucket(float(self.burst), now)
+            else:
+                bucket.tokens = min(self.burst, bucket.tokens + (now - bucket.updated) * self.rate)
+                bucket.updated = now
+                self._buckets.move_to_end(client)
+            self._expire(now)
+
+            if bucket.tokens >= 1:
+                bucket.tokens -= 1
+                return 0.0
+            return (1 - bucket.tokens) / self.rate
+
+    def _expire(self, now: float) -> None:
+        buckets = self._buckets
+        while buckets:
+            oldest = next(iter(buckets.values()))
+            if now - oldest.updated < self.idle_ttl and len(buckets) <= self.max_clients:
+                break
+            buckets.popitem(last=False)
+
+    def _acquire(self) -> bool:
+        with self._in_flight_lock:
+            if self._in_flight >= self.max_concurrent:
+                return False
+            self._in_flight += 1
+            return True
+
+    def _release(self) -> None:
+        with self._in_flight_lock:
+            self._in_flight -= 1
+
+    @staticmethod
+    def _reject(start_response, status: str, retry_after: float):
+        body = status.encode()
+        start_response(
+            status,
+            [
+                ("Content-Type", "text/plain; charset=utf-8"),
+                ("Content-Length", str(len(body))),
+                ("Retry-After", str(max(1, math.ceil(retry_after)))),
+            ],
+        )
+        return [body]
+
+    def __call__(self, environ, start_response):
+        path = environ.get("PATH_INFO", "/")
+        if path.startswith(self.exempt_prefixes):
+            return self.app(environ, start_response)
+
+        if self.rate > 0:
+            client = self.client_ip(environ)
+            wait = self._take_token(client)
+            if wait:
+                REQUESTS_SHED.inc(("rate_limit",))
+                self.logger.debug("Rate limit exceeded for %s on %s", client, path)
+                return self._reject(start_response, "429 Too Many Requests", wait)
+
+        if not self.max_concurrent:
+            return self.app(environ, start_response)
+
+        if not self._acquire():
+            REQUESTS_SHED.inc(("overload",))
+            self.logger.debug("Shedding %s: %d requests in flight", path, self.max_concurrent)
+            return self._reject(start_response, "503 Service Unavailable", 1)
+        try:
+            result = self.app(environ, start_response)
+        except BaseException:
+            self._release()
+            raise
+        return release_after_body(environ, result, self._release)
@@ -1,61 +1,383 @@
-"""Middleware для обслуживания статических файлов в приложении теннисного скоринга."""
+"""Middleware для обслуживания статических файлов в приложении теннисного скоринга.
 
+Все файлы статической директории индексируются при старте в таблицу
+``{URL-путь: StaticFile}``, поэтому обработка запроса сводится к поиску в словаре.
+Небольшие файлы держатся в памяти целиком, крупные отдаются через
+``wsgi.file_wrapper`` (sendfile, если сервер его поддерживает).
+
+Каждый файл дополнительно доступен по «отпечатанному» URL с хешем содержимого
+в имени (``css/style.59f7612a191c.css``). Такие URL отдаются с
+``Cache-Control: immutable`` и генерируются Jinja-хелпером ``asset_url()``.
+
+``AsgiStaticMiddleware`` — тот же индекс и те же правила отдачи для ASGI.
+"""
+
+import hashlib
 import logging
 import mimetypes
 import os
+import posixpath
+import time
+from collections.abc import Iterator
+from dataclasses import dataclass
+from email.utils import formatdate, parsedate_to_datetime
+
+from ..asgi_environ import build_environ, send_response
+from ..memory import MEMORY
+
+# Файлы до этого размера кешируются в памяти целиком
+DEFAULT_MAX_INLINE_SIZE = 256 * 1024
+# Размер блока при потоковой отдаче крупных файлов
+BLOCK_SIZE = 64 * 1024
+# Длина хеша в отпечатанном имени файла
+FINGERPRINT_LENGTH = 12
+IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+
+
+@dataclass(slots=True)
+class StaticFile:
+    """Запись таблицы статических файлов."""
+
+    path: str
+    content_type: str
+    size: int
+    mtime: int
+    etag: str
+    last_modified: str
+    content: bytes | None  # None — файл отдаётся с диска
+
+    @property
+    def fingerprint(self) -> str:
+        """Короткий хеш содержимого для отпечатанного URL."""
+        return self.etag.strip('"')[:FINGERPRINT_LENGTH]
 
 
 class StaticMiddleware:
     """Middleware для обслуживания всех файлов из одной статической директории."""
 
-    def __init__(self, app, static_url='/static/', static_dir='templates/static'):
+    def __init__(
+        self,
+        app,
+        static_url='/static/',
+        static_dir='templates/static',
+        max_inline_size: int = DEFAULT_MAX_INLINE_SIZE,
+        cache_control: str = 'public, max-age=86400',
+        auto_reload: bool = False,
+        reload_interval: float = 1.0,
+    ):
         """Args:
         app: Оборачиваемое WSGI-приложение
             static_url: URL-префикс, под которым доступны статические файлы
-            static_dir: Директория на диске, где хранятся статические файлы.
+            static_dir: Директория на диске, где хранятся статические файлы
+            max_inline_size: Максимальный размер файла, содержимое которого держится в памяти
+            cache_control: Значение заголовка Cache-Control для статики
+            auto_reload: Перечитывать директорию при изменениях (режим разработки)
+            reload_interval: Минимальный интервал между проверками директории, в секундах.
         """  # noqa: D205
         self.app = app
         self.static_url = static_url.rstrip('/') + '/'
         self.static_dir = static_dir
+        self.max_inline_size = max_inline_size
+        self.cache_control = cache_control
+        self.auto_reload = auto_reload
+        self.reload_interval = reload_interval
+        self.logger = logging.getLogger("infrastructure.middleware.static")
 
-    def __call__(self, environ, start_response):
-        path = environ.get('PATH_INFO', '')
+        self.files: dict[str, StaticFile] = {}
+        # Отпечатанный путь -> запись, и логический путь -> отпечатанный путь
+        self.hashed_files: dict[str, StaticFile] = {}
+        self.fingerprints: dict[str, str] = {}
+        self._signature: tuple = ()
+        self._last_check = 0.0
+        self.reload()
+        MEMORY.track("static_index", lambda: self.files)
+
+    # ------------------------------------------------------------------
+    # Индексация
+    # ------------------------------------------------------------------
 
+    def _scan_signature(self) -> tuple:
+        """Дешёвый снимок директории: пути, размеры и mtime без чтения содержимого."""
+        entries = []
+        for root, _, files in os.walk(self.static_dir):
+            for name in files:
+                file_path = os.path.join(root, name)
+                try:
+                    st = os.stat(file_path)
+                except OSError:
+                    continue
+                entries.append((file_path, st.st_size, st.st_mtime_ns))
+        entries.sort()
+        return tuple(entries)
 
+    def _build_entry(self, file_path: str) -> StaticFile:
+        st = os.stat(file_path)
+        content_type, _ = mimetypes.guess_type(file_path)
+        if not content_type:
+            content_type = 'application/octet-stream'
+        elif content_type.startswith('text/') or content_type == 'application/javascript':
+            content_type += '; charset=utf-8'
 
-        if path.startswith(self.static_url):
-            relative_path = path[len(self.static_url):].lstrip('/')
-            file_path = os.path.join(self.static_dir, relative_path)
+        digest = hashlib.blake2b(digest_size=16)
+        content = None
+        with open(file_path, 'rb') as f:
+            if st.st_size <= self.max_inline_size:
+                content = f.read()
+                digest.update(content)
+            else:
+                for block in iter(lambda: f.read(BLOCK_SIZE), b''):
+                    digest.update(block)
 
+        mtime = int(st.st_mtime)
+        return StaticFile(
+            path=file_path,
+            content_type=content_type,
+            size=st.st_size,
+            mtime=mtime,
+            etag=f'"{digest.hexdigest()}"',
+            last_modified=formatdate(mtime, usegmt=True),
+            content=content,
+        )
 
+    def reload(self) -> None:
+        """Переиндексирует статическую директорию."""
+        self._last_check = time.monotonic()
+        if not os.path.isdir(self.static_dir):
+            self.logger.warning("Static directory not found: %s", self.static_dir)
+            self.files = {}
+            self.hashed_files = {}
+            self.fingerprints = {}
+            self._signature = ()
+            return
 
-            if os.path.isfile(file_path):
-                return self.serve_static(file_path, start_response)
+        signature = self._scan_signature()
+        files: dict[str, StaticFile] = {}
+        for file_path, _, _ in signature:
+            rel_path = os.path.relpath(file_path, self.static_dir).replace(os.sep, '/')
+            try:
+                files[rel_path] = self._build_entry(file_path)
+            except OSError as e:
+                self.logger.error("Failed to index static file %s: %s", file_path, e)
 
+        fingerprints = {rel_path: self._fingerprinted_path(rel_path, f) for rel_path, f in files.items()}
+        hashed_files = {fingerprints[rel_path]: f for rel_path, f in files.items()}
+
+        # Атомарная подмена таблиц: параллельные запросы видят либо старую, либо новую
+        self.files = files
+        self.hashed_files = hashed_files
+        self.fingerprints = fingerprints
+        self._signature = signature
+        inline = sum(1 for f in files.values() if f.content is not None)
+        self.logger.info(
+            "Static files indexed: %d files (%d in memory) from %s", len(files), inline, self.static_dir
+        )
+
+    @staticmethod
+    def _fingerprinted_path(rel_path: str, entry: StaticFile) -> str:
+        root, ext = posixpath.splitext(rel_path)
+        return f'{root}.{entry.fingerprint}{ext}'
+
+    def asset_url(self, rel_path: str) -> str:
+        """Возвращает URL статического файла с хешем содержимого в имени.
+
+        Предназначен для использования в шаблонах: ``{{ asset_url('css/style.css') }}``.
+        Для неизвестного файла возвращается обычный URL без отпечатка.
+        """
+        rel_path = rel_path.lstrip('/')
+        if self.auto_reload:
+            self._maybe_reload()
+        return self.static_url + self.fingerprints.get(rel_path, rel_path)
+
+    def _maybe_reload(self) -> None:
+        """Проверяет директорию на изменения не чаще reload_interval (без inotify)."""
+        now = time.monotonic()
+        if now - self._last_check < self.reload_interval:
+            return
+        self._last_check = now
+        if self._scan_signature() != self._signature:
+            self.logger.debug("Static directory changed, reindexing")
+            self.reload()
+
+    # ------------------------------------------------------------------
+    # WSGI
+    # ------------------------------------------------------------------
+
+    def __call__(self, environ, start_response):
+        found = self.lookup(environ.get('PATH_INFO', ''), environ.get('REQUEST_METHOD', 'GET'))
+        if found is not None:
+            entry, cache_control = found
+            return self.serve_static(entry, environ, start_response, cache_control)
         return self.app(environ, start_response)
 
-    def serve_static(self, file_path, start_response):
-        """Отдает статический файл клиенту."""
+    def lookup(self, path: str, method: str) -> tuple[StaticFile, str | None] | None:
+        """Запись статического файла для запроса и её Cache-Control (None — значение по умолчанию).
+
+        Returns:
+            None, если запрос не к статике или файла нет
+        """
+        if not path.startswith(self.static_url) or method not in ('GET', 'HEAD'):
+            return None
+        if self.auto_reload:
+            self._maybe_reload()
+        rel_path = path[len(self.static_url):].lstrip('/')
+        entry = self.files.get(rel_path)
+        if entry is not None:
+            return entry, None
+        entry = self.hashed_files.get(rel_path)
+        if entry is not None:
+            return entry, IMMUTABLE_CACHE_CONTROL
+        return None
+
+    @staticmethod
+    def _base_headers(entry: StaticFile, cache_control: str) -> list[tuple[str, str]]:
+        return [
+            ('ETag', entry.etag),
+            ('Last-Modified', entry.last_modified),
+            ('Cache-Control', cache_control),
+            ('Accept-Ranges', 'bytes'),
+        ]
+
+    @staticmethod
+    def _etag_matches(header: str, etag: str) -> bool:
+        """Сравнение по If-None-Match (слабое сравнение, RFC 9110 §13.1.2)."""
+        if header.strip() == '*':
+            return True
+        return any(tag.strip().removeprefix('W/') == etag for tag in header.split(','))
+
+    def _is_not_modified(self, entry: StaticFile, environ) -> bool:
+        if_none_match = environ.get('HTTP_IF_NONE_MATCH')
+        if if_none_match is not None:
+            # If-None-Match имеет приоритет над If-Modified-Since
+            return self._etag_matches(if_none_match, entry.etag)
+
+        if_modified_since = environ.get('HTTP_IF_MODIFIED_SINCE')
+        if if_modified_since:
+            try:
+                since = parsedate_to_datetime(if_modified_since)
+            except (TypeError, ValueError):
+                return False
+            return entry.mtime <= since.timestamp()
+        return False
+
+    @staticmethod
+    def _parse_range(header: str, size: int) -> tuple[int, int] | None:
+        """Разбирает одиночный диапазон ``bytes=start-end``.
+
+        Returns:
+            (start, end) включительно; None, если заголовок не поддерживается
+            (например, несколько диапазонов) и нужно отдать файл целиком.
+
+        Raises:
+            ValueError: если диапазон синтаксически верен, но неудовлетворим.
+        """
+        unit, _, spec = header.partition('=')
+        if unit.strip().lower() != 'bytes' or ',' in spec:
+            return None
+        start_str, sep, end_str = spec.strip().partition('-')
+        if not sep or not (start_str + end_str).isdigit():
+            return None
+        if not start_str:
+            # Суффиксный диапазон: последние N байт
+            length = int(end_str)
+            if length <= 0:
+                raise ValueError("Empty suffix range")
+            return max(0, size - length), size - 1
+        start = int(start_str)
+        end = int(end_str) if end_str else size - 1
+        if start >= size or start > end:
+            raise ValueError("Unsatisfiable range")
+        return start, min(end, size - 1)
+
+    def serve_static(self, entry: StaticFile, environ, start_response, cache_control: str | None = None):
+        """Отдает статический файл клиенту с учётом условных и Range-запросов."""
+        headers = self._base_headers(entry, cache_control or self.cache_control)
+
+        if self._is_not_modified(entry, environ):
+            start_response('304 Not Modified', headers)
+            return []
+
+        status = '200 OK'
+        start, end = 0, entry.size - 1
+        range_header = environ.get('HTTP_RANGE')
+        if_range = environ.get('HTTP_IF_RANGE')
+        range_applies = not if_range or if_range.strip() in (entry.etag, entry.last_modified)
+        if range_header and entry.size and range_applies:
+            try:
+                byte_range = self._parse_range(range_header, entry.size)
+            except ValueError:
+                headers.append(('Content-Range', f'bytes */{entry.size}'))
+                start_response('416 Range Not Satisfiable', headers)
+                return []
+            if byte_range is not None:
+                start, end = byte_range
+                status = '206 Partial Content'
+                headers.append(('Content-Range', f'bytes {start}-{end}/{entry.size}'))
+
+        length = end - start + 1 if entry.size else 0
+        headers.append(('Content-Type', entry.content_type))
+        headers.append(('Content-Length', str(length)))
+
+        if environ.get('REQUEST_METHOD') == 'HEAD':
+            start_response(status, headers)
+            return []
+
+        if entry.content is not None:
+            start_response(status, headers)
+            if length == entry.size:
+                return [entry.content]
+            return [entry.content[start:end + 1]]
+
         try:
-            content_type, _ = mimetypes.guess_type(file_path)
-            if not content_type:
-                content_type = 'application/octet-stream'
-
-            file_size = os.path.getsize(file_path)
-
-            headers = [
-                ('Content-Type', content_type),
-                ('Content-Length', str(file_size)),
-                ('Cache-Control', 'public, max-age=86400'),
-            ]
-            start_response('200 OK', headers)
-
-            with open(file_path, 'rb') as f:
-                return [f.read()]
-
-        except Exception as e:
-            logging.getLogger("infrastructure.middleware.static").error(
-                f"Ошибка при отдаче файла {file_path}: {e}"
-            )
+            f = open(entry.path, 'rb')  # noqa: SIM115 — закрывается file_wrapper'ом или генератором
+        except OSError as e:
+            self.logger.error("Ошибка при отдаче файла %s: %s", entry.path, e)
             start_response('500 Internal Server Error', [('Content-Type', 'text/plain')])
             return [b'Internal Server Error']
+
+        start_response(status, headers)
+        file_wrapper = environ.get('wsgi.file_wrapper')
+        if status == '200 OK' and file_wrapper is not None:
+            return file_wrapper(f, BLOCK_SIZE)
+        return _iter_file(f, start, length)
+
+
+class AsgiStaticMiddleware(StaticMiddleware):
+    """ASGI-двойник ``StaticMiddleware``: тот же индекс, условные и Range-запросы.
+
+    Файлы из памяти отправляются сразу, крупные читаются с диска блоками в пуле
+    потоков, не блокируя цикл событий.
+    """
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        found = self.lookup(scope["path"], scope["method"])
+        if found is None:
+            return await self.app(scope, receive, send)
+
+        entry, cache_control = found
+        response = {}
+
+        def start_response(status, headers, exc_info=None):
+            response["status"] = status
+            response["headers"] = headers
+
+        body = self.serve_static(entry, build_environ(scope), start_response, cache_control)
+        await send_response(
+            send, response["status"], response["headers"], body, blocking=entry.content is None
+        )
+
+
+def _iter_file(f, start: int, length: int) -> Iterator[bytes]:
+    """Потоково читает ``length`` байт файла начиная со смещения ``start``."""
+    try:
+        f.seek(start)
+        remaining = length
+        while remaining > 0:
+            block = f.read(min(BLOCK_SIZE, remaining))
+            if not block:
+                break
+            remaining -= len(block)
+            yield block
+    finally:
+        f.close()
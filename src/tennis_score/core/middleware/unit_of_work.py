@@ -0,0 +1,49 @@
+"""Middleware единицы работы: одна сессия и транзакция БД на HTTP-запрос."""
+
+import logging
+
+from ..unit_of_work import RequestUnitOfWork, current_unit_of_work
+
+
+class UnitOfWorkMiddleware:
+    """WSGI middleware, открывающий единицу работы на время обработки запроса.
+
+    Транзакция фиксируется, если приложение вернуло ответ без исключения и со
+    статусом ниже 500, иначе откатывается. Фиксация выполняется до отдачи тела
+    ответа, поэтому ошибка фиксации превращается в ошибку запроса. Состояние в
+    памяти процесса, зависящее от исхода транзакции, меняется в обработчиках
+    ``after_commit``/``after_rollback`` единицы работы — уже после фиксации или отката.
+    """
+
+    def __init__(self, app):
+        """Инициализирует объект класса.
+
+        Args:
+            app: WSGI приложение, которое будет обернуто
+        """
+        self.app = app
+        self.logger = logging.getLogger("core.uow")
+
+    def __call__(self, environ, start_response):
+        uow = RequestUnitOfWork()
+        token = current_unit_of_work.set(uow)
+        status_holder = []
+
+        def custom_start_response(status, headers, exc_info=None):
+            status_holder.append(status)
+            return start_response(status, headers, exc_info)
+
+        commit = False
+        try:
+            result = self.app(environ, custom_start_response)
+            commit = not (status_holder and status_holder[-1].startswith("5"))
+            return result
+        finally:
+            current_unit_of_work.reset(token)
+            if uow.opened and (not commit or uow.failed):
+                self.logger.debug(
+                    "Rolling back request transaction: %s %s",
+                    environ.get("REQUEST_METHOD", "GET"),
+                    environ.get("PATH_INFO", "/"),
+                )
+            uow.finish(commit)
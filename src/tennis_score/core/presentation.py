@@ -22,7 +22,7 @@ class ViewDataHandler:
         player1_name = getattr(match_dto, 'player1', '') if match_dto else ''
         player2_name = getattr(match_dto, 'player2', '') if match_dto else ''
 
-        self.logger.debug(f"Display names: {player1_name} vs {player2_name}")
+        self.logger.debug("Display names: %s vs %s", player1_name, player2_name)
         error_message = None
         if match_dto and match_dto.score:
             if isinstance(match_dto.score, dict):
@@ -33,7 +33,7 @@ class ViewDataHandler:
                     "tiebreak_points": match_dto.score.get("tiebreak_points", [0, 0]),  # Добавлено
                     "is_tiebreak": match_dto.score.get("is_tiebreak", False),  # Добавлено
                 }
-                self.logger.debug(f"Parsed score data: {score_data}")
+                self.logger.debug("Parsed score data: %s", score_data)
             else:
                 # score — это красивая строка (для истории)
                 score_data = match_dto.score
@@ -52,5 +52,5 @@ class ViewDataHandler:
         if match_dto and getattr(match_dto, 'winner', None):
             context['winner'] = match_dto.winner
             
-        self.logger.debug(f"Final context for template: {context}") 
+        self.logger.debug("Final context for template: %s", context) 
         return context
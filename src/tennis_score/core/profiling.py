@@ -0,0 +1,141 @@
+"""Сэмплирующий профилировщик запросов: стеки потоков, выполняющих выбранные запросы.
+
+Фоновый поток раз в ``interval`` секунд снимает стеки (``sys._current_frames``) только
+тех потоков, которые сейчас выполняют профилируемый запрос, и считает одинаковые
+стеки по маршрутам. Код запроса не инструментируется, поэтому накладные расходы
+ограничены частотой снимков, а остальные запросы не замедляются. Пока профилируемых
+запросов нет, поток спит.
+
+cProfile здесь не подходит: начиная с Python 3.12 он один на интерпретатор и
+учитывает вызовы всех потоков, так что одновременные запросы смешались бы.
+
+Результат выгружается в формате collapsed stacks (``стек;вызов;вызов число``), который
+читают ``flamegraph.pl``, speedscope и inferno.
+"""
+
+import logging
+import os
+import sys
+import threading
+import time
+from collections import Counter, defaultdict
+
+logger = logging.getLogger("core.profiling")
+
+
+def collapse_stack(frame, max_depth: int = 128) -> str:
+    """Стек кадра ``frame`` от корня к листу: ``модуль:функция`` через ``;``."""
+    names = []
+    while frame is not None and len(names) < max_depth:
+        names.append(f"{frame.f_globals.get('__name__', '?')}:{frame.f_code.co_qualname}")
+        frame = frame.f_back
+    return ";".join(reversed(names))
+
+
+def route_file_name(route: str) -> str:
+    """Имя файла для метки маршрута: ``/match-score`` -> ``match-score``, ``/`` -> ``index``."""
+    return route.strip("/").replace("/", "_") or "index"
+
+
+class StackSampler:
+    """Снимает стеки потоков, зарегистрированных через ``begin``, и агрегирует их по маршрутам."""
+
+    def __init__(self, interval: float = 0.005, max_depth: int = 128):
+        """Инициализирует объект класса.
+
+        Args:
+            interval: Секунд между снимками стеков
+            max_depth: Сколько кадров от листа сохранять в стеке
+        """
+        self.interval = interval
+        self.max_depth = max_depth
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._active: dict[int, str] = {}
+        self._thread: threading.Thread | None = None
+        self.stacks: defaultdict[str, Counter] = defaultdict(Counter)
+        self.requests: Counter = Counter()
+
+    def begin(self, route: str) -> int:
+        """Начинает профилировать текущий поток как запрос маршрута ``route``."""
+        ident = threading.get_ident()
+        with self._lock:
+            self._active[ident] = route
+            self.requests[route] += 1
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+                self._thread.start()
+            self._wakeup.set()
+        return ident
+
+    def end(self, ident: int) -> None:
+        """Перестаёт профилировать поток ``ident``."""
+        with self._lock:
+            self._active.pop(ident, None)
+
+    def _run(self) -> None:
+        while True:
+            self._wakeup.wait()
+            with self._lock:
+                if not self._active:
+                    self._wakeup.clear()
+                    continue
+            time.sleep(self.interval)
+            with self._lock:
+                active = dict(self._active)
+            frames = sys._current_frames()
+            samples = [
+                (route, collapse_stack(frames[ident], self.max_depth))
+                for ident, route in active.items()
+                if ident in frames
+            ]
+            del frames
+            with self._lock:
+                for route, stack in samples:
+                    self.stacks[route][stack] += 1
+
+    def snapshot(self) -> dict[str, Counter]:
+        """Копия накопленных стеков по маршрутам."""
+        with self._lock:
+            return {route: Counter(stacks) for route, stacks in self.stacks.items()}
+
+    def reset(self) -> None:
+        """Забывает накопленные стеки и счётчики запросов."""
+        with self._lock:
+            self.stacks.clear()
+            self.requests.clear()
+
+    def summary(self, top: int = 5) -> dict[str, dict]:
+        """Сводка по маршрутам: запросов, снимков и самые частые листовые функции."""
+        with self._lock:
+            requests = dict(self.requests)
+        summary = {}
+        for route, stacks in self.snapshot().items():
+            total = sum(stacks.values())
+            leaves: Counter = Counter()
+            for stack, count in stacks.items():
+                leaves[stack.rsplit(";", 1)[-1]] += count
+            summary[route] = {
+                "requests": requests.get(route, 0),
+                "samples": total,
+                "top_self": [
+                    {"function": name, "samples": count, "share": round(count / total, 3)}
+                    for name, count in leaves.most_common(top)
+                ],
+            }
+        return summary
+
+    def dump(self, directory: str) -> list[str]:
+        """Записывает стеки каждого маршрута в ``<маршрут>.<pid>.collapsed``; возвращает пути файлов."""
+        os.makedirs(directory, exist_ok=True)
+        paths = []
+        for route, stacks in self.snapshot().items():
+            path = os.path.join(directory, f"{route_file_name(route)}.{os.getpid()}.collapsed")
+            tmp_path = path + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                for stack, count in stacks.most_common():
+                    f.write(f"{stack} {count}\n")
+            os.replace(tmp_path, path)
+            paths.append(path)
+        logger.info("Стеки профилировщика записаны: %s", ", ".join(paths) or "нет данных")
+        return paths
@@ -0,0 +1,87 @@
+"""Учёт SQL-запросов: метрики, журнал медленных запросов и привязка к HTTP-запросу.
+
+События движка SQLAlchemy пишут каждый выполненный оператор в ``RequestQueries``
+текущего HTTP-запроса, который ``QueryTrackingMiddleware`` кладёт в contextvar.
+Повторы одного и того же оператора в рамках запроса (N+1) видны по
+``RequestQueries.repeated``.
+"""
+
+import logging
+import os
+import time
+from collections import Counter
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+
+from sqlalchemy import event
+
+from .metrics import DB_QUERIES, DB_QUERY_DURATION, DB_SLOW_QUERIES
+
+logger = logging.getLogger("core.sql")
+
+# Порог медленного запроса, в секундах
+SLOW_QUERY_THRESHOLD = float(os.getenv("SLOW_QUERY_THRESHOLD", "0.1"))
+
+
+@dataclass
+class RequestQueries:
+    """SQL-статистика одного HTTP-запроса."""
+
+    count: int = 0
+    total_time: float = 0.0
+    statements: Counter = field(default_factory=Counter)
+    slow: list[tuple[str, float]] = field(default_factory=list)
+
+    def record(self, statement: str, elapsed: float, slow: bool) -> None:
+        self.count += 1
+        self.total_time += elapsed
+        self.statements[statement] += 1
+        if slow:
+            self.slow.append((statement, elapsed))
+
+    def repeated(self, threshold: int) -> list[tuple[str, int]]:
+        """Операторы, выполненные ``threshold`` и более раз — кандидаты в N+1."""
+        return [(stmt, n) for stmt, n in self.statements.most_common() if n >= threshold]
+
+
+current_request_queries: ContextVar[RequestQueries | None] = ContextVar(
+    "current_request_queries", default=None
+)
+
+
+def one_line_sql(statement: str, limit: int = 300) -> str:
+    """Сворачивает SQL в одну строку для журнала."""
+    statement = " ".join(statement.split())
+    return statement if len(statement) <= limit else statement[:limit] + "..."
+
+
+def instrument_engine(engine) -> None:
+    """Подключает к движку SQLAlchemy метрики, журнал медленных запросов и учёт по запросам."""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["query_start_time"].pop()
+        DB_QUERIES.inc()
+        DB_QUERY_DURATION.observe(elapsed)
+
+        slow = elapsed >= SLOW_QUERY_THRESHOLD
+        if slow:
+            DB_SLOW_QUERIES.inc()
+            logger.warning("Slow query (%.4fs): %s", elapsed, one_line_sql(statement))
+
+        stats = current_request_queries.get()
+        if stats is not None:
+            stats.record(statement, elapsed, slow)
+
+    @event.listens_for(engine, "handle_error")
+    def _handle_error(context):
+        # Для упавшего оператора after_cursor_execute не вызывается: время снимается здесь,
+        # иначе стек растёт, а замеры следующих операторов берут чужие отметки
+        if context.connection is not None:
+            starts = context.connection.info.get("query_start_time")
+            if starts:
+                starts.pop()
@@ -0,0 +1,185 @@
+"""Ограниченный разбор тела POST-запроса: формы и JSON.
+
+Тело читается порциями не больше ``MAX_BODY_SIZE`` байт, поля формы разбираются
+по мере чтения и считаются, поэтому слишком большой запрос отклоняется до того,
+как будет прочитан целиком. Результат имеет тот же вид, что у ``parse_qs``:
+``{имя: [значение, ...]}``.
+
+Параметры берутся из переменных окружения:
+
+- ``MAX_BODY_SIZE`` — максимальный размер тела в байтах (по умолчанию 64 КиБ);
+- ``MAX_FORM_FIELDS`` — максимальное число полей формы или ключей JSON (по умолчанию 100).
+"""
+
+import json
+import os
+from urllib.parse import unquote_to_bytes
+
+MAX_BODY_SIZE = int(os.getenv("MAX_BODY_SIZE", str(64 * 1024)))
+MAX_FORM_FIELDS = int(os.getenv("MAX_FORM_FIELDS", "100"))
+
+# Размер порции чтения из wsgi.input
+CHUNK_SIZE = 8192
+
+FORM_CONTENT_TYPE = "application/x-www-form-urlencoded"
+JSON_CONTENT_TYPE = "application/json"
+
+
+class RequestBodyError(ValueError):
+    """Тело запроса не может быть принято; ``status`` — HTTP-статус ответа."""
+
+    status = "400 Bad Request"
+
+
+class BodyTooLargeError(RequestBodyError):
+    """Тело больше допустимого размера."""
+
+    status = "413 Payload Too Large"
+
+
+class TooManyFieldsError(RequestBodyError):
+    """Полей формы или ключей JSON больше допустимого."""
+
+    status = "413 Payload Too Large"
+
+
+class UnsupportedMediaTypeError(RequestBodyError):
+    """Content-Type, который не умеем разбирать."""
+
+    status = "415 Unsupported Media Type"
+
+
+def _content_length(environ: dict) -> int | None:
+    value = environ.get("CONTENT_LENGTH")
+    if not value:
+        return None
+    try:
+        length = int(value)
+    except ValueError:
+        raise RequestBodyError(f"Invalid Content-Length: {value!r}") from None
+    if length < 0:
+        raise RequestBodyError(f"Invalid Content-Length: {value!r}")
+    return length
+
+
+def iter_body(environ: dict, max_size: int = MAX_BODY_SIZE):
+    """Отдаёт тело запроса порциями, не позволяя прочитать больше ``max_size`` байт.
+
+    Объявленный ``Content-Length`` больше лимита отклоняется сразу, без чтения.
+    Без ``Content-Length`` тело читается только если сервер гарантирует конец
+    потока (``wsgi.input_terminated``), иначе считается пустым.
+
+    Raises:
+        BodyTooLargeError: Тело больше ``max_size``
+    """
+    stream = environ.get("wsgi.input")
+    length = _content_length(environ)
+    if stream is None:
+        return
+    if length is None:
+        if not environ.get("wsgi.input_terminated"):
+            return
+        remaining = max_size + 1  # Читаем на байт больше лимита, чтобы заметить превышение
+    elif length > max_size:
+        raise BodyTooLargeError(f"Request body of {length} bytes exceeds {max_size}")
+    else:
+        remaining = length
+
+    total = 0
+    while remaining > 0:
+        chunk = stream.read(min(CHUNK_SIZE, remaining))
+        if not chunk:
+            break
+        total += len(chunk)
+        if total > max_size:
+            raise BodyTooLargeError(f"Request body exceeds {max_size} bytes")
+        remaining -= len(chunk)
+        yield chunk
+
+
+def _decode(component: bytes) -> str:
+    return unquote_to_bytes(component.replace(b"+", b" ")).decode("utf-8", errors="replace")
+
+
+def parse_form(chunks, max_fields: int = MAX_FORM_FIELDS) -> dict[str, list[str]]:
+    """Разбирает ``application/x-www-form-urlencoded`` по мере поступления порций.
+
+    Поведение совпадает с ``parse_qs``: пары без ``=`` и с пустым значением пропускаются.
+
+    Raises:
+        TooManyFieldsError: Полей больше ``max_fields``
+    """
+    params: dict[str, list[str]] = {}
+    fields = 0
+    tail = b""
+
+    def add(pair: bytes) -> None:
+        nonlocal fields
+        if not pair:
+            return
+        fields += 1
+        if fields > max_fields:
+            raise TooManyFieldsError(f"More than {max_fields} form fields")
+        name, sep, value = pair.partition(b"=")
+        if sep and value:
+            params.setdefault(_decode(name), []).append(_decode(value))
+
+    for chunk in chunks:
+        pairs = (tail + chunk).split(b"&")
+        tail = pairs.pop()  # Последняя пара может продолжиться в следующей порции
+        for pair in pairs:
+            add(pair)
+    add(tail)
+    return params
+
+
+def parse_json(body: bytes, max_fields: int = MAX_FORM_FIELDS) -> dict[str, list[str]]:
+    """Разбирает JSON-объект и приводит его к виду ``parse_qs``.
+
+    Скаляры становятся строками, списки — списками строк; ``null`` пропускается.
+
+    Raises:
+        RequestBodyError: Тело не является JSON-объектом
+        TooManyFieldsError: Ключей больше ``max_fields``
+    """
+    try:
+        data = json.loads(body) if body else {}  # json.loads принимает bytes без отдельного decode
+    except ValueError as e:
+        raise RequestBodyError(f"Invalid JSON: {e}") from None
+    if not isinstance(data, dict):
+        raise RequestBodyError("JSON body must be an object")
+    if len(data) > max_fields:
+        raise TooManyFieldsError(f"More than {max_fields} JSON fields")
+
+    params: dict[str, list[str]] = {}
+    for name, value in data.items():
+        items = value if isinstance(value, list) else [value]
+        values = [_to_str(item) for item in items if item is not None]
+        if values:
+            params[name] = values
+    return params
+
+
+def _to_str(value) -> str:
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, ensure_ascii=False)
+    return str(value)
+
+
+def parse_body(
+    environ: dict, max_size: int = MAX_BODY_SIZE, max_fields: int = MAX_FORM_FIELDS
+) -> dict[str, list[str]]:
+    """Разбирает тело POST-запроса по ``Content-Type`` (форма или JSON).
+
+    Raises:
+        RequestBodyError: Тело отклонено; статус ответа — в ``status`` исключения
+    """
+    content_type = environ.get("CONTENT_TYPE", "").split(";", 1)[0].strip().lower()
+    chunks = iter_body(environ, max_size)
+    if content_type in ("", FORM_CONTENT_TYPE):
+        return parse_form(chunks, max_fields)
+    if content_type == JSON_CONTENT_TYPE or content_type.endswith("+json"):
+        return parse_json(b"".join(chunks), max_fields)
+    raise UnsupportedMediaTypeError(f"Unsupported Content-Type: {content_type}")
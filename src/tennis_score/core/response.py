@@ -2,7 +2,11 @@
 
 
 def make_response(
-    template: str | None, context: dict | None = None, status: str = "200 OK"
+    template: str | None,
+    context: dict | None = None,
+    status: str = "200 OK",
+    stream: bool = False,
+    cache_key: tuple | None = None,
 ) -> dict:
     """Создание ответа для рендеринга в шаблонизаторе.
 
@@ -10,6 +14,9 @@ def make_response(
         template: Имя HTML-шаблона для рендеринга
         context: Данные для шаблона
         status: HTTP-статус ответа
+        stream: Отдавать страницу частями по мере рендеринга (для больших списков)
+        cache_key: Ключ кеша отрендеренной страницы; страница с тем же ключом
+            отдаётся из кеша без рендеринга, поэтому в ключ входит версия данных
 
     Returns:
         Словарь, содержащий информацию для рендеринга HTTP-ответа
@@ -19,4 +26,6 @@ def make_response(
         "context": context or {},
         "status": status,
         "headers": [("Content-Type", "text/html; charset=utf-8")],
+        "stream": stream,
+        "cache_key": cache_key,
     }
@@ -9,50 +9,79 @@ from ..controllers.match_controllers import (
     new_match_controller,
     reset_match_controller,
 )
+from ..controllers.player_controllers import (
+    head_to_head_controller,
+    leaderboard_controller,
+    player_profile_controller,
+)
 from ..controllers.view_controllers import TemplateViewController
+from .request_body import MAX_BODY_SIZE, MAX_FORM_FIELDS, RequestBodyError, parse_body
 from .response import make_response
 
 
 class RoutesHandler:
     """Обработчик маршрутов для управления роутингом HTTP запросов."""
-    def __init__(self, routing_table: dict):
+    def __init__(
+        self, routing_table: dict, max_body_size: int = MAX_BODY_SIZE, max_fields: int = MAX_FORM_FIELDS
+    ):
         self.routing_table = routing_table
+        self.max_body_size = max_body_size
+        self.max_fields = max_fields
         self.logger = logging.getLogger("core.routing")
 
     def route_request(self, path: str, method: str, environ: dict | None = None) -> dict:
-        self.logger.info(f"route_request: {method} {path}")
+        self.logger.info("route_request: %s %s", method, path)
         
         # Отделяем путь от строки запроса для точного совпадения маршрута
         actual_path = path.split('?')[0]
         
         controller = self.routing_table.get((actual_path, method))
         if not controller:
-            self.logger.warning(f"Route not found: {method} {actual_path}")
+            self.logger.warning("Route not found: %s %s", method, actual_path)
             return make_response(None, {}, status="404 Not Found")
-        self.logger.debug(f"Matched route: {method} {actual_path}")
+        self.logger.debug("Matched route: %s %s", method, actual_path)
         
+        try:
+            params = self.request_params(method, environ)
+        except RequestBodyError as e:
+            return self.body_error_response(actual_path, e)
+        return controller(params)
+
+    def request_params(self, method: str, environ: dict | None) -> dict:
+        """Параметры запроса: тело POST или строка запроса GET в виде ``parse_qs``.
+
+        Raises:
+            RequestBodyError: Тело POST отклонено
+        """
         params = {}
         if environ: # environ должен быть всегда доступен
             if method == "POST":
                 params = self._parse_post_data(environ)
-                self.logger.debug(f"POST params: {params}")
+                self.logger.debug("POST params: %s", params)
             elif method == "GET":
                 query_string = environ.get("QUERY_STRING", "")
                 if query_string:
                     params = parse_qs(query_string)
-                    self.logger.debug(f"GET query params: {params}")
-        
-        return controller(params)
+                    self.logger.debug("GET query params: %s", params)
+        return params
 
-    @staticmethod
-    def _parse_post_data(environ: dict) -> dict:
-        try:
-            size = int(environ.get("CONTENT_LENGTH", 0))
-        except (ValueError, TypeError):
-            size = 0
-        body = environ.get("wsgi.input")
-        body_bytes = body.read(size) if body and size > 0 else b""
-        return parse_qs(body_bytes.decode("utf-8"))
+    def body_error_response(self, path: str, error: RequestBodyError) -> dict:
+        """Страница ошибки для отклонённого тела запроса (статус — из исключения)."""
+        self.logger.warning("Rejected POST %s body: %s", path, error)
+        return make_response(
+            "error.html",
+            {
+                "error_title": "Некорректный запрос",
+                "error_message": "Не удалось принять данные формы.",
+                "error_details": str(error),
+                "show_new_match_button": True,
+            },
+            status=error.status,
+        )
+
+    def _parse_post_data(self, environ: dict) -> dict:
+        """Разбирает тело POST (форма или JSON) с ограничением размера и числа полей."""
+        return parse_body(environ, self.max_body_size, self.max_fields)
 
 # Определение маршрутов приложения
 ROUTING_TABLE: dict[tuple[str, str], callable] = {
@@ -63,6 +92,9 @@ ROUTING_TABLE: dict[tuple[str, str], callable] = {
     ("/match-score", "POST"): match_score_controller,
     ("/matches", "GET"): list_matches_controller,
     ("/reset-match", "POST"): reset_match_controller,
+    ("/player", "GET"): player_profile_controller,
+    ("/head-to-head", "GET"): head_to_head_controller,
+    ("/leaderboard", "GET"): leaderboard_controller,
 }
 
 routes_handler = RoutesHandler(ROUTING_TABLE)
@@ -70,5 +102,5 @@ routes_handler = RoutesHandler(ROUTING_TABLE)
 def route_request(path: str, method: str, environ: dict | None = None) -> dict:
     """Маршрутизация HTTP запросов к соответствующим контроллерам."""
     logger = logging.getLogger("router")
-    logger.debug(f"Routing request: {method} {path}")
+    logger.debug("Routing request: %s %s", method, path)
     return routes_handler.route_request(path, method, environ)
@@ -0,0 +1,44 @@
+"""Замер времени запуска приложения по фазам."""
+
+import logging
+import time
+from contextlib import contextmanager
+
+from .metrics import STARTUP_PHASE_DURATION
+
+
+class StartupTimer:
+    """Накапливает длительность фаз запуска и выводит сводку в журнал.
+
+    Каждая фаза также публикуется на ``/metrics`` как ``tennis_startup_phase_seconds``.
+    """
+
+    def __init__(self):
+        self.logger = logging.getLogger("core.startup")
+        self.started = time.perf_counter()
+        self.phases: dict[str, float] = {}
+
+    @contextmanager
+    def phase(self, name: str):
+        """Замеряет блок как фазу запуска ``name``."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            self.phases[name] = elapsed
+            STARTUP_PHASE_DURATION.set_function(lambda value=elapsed: value, (name,))
+            self.logger.debug("Startup phase %s: %.1f ms", name, elapsed * 1000)
+
+    @property
+    def total(self) -> float:
+        """Время с создания таймера, в секундах."""
+        return time.perf_counter() - self.started
+
+    def report(self) -> None:
+        """Пишет в журнал итоговое время запуска с разбивкой по фазам."""
+        self.logger.info(
+            "Startup finished in %.1f ms (%s)",
+            self.total * 1000,
+            ", ".join(f"{name}: {elapsed * 1000:.1f} ms" for name, elapsed in self.phases.items()),
+        )
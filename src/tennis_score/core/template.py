@@ -2,20 +2,40 @@
 
 import logging
 import os
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Iterator
 
 from jinja2 import Environment, FileSystemLoader
 
+from .memory import MEMORY
+from .metrics import TEMPLATE_RENDER_DURATION
+
 
 class TemplateRenderer:
     """Класс для рендеринга HTML шаблонов с использованием Jinja2."""
 
-    def __init__(self, templates_dir=None):
+    def __init__(
+        self, templates_dir=None, stream_chunk_size: int | None = None, cache_size: int | None = None
+    ):
         """Инициализирует объект класса.
         
         Args:
             templates_dir: директория с шаблонами. Если None, используется ../templates
+            stream_chunk_size: Размер порции потокового рендеринга в символах;
+                по умолчанию ``TEMPLATE_STREAM_CHUNK_SIZE`` или 16384
+            cache_size: Сколько отрендеренных страниц хранит ``render_cached``;
+                по умолчанию ``TEMPLATE_CACHE_SIZE`` или 32
         """
         self.logger = logging.getLogger("core.template")
+        self.stream_chunk_size = stream_chunk_size or int(os.getenv("TEMPLATE_STREAM_CHUNK_SIZE", "16384"))
+        if cache_size is None:
+            cache_size = int(os.getenv("TEMPLATE_CACHE_SIZE", "32"))
+        self.cache_size = cache_size
+        self._cache: OrderedDict[tuple, bytes] = OrderedDict()
+        self._cache_lock = threading.Lock()
+        MEMORY.track("template_cache", lambda: self._cache)
         
         if templates_dir is None:
             # Определяем путь к шаблонам относительно текущего файла
@@ -24,7 +44,21 @@ class TemplateRenderer:
         
         self.templates_dir = templates_dir
         self.env = Environment(loader=FileSystemLoader(templates_dir))
-        self.logger.debug(f"Template renderer initialized with dir: {templates_dir}")
+        # Без StaticMiddleware asset_url отдаёт обычный URL; оркестратор подменяет его
+        # на версию с отпечатками содержимого
+        self.env.globals["asset_url"] = lambda path: "/static/" + path.lstrip("/")
+        self.logger.debug("Template renderer initialized with dir: %s", templates_dir)
+
+    def precompile(self) -> int:
+        """Заранее компилирует все HTML-шаблоны в кеш окружения Jinja.
+
+        Returns:
+            Число скомпилированных шаблонов
+        """
+        names = self.env.list_templates(extensions=["html"])
+        for name in names:
+            self.env.get_template(name)
+        return len(names)
 
     def render(self, template_name: str, context: dict = None) -> bytes:
         """Отрендерить шаблон с заданным контекстом.
@@ -39,12 +73,93 @@ class TemplateRenderer:
         if context is None:
             context = {}
             
-        self.logger.debug(f"Rendering template: {template_name}")
+        self.logger.debug("Rendering template: %s", template_name)
         template = self.env.get_template(template_name)
         
         try:
-            html_content = template.render(**context)
+            with TEMPLATE_RENDER_DURATION.time((template_name,)):
+                html_content = template.render(**context)
             return html_content.encode()
         except Exception as e:
-            self.logger.error(f"Error rendering template {template_name}: {e}")
+            self.logger.error("Error rendering template %s: %s", template_name, e)
+            return f"<h1>Error rendering template</h1><p>{str(e)}</p>".encode()
+
+    def render_cached(self, template_name: str, context: dict | None, key: tuple) -> bytes:
+        """Рендерит шаблон один раз на ``key`` и отдаёт страницу из LRU-кеша.
+
+        Ключ должен однозначно определять содержимое страницы (например, включать
+        версию данных): устаревшие ключи просто вытесняются. Страницы с ошибкой
+        рендеринга не кешируются.
+
+        Args:
+            template_name: Имя шаблона для рендеринга (относительно templates_dir)
+            context: Контекст для шаблона (переменные)
+            key: Ключ кеша
+
+        Returns:
+            Байтовая строка с HTML-кодом
+        """
+        key = (template_name, *key)
+        with self._cache_lock:
+            content = self._cache.get(key)
+            if content is not None:
+                self._cache.move_to_end(key)
+                return content
+
+        try:
+            with TEMPLATE_RENDER_DURATION.time((template_name,)):
+                content = self.env.get_template(template_name).render(**(context or {})).encode()
+        except Exception as e:
+            self.logger.error("Error rendering template %s: %s", template_name, e)
             return f"<h1>Error rendering template</h1><p>{str(e)}</p>".encode()
+
+        if self.cache_size > 0:
+            with self._cache_lock:
+                self._cache[key] = content
+                while len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+        return content
+
+    def stream(self, template_name: str, context: dict | None = None) -> Iterator[bytes]:
+        """Рендерит шаблон по частям через ``Template.generate``.
+
+        Фрагменты накапливаются до ``stream_chunk_size`` символов и отдаются
+        закодированными в UTF-8, так что первый байт уходит клиенту до окончания
+        рендеринга, а в памяти держится одна порция, а не вся страница.
+
+        Шаблон загружается сразу, поэтому ошибка его поиска возникает до отправки
+        заголовков. Ошибка посреди рендеринга пишется в журнал и пробрасывается
+        серверу: статус уже отправлен, и сервер обрывает соединение, так что клиент
+        не примет обрезанную страницу за полную.
+
+        Args:
+            template_name: Имя шаблона для рендеринга (относительно templates_dir)
+            context: Контекст для шаблона (переменные)
+
+        Returns:
+            Итератор байтовых порций HTML
+        """
+        self.logger.debug("Streaming template: %s", template_name)
+        template = self.env.get_template(template_name)
+        return self._generate(template, template_name, context or {})
+
+    def _generate(self, template, template_name: str, context: dict) -> Iterator[bytes]:
+        chunk_size = self.stream_chunk_size
+        buffer: list[str] = []
+        buffered = 0
+        start = time.perf_counter()
+        try:
+            for fragment in template.generate(**context):
+                buffer.append(fragment)
+                buffered += len(fragment)
+                if buffered >= chunk_size:
+                    yield "".join(buffer).encode()
+                    buffer.clear()
+                    buffered = 0
+            if buffer:
+                yield "".join(buffer).encode()
+        except Exception as e:
+            self.logger.error("Error streaming template %s: %s", template_name, e)
+            raise
+        finally:
+            TEMPLATE_RENDER_DURATION.observe(time.perf_counter() - start, (template_name,))
@@ -0,0 +1,147 @@
+"""Единица работы на HTTP-запрос: одна сессия SQLAlchemy и одна транзакция.
+
+``UnitOfWorkMiddleware`` кладёт в contextvar пустую ``RequestUnitOfWork``;
+сессия открывается только при первом обращении репозитория к БД, после чего все
+методы репозитория в этом запросе работают в ней. В конце запроса транзакция
+фиксируется или откатывается один раз.
+
+Изменения состояния в памяти процесса, которые должны совпасть с исходом транзакции
+(удаление сохранённого матча из активных, возврат очков в буфер), регистрируются
+через ``after_commit`` и ``after_rollback`` и выполняются после фиксации или отката.
+
+Вне HTTP-запроса (прогрев, бенчмарки, скрипты) contextvar пуст, и репозиторий
+открывает сессию на каждую операцию, как раньше. Операции, которые должны
+выполниться в одной транзакции и вне запроса, оборачиваются в ``unit_of_work()``.
+
+Асинхронный репозиторий выполняет синхронные методы в сессии ``AsyncSession.run_sync``
+и кладёт в contextvar ``SessionUnitOfWork`` — единицу работы поверх этой сессии.
+"""
+
+import logging
+from collections.abc import Callable
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+logger = logging.getLogger("core.uow")
+
+
+class RequestUnitOfWork:
+    """Сессии БД одного HTTP-запроса, открываемые лениво."""
+
+    def __init__(self):
+        self._sessions: dict[object, object] = {}
+        self._after_commit: list[Callable[[], None]] = []
+        self._after_rollback: list[Callable[[], None]] = []
+        self.failed = False
+
+    def session(self, session_factory):
+        """Сессия запроса для ``session_factory``; создаётся при первом вызове."""
+        session = self._sessions.get(session_factory)
+        if session is None:
+            session = self._sessions[session_factory] = session_factory()
+            logger.debug("Opened request-scoped DB session")
+        return session
+
+    @property
+    def opened(self) -> bool:
+        """Открыта ли в запросе хотя бы одна сессия."""
+        return bool(self._sessions)
+
+    def mark_failed(self) -> None:
+        """Помечает единицу работы как неудачную: в конце запроса будет откат."""
+        self.failed = True
+
+    def after_commit(self, callback: Callable[[], None]) -> None:
+        """Выполнит ``callback`` после успешной фиксации транзакции."""
+        self._after_commit.append(callback)
+
+    def after_rollback(self, callback: Callable[[], None]) -> None:
+        """Выполнит ``callback`` после отката транзакции (в том числе при ошибке фиксации)."""
+        self._after_rollback.append(callback)
+
+    def run_callbacks(self, committed: bool) -> None:
+        """Выполняет обработчики исхода транзакции и забывает все обработчики.
+
+        Ошибка обработчика пишется в журнал и не мешает остальным.
+        """
+        callbacks = self._after_commit if committed else self._after_rollback
+        self._after_commit, self._after_rollback = [], []
+        for callback in callbacks:
+            try:
+                callback()
+            except Exception:
+                logger.exception("Ошибка обработчика после %s", "фиксации" if committed else "отката")
+
+    def finish(self, commit: bool) -> None:
+        """Фиксирует (``commit=True`` и не было ошибок) или откатывает транзакции и закрывает сессии.
+
+        Затем выполняет обработчики ``after_commit`` или ``after_rollback``.
+
+        Raises:
+            Exception: Ошибка фиксации; транзакция при этом откатывается
+        """
+        sessions, self._sessions = list(self._sessions.values()), {}
+        committed = False
+        try:
+            for session in sessions:
+                if commit and not self.failed:
+                    try:
+                        session.commit()
+                    except Exception:
+                        session.rollback()
+                        raise
+                else:
+                    session.rollback()
+            committed = commit and not self.failed
+        finally:
+            for session in sessions:
+                session.close()
+            self.run_callbacks(committed)
+
+
+class SessionUnitOfWork(RequestUnitOfWork):
+    """Единица работы поверх уже открытой сессии; транзакцией управляет владелец сессии."""
+
+    def __init__(self, session):
+        super().__init__()
+        self._session = session
+
+    def session(self, session_factory):
+        """Открытая сессия владельца, независимо от ``session_factory``."""
+        return self._session
+
+    @property
+    def opened(self) -> bool:
+        """Сессия всегда открыта."""
+        return True
+
+    def finish(self, commit: bool) -> None:
+        """Ничего не делает: фиксация, закрытие и ``run_callbacks`` остаются за владельцем сессии."""
+
+
+current_unit_of_work: ContextVar[RequestUnitOfWork | None] = ContextVar(
+    "current_unit_of_work", default=None
+)
+
+
+@contextmanager
+def unit_of_work():
+    """Единица работы для блока кода: одна сессия и транзакция на все обращения к БД.
+
+    Внутри HTTP-запроса (или другой единицы работы) присоединяется к текущей, и
+    фиксация остаётся за её владельцем.
+    """
+    uow = current_unit_of_work.get()
+    if uow is not None:
+        yield uow
+        return
+
+    uow = RequestUnitOfWork()
+    token = current_unit_of_work.set(uow)
+    completed = False
+    try:
+        yield uow
+        completed = True
+    finally:
+        current_unit_of_work.reset(token)
+        uow.finish(completed)
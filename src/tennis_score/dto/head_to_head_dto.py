@@ -0,0 +1,18 @@
+"""DTO итогов личных встреч двух игроков."""
+from dataclasses import dataclass, field
+
+from .match_dto import MatchDTO
+
+
+@dataclass
+class HeadToHeadDTO:
+    """DTO для передачи итогов встреч пары игроков в порядке запроса."""
+
+    player1: str
+    player2: str
+    matches_played: int = 0
+    player1_wins: int = 0
+    player2_wins: int = 0
+    player1_sets: int = 0
+    player2_sets: int = 0
+    recent: list[MatchDTO] = field(default_factory=list)  # Последние матчи пары, новые первыми
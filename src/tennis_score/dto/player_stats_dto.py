@@ -0,0 +1,24 @@
+"""DTO статистики игрока."""
+from dataclasses import dataclass
+
+
+@dataclass
+class PlayerStatsDTO:
+    """DTO для передачи накопленной статистики игрока."""
+
+    player_id: int
+    name: str
+    matches_played: int = 0
+    wins: int = 0
+    losses: int = 0
+    sets_won: int = 0
+    sets_lost: int = 0
+    games_won: int = 0
+    games_lost: int = 0
+    tiebreaks_won: int = 0
+    tiebreaks_lost: int = 0
+
+    @property
+    def win_rate(self) -> float:
+        """Доля выигранных матчей, от 0 до 1."""
+        return self.wins / self.matches_played if self.matches_played else 0.0
@@ -0,0 +1,14 @@
+"""DTO строки таблицы рейтинга."""
+from dataclasses import dataclass
+
+
+@dataclass
+class RatingDTO:
+    """DTO для передачи места игрока в таблице рейтинга."""
+
+    rank: int
+    name: str
+    rating: float
+    rated_matches: int
+    wins: int
+    losses: int
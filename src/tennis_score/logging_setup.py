@@ -0,0 +1,181 @@
+"""Настройка неблокирующего логирования приложения.
+
+Рабочие потоки только кладут записи в очередь (``QueueHandler``), а форматирование
+и запись в консоль/файл выполняет фоновый поток ``QueueListener``. DEBUG-записи
+дополнительно прореживаются (1 из N) и ограничиваются по частоте, чтобы отладочный
+поток сообщений не съедал время запросов под нагрузкой.
+
+Параметры берутся из аргументов или переменных окружения:
+
+- ``LOG_LEVEL`` — уровень корневого логгера (по умолчанию DEBUG);
+- ``LOG_FILE`` — файл журнала (по умолчанию ``tennis_app.log``, пустая строка отключает);
+- ``LOG_DEBUG_SAMPLE`` — пропускать каждую N-ю DEBUG-запись логгера (по умолчанию 1 — все);
+- ``LOG_DEBUG_RATE_LIMIT`` — максимум DEBUG-записей в секунду (по умолчанию 200, 0 — без лимита).
+"""
+
+import atexit
+import itertools
+import logging
+import os
+import queue
+import sys
+import threading
+import time
+from collections import defaultdict
+from logging.handlers import QueueHandler, QueueListener
+
+LOG_FORMAT = '[%(asctime)s] %(levelname)-8s %(name)-25s %(funcName)-25s %(message)s'
+LOG_DATEFMT = '%Y-%m-%d %H:%M:%S'
+
+# Аргументы этих типов неизменяемы, поэтому сообщение можно собрать позже в фоновом потоке
+_IMMUTABLE_ARG_TYPES = (str, int, float, bool, bytes, type(None))
+
+# Переопределения уровней; логгеры слоёв приложения (controller, service, repository,
+# core, presentation) наследуют уровень корневого логгера
+LOGGER_LEVELS = {
+    "wsgi": logging.WARNING,  # Только предупреждения и ошибки
+    "waitress": logging.INFO,
+}
+
+# Текущий фоновый поток записи логов
+_listener: QueueListener | None = None
+
+
+class DebugSamplingFilter(logging.Filter):
+    """Прореживает DEBUG-записи: 1 из ``sample_every`` на логгер и не более ``max_per_second``.
+
+    Записи уровня INFO и выше проходят всегда.
+    """
+
+    def __init__(self, sample_every: int = 1, max_per_second: float = 0):
+        super().__init__()
+        self.sample_every = max(1, sample_every)
+        self.max_per_second = max_per_second
+        self.dropped = 0
+        self._counters: defaultdict[str, itertools.count] = defaultdict(itertools.count)
+        self._tokens = float(max_per_second)
+        self._last_refill = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _take_token(self) -> bool:
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                float(self.max_per_second), self._tokens + (now - self._last_refill) * self.max_per_second
+            )
+            self._last_refill = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return True
+            return False
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno > logging.DEBUG:
+            return True
+        if self.sample_every > 1 and next(self._counters[record.name]) % self.sample_every:
+            self.dropped += 1
+            return False
+        if self.max_per_second and not self._take_token():
+            self.dropped += 1
+            return False
+        return True
+
+
+class DeferredQueueHandler(QueueHandler):
+    """QueueHandler, откладывающий форматирование сообщения до фонового потока.
+
+    Стандартный ``QueueHandler.prepare`` собирает строку в вызывающем потоке.
+    Здесь это делается только если среди аргументов есть изменяемые объекты,
+    состояние которых к моменту записи может поменяться.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        args = record.args
+        if args and (
+            isinstance(args, dict) or not all(isinstance(a, _IMMUTABLE_ARG_TYPES) for a in args)
+        ):
+            record.msg = record.getMessage()
+            record.args = None
+        return record
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.getenv(name, default))
+    except ValueError:
+        return default
+
+
+def setup_logging(
+    level: str | int | None = None,
+    log_file: str | None = None,
+    debug_sample_every: int | None = None,
+    debug_rate_limit: float | None = None,
+) -> QueueListener:
+    """Настраивает корневой логгер на запись через очередь и фоновый поток.
+
+    Повторный вызов заменяет предыдущую конфигурацию.
+
+    Args:
+        level: Уровень корневого логгера
+        log_file: Путь к файлу журнала; пустая строка отключает запись в файл
+        debug_sample_every: Пропускать каждую N-ю DEBUG-запись каждого логгера
+        debug_rate_limit: Максимум DEBUG-записей в секунду (0 — без ограничения)
+
+    Returns:
+        Запущенный QueueListener; останавливается автоматически при выходе.
+    """
+    global _listener
+    if level is None:
+        level = os.getenv("LOG_LEVEL", "DEBUG").upper()
+    if log_file is None:
+        log_file = os.getenv("LOG_FILE", "tennis_app.log")
+    if debug_sample_every is None:
+        debug_sample_every = _env_int("LOG_DEBUG_SAMPLE", 1)
+    if debug_rate_limit is None:
+        debug_rate_limit = _env_int("LOG_DEBUG_RATE_LIMIT", 200)
+
+    formatter = logging.Formatter(LOG_FORMAT, LOG_DATEFMT)
+    handlers: list[logging.Handler] = [logging.StreamHandler(sys.stdout)]  # Вывод в консоль
+    if log_file:
+        handlers.append(logging.FileHandler(log_file, encoding="utf-8"))  # Дополнительно запись в файл
+    for handler in handlers:
+        handler.setFormatter(formatter)
+
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    queue_handler = DeferredQueueHandler(log_queue)
+    queue_handler.addFilter(DebugSamplingFilter(debug_sample_every, debug_rate_limit))
+
+    root_logger = logging.getLogger()
+    stop_logging()
+    for handler in root_logger.handlers[:]:
+        root_logger.removeHandler(handler)
+        handler.close()
+    root_logger.addHandler(queue_handler)
+    root_logger.setLevel(level)
+
+    for logger_name, logger_level in LOGGER_LEVELS.items():
+        logging.getLogger(logger_name).setLevel(logger_level)
+
+    listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    listener.start()
+    _listener = listener
+    return listener
+
+
+def log_queue() -> queue.SimpleQueue | None:
+    """Очередь записей, ещё не записанных фоновым потоком; None, пока логирование не настроено."""
+    return _listener.queue if _listener is not None else None
+
+
+def stop_logging() -> None:
+    """Останавливает фоновый поток, дописывая оставшиеся в очереди записи."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+
+
+atexit.register(stop_logging)
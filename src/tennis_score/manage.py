@@ -0,0 +1,81 @@
+"""Служебные команды приложения.
+
+Запуск::
+
+    python -m src.tennis_score.manage backfill-set-scores
+    python -m src.tennis_score.manage backfill-player-stats
+    python -m src.tennis_score.manage backfill-head-to-head
+    python -m src.tennis_score.manage recompute-ratings
+"""
+
+import argparse
+import logging
+import sys
+
+from .logging_setup import setup_logging, stop_logging
+from .services.match_service import get_match_service
+
+logger = logging.getLogger("manage")
+
+
+def backfill_set_scores(args: argparse.Namespace) -> int:
+    """Заполняет ``match_sets`` по ``score_str`` матчей, сохранённых до появления таблицы."""
+    filled, skipped = get_match_service().repository.backfill_set_scores(args.batch_size)
+    logger.info("match_sets: заполнено матчей %d, счёт не разобран у %d", filled, skipped)
+    return 0
+
+
+def backfill_player_stats(args: argparse.Namespace) -> int:
+    """Пересчитывает таблицу ``player_stats`` по истории матчей (дозаполняя ``match_sets``)."""
+    players, matches, skipped = get_match_service().repository.rebuild_player_stats(args.batch_size)
+    logger.info("player_stats: игроков %d, матчей %d, счёт не разобран у %d", players, matches, skipped)
+    return 0
+
+
+def backfill_head_to_head(args: argparse.Namespace) -> int:
+    """Пересчитывает таблицу ``head_to_head`` по истории матчей."""
+    pairs = get_match_service().repository.rebuild_head_to_head(args.batch_size)
+    logger.info("head_to_head: пар %d", pairs)
+    return 0
+
+
+def recompute_ratings(args: argparse.Namespace) -> int:
+    """Пересчитывает таблицу ``player_ratings`` по истории матчей (например, после смены ELO_K_FACTOR)."""
+    players, matches = get_match_service().repository.recompute_ratings(args.batch_size)
+    logger.info("player_ratings: игроков %d, матчей %d", players, matches)
+    return 0
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Разбирает аргументы командной строки и выполняет команду."""
+    parser = argparse.ArgumentParser(
+        prog="python -m src.tennis_score.manage", description=__doc__.splitlines()[0]
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    sets = commands.add_parser("backfill-set-scores", help="заполнить match_sets по score_str")
+    sets.add_argument("--batch-size", type=int, default=1000, help="матчей в одном пакете вставки")
+    sets.set_defaults(handler=backfill_set_scores)
+
+    stats = commands.add_parser("backfill-player-stats", help="пересчитать player_stats по истории матчей")
+    stats.add_argument("--batch-size", type=int, default=1000, help="матчей в одном пакете вставки")
+    stats.set_defaults(handler=backfill_player_stats)
+
+    h2h = commands.add_parser("backfill-head-to-head", help="пересчитать head_to_head по истории матчей")
+    h2h.add_argument("--batch-size", type=int, default=1000, help="матчей в одном пакете вставки")
+    h2h.set_defaults(handler=backfill_head_to_head)
+
+    ratings = commands.add_parser("recompute-ratings", help="пересчитать player_ratings по истории матчей")
+    ratings.add_argument("--batch-size", type=int, default=1000, help="матчей в одной порции чтения")
+    ratings.set_defaults(handler=recompute_ratings)
+
+    args = parser.parse_args(argv)
+    setup_logging(log_file="")
+    try:
+        return args.handler(args)
+    finally:
+        stop_logging()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,4 +1,5 @@
 """Модель матча в теннисном приложении."""
+import re
 import uuid
 
 from .player import Player
@@ -15,6 +16,7 @@ class Match:
         is_tiebreak (bool): Флаг тай-брейка.
         winner (int | None): ID победителя (Player.id).
         id (int | None): ID матча в базе данных.
+        points_played (int): Число разыгранных очков — номер последнего очка в журнале.
         _player1_id (int | None): ID первого игрока из базы (PlayerORM.id).
         _player2_id (int | None): ID второго игрока из базы (PlayerORM.id).
     """
@@ -40,6 +42,35 @@ class Match:
         self.id: int | None = None
         # История: (игры_игрока1, игры_игрока2, очки_тайбрейка_игрока1 | None, очки_тайбрейка_игрока2 | None)
         self.set_scores_history: list[tuple[int, int, int | None, int | None]] = []
+        self.points_played: int = 0
+
+    def to_state(self) -> dict:
+        """Состояние матча в виде JSON-совместимого словаря (общее хранилище активных матчей)."""
+        return {
+            "uuid": self.match_uid,
+            "players": [self.player_one_name, self.player_two_name],
+            "player_ids": [self._player1_id, self._player2_id],
+            "scores": {player: dict(score) for player, score in self.scores.items()},
+            "is_tiebreak": self.is_tiebreak,
+            "winner": self.winner,
+            "id": self.id,
+            "set_scores_history": [list(set_score) for set_score in self.set_scores_history],
+            "points_played": self.points_played,
+        }
+
+    @classmethod
+    def from_state(cls, state: dict) -> "Match":
+        """Восстанавливает матч из словаря ``to_state``."""
+        match = cls(*state["players"])
+        match.match_uid = state["uuid"]
+        match.set_player_ids(*state["player_ids"])
+        match.scores = state["scores"]
+        match.is_tiebreak = state["is_tiebreak"]
+        match.winner = state["winner"]
+        match.id = state["id"]
+        match.set_scores_history = [tuple(set_score) for set_score in state["set_scores_history"]]
+        match.points_played = state["points_played"]
+        return match
 
     @property
     def player_one_name(self) -> str:
@@ -150,4 +181,38 @@ class Match:
             player2=self.player_two_name,
             winner=winner_name,
             score=self.get_final_score_str(),
-        )
\ No newline at end of file
+        )
+
+
+# Сет в строке итогового счёта: "6-4" или "7-6(7-2)" — очки тай-брейка победителя сета первыми
+_SET_SCORE_RE = re.compile(r"^(\d+)-(\d+)(?:\((\d+)-(\d+)\))?$")
+
+
+def parse_final_score_str(score: str) -> list[tuple[int, int, int | None, int | None]]:
+    """Разбирает строку ``Match.get_final_score_str`` обратно в историю сетов.
+
+    Args:
+        score: Итоговый счёт, например ``"6-4, 6-7(7-5), 7-6(7-2)"``
+
+    Returns:
+        Список ``(игры_игрока1, игры_игрока2, тай-брейк_игрока1, тай-брейк_игрока2)``
+        в формате ``Match.set_scores_history``
+
+    Raises:
+        ValueError: Строка не в формате итогового счёта
+    """
+    history = []
+    for part in score.split(","):
+        set_match = _SET_SCORE_RE.match(part.strip())
+        if not set_match:
+            raise ValueError(f"Некорректный счёт сета: {part.strip()!r}")
+        p1_games, p2_games = int(set_match[1]), int(set_match[2])
+        p1_tiebreak = p2_tiebreak = None
+        if set_match[3] is not None:
+            winner_points, loser_points = int(set_match[3]), int(set_match[4])
+            if p1_games > p2_games:
+                p1_tiebreak, p2_tiebreak = winner_points, loser_points
+            else:
+                p1_tiebreak, p2_tiebreak = loser_points, winner_points
+        history.append((p1_games, p2_games, p1_tiebreak, p2_tiebreak))
+    return history
@@ -1,6 +1,6 @@
 """ORM-модели для работы с базой данных теннисных матчей."""
 
-from sqlalchemy import Column, ForeignKey, Integer, String
+from sqlalchemy import JSON, Boolean, Column, DateTime, Float, ForeignKey, Index, Integer, String, Uuid
 from sqlalchemy.orm import declarative_base, relationship
 
 Base = declarative_base()
@@ -54,6 +54,108 @@ class MatchORM(Base):
         foreign_keys=[winner_id]
     )
 
+    sets = relationship(
+        "MatchSetORM",
+        order_by="MatchSetORM.set_number",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+    )
+
+    # Матчи пары игроков в любом порядке: два поиска по индексу вместо обхода истории
+    __table_args__ = (Index("ix_matches_player1_id_player2_id", "player1_id", "player2_id"),)
+
+
+class MatchSetORM(Base):
+    """Счёт одного сета завершённого матча; дублирует ``MatchORM.score_str`` в структурированном виде."""
+    __tablename__ = "match_sets"
+    match_id = Column(Integer, ForeignKey("matches.id", ondelete="CASCADE"), primary_key=True)
+    set_number = Column(Integer, primary_key=True)  # С единицы, в порядке розыгрыша
+
+    player1_games = Column(Integer, nullable=False)
+    player2_games = Column(Integer, nullable=False)
+    # Очки тай-брейка; NULL, если сет завершился без тай-брейка
+    player1_tiebreak = Column(Integer)
+    player2_tiebreak = Column(Integer)
+
+
+class PlayerStatsORM(Base):
+    """Накопленная статистика игрока; обновляется при сохранении каждого завершённого матча."""
+    __tablename__ = "player_stats"
+    player_id = Column(Integer, ForeignKey("players.id", ondelete="CASCADE"), primary_key=True)
+
+    matches_played = Column(Integer, nullable=False, default=0, server_default="0")
+    wins = Column(Integer, nullable=False, default=0, server_default="0")
+    losses = Column(Integer, nullable=False, default=0, server_default="0")
+    sets_won = Column(Integer, nullable=False, default=0, server_default="0")
+    sets_lost = Column(Integer, nullable=False, default=0, server_default="0")
+    games_won = Column(Integer, nullable=False, default=0, server_default="0")
+    games_lost = Column(Integer, nullable=False, default=0, server_default="0")
+    tiebreaks_won = Column(Integer, nullable=False, default=0, server_default="0")
+    tiebreaks_lost = Column(Integer, nullable=False, default=0, server_default="0")
+
+    player = relationship("PlayerORM")
+
+
+class MatchPointORM(Base):
+    """Одно разыгранное очко матча.
+
+    Запись компактна: UUID матча (16 байт в PostgreSQL), номер очка и бит
+    победителя. Строки появляются, пока матч идёт, до записи в ``matches``,
+    поэтому связь с матчем — по UUID, без внешнего ключа.
+    """
+    __tablename__ = "match_points"
+    match_uuid = Column(Uuid(as_uuid=False), primary_key=True)
+    seq = Column(Integer, primary_key=True)  # С единицы, в порядке розыгрыша
+    player2_won = Column(Boolean, nullable=False)  # False — очко первого игрока
+    scored_at = Column(DateTime(timezone=True), nullable=False)
+
+
+class HeadToHeadORM(Base):
+    """Итоги встреч пары игроков; обновляются при сохранении каждого завершённого матча.
+
+    Пара хранится один раз: ``player_low_id`` — меньший из двух ID.
+    """
+    __tablename__ = "head_to_head"
+    player_low_id = Column(Integer, ForeignKey("players.id", ondelete="CASCADE"), primary_key=True)
+    player_high_id = Column(Integer, ForeignKey("players.id", ondelete="CASCADE"), primary_key=True)
+
+    matches_played = Column(Integer, nullable=False, default=0, server_default="0")
+    low_wins = Column(Integer, nullable=False, default=0, server_default="0")
+    high_wins = Column(Integer, nullable=False, default=0, server_default="0")
+    low_sets_won = Column(Integer, nullable=False, default=0, server_default="0")
+    high_sets_won = Column(Integer, nullable=False, default=0, server_default="0")
+
+
+class PlayerRatingORM(Base):
+    """Текущий рейтинг игрока; обновляется в транзакции сохранения каждого завершённого матча."""
+    __tablename__ = "player_ratings"
+    player_id = Column(Integer, ForeignKey("players.id", ondelete="CASCADE"), primary_key=True)
+    rating = Column(Float, nullable=False, index=True)  # Индекс — для топа таблицы рейтинга
+    rated_matches = Column(Integer, nullable=False, default=0, server_default="0")
+
+    player = relationship("PlayerORM")
+
+
+class TableRevisionORM(Base):
+    """Номер изменения производной таблицы (``player_ratings``, ``player_stats``).
+
+    Увеличивается на 1 в транзакции, изменившей таблицу (рейтинги — каждым матчем с
+    победителем, обе таблицы — пересчётом по истории); номер входит в версию страниц,
+    построенных по таблице (см. ``OrmMatchRepository.ratings_version``).
+    """
+    __tablename__ = "table_revisions"
+    table_name = Column(String(64), primary_key=True)
+    revision = Column(Integer, nullable=False, default=0, server_default="0")
 
 
+class ActiveMatchORM(Base):
+    """Состояние идущего матча в общем хранилище (``ACTIVE_MATCH_STORE=db``).
 
+    Нужна, когда запросы одного матча обслуживают разные процессы (см. ``prefork``).
+    Строка удаляется в транзакции сохранения завершённого матча.
+    """
+    __tablename__ = "active_matches"
+    match_uuid = Column(Uuid(as_uuid=False), primary_key=True)
+    state = Column(JSON, nullable=False)  # Match.to_state()
+    created_at = Column(DateTime(timezone=True), nullable=False)
+    updated_at = Column(DateTime(timezone=True), nullable=False)
@@ -0,0 +1,38 @@
+"""Рейтинг игроков по системе Эло."""
+import os
+
+
+class EloRating:
+    """Формула рейтинга Эло с постоянным коэффициентом K.
+
+    Attributes:
+        k_factor (float): Максимальное изменение рейтинга за матч.
+        initial (float): Рейтинг нового игрока.
+        version (str): Идентификатор формулы; меняется вместе с параметрами, и по нему
+            сбрасываются закешированные таблицы рейтинга.
+    """
+
+    def __init__(self, k_factor: float = 32.0, initial: float = 1500.0):
+        self.k_factor = k_factor
+        self.initial = initial
+        self.version = f"elo-k{k_factor:g}-i{initial:g}"
+
+    @staticmethod
+    def expected(rating: float, opponent_rating: float) -> float:
+        """Ожидаемая доля побед игрока с рейтингом ``rating`` против ``opponent_rating``."""
+        return 1.0 / (1.0 + 10.0 ** ((opponent_rating - rating) / 400.0))
+
+    def update(self, rating1: float, rating2: float, player1_won: bool) -> tuple[float, float]:
+        """Новые рейтинги обоих игроков после матча.
+
+        Сумма рейтингов сохраняется: сколько очков получил победитель, столько потерял проигравший.
+        """
+        delta = self.k_factor * ((1.0 if player1_won else 0.0) - self.expected(rating1, rating2))
+        return rating1 + delta, rating2 - delta
+
+
+# Формула процесса; параметры — из переменных окружения ELO_K_FACTOR и ELO_INITIAL_RATING
+elo = EloRating(
+    k_factor=float(os.getenv("ELO_K_FACTOR", "32")),
+    initial=float(os.getenv("ELO_INITIAL_RATING", "1500")),
+)
@@ -0,0 +1,380 @@
+"""Многопроцессный запуск WSGI-приложения: мастер-процесс и воркеры waitress.
+
+Мастер открывает слушающий сокет и порождает воркеры через ``fork``; соединения
+с общего сокета между воркерами распределяет ядро, и каждый воркер обслуживает их
+своим пулом потоков waitress. Рендеринг шаблонов и подсчёт очков выполняются на
+нескольких ядрах, а не упираются в GIL одного процесса.
+
+Мастер не импортирует приложение: каждый воркер собирает его после ``fork``, поэтому
+перезагрузка подхватывает новый код, а соединения с БД не наследуются от мастера.
+
+Сигналы мастеру:
+
+- ``SIGTERM``, ``SIGINT`` — плавная остановка: воркеры перестают принимать соединения,
+  дообслуживают начатые запросы (не дольше ``GRACEFUL_TIMEOUT`` секунд) и завершаются;
+- ``SIGHUP`` — плавная перезагрузка: запускаются новые воркеры, старые плавно останавливаются.
+
+Воркер, обслуживший ``WORKER_MAX_REQUESTS`` запросов (плюс случайная добавка до
+``WORKER_MAX_REQUESTS_JITTER``, чтобы воркеры не перезапускались одновременно),
+плавно завершается, и мастер запускает вместо него новый: так ограничивается рост памяти.
+
+Запросы одного матча попадают в разные воркеры, поэтому при нескольких воркерах
+активные матчи хранятся в БД: ``ACTIVE_MATCH_STORE`` по умолчанию становится ``db``,
+а воркер с матчами или базой SQLite в памяти процесса не запускается, и мастер
+останавливается.
+
+Запуск::
+
+    python -m src.tennis_score.prefork --workers 4 --threads 8
+"""
+
+import argparse
+import dataclasses
+import logging
+import os
+import random
+import select
+import signal
+import socket
+import sys
+import threading
+import time
+from collections.abc import Callable
+
+from waitress import wasyncore
+from waitress.server import create_server
+
+from .logging_setup import LOG_DATEFMT, LOG_FORMAT, setup_logging
+from .server_config import ServerConfig, load_server_config
+
+logger = logging.getLogger("prefork")
+
+# Код выхода воркера, который не смог собрать приложение: перезапуск не поможет
+WORKER_BOOT_ERROR = 3
+
+# При остановке воркера соединение без запроса в обработке закрывается, если молчит дольше:
+# только что принятое соединение успевает прислать запрос и не получает сброс
+IDLE_CLOSE_DELAY = 0.5
+
+
+def create_wsgi_app(config: ServerConfig, workers: int):
+    """Собирает WSGI-приложение в воркере и публикует настройки сервера.
+
+    Raises:
+        ValueError: Воркеров несколько, а активные матчи не общие для процессов
+    """
+    from .core.app_orchestrator import AppOrchestrator
+    from .repositories.engine import pool_capacity
+    from .services.match_service import get_match_service
+
+    orchestrator = AppOrchestrator()
+    repository = get_match_service().repository
+    if workers > 1:
+        repository.check_multiprocess()
+    app = orchestrator.create_app()
+    config.report(db_pool_capacity=pool_capacity(repository.db_url), workers=workers)
+    return app
+
+
+class PreforkServer:
+    """Мастер-процесс: слушающий сокет, запуск, перезапуск и остановка воркеров."""
+
+    def __init__(
+        self,
+        app_factory: Callable[[], Callable],
+        config: ServerConfig | None = None,
+        workers: int = 1,
+        max_requests: int = 0,
+        max_requests_jitter: int = 0,
+        graceful_timeout: float = 30.0,
+    ):
+        """Инициализирует объект класса.
+
+        Args:
+            app_factory: Функция, собирающая WSGI-приложение (вызывается в каждом воркере)
+            config: Адрес, пул потоков и остальные настройки waitress каждого воркера
+            workers: Число процессов-воркеров
+            max_requests: Перезапускать воркер после стольких запросов (0 — не перезапускать)
+            max_requests_jitter: Случайная добавка к ``max_requests``, до
+            graceful_timeout: Сколько секунд воркер дообслуживает начатые запросы при остановке
+        """
+        if workers < 1:
+            raise ValueError("workers must be positive")
+        self.app_factory = app_factory
+        self.config = config or ServerConfig()
+        self.worker_count = workers
+        self.max_requests = max_requests
+        self.max_requests_jitter = max_requests_jitter
+        self.graceful_timeout = graceful_timeout
+        # PID воркера -> поколение; SIGHUP начинает новое поколение
+        self.workers: dict[int, int] = {}
+        self.generation = 0
+        self.listener: socket.socket | None = None
+        self._signals: list[int] = []
+        self._exit_code: int | None = None
+
+    def run(self) -> int:
+        """Запускает воркеры и управляет ими до остановки; возвращает код выхода мастера."""
+        self.listener = socket.create_server(
+            (self.config.host, self.config.port), backlog=self.config.backlog
+        )
+        self._wakeup_read, self._wakeup_write = os.pipe()
+        os.set_blocking(self._wakeup_read, False)
+        os.set_blocking(self._wakeup_write, False)
+        # Сигнал будит select в цикле мастера сразу, а не по таймауту
+        signal.set_wakeup_fd(self._wakeup_write)
+        for signum in (signal.SIGTERM, signal.SIGINT, signal.SIGHUP, signal.SIGCHLD):
+            signal.signal(signum, self._on_signal)
+        logger.info(
+            "Мастер %d слушает %s:%d: воркеров %d, потоков в воркере %d",
+            os.getpid(),
+            self.config.host,
+            self.config.port,
+            self.worker_count,
+            self.config.threads,
+        )
+
+        self._spawn_missing()
+        while True:
+            select.select([self._wakeup_read], [], [], 1.0)
+            self._drain_wakeup()
+            self._reap()
+            signals, self._signals = self._signals, []
+            for signum in signals:
+                if signum in (signal.SIGTERM, signal.SIGINT):
+                    logger.info("Получен %s: плавная остановка", signal.Signals(signum).name)
+                    self._stop()
+                    return 0
+                if signum == signal.SIGHUP:
+                    self._reload()
+            if self._exit_code is not None:
+                self._stop()
+                return self._exit_code
+            self._spawn_missing()
+
+    def _on_signal(self, signum, frame) -> None:
+        self._signals.append(signum)
+
+    def _drain_wakeup(self) -> None:
+        try:
+            while os.read(self._wakeup_read, 512):
+                pass
+        except BlockingIOError:
+            pass
+
+    def _spawn_missing(self) -> None:
+        """Дозапускает воркеры текущего поколения до заданного числа."""
+        current = sum(1 for generation in self.workers.values() if generation == self.generation)
+        for _ in range(self.worker_count - current):
+            self._spawn()
+
+    def _spawn(self) -> None:
+        pid = os.fork()
+        if pid:
+            self.workers[pid] = self.generation
+            logger.info("Запущен воркер %d (поколение %d)", pid, self.generation)
+            return
+
+        # Воркер: выход через sys.exit, чтобы выполнились обработчики atexit приложения
+        # (запись буфера очков, остановка потока логирования)
+        signal.set_wakeup_fd(-1)
+        os.close(self._wakeup_read)
+        os.close(self._wakeup_write)
+        for signum in (signal.SIGTERM, signal.SIGHUP, signal.SIGCHLD):
+            signal.signal(signum, signal.SIG_DFL)
+        # Ctrl+C получает вся группа процессов; остановкой воркеров управляет мастер
+        signal.signal(signal.SIGINT, signal.SIG_IGN)
+        sys.exit(Worker(self).run())
+
+    def _reap(self) -> None:
+        """Забирает статусы завершившихся воркеров."""
+        while True:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                return
+            if pid == 0:
+                return
+            self.workers.pop(pid, None)
+            code = os.waitstatus_to_exitcode(status)
+            if code == WORKER_BOOT_ERROR:
+                logger.error("Воркер %d не смог собрать приложение, мастер останавливается", pid)
+                self._exit_code = WORKER_BOOT_ERROR
+            elif code:
+                logger.warning("Воркер %d завершился с кодом %d", pid, code)
+            else:
+                logger.info("Воркер %d завершился", pid)
+
+    def _reload(self) -> None:
+        """Запускает новое поколение воркеров и плавно останавливает предыдущие."""
+        old = list(self.workers)
+        self.generation += 1
+        logger.info("Перезагрузка: поколение %d, останавливается воркеров %d", self.generation, len(old))
+        self._spawn_missing()
+        self._signal_workers(signal.SIGTERM, old)
+
+    def _stop(self) -> None:
+        """Плавно останавливает все воркеры; не успевшие за ``graceful_timeout`` завершаются принудительно."""
+        self._signal_workers(signal.SIGTERM, list(self.workers))
+        deadline = time.monotonic() + self.graceful_timeout + 1
+        while self.workers and time.monotonic() < deadline:
+            time.sleep(0.1)
+            self._reap()
+        if self.workers:
+            logger.warning("Воркеры не остановились вовремя, принудительно: %s", list(self.workers))
+            self._signal_workers(signal.SIGKILL, list(self.workers))
+            while self.workers:
+                time.sleep(0.1)
+                self._reap()
+        self.listener.close()
+        logger.info("Мастер %d остановлен", os.getpid())
+
+    def _signal_workers(self, signum: int, pids: list[int]) -> None:
+        for pid in pids:
+            try:
+                os.kill(pid, signum)
+            except ProcessLookupError:
+                self.workers.pop(pid, None)
+
+
+class Worker:
+    """Процесс-воркер: собирает приложение и обслуживает общий сокет waitress."""
+
+    def __init__(self, master: PreforkServer):
+        self.master = master
+        self.master_pid = os.getppid()
+        self.max_requests = master.max_requests
+        if self.max_requests and master.max_requests_jitter:
+            self.max_requests += random.randint(0, master.max_requests_jitter)
+        self.requests = 0
+        self._requests_lock = threading.Lock()
+        self._stop = threading.Event()
+        self.server = None
+
+    def run(self) -> int:
+        """Обслуживает запросы до сигнала остановки или лимита запросов; возвращает код выхода."""
+        # SIGTERM во время сборки приложения: воркер завершится, не приняв ни одного соединения
+        signal.signal(signal.SIGTERM, self._on_term)
+        # Поток записи логов запускается в воркере: потоки не переживают fork
+        setup_logging()
+        try:
+            app = self.master.app_factory()
+        except Exception:
+            logger.exception("Воркер %d не смог собрать приложение", os.getpid())
+            return WORKER_BOOT_ERROR
+
+        self.server = create_server(
+            self._counting(app), sockets=[self.master.listener], **self.master.config.server_kwargs()
+        )
+        logger.info("Воркер %d принимает соединения", os.getpid())
+
+        adj = self.server.adj
+        while not self._stop.is_set():
+            wasyncore.loop(
+                timeout=adj.asyncore_loop_timeout,
+                map=self.server._map,
+                use_poll=adj.asyncore_use_poll,
+                count=1,
+            )
+            if os.getppid() != self.master_pid:
+                logger.warning("Мастер %d завершился, воркер останавливается", self.master_pid)
+                break
+        self._drain()
+        return 0
+
+    def _counting(self, app):
+        """Считает запросы воркера и после ``max_requests`` начинает плавную остановку."""
+
+        def counting_app(environ, start_response):
+            with self._requests_lock:
+                self.requests += 1
+                limit_reached = self.max_requests > 0 and self.requests == self.max_requests
+            if limit_reached:
+                logger.info("Воркер %d обслужил %d запросов и будет перезапущен", os.getpid(), self.requests)
+                self._stop.set()
+                self.server.pull_trigger()
+            return app(environ, start_response)
+
+        return counting_app
+
+    def _on_term(self, signum, frame) -> None:
+        self._stop.set()
+        if self.server is not None:
+            self.server.pull_trigger()
+
+    def _drain(self) -> None:
+        """Перестаёт принимать соединения и дообслуживает начатые запросы."""
+        server = self.server
+        adj = server.adj
+        # Слушающий сокет убирается из цикла воркера; новые соединения принимают остальные воркеры
+        server.accepting = False
+        server.del_channel()
+        deadline = time.monotonic() + self.master.graceful_timeout
+        while server.active_channels and time.monotonic() < deadline:
+            # Простаивающие соединения keep-alive закрываются, не дожидаясь channel_timeout
+            server.maintenance(time.time() + adj.channel_timeout - IDLE_CLOSE_DELAY)
+            wasyncore.loop(timeout=0.1, map=server._map, use_poll=adj.asyncore_use_poll, count=1)
+        server.task_dispatcher.shutdown(timeout=max(0.0, deadline - time.monotonic()))
+        logger.info("Воркер %d остановлен, обслужено запросов: %d", os.getpid(), self.requests)
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Разбирает аргументы (по умолчанию — из переменных окружения) и запускает мастер.
+
+    ``--host``, ``--port``, ``--threads`` и ``--backlog`` переопределяют настройки
+    waitress из ``WEB_CONFIG`` и ``WEB_*`` (см. ``server_config``).
+    """
+    parser = argparse.ArgumentParser(
+        prog="python -m src.tennis_score.prefork", description=__doc__.splitlines()[0]
+    )
+    parser.add_argument("--host")
+    parser.add_argument("--port", type=int)
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=int(os.getenv("WEB_WORKERS", str(os.cpu_count() or 1))),
+        help="процессов-воркеров (по умолчанию — число ядер)",
+    )
+    parser.add_argument("--threads", type=int, help="потоков в воркере")
+    parser.add_argument(
+        "--max-requests",
+        type=int,
+        default=int(os.getenv("WORKER_MAX_REQUESTS", "0")),
+        help="перезапуск воркера после N запросов (0 — без перезапуска)",
+    )
+    parser.add_argument(
+        "--max-requests-jitter", type=int, default=int(os.getenv("WORKER_MAX_REQUESTS_JITTER", "0"))
+    )
+    parser.add_argument(
+        "--graceful-timeout",
+        type=float,
+        default=float(os.getenv("GRACEFUL_TIMEOUT", "30")),
+        help="секунд на завершение начатых запросов при остановке",
+    )
+    parser.add_argument("--backlog", type=int)
+    args = parser.parse_args(argv)
+    overrides = {
+        name: getattr(args, name)
+        for name in ("host", "port", "threads", "backlog")
+        if getattr(args, name) is not None
+    }
+
+    # Поток логирования не переживает fork: мастер пишет в консоль напрямую, воркеры — через очередь
+    logging.basicConfig(level=logging.INFO, format=LOG_FORMAT, datefmt=LOG_DATEFMT, stream=sys.stdout)
+    config = dataclasses.replace(load_server_config(), **overrides).validate()
+    if args.workers > 1:
+        os.environ.setdefault("ACTIVE_MATCH_STORE", "db")
+
+    server = PreforkServer(
+        lambda: create_wsgi_app(config, args.workers),
+        config,
+        workers=args.workers,
+        max_requests=args.max_requests,
+        max_requests_jitter=args.max_requests_jitter,
+        graceful_timeout=args.graceful_timeout,
+    )
+    return server.run()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,169 @@
+"""Хранилища активных (ещё не сохранённых в ``matches``) матчей.
+
+- ``memory`` (по умолчанию) — словарь в памяти процесса: матч изменяется на месте,
+  ``save`` ничего не делает. Подходит для одного процесса с любым числом потоков;
+- ``db`` — таблица ``active_matches``: состояние матча (``Match.to_state``) читается
+  и записывается в транзакции запроса. Нужна, когда запросы одного матча попадают в
+  разные процессы (``prefork`` с несколькими воркерами). ``get(..., for_update=True)``
+  блокирует строку матча до конца транзакции, поэтому очки одного матча
+  засчитываются по очереди и в разных процессах.
+
+Хранилище выбирается переменной окружения ``ACTIVE_MATCH_STORE``.
+"""
+
+import os
+from collections.abc import Callable
+from datetime import datetime, timezone
+
+from sqlalchemy import delete, func, select, update
+
+from ..core.memory import MEMORY
+from ..core.unit_of_work import current_unit_of_work
+from ..model.match import Match
+from ..model.orm_models import ActiveMatchORM
+from .engine import is_sqlite_memory
+
+
+class InMemoryActiveMatchStore:
+    """Активные матчи в словаре процесса."""
+
+    # Видны ли матчи другим процессам
+    shared = False
+
+    def __init__(self):
+        self._matches: dict[str, Match] = {}
+        MEMORY.track("active_matches", lambda: self._matches)
+
+    def add(self, match: Match) -> None:
+        self._matches[match.match_uid] = match
+
+    def get(self, match_uuid: str, for_update: bool = False) -> Match | None:
+        """Матч по UUID; изменения объекта сразу видны остальным потокам."""
+        return self._matches.get(match_uuid)
+
+    def save(self, match: Match) -> None:
+        """Ничего не делает: матч изменяется на месте."""
+
+    def remove(self, match_uuid: str) -> bool:
+        """Удаляет матч; False, если его не было.
+
+        Внутри единицы работы матч удаляется после фиксации её транзакции, как строка
+        общего хранилища: при откате он остаётся активным.
+        """
+        if match_uuid not in self._matches:
+            return False
+        uow = current_unit_of_work.get()
+        if uow is None:
+            self._matches.pop(match_uuid, None)
+        else:
+            uow.after_commit(lambda: self._matches.pop(match_uuid, None))
+        return True
+
+    def count(self) -> int:
+        return len(self._matches)
+
+    def values(self) -> list[Match]:
+        """Активные матчи в порядке создания."""
+        return list(self._matches.values())
+
+
+class DbActiveMatchStore:
+    """Активные матчи в таблице ``active_matches`` — общие для всех процессов с одной БД."""
+
+    shared = True
+
+    def __init__(self, get_session: Callable):
+        """Инициализирует объект класса.
+
+        Args:
+            get_session: Контекстный менеджер сессии репозитория (``_get_session``):
+                внутри запроса — сессия единицы работы, иначе отдельная сессия
+        """
+        self._get_session = get_session
+
+    def add(self, match: Match) -> None:
+        now = datetime.now(timezone.utc)
+        with self._get_session() as session:
+            session.add(
+                ActiveMatchORM(
+                    match_uuid=match.match_uid, state=match.to_state(), created_at=now, updated_at=now
+                )
+            )
+
+    def get(self, match_uuid: str, for_update: bool = False) -> Match | None:
+        """Копия матча из БД; изменения сохраняются через ``save``.
+
+        Args:
+            match_uuid: UUID матча
+            for_update: Заблокировать строку матча до конца транзакции. Блокировка
+                берётся записью (``UPDATE ... RETURNING``): в SQLite ``SELECT ... FOR UPDATE``
+                нет, а запись сразу захватывает блокировку базы
+        """
+        with self._get_session() as session:
+            if for_update:
+                statement = (
+                    update(ActiveMatchORM)
+                    .where(ActiveMatchORM.match_uuid == match_uuid)
+                    .values(updated_at=datetime.now(timezone.utc))
+                )
+                if session.get_bind().dialect.update_returning:
+                    state = session.execute(statement.returning(ActiveMatchORM.state)).scalar_one_or_none()
+                    return Match.from_state(state) if state is not None else None
+                session.execute(statement)
+            state = session.execute(
+                select(ActiveMatchORM.state).where(ActiveMatchORM.match_uuid == match_uuid)
+            ).scalar_one_or_none()
+        return Match.from_state(state) if state is not None else None
+
+    def save(self, match: Match) -> None:
+        """Записывает изменённое состояние матча."""
+        with self._get_session() as session:
+            session.execute(
+                update(ActiveMatchORM)
+                .where(ActiveMatchORM.match_uuid == match.match_uid)
+                .values(state=match.to_state(), updated_at=datetime.now(timezone.utc))
+            )
+
+    def remove(self, match_uuid: str) -> bool:
+        """Удаляет матч; False, если его не было."""
+        with self._get_session() as session:
+            result = session.execute(delete(ActiveMatchORM).where(ActiveMatchORM.match_uuid == match_uuid))
+        return result.rowcount > 0
+
+    def count(self) -> int:
+        with self._get_session() as session:
+            return session.execute(select(func.count()).select_from(ActiveMatchORM)).scalar_one()
+
+    def values(self) -> list[Match]:
+        """Активные матчи в порядке создания."""
+        with self._get_session() as session:
+            states = session.execute(
+                select(ActiveMatchORM.state).order_by(ActiveMatchORM.created_at)
+            ).scalars()
+            return [Match.from_state(state) for state in states]
+
+
+def create_active_match_store(get_session: Callable, kind: str | None = None):
+    """Хранилище активных матчей по ``kind`` или переменной ``ACTIVE_MATCH_STORE``.
+
+    Raises:
+        ValueError: Неизвестный вид хранилища
+    """
+    kind = kind or os.getenv("ACTIVE_MATCH_STORE", "memory")
+    if kind == "memory":
+        return InMemoryActiveMatchStore()
+    if kind == "db":
+        return DbActiveMatchStore(get_session)
+    raise ValueError(f"Unknown ACTIVE_MATCH_STORE '{kind}', expected 'memory' or 'db'")
+
+
+def check_multiprocess(store, db_url: str) -> None:
+    """Проверяет, что активные матчи будут общими для нескольких процессов.
+
+    Raises:
+        ValueError: Хранилище в памяти процесса или база SQLite в памяти
+    """
+    if not store.shared:
+        raise ValueError("Active matches are per-process; set ACTIVE_MATCH_STORE=db to run several workers")
+    if is_sqlite_memory(db_url):
+        raise ValueError("In-memory SQLite is per-process; use a database file or PostgreSQL for workers")
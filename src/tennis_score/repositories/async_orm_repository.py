@@ -0,0 +1,197 @@
+"""Асинхронный доступ к матчам и игрокам на SQLAlchemy asyncio (для ASGI).
+
+``AsyncOrmMatchRepository`` не дублирует запросы ``OrmMatchRepository``: синхронный
+метод выполняется через ``AsyncSession.run_sync`` в сессии асинхронного движка
+(asyncpg для PostgreSQL, aiosqlite для SQLite), и ожидание БД не занимает поток
+ОС — только корутину. Активные матчи и буфер очков остаются общими с синхронным
+репозиторием: WSGI- и ASGI-обработчики одного процесса видят одни и те же матчи.
+
+Каждый вызов выполняется в своей транзакции. URL берётся из ``ASYNC_DATABASE_URL``,
+иначе из URL синхронного репозитория с заменой драйвера. Нужны пакеты
+``sqlalchemy[asyncio]`` и драйвер: ``pip install -e .[async]``.
+"""
+
+import asyncio
+import logging
+import os
+from collections.abc import Callable
+
+from sqlalchemy import text
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from ..core.query_tracking import instrument_engine
+from ..core.unit_of_work import SessionUnitOfWork, current_unit_of_work
+from ..dto.head_to_head_dto import HeadToHeadDTO
+from ..dto.match_dto import MatchDTO
+from ..dto.player_stats_dto import PlayerStatsDTO
+from ..dto.rating_dto import RatingDTO
+from ..model.match import Match
+from .engine import is_sqlite_memory
+from .orm_repository import OrmMatchRepository
+
+logger = logging.getLogger("repository.async")
+
+# Асинхронный драйвер SQLAlchemy для каждой поддерживаемой СУБД
+ASYNC_DRIVERS = {"postgresql": "asyncpg", "sqlite": "aiosqlite"}
+
+
+def async_db_url(db_url: str) -> str:
+    """URL с асинхронным драйвером для той же базы.
+
+    Raises:
+        ValueError: СУБД без асинхронного драйвера или SQLite в памяти — такая база
+            принадлежит одному соединению синхронного движка и асинхронному не видна
+    """
+    url = make_url(db_url)
+    backend = url.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f"No async driver for database backend '{backend}'")
+    if is_sqlite_memory(db_url):
+        raise ValueError("In-memory SQLite is not shared with the async engine; use a database file")
+    return url.set(drivername=f"{backend}+{ASYNC_DRIVERS[backend]}").render_as_string(hide_password=False)
+
+
+def _call_in_session(session, uow: SessionUnitOfWork, operation: Callable, args: tuple):
+    """Выполняет синхронный метод репозитория в сессии ``run_sync`` (внутри greenlet)."""
+    token = current_unit_of_work.set(uow)
+    try:
+        return operation(*args)
+    finally:
+        current_unit_of_work.reset(token)
+
+
+class AsyncOrmMatchRepository:
+    """Асинхронные двойники методов ``OrmMatchRepository``, работающих с БД."""
+
+    def __init__(self, repository: OrmMatchRepository, db_url: str | None = None):
+        """Инициализирует объект класса.
+
+        Args:
+            repository: Синхронный репозиторий: его запросы, активные матчи и буфер очков
+            db_url: URL базы; по умолчанию ``ASYNC_DATABASE_URL`` или URL ``repository``
+        """
+        self.repository = repository
+        self.db_url = async_db_url(db_url or os.getenv("ASYNC_DATABASE_URL") or repository.db_url)
+        # Движок создаётся при первом обращении, как и синхронный
+        self._engine = None
+        self._session_factory = None
+
+    def _create_engine(self):
+        if self._engine is None:
+            engine = create_async_engine(self.db_url, echo=False)
+            instrument_engine(engine.sync_engine)
+            self._session_factory = async_sessionmaker(engine, expire_on_commit=False)
+            self._engine = engine
+            logger.debug(
+                "Создан асинхронный движок БД: %s", engine.url.render_as_string(hide_password=True)
+            )
+        return self._engine
+
+    @property
+    def engine(self):
+        """Асинхронный движок SQLAlchemy; создаётся при первом обращении."""
+        return self._engine if self._engine is not None else self._create_engine()
+
+    @property
+    def Session(self):  # noqa: N802 — как у синхронного репозитория
+        """Фабрика асинхронных сессий."""
+        if self._session_factory is None:
+            self._create_engine()
+        return self._session_factory
+
+    async def run(self, operation: Callable, *args):
+        """Выполняет синхронный метод репозитория в транзакции асинхронной сессии.
+
+        Транзакция фиксируется, если ``operation`` завершилась без исключения; после
+        фиксации или отката выполняются обработчики ``after_commit``/``after_rollback``.
+        """
+        async with self.Session() as session:
+            uow = SessionUnitOfWork(session)
+            try:
+                async with session.begin():
+                    result = await session.run_sync(_call_in_session, uow, operation, args)
+            except BaseException:
+                uow.run_callbacks(committed=False)
+                raise
+            uow.run_callbacks(committed=True)
+            return result
+
+    async def ping(self) -> None:
+        """Выполняет ``SELECT 1``; при недоступности БД бросает исключение."""
+        async with self.engine.connect() as connection:
+            await connection.execute(text("SELECT 1"))
+
+    async def dispose(self) -> None:
+        """Закрывает соединения пула асинхронного движка."""
+        if self._engine is not None:
+            await self._engine.dispose()
+
+    # Активные матчи хранятся в памяти процесса: эти операции не обращаются к БД
+
+    def get_active_match_by_uuid(self, uuid: str) -> Match | None:
+        """Получить активный матч по UUID из памяти."""
+        return self.repository.get_active_match_by_uuid(uuid)
+
+    def record_point(self, match_uuid: str, player: str) -> int:
+        """Добавляет очко в буфер журнала очков (без обращения к БД)."""
+        return self.repository.record_point(match_uuid, player)
+
+    async def get_or_create_player_by_name(self, name: str) -> int:
+        """Получить ID игрока по имени или создать, если не найден."""
+        return await self.run(self.repository.get_or_create_player_by_name, name)
+
+    async def save_finished_match(self, match: Match) -> MatchDTO:
+        """Сохранить завершённый матч вместе с остатком его журнала очков.
+
+        Очки матча забираются из буфера до транзакции: блокировка записи буфера не
+        удерживается, пока корутина ждёт БД. При ошибке очки возвращаются в буфер.
+        """
+        buffer = self.repository.point_buffer
+        rows = buffer.take(match.match_uid)
+        try:
+            saved = await self.run(self.repository.write_finished_match, match, rows)
+        except Exception:
+            buffer.requeue(rows)
+            raise
+        buffer.forget(match.match_uid)
+        self.repository.release_active_match(match.match_uid)
+        return saved
+
+    async def delete_match_points(self, match_uuid: str) -> None:
+        """Удаляет журнал очков матча (сброс счёта).
+
+        Удаление выполняется синхронным репозиторием в потоке пула: оно должно идти под
+        блокировкой записи буфера, а сброс счёта редок.
+        """
+        await asyncio.to_thread(self.repository.delete_match_points, match_uuid)
+
+    async def get_completed_match_by_uuid(self, match_uuid: str) -> dict | None:
+        """Получить завершённый матч из БД по UUID."""
+        return await self.run(self.repository.get_completed_match_by_uuid, match_uuid)
+
+    async def get_match_by_uuid_from_db(self, match_uuid: str) -> MatchDTO | None:
+        """Получить данные матча из БД по UUID."""
+        return await self.run(self.repository.get_match_by_uuid_from_db, match_uuid)
+
+    async def list_matches_paginated(
+        self, page: int = 1, per_page: int = 10, filter_query: str | None = None
+    ) -> tuple[list[MatchDTO], int]:
+        """Получить список матчей (активных и из БД) с пагинацией и фильтрацией."""
+        return await self.run(self.repository.list_matches_paginated, page, per_page, filter_query)
+
+    async def get_player_stats(self, name: str) -> PlayerStatsDTO | None:
+        """Получить накопленную статистику игрока по имени."""
+        return await self.run(self.repository.get_player_stats, name)
+
+    async def get_head_to_head(self, name1: str, name2: str) -> HeadToHeadDTO | None:
+        """Получить итоги личных встреч двух игроков."""
+        return await self.run(self.repository.get_head_to_head, name1, name2)
+
+    async def ratings_version(self) -> tuple[str, int]:
+        """Версия таблицы рейтинга (см. ``OrmMatchRepository.ratings_version``)."""
+        return await self.run(self.repository.ratings_version)
+
+    async def get_leaderboard(self, limit: int = 20) -> list[RatingDTO]:
+        """Первые ``limit`` игроков по рейтингу."""
+        return await self.run(self.repository.get_leaderboard, limit)
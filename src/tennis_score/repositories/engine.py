@@ -0,0 +1,159 @@
+"""Движок БД для поддерживаемых СУБД: PostgreSQL (основная) и SQLite (локальные прогоны и CI).
+
+Для SQLite:
+
+- ``sqlite://`` и ``sqlite:///:memory:`` — база в памяти процесса, которая живёт, пока
+  открыто её единственное соединение. Пул держит ровно одно соединение и выдаёт его
+  потокам (обработчикам запросов, фоновой записи очков) по очереди: пул по умолчанию
+  дал бы каждому потоку свою пустую базу, а ``StaticPool`` — одну транзакцию на все
+  потоки сразу, где фиксация или откат одного потока задевает чужие изменения;
+- ``sqlite:///путь.db`` — файл в режиме WAL: чтение не блокируется записью, запись
+  ждёт блокировку до ``SQLITE_BUSY_TIMEOUT`` секунд (по умолчанию 5);
+- включаются внешние ключи (``ON DELETE CASCADE`` работает как в PostgreSQL), а схема
+  создаётся по ``Base.metadata`` при создании движка — миграции не нужны.
+
+Размер пула PostgreSQL и файла SQLite задают ``DB_POOL_SIZE`` (постоянных соединений,
+по умолчанию 5) и ``DB_MAX_OVERFLOW`` (временных сверх них, по умолчанию 10). Потоков
+сервера больше, чем соединений, — лишние запросы ждут соединение до ``DB_POOL_TIMEOUT``
+секунд (см. ``server_config``).
+"""
+
+import logging
+import os
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.pool import QueuePool
+
+from ..model.orm_models import Base
+
+logger = logging.getLogger("repository.engine")
+
+# INSERT ... ON CONFLICT есть в PostgreSQL и SQLite (3.24+) с одинаковым API SQLAlchemy
+_UPSERT_INSERTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+
+def is_sqlite_memory(db_url: str) -> bool:
+    """Указывает ли URL на базу SQLite в памяти процесса."""
+    url = make_url(db_url)
+    return url.get_backend_name() == "sqlite" and (
+        url.database in (None, "", ":memory:") or url.query.get("mode") == "memory"
+    )
+
+
+def pool_options() -> dict[str, int | float]:
+    """Параметры ``QueuePool`` из переменных окружения."""
+    return {
+        "pool_size": int(os.getenv("DB_POOL_SIZE", "5")),
+        "max_overflow": int(os.getenv("DB_MAX_OVERFLOW", "10")),
+        "pool_timeout": float(os.getenv("DB_POOL_TIMEOUT", "30")),
+    }
+
+
+def pool_capacity(db_url: str) -> int:
+    """Сколько соединений одновременно может выдать пул движка для ``db_url``."""
+    if is_sqlite_memory(db_url):
+        return 1
+    options = pool_options()
+    return options["pool_size"] + options["max_overflow"]
+
+
+def _set_sqlite_pragmas(journal_mode: str | None):
+    def on_connect(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            cursor.execute("PRAGMA foreign_keys=ON")
+            if journal_mode:
+                cursor.execute(f"PRAGMA journal_mode={journal_mode}")
+                # В WAL синхронизация на каждой фиксации не нужна для целостности базы
+                cursor.execute("PRAGMA synchronous=NORMAL")
+        finally:
+            cursor.close()
+
+    return on_connect
+
+
+def create_db_engine(db_url: str) -> Engine:
+    """Создаёт движок с настройками пула и соединений под СУБД из URL.
+
+    Для SQLite дополнительно создаёт недостающие таблицы по ``Base.metadata``.
+    """
+    url = make_url(db_url)
+    if url.get_backend_name() != "sqlite":
+        return create_engine(db_url, echo=False, poolclass=QueuePool, **pool_options())
+
+    connect_args = {
+        # Соединения пула используются разными потоками, но не одновременно
+        "check_same_thread": False,
+        "timeout": float(os.getenv("SQLITE_BUSY_TIMEOUT", "5")),
+    }
+    if is_sqlite_memory(db_url):
+        engine = create_engine(
+            db_url,
+            echo=False,
+            connect_args=connect_args,
+            poolclass=QueuePool,
+            pool_size=1,
+            max_overflow=0,
+        )
+        event.listen(engine, "connect", _set_sqlite_pragmas(None))
+    else:
+        engine = create_engine(
+            db_url, echo=False, connect_args=connect_args, poolclass=QueuePool, **pool_options()
+        )
+        event.listen(engine, "connect", _set_sqlite_pragmas("WAL"))
+    Base.metadata.create_all(engine)
+    logger.debug("Схема SQLite создана по Base.metadata")
+    return engine
+
+
+def insert_missing(session, model, key: dict, values: dict) -> None:
+    """Создаёт строку ``model`` с первичным ключом ``key`` и значениями ``values``, если её нет.
+
+    В PostgreSQL и SQLite — ``INSERT ... ON CONFLICT DO NOTHING``: при одновременном
+    создании строки одна транзакция её вставляет, другая ждёт её фиксации и ничего не
+    меняет. В остальных СУБД — ``INSERT``, если строки не было.
+    """
+    dialect_insert = _UPSERT_INSERTS.get(session.get_bind().dialect.name)
+    if dialect_insert is not None:
+        statement = dialect_insert(model).values(**key, **values)
+        session.execute(statement.on_conflict_do_nothing(index_elements=list(key)))
+    elif session.get(model, tuple(key.values())) is None:
+        session.add(model(**key, **values))
+        session.flush()
+
+
+def upsert_increment(session, model, key: dict, increments: dict[str, int]) -> None:
+    """Прибавляет ``increments`` к строке ``model`` с первичным ключом ``key`` или создаёт её.
+
+    В PostgreSQL и SQLite — один ``INSERT ... ON CONFLICT DO UPDATE`` с приращением,
+    атомарный и при одновременном создании строки. В остальных СУБД — ``UPDATE`` с
+    приращением и ``INSERT``, если строки не было.
+    """
+    changed = {name: value for name, value in increments.items() if value}
+    dialect_insert = _UPSERT_INSERTS.get(session.get_bind().dialect.name)
+    if dialect_insert is not None:
+        statement = dialect_insert(model).values(**key, **increments)
+        if changed:
+            statement = statement.on_conflict_do_update(
+                index_elements=list(key),
+                set_={name: getattr(model, name) + statement.excluded[name] for name in changed},
+            )
+        else:
+            statement = statement.on_conflict_do_nothing(index_elements=list(key))
+        session.execute(statement)
+        return
+
+    updated = 0
+    if changed:
+        updated = (
+            session.query(model)
+            .filter_by(**key)
+            .update(
+                {getattr(model, name): getattr(model, name) + value for name, value in changed.items()},
+                synchronize_session=False,
+            )
+        )
+    if not updated and session.get(model, tuple(key.values())) is None:
+        session.add(model(**key, **increments))
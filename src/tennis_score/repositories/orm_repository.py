@@ -2,21 +2,124 @@
 import logging
 import math
 import os
+import threading
+from collections.abc import Iterator
 from contextlib import contextmanager
+from datetime import datetime, timezone
 
-from sqlalchemy import create_engine
+from sqlalchemy import and_, case, func, insert, or_, select, text, union_all
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import QueuePool
 
+from ..core.query_tracking import instrument_engine
+from ..core.unit_of_work import current_unit_of_work, unit_of_work
+from ..dto.head_to_head_dto import HeadToHeadDTO
 from ..dto.match_dto import MatchDTO
-from ..model.match import Match
-from ..model.orm_models import MatchORM, PlayerORM
+from ..dto.player_stats_dto import PlayerStatsDTO
+from ..dto.rating_dto import RatingDTO
+from ..model.match import Match, parse_final_score_str
+from ..model.orm_models import (
+    HeadToHeadORM,
+    MatchORM,
+    MatchPointORM,
+    MatchSetORM,
+    PlayerORM,
+    PlayerRatingORM,
+    PlayerStatsORM,
+    TableRevisionORM,
+)
+from ..model.rating import elo
+from .active_match_store import check_multiprocess, create_active_match_store
+from .engine import create_db_engine, insert_missing, upsert_increment
+from .point_buffer import PointBuffer
+
+# Логгер модуля; обработчики настраиваются точкой входа (см. core.logging_setup)
+logger = logging.getLogger("repository.orm")
+
+# Счётчики PlayerStatsORM, которые меняются при сохранении матча
+STATS_FIELDS = (
+    "matches_played",
+    "wins",
+    "losses",
+    "sets_won",
+    "sets_lost",
+    "games_won",
+    "games_lost",
+    "tiebreaks_won",
+    "tiebreaks_lost",
+)
+
+# Таблицы, из которых строится страница рейтинга: их изменение меняет ratings_version
+LEADERBOARD_TABLES = (PlayerRatingORM.__tablename__, PlayerStatsORM.__tablename__)
+
+
+def _bump_revision(session, model) -> None:
+    """Увеличивает номер изменения таблицы ``model`` в транзакции ``session`` (см. ``TableRevisionORM``)."""
+    upsert_increment(session, TableRevisionORM, {"table_name": model.__tablename__}, {"revision": 1})
+
+
+# Счётчики HeadToHeadORM
+H2H_FIELDS = ("matches_played", "low_wins", "high_wins", "low_sets_won", "high_sets_won")
+
+
+def player_stats_deltas(
+    set_history: list[tuple[int, int, int | None, int | None]],
+    player1_id: int,
+    player2_id: int,
+    winner_id: int | None,
+) -> dict[int, dict[str, int]]:
+    """Приращения статистики обоих игроков за один завершённый матч.
+
+    Args:
+        set_history: История сетов в формате ``Match.set_scores_history``
+        player1_id: ID первого игрока
+        player2_id: ID второго игрока
+        winner_id: ID победителя (None — победитель не сохранён)
+
+    Returns:
+        ``{player_id: {поле: приращение}}`` для полей ``STATS_FIELDS``
+    """
+    first = dict.fromkeys(STATS_FIELDS, 0)
+    second = dict.fromkeys(STATS_FIELDS, 0)
+    first["matches_played"] = second["matches_played"] = 1
+    if winner_id == player1_id:
+        first["wins"] = second["losses"] = 1
+    elif winner_id == player2_id:
+        second["wins"] = first["losses"] = 1
+
+    for p1_games, p2_games, p1_tiebreak, _ in set_history:
+        first["games_won"] += p1_games
+        first["games_lost"] += p2_games
+        second["games_won"] += p2_games
+        second["games_lost"] += p1_games
+        set_winner, set_loser = (first, second) if p1_games > p2_games else (second, first)
+        set_winner["sets_won"] += 1
+        set_loser["sets_lost"] += 1
+        if p1_tiebreak is not None:
+            set_winner["tiebreaks_won"] += 1
+            set_loser["tiebreaks_lost"] += 1
+    return {player1_id: first, player2_id: second}
+
+
+def match_set_rows(
+    match_id: int, set_history: list[tuple[int, int, int | None, int | None]]
+) -> list[dict]:
+    """Строки ``match_sets`` для истории сетов матча."""
+    return [
+        {
+            "match_id": match_id,
+            "set_number": number,
+            "player1_games": p1_games,
+            "player2_games": p2_games,
+            "player1_tiebreak": p1_tiebreak,
+            "player2_tiebreak": p2_tiebreak,
+        }
+        for number, (p1_games, p2_games, p1_tiebreak, p2_tiebreak) in enumerate(set_history, start=1)
+    ]
 
-# Настройка логирования
-logger = logging.getLogger("orm")
-logging.basicConfig(level=logging.INFO)
 
 class OrmMatchRepository:
-    """Репозиторий для работы с матчами и игроками через ORM (PostgreSQL)."""
+    """Репозиторий для работы с матчами и игроками через ORM (PostgreSQL или SQLite, см. ``engine``)."""
     def __init__(self, db_url: str | None = None):
         effective_db_url = db_url or os.getenv(
             "DATABASE_URL", 
@@ -26,13 +129,102 @@ class OrmMatchRepository:
             raise ValueError(
                 "DATABASE_URL must be set as an environment variable or passed as an argument."
             )
-        self.engine = create_engine(effective_db_url, echo=False)
-        self.Session = sessionmaker(bind=self.engine)
-        self._active_matches: dict[str, Match] = {}
+        self.db_url = effective_db_url
+        # Движок создаётся при первом обращении: импорт и сборка приложения не зависят
+        # от доступности драйвера и базы
+        self._engine = None
+        self._session_factory = None
+        self._engine_lock = threading.Lock()
+        # Активные матчи: в памяти процесса или в БД, общие для воркеров (ACTIVE_MATCH_STORE)
+        self.active_matches = create_active_match_store(self._get_session)
+        # Очки пишутся в match_points пакетами, а не отдельным INSERT на каждое очко
+        self.point_buffer = PointBuffer(
+            self._insert_points,
+            flush_interval=float(os.getenv("POINT_FLUSH_INTERVAL", "2")),
+            max_pending=int(os.getenv("POINT_BUFFER_MAX", "100000")),
+        )
+
+    def _create_engine(self):
+        with self._engine_lock:
+            if self._engine is None:
+                engine = create_db_engine(self.db_url)
+                instrument_engine(engine)
+                self._session_factory = sessionmaker(bind=engine)
+                self._engine = engine
+                logger.debug("Создан движок БД: %s", engine.url.render_as_string(hide_password=True))
+        return self._engine
+
+    @property
+    def engine(self):
+        """Движок SQLAlchemy; создаётся при первом обращении."""
+        return self._engine if self._engine is not None else self._create_engine()
+
+    @property
+    def Session(self):  # noqa: N802 — прежнее имя атрибута-фабрики сессий
+        """Фабрика сессий, привязанная к движку."""
+        if self._session_factory is None:
+            self._create_engine()
+        return self._session_factory
+
+    def warm_pool(self) -> int:
+        """Открывает и возвращает в пул столько соединений, сколько пул держит постоянно.
+
+        Returns:
+            Число открытых соединений
+        """
+        engine = self.engine
+        size = engine.pool.size() if isinstance(engine.pool, QueuePool) else 1
+        connections = []
+        try:
+            for _ in range(size):
+                connection = engine.connect()
+                connections.append(connection)
+                connection.execute(text("SELECT 1"))
+        finally:
+            for connection in connections:
+                connection.close()
+        return len(connections)
+
+    def pool_status(self) -> dict[str, object]:
+        """Состояние пула соединений БД; движок ради этого не создаётся."""
+        if self._engine is None:
+            return {"engine_created": False}
+        pool = self._engine.pool
+        status = {"engine_created": True, "pool": type(pool).__name__, "status": pool.status()}
+        if isinstance(pool, QueuePool):
+            status.update(
+                size=pool.size(),
+                checked_in=pool.checkedin(),
+                checked_out=pool.checkedout(),
+                overflow=pool.overflow(),
+            )
+        return status
+
+    def ping(self) -> None:
+        """Берёт соединение из пула и выполняет ``SELECT 1``; при недоступности БД бросает исключение."""
+        with self.engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
 
     @contextmanager
     def _get_session(self):
-        """Контекстный менеджер для безопасной работы с сессией."""
+        """Контекстный менеджер для безопасной работы с сессией.
+
+        Внутри HTTP-запроса отдаёт общую сессию единицы работы (см. ``core.unit_of_work``):
+        фиксация и закрытие выполняются один раз в конце запроса, а ошибка откатывает
+        всю транзакцию запроса. Вне запроса открывает отдельную сессию на операцию.
+        """
+        uow = current_unit_of_work.get()
+        if uow is not None:
+            session = uow.session(self.Session)
+            try:
+                yield session
+            except Exception as e:
+                uow.mark_failed()
+                session.rollback()
+                logger.error("Ошибка при работе с БД: %s", e)
+                raise
+            return
+
         session = self.Session()
         try:
             yield session
@@ -45,8 +237,12 @@ class OrmMatchRepository:
             session.close()
 
     def add_match(self, uuid: str, player1_id: int, player2_id: int, 
-                  winner_id: int | None, score: str) -> int:
-        """Добавление матча в БД. Возвращает id созданного матча."""
+                  winner_id: int | None, score: str,
+                  set_history: list[tuple[int, int, int | None, int | None]] | None = None) -> int:
+        """Добавление матча в БД. Возвращает id созданного матча.
+
+        ``set_history`` (формат ``Match.set_scores_history``) сохраняется в ``match_sets``.
+        """
         if not uuid or not isinstance(uuid, str):
             raise ValueError("UUID матча должен быть непустой строкой")
         if player1_id == player2_id:
@@ -68,7 +264,9 @@ class OrmMatchRepository:
             )
             session.add(match)
             session.flush()
-            logger.info(f"Добавлен матч: {match}")
+            if set_history:
+                session.execute(insert(MatchSetORM), match_set_rows(match.id, set_history))
+            logger.info("Добавлен матч: %s", match)
             return match.id
 
     def _orm_to_dto_internal(self, match_orm: MatchORM, player_map: dict[int, str]) -> MatchDTO:
@@ -86,11 +284,9 @@ class OrmMatchRepository:
         self, page: int = 1, per_page: int = 10, filter_query: str | None = None
     ) -> tuple[list[MatchDTO], int]:
         """Получить список матчей (активных и из БД) с пагинацией и фильтрацией."""
-        logger.info(f"Listing matches. Current _active_matches: {self._active_matches}")
-        
         # 1. Get All Active Match DTOs
-        active_match_dtos = [match.to_live_dto() for match in self._active_matches.values()]
-        logger.info(f"Active match DTOs generated: {len(active_match_dtos)}")
+        active_match_dtos = [match.to_live_dto() for match in self.active_matches.values()]
+        logger.debug("Listing matches. Active matches: %d", len(active_match_dtos))
 
         # 2. Get All DB Match DTOs
         all_db_match_dtos = []
@@ -164,7 +360,9 @@ class OrmMatchRepository:
             player = PlayerORM(name=name)
             session.add(player)
             session.flush()
-            logger.info(f"Создан новый игрок: {player}")
+            # Строка статистики создаётся вместе с игроком: дальше она только обновляется
+            session.add(PlayerStatsORM(player_id=player.id, **dict.fromkeys(STATS_FIELDS, 0)))
+            logger.info("Создан новый игрок: %s", player)
             return player.id
 
     def orm_to_dto(self, match: MatchORM) -> MatchDTO:
@@ -193,31 +391,157 @@ class OrmMatchRepository:
             raise ValueError("Игроки должны быть разными")
 
         match = Match(player_one_name, player_two_name)
-        self._active_matches[match.match_uid] = match
-        logger.info(f"Создан активный матч: {match.match_uid}, {player_one_name} vs {player_two_name}")
-        logger.info(f"Current _active_matches after creation: {self._active_matches}")
+        self.active_matches.add(match)
+        logger.info("Создан активный матч: %s, %s vs %s", match.match_uid, player_one_name, player_two_name)
         return match
 
-    def get_active_match_by_uuid(self, uuid: str) -> Match | None:
-        """Получить активный (не сохраненный в БД) матч по UUID из памяти."""
-        return self._active_matches.get(uuid)
+    def active_match_count(self) -> int:
+        """Количество активных матчей."""
+        return self.active_matches.count()
+
+    def get_active_match_by_uuid(self, uuid: str, for_update: bool = False) -> Match | None:
+        """Получить активный (не сохраненный в БД) матч по UUID.
+
+        Args:
+            uuid: UUID матча
+            for_update: Матч будет изменён: в общем хранилище строка матча блокируется
+                до конца транзакции, изменения записываются ``save_active_match``
+        """
+        return self.active_matches.get(uuid, for_update)
+
+    def save_active_match(self, match: Match) -> None:
+        """Записывает изменённое состояние активного матча (в памяти процесса — ничего не делает)."""
+        self.active_matches.save(match)
+
+    def check_multiprocess(self) -> None:
+        """Проверяет, что активные матчи общие для процессов-воркеров (см. ``prefork``).
+
+        Raises:
+            ValueError: Активные матчи или база — в памяти процесса
+        """
+        check_multiprocess(self.active_matches, self.db_url)
+
+    def record_point(
+        self, match_uuid: str, player: str, scored_at: datetime | None = None, seq: int | None = None
+    ) -> int:
+        """Добавляет разыгранное очко в журнал матча.
+
+        С активными матчами в памяти очко попадает в буфер (без обращения к БД). С общим
+        хранилищем очко записывается сразу, в транзакции изменения счёта: буфер одного
+        процесса не знает об очках и сбросах матча в других процессах.
+
+        Args:
+            match_uuid: UUID матча
+            player: Выигравший очко игрок: "player1" или "player2"
+            scored_at: Время розыгрыша; по умолчанию — текущее
+            seq: Номер очка в матче (``Match.points_played``); с общим хранилищем обязателен,
+                иначе по умолчанию — следующий номер в буфере
+
+        Returns:
+            Номер очка в матче
+        """
+        if not self.active_matches.shared:
+            return self.point_buffer.append(match_uuid, player == "player2", scored_at, seq)
+        row = {
+            "match_uuid": match_uuid,
+            "seq": seq,
+            "player2_won": player == "player2",
+            "scored_at": scored_at or datetime.now(timezone.utc),
+        }
+        self._insert_points([row])
+        return seq
+
+    def _insert_points(self, rows: list[dict]) -> None:
+        """Записывает очки одной многострочной вставкой."""
+        with unit_of_work(), self._get_session() as session:
+            session.execute(insert(MatchPointORM), rows)
+
+    def delete_match_points(self, match_uuid: str) -> None:
+        """Удаляет журнал очков матча — буферизованные и записанные очки (сброс счёта)."""
+        def delete_written() -> None:
+            with unit_of_work(), self._get_session() as session:
+                session.query(MatchPointORM).filter(MatchPointORM.match_uuid == match_uuid).delete(
+                    synchronize_session=False
+                )
+
+        if self.active_matches.shared:
+            delete_written()
+        else:
+            self.point_buffer.discard(match_uuid, delete_written)
+
+    def iter_match_points(
+        self, match_uuid: str, batch_size: int = 500
+    ) -> Iterator[tuple[int, str, datetime]]:
+        """Очки матча по порядку: ``(номер, "player1" | "player2", время)``.
+
+        Буферизованные очки матча сначала записываются в транзакции вызывающего (при её
+        откате возвращаются в буфер), затем строки читаются из БД порциями по
+        ``batch_size``, не загружая весь журнал в память.
+        """
+        with unit_of_work() as uow:
+            pending = self.point_buffer.take(match_uuid)
+            if pending:
+                uow.after_rollback(lambda: self.point_buffer.requeue(pending))
+                self._insert_points(pending)
+        with self._get_session() as session:
+            rows = (
+                session.query(MatchPointORM.seq, MatchPointORM.player2_won, MatchPointORM.scored_at)
+                .filter(MatchPointORM.match_uuid == match_uuid)
+                .order_by(MatchPointORM.seq)
+                .yield_per(batch_size)
+            )
+            for seq, player2_won, scored_at in rows:
+                yield seq, "player2" if player2_won else "player1", scored_at
 
     def get_match_by_uuid_from_db(self, match_uuid: str) -> MatchDTO | None:
         """Получить данные матча из БД по UUID и вернуть как MatchDTO."""
-        logger.debug(f"Attempting to fetch match from DB by UUID: {match_uuid}")
+        logger.debug("Attempting to fetch match from DB by UUID: %s", match_uuid)
         with self._get_session() as session:
             match_orm = session.query(MatchORM).filter_by(uuid=match_uuid).first()
             if match_orm:
-                logger.debug(f"Match found in DB: {match_uuid}")
+                logger.debug("Match found in DB: %s", match_uuid)
                 return self.orm_to_dto(match_orm)
-            logger.debug(f"Match with UUID {match_uuid} not found in DB.")
+            logger.debug("Match with UUID %s not found in DB.", match_uuid)
             return None
 
     def save_finished_match(self, match: Match) -> MatchDTO:
-        """Сохранить завершённый матч в БД, вернуть его DTO и удалить из активных."""
+        """Сохранить завершённый матч в БД, вернуть его DTO и удалить из активных.
+
+        Игроки, матч, статистика игроков и остаток журнала очков записываются в одной транзакции.
+        """
+        with unit_of_work() as uow:
+            # Последние очки матча попадают в ту же транзакцию, что и сам матч; при откате
+            # транзакции (в том числе всего запроса) они возвращаются в буфер
+            rows = self.point_buffer.take(match.match_uid)
+            uow.after_rollback(lambda: self.point_buffer.requeue(rows))
+            uow.after_commit(lambda: self.point_buffer.forget(match.match_uid))
+            if rows:
+                self._insert_points(rows)
+            saved_match_dto = self._save_finished_match(match)
+            # Матч перестаёт быть активным вместе с фиксацией его записи: откат оставит его активным
+            self.release_active_match(match.match_uid)
+        return saved_match_dto
+
+    def write_finished_match(self, match: Match, point_rows: list[dict]) -> MatchDTO:
+        """Записывает завершённый матч и переданные очки его журнала в одной транзакции.
+
+        В отличие от ``save_finished_match`` не трогает буфер очков и активные матчи.
+        """
+        with unit_of_work():
+            if point_rows:
+                self._insert_points(point_rows)
+            return self._save_finished_match(match)
+
+    def release_active_match(self, match_uuid: str) -> None:
+        """Удаляет сохранённый в БД матч из активных."""
+        if self.active_matches.remove(match_uuid):
+            logger.info("Активный матч %s удален из активных после сохранения в БД", match_uuid)
+        else:
+            logger.warning("Match %s not found in active matches during save_finished_match.", match_uuid)
+
+    def _save_finished_match(self, match: Match) -> MatchDTO:
         if not match.player_one_name or not match.player_two_name:
             raise ValueError("Имена игроков не могут быть пустыми")
-
         player1_id = self.get_or_create_player_by_name(match.player_one_name)
         player2_id = self.get_or_create_player_by_name(match.player_two_name)
         
@@ -234,8 +558,9 @@ class OrmMatchRepository:
                 winner_id = match.winner
             else:
                 logger.warning(
-                    f"Некорректное значение match.winner ({match.winner}) для матча {match.match_uid}. "
-                    f"Победитель не будет сохранен."
+                    "Некорректное значение match.winner (%s) для матча %s. Победитель не будет сохранен.",
+                    match.winner,
+                    match.match_uid,
                 )
 
         self.add_match(
@@ -244,31 +569,398 @@ class OrmMatchRepository:
             player2_id=player2_id,
             winner_id=winner_id,
             score=match.get_final_score_str(),
+            set_history=match.set_scores_history,
         )
 
+        with self._get_session() as session:
+            deltas = player_stats_deltas(match.set_scores_history, player1_id, player2_id, winner_id)
+            self._apply_player_stats(session, deltas)
+            self._apply_head_to_head(session, deltas)
+            self._apply_ratings(session, player1_id, player2_id, winner_id)
+
         saved_match_dto = self.get_match_by_uuid_from_db(match.match_uid)
 
         if not saved_match_dto:
             raise RuntimeError(
                 f"Не удалось получить DTO для сохраненного матча {match.match_uid} из БД."
             )
+        return saved_match_dto
 
-        logger.info(
-            f"Attempting to remove match {match.match_uid} from _active_matches. "
-            f"Current: {self._active_matches}"
+    @staticmethod
+    def _apply_player_stats(session, deltas: dict[int, dict[str, int]]) -> None:
+        """Прибавляет приращения к строкам статистики одним upsert на игрока.
+
+        Приращение считается в самом запросе (``wins = wins + 1``), поэтому
+        одновременные сохранения матчей одного игрока не теряют обновления. Строка
+        создаётся, если игрок появился до таблицы статистики и ещё не попал в пересчёт.
+        """
+        for player_id, delta in deltas.items():
+            upsert_increment(session, PlayerStatsORM, {"player_id": player_id}, delta)
+
+    @staticmethod
+    def _apply_head_to_head(session, deltas: dict[int, dict[str, int]]) -> None:
+        """Прибавляет итог матча к строке пары в ``head_to_head`` (upsert с приращением)."""
+        low_id, high_id = sorted(deltas)
+        low, high = deltas[low_id], deltas[high_id]
+        increments = {
+            "matches_played": 1,
+            "low_wins": low["wins"],
+            "high_wins": high["wins"],
+            "low_sets_won": low["sets_won"],
+            "high_sets_won": high["sets_won"],
+        }
+        upsert_increment(
+            session, HeadToHeadORM, {"player_low_id": low_id, "player_high_id": high_id}, increments
         )
-        if match.match_uid in self._active_matches:
-            del self._active_matches[match.match_uid]
-            logger.info(
-                f"Активный матч {match.match_uid} удален из памяти после сохранения в БД. "
-                f"_active_matches: {self._active_matches}"
+
+    @staticmethod
+    def _apply_ratings(session, player1_id: int, player2_id: int, winner_id: int | None) -> None:
+        """Обновляет рейтинги обоих игроков по итогу матча.
+
+        Строки рейтинга блокируются (``SELECT ... FOR UPDATE``) в порядке ID игроков,
+        чтобы одновременные матчи одного игрока применялись последовательно. Строки
+        первого матча игрока сначала создаются с начальным рейтингом (``insert_missing``):
+        блокировать несуществующую строку нельзя, и одновременные первые матчи
+        вставляли бы её оба. В той же транзакции увеличивается номер изменения
+        ``player_ratings`` — версия кеша таблицы рейтинга (см. ``ratings_version``).
+        """
+        if winner_id not in (player1_id, player2_id):
+            return
+        initial = {"rating": elo.initial, "rated_matches": 0}
+        for player_id in sorted((player1_id, player2_id)):
+            insert_missing(session, PlayerRatingORM, {"player_id": player_id}, initial)
+        ratings = {
+            row.player_id: row
+            for row in session.query(PlayerRatingORM)
+            .filter(PlayerRatingORM.player_id.in_((player1_id, player2_id)))
+            .order_by(PlayerRatingORM.player_id)
+            .with_for_update()
+        }
+        first, second = ratings[player1_id], ratings[player2_id]
+        first.rating, second.rating = elo.update(first.rating, second.rating, winner_id == player1_id)
+        first.rated_matches += 1
+        second.rated_matches += 1
+        _bump_revision(session, PlayerRatingORM)
+
+    def ratings_version(self) -> tuple[str, int]:
+        """Версия таблицы рейтинга: формула и номер изменения таблиц из ``table_revisions``.
+
+        Номер увеличивается в транзакции каждого матча, изменившего рейтинги, и при
+        пересчёте ``player_ratings`` или ``player_stats`` по истории, поэтому меняется
+        с каждой фиксацией — в том числе когда матчи фиксируются не в порядке ID
+        (``max(matches.id)`` этого не заметил бы). Ключ кеша таблицы рейтинга.
+        """
+        with self._get_session() as session:
+            revision = (
+                session.query(func.sum(TableRevisionORM.revision))
+                .filter(TableRevisionORM.table_name.in_(LEADERBOARD_TABLES))
+                .scalar()
             )
-        else:
-            logger.warning(
-                f"Match {match.match_uid} not found in _active_matches during save_finished_match."
+        return elo.version, revision or 0
+
+    def get_leaderboard(self, limit: int = 20) -> list[RatingDTO]:
+        """Первые ``limit`` игроков по рейтингу — чтение по индексу ``player_ratings.rating``."""
+        with self._get_session() as session:
+            rows = (
+                session.query(
+                    PlayerORM.name,
+                    PlayerRatingORM.rating,
+                    PlayerRatingORM.rated_matches,
+                    PlayerStatsORM.wins,
+                    PlayerStatsORM.losses,
+                )
+                .join(PlayerORM, PlayerORM.id == PlayerRatingORM.player_id)
+                .outerjoin(PlayerStatsORM, PlayerStatsORM.player_id == PlayerRatingORM.player_id)
+                .order_by(PlayerRatingORM.rating.desc(), PlayerRatingORM.player_id)
+                .limit(limit)
+                .all()
             )
-        
-        return saved_match_dto
+            return [
+                RatingDTO(
+                    rank=rank,
+                    name=name,
+                    rating=rating,
+                    rated_matches=rated_matches,
+                    wins=wins or 0,
+                    losses=losses or 0,
+                )
+                for rank, (name, rating, rated_matches, wins, losses) in enumerate(rows, start=1)
+            ]
+
+    def recompute_ratings(self, batch_size: int = 1000) -> tuple[int, int]:
+        """Пересчитывает ``player_ratings`` по всей истории матчей в порядке их сохранения.
+
+        Рейтинг каждого матча зависит от результатов предыдущих, поэтому матчи
+        проходятся одним упорядоченным проходом с рейтингами в памяти (читаются
+        порциями по ``batch_size``), а таблица перезаписывается одной вставкой.
+
+        Returns:
+            (число игроков с рейтингом, число учтённых матчей)
+        """
+        ratings: dict[int, list] = {}  # player_id -> [рейтинг, матчей]
+        rated = 0
+        with unit_of_work(), self._get_session() as session:
+            rows = (
+                session.query(MatchORM.player1_id, MatchORM.player2_id, MatchORM.winner_id)
+                .filter(MatchORM.winner_id.isnot(None))
+                .order_by(MatchORM.id)
+                .yield_per(batch_size)
+            )
+            for player1_id, player2_id, winner_id in rows:
+                if winner_id not in (player1_id, player2_id):
+                    continue
+                first = ratings.setdefault(player1_id, [elo.initial, 0])
+                second = ratings.setdefault(player2_id, [elo.initial, 0])
+                first[0], second[0] = elo.update(first[0], second[0], winner_id == player1_id)
+                first[1] += 1
+                second[1] += 1
+                rated += 1
+
+            session.query(PlayerRatingORM).delete(synchronize_session=False)
+            if ratings:
+                session.execute(
+                    insert(PlayerRatingORM),
+                    [
+                        {"player_id": player_id, "rating": rating, "rated_matches": matches}
+                        for player_id, (rating, matches) in ratings.items()
+                    ],
+                )
+            _bump_revision(session, PlayerRatingORM)
+        logger.info("Рейтинги пересчитаны (%s): игроков %d, матчей %d", elo.version, len(ratings), rated)
+        return len(ratings), rated
+
+    def get_head_to_head(self, name1: str, name2: str, recent_limit: int = 5) -> HeadToHeadDTO | None:
+        """Итоги встреч двух игроков: строка пары в ``head_to_head`` и последние матчи по индексу.
+
+        Returns:
+            DTO в порядке аргументов; None, если одного из игроков нет
+        """
+        with self._get_session() as session:
+            ids = dict(
+                session.query(PlayerORM.name, PlayerORM.id).filter(PlayerORM.name.in_((name1, name2)))
+            )
+            if name1 == name2 or len(ids) < 2:
+                return None
+            id1, id2 = ids[name1], ids[name2]
+            low_id, high_id = sorted((id1, id2))
+            pair = session.get(HeadToHeadORM, (low_id, high_id))
+            recent = (
+                session.query(MatchORM)
+                .filter(
+                    or_(
+                        and_(MatchORM.player1_id == id1, MatchORM.player2_id == id2),
+                        and_(MatchORM.player1_id == id2, MatchORM.player2_id == id1),
+                    )
+                )
+                .order_by(MatchORM.id.desc())
+                .limit(recent_limit)
+                .all()
+            )
+            player_map = {id1: name1, id2: name2}
+            result = HeadToHeadDTO(
+                player1=name1,
+                player2=name2,
+                recent=[self._orm_to_dto_internal(match_orm, player_map) for match_orm in recent],
+            )
+            if pair is not None:
+                first_is_low = id1 == low_id
+                result.matches_played = pair.matches_played
+                result.player1_wins, result.player2_wins = (
+                    (pair.low_wins, pair.high_wins) if first_is_low else (pair.high_wins, pair.low_wins)
+                )
+                result.player1_sets, result.player2_sets = (
+                    (pair.low_sets_won, pair.high_sets_won)
+                    if first_is_low
+                    else (pair.high_sets_won, pair.low_sets_won)
+                )
+            return result
+
+    def get_player_stats(self, name: str) -> PlayerStatsDTO | None:
+        """Статистика игрока по имени — одна строка ``player_stats``, без обхода матчей.
+
+        Returns:
+            DTO статистики; None, если игрока нет
+        """
+        with self._get_session() as session:
+            row = (
+                session.query(PlayerORM.id, PlayerORM.name, PlayerStatsORM)
+                .outerjoin(PlayerStatsORM, PlayerStatsORM.player_id == PlayerORM.id)
+                .filter(PlayerORM.name == name)
+                .first()
+            )
+            if row is None:
+                return None
+            player_id, player_name, stats = row
+            counters = {field: getattr(stats, field) for field in STATS_FIELDS} if stats else {}
+            return PlayerStatsDTO(player_id=player_id, name=player_name, **counters)
+
+    def backfill_set_scores(self, batch_size: int = 1000) -> tuple[int, int]:
+        """Заполняет ``match_sets`` для матчей, у которых есть только ``score_str``.
+
+        Счёт матчей без строк в ``match_sets`` разбирается ``parse_final_score_str``,
+        строки вставляются пакетами по ``batch_size`` матчей; неразбираемый счёт
+        пропускается с предупреждением в журнале.
+
+        Returns:
+            (число заполненных матчей, число матчей с неразобранным счётом)
+        """
+        filled = skipped = 0
+        with unit_of_work(), self._get_session() as session:
+            pending = (
+                session.query(MatchORM.id, MatchORM.uuid, MatchORM.score_str)
+                .filter(~MatchORM.sets.any())
+                .order_by(MatchORM.id)
+                .all()
+            )
+            for offset in range(0, len(pending), batch_size):
+                rows = []
+                for match_id, uuid, score_str in pending[offset:offset + batch_size]:
+                    try:
+                        rows.extend(match_set_rows(match_id, parse_final_score_str(score_str)))
+                    except ValueError as e:
+                        skipped += 1
+                        logger.warning("Матч %s: счёт не разобран: %s", uuid, e)
+                        continue
+                    filled += 1
+                if rows:
+                    session.execute(insert(MatchSetORM), rows)
+        logger.info("Счёт по сетам заполнен: матчей %d, счёт не разобран у %d", filled, skipped)
+        return filled, skipped
+
+    @staticmethod
+    def _match_totals_query():
+        """Матчи, победы и поражения каждого игрока: GROUP BY по обеим сторонам матча."""
+        sides = union_all(
+            select(MatchORM.player1_id.label("player_id"), MatchORM.winner_id),
+            select(MatchORM.player2_id.label("player_id"), MatchORM.winner_id),
+        ).subquery()
+        lost = and_(sides.c.winner_id.isnot(None), sides.c.winner_id != sides.c.player_id)
+        return select(
+            sides.c.player_id,
+            func.count().label("matches_played"),
+            func.sum(case((sides.c.winner_id == sides.c.player_id, 1), else_=0)).label("wins"),
+            func.sum(case((lost, 1), else_=0)).label("losses"),
+        ).group_by(sides.c.player_id)
+
+    @staticmethod
+    def _set_totals_query():
+        """Сеты, геймы и тай-брейки каждого игрока по столбцам ``match_sets``."""
+        tiebreak = MatchSetORM.player1_tiebreak.isnot(None)
+
+        def side(player_id, own_games, other_games):
+            return (
+                select(
+                    player_id.label("player_id"),
+                    own_games.label("games_won"),
+                    other_games.label("games_lost"),
+                    case((own_games > other_games, 1), else_=0).label("set_won"),
+                    case((own_games < other_games, 1), else_=0).label("set_lost"),
+                    case((and_(tiebreak, own_games > other_games), 1), else_=0).label("tiebreak_won"),
+                    case((and_(tiebreak, own_games < other_games), 1), else_=0).label("tiebreak_lost"),
+                )
+                .select_from(MatchSetORM)
+                .join(MatchORM, MatchORM.id == MatchSetORM.match_id)
+            )
+
+        sides = union_all(
+            side(MatchORM.player1_id, MatchSetORM.player1_games, MatchSetORM.player2_games),
+            side(MatchORM.player2_id, MatchSetORM.player2_games, MatchSetORM.player1_games),
+        ).subquery()
+        return select(
+            sides.c.player_id,
+            func.sum(sides.c.set_won).label("sets_won"),
+            func.sum(sides.c.set_lost).label("sets_lost"),
+            func.sum(sides.c.games_won).label("games_won"),
+            func.sum(sides.c.games_lost).label("games_lost"),
+            func.sum(sides.c.tiebreak_won).label("tiebreaks_won"),
+            func.sum(sides.c.tiebreak_lost).label("tiebreaks_lost"),
+        ).group_by(sides.c.player_id)
+
+    def rebuild_head_to_head(self, batch_size: int = 1000) -> int:
+        """Пересчитывает ``head_to_head`` агрегирующими запросами по ``matches`` и ``match_sets``.
+
+        Returns:
+            Число пар игроков
+        """
+        low = case(
+            (MatchORM.player1_id < MatchORM.player2_id, MatchORM.player1_id), else_=MatchORM.player2_id
+        )
+        high = case(
+            (MatchORM.player1_id < MatchORM.player2_id, MatchORM.player2_id), else_=MatchORM.player1_id
+        )
+        match_totals = select(
+            low.label("player_low_id"),
+            high.label("player_high_id"),
+            func.count().label("matches_played"),
+            func.sum(case((MatchORM.winner_id == low, 1), else_=0)).label("low_wins"),
+            func.sum(case((MatchORM.winner_id == high, 1), else_=0)).label("high_wins"),
+        ).group_by(low, high)
+        low_won_set = or_(
+            and_(MatchORM.player1_id == low, MatchSetORM.player1_games > MatchSetORM.player2_games),
+            and_(MatchORM.player2_id == low, MatchSetORM.player2_games > MatchSetORM.player1_games),
+        )
+        set_totals = (
+            select(
+                low.label("player_low_id"),
+                high.label("player_high_id"),
+                func.sum(case((low_won_set, 1), else_=0)).label("low_sets_won"),
+                func.sum(case((low_won_set, 0), else_=1)).label("high_sets_won"),
+            )
+            .select_from(MatchSetORM)
+            .join(MatchORM, MatchORM.id == MatchSetORM.match_id)
+            .group_by(low, high)
+        )
+
+        with unit_of_work(), self._get_session() as session:
+            self.backfill_set_scores(batch_size)
+            pairs: dict[tuple[int, int], dict] = {}
+            for query in (match_totals, set_totals):
+                for row in session.execute(query).mappings():
+                    key = (row["player_low_id"], row["player_high_id"])
+                    pair = pairs.setdefault(
+                        key,
+                        {"player_low_id": key[0], "player_high_id": key[1], **dict.fromkeys(H2H_FIELDS, 0)},
+                    )
+                    pair.update(row)
+            session.query(HeadToHeadORM).delete(synchronize_session=False)
+            if pairs:
+                session.execute(insert(HeadToHeadORM), list(pairs.values()))
+        logger.info("Итоги встреч пересчитаны: пар %d", len(pairs))
+        return len(pairs)
+
+    def rebuild_player_stats(self, batch_size: int = 1000) -> tuple[int, int, int]:
+        """Пересчитывает ``player_stats`` по всей истории матчей в одной транзакции.
+
+        Сначала дозаполняет ``match_sets`` (см. ``backfill_set_scores``), затем
+        считает статистику агрегирующими запросами по структурированным столбцам,
+        без разбора строк счёта в Python.
+
+        Returns:
+            (число игроков, число матчей, число матчей с неразобранным счётом)
+        """
+        with unit_of_work(), self._get_session() as session:
+            _, skipped = self.backfill_set_scores(batch_size)
+            totals = {
+                player_id: dict.fromkeys(STATS_FIELDS, 0) for (player_id,) in session.query(PlayerORM.id)
+            }
+            for query in (self._match_totals_query(), self._set_totals_query()):
+                for row in session.execute(query).mappings():
+                    counters = totals.setdefault(row["player_id"], dict.fromkeys(STATS_FIELDS, 0))
+                    counters.update({name: value for name, value in row.items() if name != "player_id"})
+            matches = session.query(func.count(MatchORM.id)).scalar()
+
+            session.query(PlayerStatsORM).delete(synchronize_session=False)
+            if totals:
+                session.execute(
+                    insert(PlayerStatsORM),
+                    [{"player_id": player_id, **counters} for player_id, counters in totals.items()],
+                )
+            _bump_revision(session, PlayerStatsORM)
+        logger.info(
+            "Статистика игроков пересчитана: игроков %d, матчей %d, счёт не разобран у %d",
+            len(totals), matches, skipped,
+        )
+        return len(totals), matches, skipped
 
     def get_completed_match_by_uuid(self, match_uuid: str) -> dict | None:
         """Получить завершенный матч из базы данных по UUID в виде словаря."""
@@ -276,7 +968,7 @@ class OrmMatchRepository:
             with self._get_session() as session:
                 match_orm = session.query(MatchORM).filter_by(uuid=match_uuid).first()
                 if not match_orm:
-                    logger.debug(f"No completed match found with UUID {match_uuid}")
+                    logger.debug("No completed match found with UUID %s", match_uuid)
                     return None
 
                 # Получаем имена игроков
@@ -296,12 +988,18 @@ class OrmMatchRepository:
                     winner = session.get(PlayerORM, match_orm.winner_id)
                     winner_name = winner.name if winner else "Unknown Winner"
 
+                set_scores = [
+                    (s.player1_games, s.player2_games, s.player1_tiebreak, s.player2_tiebreak)
+                    for s in match_orm.sets
+                ]
+
                 completed_match = {
                     "match_uid": match_orm.uuid,
                     "player_one_name": player1_name,
                     "player_two_name": player2_name,
                     "winner": winner_name,
                     "final_score": match_orm.score_str or "Счет недоступен",
+                    "set_scores": set_scores,
                     "completed_at": (
                         match_orm.created_at.isoformat() 
                         if hasattr(match_orm, 'created_at') and match_orm.created_at 
@@ -310,9 +1008,9 @@ class OrmMatchRepository:
                     "id": match_orm.id
                 }
 
-                logger.debug(f"Found completed match {match_uuid}: {completed_match}")
+                logger.debug("Found completed match %s: %s", match_uuid, completed_match)
                 return completed_match
 
         except Exception as e:
-            logger.error(f"Error retrieving completed match {match_uuid}: {e}")
+            logger.error("Error retrieving completed match %s: %s", match_uuid, e)
             return None
\ No newline at end of file
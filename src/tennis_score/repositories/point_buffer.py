@@ -0,0 +1,181 @@
+"""Буфер разыгранных очков для пакетной записи в ``match_points``.
+
+Засчитанное очко только добавляется в память (без обращения к БД); накопленные
+очки всех матчей записываются одной многострочной вставкой фоновым потоком раз
+в ``flush_interval`` секунд, а очки конкретного матча — сразу при его завершении.
+"""
+
+import atexit
+import logging
+import threading
+from collections.abc import Callable
+from datetime import datetime, timezone
+
+from ..core.memory import MEMORY
+from ..core.metrics import POINT_LOG_DROPPED, POINT_LOG_FLUSHED, POINT_LOG_PENDING
+
+logger = logging.getLogger("repository.points")
+
+
+class PointBuffer:
+    """Очки матчей в памяти до пакетной записи.
+
+    Номер очка (``seq``) выдаётся буфером при добавлении, по порядку внутри
+    матча. Запись выполняется функцией ``write`` со списком строк ``match_points``;
+    при ошибке строки возвращаются в буфер и будут записаны в следующий раз.
+    """
+
+    def __init__(
+        self,
+        write: Callable[[list[dict]], None],
+        flush_interval: float = 2.0,
+        max_pending: int = 100_000,
+    ):
+        """Инициализирует объект класса.
+
+        Args:
+            write: Функция записи строк ``match_points`` одной транзакцией
+            flush_interval: Период фоновой записи, в секундах (0 — только явный ``flush``)
+            max_pending: Сколько очков держать в буфере после неудачной записи;
+                сверх лимита неудачная порция отбрасывается
+        """
+        self._write = write
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self._pending: dict[str, list[dict]] = {}
+        self._next_seq: dict[str, int] = {}
+        self._count = 0
+        self._lock = threading.Lock()
+        # Записи идут по одной, чтобы порции одного матча попадали в БД по порядку
+        self._flush_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        POINT_LOG_PENDING.set_function(lambda: self._count)
+        MEMORY.track("point_buffer", lambda: self._pending, lambda pending: self._count)
+
+    def append(
+        self, match_uuid: str, player2_won: bool, scored_at: datetime | None = None, seq: int | None = None
+    ) -> int:
+        """Добавляет очко матча в буфер и возвращает его номер (``seq`` или следующий по порядку)."""
+        with self._lock:
+            if seq is None:
+                seq = self._next_seq.get(match_uuid, 0) + 1
+            self._next_seq[match_uuid] = seq
+            self._pending.setdefault(match_uuid, []).append(
+                {
+                    "match_uuid": match_uuid,
+                    "seq": seq,
+                    "player2_won": player2_won,
+                    "scored_at": scored_at or datetime.now(timezone.utc),
+                }
+            )
+            self._count += 1
+        if self._thread is None and self.flush_interval > 0:
+            self._start()
+        return seq
+
+    def flush(self, match_uuid: str | None = None) -> int:
+        """Записывает буферизованные очки одного матча или всех матчей.
+
+        Returns:
+            Число записанных очков
+
+        Raises:
+            Exception: Ошибка записи; очки остаются в буфере
+        """
+        written = self._flush(match_uuid)
+        if written:
+            logger.debug("Записано очков: %d", written)
+        return written
+
+    def _flush(self, match_uuid: str | None) -> int:
+        with self._flush_lock:
+            rows = self.take(match_uuid)
+            if not rows:
+                return 0
+            try:
+                self._write(rows)
+            except Exception:
+                self.requeue(rows)
+                raise
+        POINT_LOG_FLUSHED.inc(amount=len(rows))
+        return len(rows)
+
+    def discard(self, match_uuid: str, on_discard: Callable[[], None] | None = None) -> None:
+        """Забывает очки матча и начинает нумерацию заново (сброс счёта).
+
+        ``on_discard`` выполняется под той же блокировкой, что и запись, — например,
+        удаление уже записанных очков, чтобы фоновая запись не вклинилась между ними.
+        """
+        with self._flush_lock:
+            with self._lock:
+                self._count -= len(self._pending.pop(match_uuid, ()))
+                self._next_seq.pop(match_uuid, None)
+            if on_discard is not None:
+                on_discard()
+
+    def forget(self, match_uuid: str) -> None:
+        """Освобождает счётчик номеров завершённого матча (его очки уже записаны)."""
+        with self._lock:
+            if match_uuid not in self._pending:
+                self._next_seq.pop(match_uuid, None)
+
+    def close(self) -> None:
+        """Останавливает фоновую запись и записывает оставшиеся очки.
+
+        Вызывается при выходе (``atexit``), когда обработчики журнала могут быть уже
+        закрыты, поэтому сам ничего не логирует: очки, которые не удалось записать,
+        учитываются в ``tennis_point_log_dropped_total``.
+        """
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.flush_interval + 5)
+        try:
+            self._flush(None)
+        except Exception:
+            POINT_LOG_DROPPED.inc(amount=len(self.take(None)))
+
+    def take(self, match_uuid: str | None) -> list[dict]:
+        """Забирает из буфера очки одного матча или всех матчей для записи вызывающим.
+
+        Если записать их не удалось, строки нужно вернуть через ``requeue``.
+        """
+        with self._lock:
+            if match_uuid is None:
+                batches, self._pending = list(self._pending.values()), {}
+            else:
+                batch = self._pending.pop(match_uuid, None)
+                batches = [batch] if batch else []
+            rows = [row for batch in batches for row in batch]
+            self._count -= len(rows)
+            return rows
+
+    def requeue(self, rows: list[dict]) -> None:
+        """Возвращает в буфер строки, которые не удалось записать (сверх ``max_pending`` — отбрасывает)."""
+        with self._lock:
+            if self._count + len(rows) > self.max_pending:
+                POINT_LOG_DROPPED.inc(amount=len(rows))
+                logger.error("Буфер очков переполнен, отброшено очков: %d", len(rows))
+                return
+            returned: dict[str, list[dict]] = {}
+            for row in rows:
+                returned.setdefault(row["match_uuid"], []).append(row)
+            for match_uuid, batch in returned.items():
+                # Вернувшиеся очки раньше добавленных за время записи
+                self._pending[match_uuid] = batch + self._pending.get(match_uuid, [])
+            self._count += len(rows)
+
+    def _start(self) -> None:
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(target=self._run, name="point-buffer", daemon=True)
+            self._thread.start()
+        atexit.register(self.close)
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.flush_interval):
+            try:
+                self.flush()
+            except Exception as e:
+                logger.error("Ошибка фоновой записи очков: %s", e)
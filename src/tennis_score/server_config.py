@@ -0,0 +1,177 @@
+"""Настройки WSGI-сервера waitress: адрес, пул потоков, соединения, таймауты и буферы.
+
+Источники по возрастанию приоритета:
+
+- значения по умолчанию waitress;
+- TOML-файл из ``WEB_CONFIG``, таблица ``[waitress]``;
+- переменные окружения ``WEB_<НАСТРОЙКА>`` (``WEB_THREADS``, ``WEB_CONNECTION_LIMIT``...).
+
+Настройки проверяются при запуске (``ServerConfig.validate``), пишутся в журнал и
+публикуются на ``/metrics`` как ``tennis_server_setting``. Число потоков сверяется с
+пулом соединений БД: поток, которому не хватило соединения, ждёт его, держа запрос.
+"""
+
+import dataclasses
+import logging
+import os
+from collections.abc import Mapping
+
+import tomllib
+from waitress.adjustments import Adjustments
+
+logger = logging.getLogger("server.config")
+
+# select() не работает с дескрипторами больше FD_SETSIZE (обычно 1024)
+SELECT_FD_LIMIT = 1024
+
+
+@dataclasses.dataclass(frozen=True)
+class ServerConfig:
+    """Настройки waitress; имена полей совпадают с параметрами ``waitress.serve``."""
+
+    host: str = "0.0.0.0"
+    port: int = 8080
+    # Потоков, обрабатывающих запросы
+    threads: int = Adjustments.threads
+    # Одновременно открытых соединений; сверх лимита новые соединения не принимаются
+    connection_limit: int = Adjustments.connection_limit
+    # Секунд простоя, после которых закрывается соединение без запроса в обработке
+    channel_timeout: int = Adjustments.channel_timeout
+    # Очередь ещё не принятых соединений слушающего сокета
+    backlog: int = Adjustments.backlog
+    # Байт, накопив которые ответ отправляется клиенту, не дожидаясь конца тела
+    send_bytes: int = Adjustments.send_bytes
+    # Байт буфера ответа в памяти; больше — во временном файле
+    outbuf_overflow: int = Adjustments.outbuf_overflow
+    # Байт неотправленного ответа, при которых поток приложения ждёт медленного клиента
+    outbuf_high_watermark: int = Adjustments.outbuf_high_watermark
+    # poll() вместо select(): без ограничения на номер дескриптора
+    asyncore_use_poll: bool = Adjustments.asyncore_use_poll
+
+    @classmethod
+    def load(cls, path: str | None = None, environ: Mapping[str, str] | None = None) -> "ServerConfig":
+        """Читает и проверяет настройки из файла и окружения.
+
+        Args:
+            path: TOML-файл с таблицей ``[waitress]``; по умолчанию ``WEB_CONFIG``
+            environ: Переменные окружения; по умолчанию ``os.environ``
+
+        Raises:
+            ValueError: Неизвестная или некорректная настройка
+        """
+        environ = os.environ if environ is None else environ
+        path = path or environ.get("WEB_CONFIG")
+        values: dict[str, object] = {}
+        if path:
+            with open(path, "rb") as f:
+                section = tomllib.load(f).get("waitress", {})
+            unknown = set(section) - set(cls._types())
+            if unknown:
+                raise ValueError(f"Unknown waitress settings in {path}: {', '.join(sorted(unknown))}")
+            values.update({name: cls._parse(name, value) for name, value in section.items()})
+        for name in cls._types():
+            raw = environ.get(f"WEB_{name.upper()}")
+            if raw not in (None, ""):
+                values[name] = cls._parse(name, raw)
+        return cls(**values).validate()
+
+    @classmethod
+    def _types(cls) -> dict[str, type]:
+        return {field.name: field.type for field in dataclasses.fields(cls)}
+
+    @classmethod
+    def _parse(cls, name: str, value: object) -> object:
+        """Приводит значение из файла или окружения к типу настройки."""
+        expected = cls._types()[name]
+        if isinstance(value, expected) and not (expected is int and isinstance(value, bool)):
+            return value
+        if isinstance(value, str):
+            text = value.strip().lower()
+            if expected is bool and text in ("1", "true", "yes", "on", "0", "false", "no", "off"):
+                return text in ("1", "true", "yes", "on")
+            if expected is int:
+                try:
+                    return int(text)
+                except ValueError:
+                    pass
+        raise ValueError(f"Waitress setting {name} must be {expected.__name__}, got {value!r}")
+
+    def validate(self) -> "ServerConfig":
+        """Проверяет диапазоны и согласованность настроек; возвращает себя.
+
+        Raises:
+            ValueError: Перечень всех найденных ошибок
+        """
+        errors = [
+            f"{name} must be positive"
+            for name in (
+                "threads",
+                "connection_limit",
+                "channel_timeout",
+                "backlog",
+                "send_bytes",
+                "outbuf_overflow",
+                "outbuf_high_watermark",
+            )
+            if getattr(self, name) < 1
+        ]
+        if not 0 <= self.port <= 65535:
+            errors.append("port must be in 0..65535")
+        if self.outbuf_high_watermark < self.outbuf_overflow:
+            errors.append("outbuf_high_watermark must not be less than outbuf_overflow")
+        if not self.asyncore_use_poll and self.connection_limit >= SELECT_FD_LIMIT:
+            errors.append(f"connection_limit >= {SELECT_FD_LIMIT} requires asyncore_use_poll")
+        if errors:
+            raise ValueError("Invalid waitress settings: " + "; ".join(errors))
+        if self.connection_limit < self.threads:
+            logger.warning(
+                "connection_limit=%d меньше threads=%d: часть потоков никогда не получит запрос",
+                self.connection_limit,
+                self.threads,
+            )
+        return self
+
+    def serve_kwargs(self) -> dict[str, object]:
+        """Параметры ``waitress.serve``."""
+        return dataclasses.asdict(self)
+
+    def server_kwargs(self) -> dict[str, object]:
+        """Параметры ``waitress.create_server`` для готового слушающего сокета (без адреса)."""
+        kwargs = self.serve_kwargs()
+        del kwargs["host"], kwargs["port"]
+        return kwargs
+
+    def report(self, db_pool_capacity: int | None = None, workers: int = 1) -> None:
+        """Пишет настройки в журнал и публикует их на ``/metrics``.
+
+        Args:
+            db_pool_capacity: Соединений в пуле БД (``pool_size + max_overflow``)
+            workers: Процессов с этими настройками (у каждого свой пул БД)
+        """
+        # Мастер prefork читает настройки, не импортируя приложение; метрики есть только у воркеров
+        from .core.metrics import SERVER_SETTINGS
+
+        settings = self.serve_kwargs()
+        logger.info("Waitress: %s", ", ".join(f"{name}={value}" for name, value in settings.items()))
+        for name, value in settings.items():
+            if isinstance(value, int):
+                SERVER_SETTINGS.set_function(lambda value=int(value): value, (name,))
+        if db_pool_capacity is None:
+            return
+        logger.info(
+            "Соединений с БД: до %d на процесс, до %d на все процессы",
+            db_pool_capacity,
+            db_pool_capacity * workers,
+        )
+        if self.threads > db_pool_capacity:
+            logger.warning(
+                "threads=%d больше соединений пула БД (%d): запросы будут ждать соединение; "
+                "увеличьте DB_POOL_SIZE/DB_MAX_OVERFLOW или уменьшите WEB_THREADS",
+                self.threads,
+                db_pool_capacity,
+            )
+
+
+def load_server_config(path: str | None = None) -> ServerConfig:
+    """Настройки waitress из ``WEB_CONFIG`` и переменных окружения (см. ``ServerConfig.load``)."""
+    return ServerConfig.load(path)
@@ -5,15 +5,20 @@
 Экспортируемые компоненты:
 - MatchDataHandler: обработка и хранение данных матчей
 - MatchService: основной сервис для управления матчами
+- get_match_service: общий экземпляр MatchService, создаваемый при первом обращении
 - ScoreHandler: логика подсчёта очков и правил тенниса
 """
 
 from .match_data_handler import MatchDataHandler  # Работа с данными матчей (CRUD, поиск)
-from .match_service import MatchService  # Главный сервис, координирует бизнес-логику
+from .match_service import (  # Главный сервис, координирует бизнес-логику
+    MatchService,
+    get_match_service,
+)
 from .score_handler import ScoreHandler  # Подсчёт очков, правила, переходы состояний
 
 __all__ = [
     "MatchDataHandler",   # Класс для работы с данными матчей
     "MatchService",       # Главный сервис управления матчами
     "ScoreHandler",       # Подсчёт очков и логика правил
+    "get_match_service",  # Общий экземпляр сервиса (ленивое создание)
 ]
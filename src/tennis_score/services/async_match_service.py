@@ -0,0 +1,134 @@
+"""Асинхронный фасад матчей для ASGI-обработчиков.
+
+``AsyncMatchService`` повторяет методы ``MatchService``, которые обращаются к БД,
+но ждёт её через ``AsyncOrmMatchRepository``. Подсчёт очков, подготовка данных для
+шаблонов, активные матчи и кеш таблицы рейтинга — общие с синхронным сервисом.
+"""
+
+import logging
+import threading
+
+from ..dto.head_to_head_dto import HeadToHeadDTO
+from ..dto.match_dto import MatchDTO
+from ..dto.player_stats_dto import PlayerStatsDTO
+from ..dto.rating_dto import RatingDTO
+from ..repositories.async_orm_repository import AsyncOrmMatchRepository
+from .match_service import MatchService, get_match_service
+
+
+class AsyncMatchService:
+    """Асинхронные двойники методов ``MatchService``, работающих с БД."""
+
+    def __init__(self, service: MatchService, repository: AsyncOrmMatchRepository | None = None):
+        """Инициализирует объект класса.
+
+        Args:
+            service: Синхронный сервис, с которым делятся состояние и обработчики
+            repository: Асинхронный репозиторий; по умолчанию — поверх репозитория ``service``
+        """
+        self.logger = logging.getLogger("service.async")
+        self.service = service
+        self.repository = repository or AsyncOrmMatchRepository(service.repository)
+
+    def create_match(self, player_one_name: str, player_two_name: str) -> MatchDTO:
+        """Создать матч (в памяти, без обращения к БД)."""
+        return self.service.create_match(player_one_name, player_two_name)
+
+    def prepare_match_view_data(self, match_dto: MatchDTO | None) -> dict:
+        return self.service.prepare_match_view_data(match_dto)
+
+    def prepare_completed_match_view_data(self, completed_match: dict) -> dict:
+        return self.service.prepare_completed_match_view_data(completed_match)
+
+    async def get_match_data_by_uuid(self, match_uuid: str) -> MatchDTO | None:
+        """Получить данные матча по UUID: из активных матчей, иначе из БД."""
+        match = self.repository.get_active_match_by_uuid(match_uuid)
+        if match:
+            return match.to_live_dto()
+        match_dto = await self.repository.get_match_by_uuid_from_db(match_uuid)
+        if match_dto is None:
+            self.logger.warning("Match with UUID %s not found in active matches or DB.", match_uuid)
+        return match_dto
+
+    async def update_match_score(self, match_uuid: str, player: str) -> MatchDTO | None:
+        """Обновить счет указанного матча для указанного игрока."""
+        service = self.service
+        match = self.repository.get_active_match_by_uuid(match_uuid)
+        if not match:
+            self.logger.warning("No active match found with UUID %s to update score", match_uuid)
+            return None
+
+        if service.needs_player_ids(match):
+            player1_id_db = await self.repository.get_or_create_player_by_name(match.player_one_name)
+            player2_id_db = await self.repository.get_or_create_player_by_name(match.player_two_name)
+            match.set_player_ids(player1_id_db, player2_id_db)
+
+        rejected = service.reject_point(match, player)
+        if rejected is not None:
+            return rejected
+        try:
+            service.play_point(match, player)
+            if match.winner:
+                await self.repository.save_finished_match(match)
+                self.logger.info("Match finished and saved: %s. Winner: %s", match.match_uid, match.winner)
+                return match.to_final_dto()
+            return match.to_live_dto()
+        except Exception as e:
+            self.logger.error("Error updating score: %s", e, exc_info=True)
+            return match.to_live_dto()
+
+    async def reset_match_score(self, match_uuid: str) -> None:
+        """Сбросить счет указанного матча."""
+        match = self.repository.get_active_match_by_uuid(match_uuid)
+        if not match:
+            self.logger.warning("No active match with UUID %s to reset", match_uuid)
+            return
+        self.service.score_handler.reset_match_score(match)
+        await self.repository.delete_match_points(match_uuid)
+        self.logger.info("Match %s reset completed", match_uuid)
+
+    async def get_completed_match_by_uuid(self, match_uuid: str) -> dict | None:
+        """Получить завершенный матч из базы данных по UUID."""
+        try:
+            return await self.repository.get_completed_match_by_uuid(match_uuid)
+        except Exception as e:
+            self.logger.error("Error retrieving completed match %s: %s", match_uuid, e)
+            return None
+
+    async def list_matches_paginated(
+        self, page: int = 1, per_page: int = 10, filter_query: str | None = None
+    ) -> tuple[list[MatchDTO], int]:
+        """Получить список матчей с пагинацией (DTO, total_pages), опционально с фильтром."""
+        return await self.repository.list_matches_paginated(page, per_page, filter_query)
+
+    async def get_head_to_head(self, name1: str, name2: str) -> HeadToHeadDTO | None:
+        """Получить итоги личных встреч двух игроков (None, если одного из них нет)."""
+        return await self.repository.get_head_to_head(name1, name2)
+
+    async def get_player_stats(self, name: str) -> PlayerStatsDTO | None:
+        """Получить накопленную статистику игрока по имени."""
+        return await self.repository.get_player_stats(name)
+
+    async def get_leaderboard(self, limit: int = 20) -> tuple[tuple, list[RatingDTO]]:
+        """Получить таблицу рейтинга и её версию (кеш общий с ``MatchService``)."""
+        version = await self.repository.ratings_version()
+        entries = self.service.cached_leaderboard(version, limit)
+        if entries is None:
+            entries = await self.repository.get_leaderboard(limit)
+            self.service.store_leaderboard(version, limit, entries)
+        return version, entries
+
+
+# Единый асинхронный сервис процесса поверх общего MatchService; создаётся при первом запросе
+_async_match_service: AsyncMatchService | None = None
+_async_match_service_lock = threading.Lock()
+
+
+def get_async_match_service() -> AsyncMatchService:
+    """Возвращает общий экземпляр AsyncMatchService, создавая его при первом вызове."""
+    global _async_match_service
+    if _async_match_service is None:
+        with _async_match_service_lock:
+            if _async_match_service is None:
+                _async_match_service = AsyncMatchService(get_match_service())
+    return _async_match_service
@@ -27,7 +27,7 @@ class MatchDataHandler:
 
     def create_match(self, player_one_name: str, player_two_name: str) -> MatchDTO:
         """Создать новый матч и вернуть DTO."""
-        self.logger.debug(f"Creating new match: {player_one_name} vs {player_two_name}")
+        self.logger.debug("Creating new match: %s vs %s", player_one_name, player_two_name)
         # match_dto = self.repository.create_match(player_one_name, player_two_name)
         # self._current_match_dto = match_dto  # Сохраняем текущий матч в памяти
         # self.logger.info(f"New match created with UUID: {match_dto.uuid}")
@@ -36,18 +36,18 @@ class MatchDataHandler:
         # match_dto = MatchDTO.from_match(match_instance)  # Преобразование Match в MatchDTO <-- ОШИБКА ЗДЕСЬ
         # Получаем DTO из объекта Match
         match_dto = match_instance.to_live_dto()
-        self.logger.info(f"New match created with UUID: {match_dto.uuid}")
+        self.logger.info("New match created with UUID: %s", match_dto.uuid)
         return match_dto
 
     def get_match_data_by_uuid(self, match_uuid: str) -> MatchDTO | None:
         """Вернуть данные матча по UUID из активных матчей."""
-        self.logger.debug(f"Attempting to get match data for UUID: {match_uuid}")
+        self.logger.debug("Attempting to get match data for UUID: %s", match_uuid)
         match_instance = self.repository.get_active_match_by_uuid(match_uuid)
         if match_instance:
-            self.logger.debug(f"Active match found for UUID: {match_uuid}")
+            self.logger.debug("Active match found for UUID: %s", match_uuid)
             # Исправлено: MatchDTO.from_match на match_instance.to_live_dto()
             return match_instance.to_live_dto()
-        self.logger.debug(f"No active match found for UUID: {match_uuid}. Attempting to fetch from DB.")
+        self.logger.debug("No active match found for UUID: %s. Attempting to fetch from DB.", match_uuid)
         # Попытка загрузить из БД, если не найден в активных
         # (например, завершенный матч)
         # Это предполагает, что в репозитории есть метод для получения матча из БД по UUID
@@ -58,17 +58,19 @@ class MatchDataHandler:
         # или мы можем загрузить объект Match и преобразовать его.
         match_from_db = self.repository.get_match_by_uuid_from_db(match_uuid)  # Предполагаемый метод
         if match_from_db:
-            self.logger.debug(f"Match found in DB for UUID: {match_uuid}")
+            self.logger.debug("Match found in DB for UUID: %s", match_uuid)
             # Если get_match_by_uuid_from_db возвращает объект Match, а не MatchDTO:
             # return MatchDTO.from_match(match_from_db)
             # Если он уже возвращает MatchDTO:
             return match_from_db
-        self.logger.warning(f"Match with UUID {match_uuid} not found in active matches or DB.")
+        self.logger.warning("Match with UUID %s not found in active matches or DB.", match_uuid)
         return None
 
     def list_matches_paginated(
         self, page: int = 1, per_page: int = 10, filter_query: str | None = None
     ) -> tuple[list[MatchDTO], int]:
         """Получить список матчей с пагинацией (DTO, total_pages), опционально с фильтром."""
-        self.logger.debug(f"Listing matches for page {page}, per_page {per_page}, filter: '{filter_query}'")
+        self.logger.debug(
+            "Listing matches for page %s, per_page %s, filter: '%s'", page, per_page, filter_query
+        )
         return self.repository.list_matches_paginated(page, per_page, filter_query)
\ No newline at end of file
@@ -1,9 +1,19 @@
 ﻿"""Фасад для работы с матчами: только координация обработчиков, без бизнес-логики."""
 
 import logging
+import threading
+from collections.abc import Iterator
+from datetime import datetime
 
+from ..core.memory import MEMORY
+from ..core.metrics import ACTIVE_MATCHES, POINTS_SCORED
 from ..core.presentation import ViewDataHandler
+from ..core.unit_of_work import unit_of_work
+from ..dto.head_to_head_dto import HeadToHeadDTO
 from ..dto.match_dto import MatchDTO
+from ..dto.player_stats_dto import PlayerStatsDTO
+from ..dto.rating_dto import RatingDTO
+from ..model.match import Match
 from ..repositories.orm_repository import OrmMatchRepository
 from .match_data_handler import MatchDataHandler
 from .score_handler import ScoreHandler
@@ -17,6 +27,10 @@ class MatchService:
         self.score_handler = ScoreHandler()
         self.view_handler = ViewDataHandler()
         self.data_handler = MatchDataHandler(self.repository)
+        # Таблица рейтинга последней версии: (версия, limit) -> строки
+        self._leaderboard_cache: tuple[tuple, list[RatingDTO]] | None = None
+        ACTIVE_MATCHES.set_function(self.repository.active_match_count)
+        MEMORY.track("leaderboard_cache", lambda: self._leaderboard_cache, lambda cached: len(cached[1]))
         self.logger.debug("MatchService initialized with ORM repository and handlers")
 
     def create_match(self, player_one_name: str, player_two_name: str) -> MatchDTO:
@@ -27,67 +41,98 @@ class MatchService:
         return self.data_handler.get_match_data_by_uuid(match_uuid)
 
     def update_match_score(self, match_uuid: str, player: str) -> MatchDTO | None:
-        """Обновить счет указанного матча для указанного игрока."""
-        match = self.repository.get_active_match_by_uuid(match_uuid)
-        if not match:
-            self.logger.warning(f"No active match found with UUID {match_uuid} to update score")
-            return None
-
-        # Убедимся, что ID игроков установлены в объекте Match.
+        """Обновить счет указанного матча для указанного игрока.
+
+        Чтение, изменение и запись матча выполняются в одной транзакции: с общим
+        хранилищем активных матчей очки одного матча засчитываются по очереди.
+        """
+        with unit_of_work():
+            match = self.repository.get_active_match_by_uuid(match_uuid, for_update=True)
+            if not match:
+                self.logger.warning("No active match found with UUID %s to update score", match_uuid)
+                return None
+
+            if self.needs_player_ids(match):
+                player1_id_db = self.repository.get_or_create_player_by_name(match.player_one_name)
+                player2_id_db = self.repository.get_or_create_player_by_name(match.player_two_name)
+                match.set_player_ids(player1_id_db, player2_id_db)
+                # Объект match был изменен, current_match в репозитории - это ссылка на этот же объект.
+
+            rejected = self.reject_point(match, player)
+            if rejected is not None:
+                return rejected
+            try:
+                self.play_point(match, player)
+                if match.winner: # Проверяем, определен ли победитель матча в ScoreHandler
+                    # Если победитель определен, значит матч завершен.
+                    # ID игроков уже установлены в объекте match ранее.
+                    self.repository.save_finished_match(match)
+                    self.logger.info(
+                        "Match finished and saved: %s. Winner: %s", match.match_uid, match.winner
+                    )
+                    return match.to_final_dto()
+
+                self.repository.save_active_match(match)
+                return match.to_live_dto()
+            except Exception as e:
+                self.logger.error("Error updating score: %s", e, exc_info=True)
+                # Возвращаем DTO с актуальными (возможно, только что установленными) ID
+                return match.to_live_dto() if match else None
+
+    def needs_player_ids(self, match: Match) -> bool:
+        """Не установлены ли в матче ID игроков из БД (первое очко матча)."""
         # Используем getattr для безопасной проверки, существуют ли атрибуты.
         player_one_id_exists = getattr(match, 'player_one_id', None) is not None
         player_two_id_exists = getattr(match, 'player_two_id', None) is not None
+        if player_one_id_exists and player_two_id_exists:
+            return False
+        self.logger.debug(
+            "Player IDs not set for match %s. Fetching/creating and setting them.", match.match_uid
+        )
+        return True
 
-        if not player_one_id_exists or not player_two_id_exists:
-            self.logger.debug(
-                f"Player IDs not set for match {match.match_uid}. Fetching/creating and setting them."
-            )
-            player1_id_db = self.repository.get_or_create_player_by_name(match.player_one_name)
-            player2_id_db = self.repository.get_or_create_player_by_name(match.player_two_name)
-            match.set_player_ids(player1_id_db, player2_id_db)
-            # Объект match был изменен, current_match в репозитории - это ссылка на этот же объект.
-
+    def reject_point(self, match: Match, player: str) -> MatchDTO | None:
+        """DTO для ответа без розыгрыша очка (неизвестный игрок, матч завершён) или None."""
         if player not in ["player1", "player2"]:
-            self.logger.error(f"Invalid player identifier: {player}")
+            self.logger.error("Invalid player identifier: %s", player)
             return match.to_live_dto() # ID игроков теперь точно будут в DTO
         if match.winner: # Если победитель уже был определен ранее
             self.logger.warning("Attempted to update score for a completed match")
             return match.to_final_dto()
+        return None
 
+    def play_point(self, match: Match, player: str) -> None:
+        """Засчитывает очко игроку и добавляет его в журнал очков (без обращения к БД).
+
+        Логика определения победителя матча находится в ScoreHandler:
+        update_regular_score/update_tiebreak_score -> check_set_win -> _check_and_set_match_winner.
+        """
         player_score = match.scores[player]
         opponent = "player2" if player == "player1" else "player1"
         opponent_score = match.scores[opponent]
-        try:
-            if match.is_tiebreak:
-                self.score_handler.update_tiebreak_score(match, player, player_score, opponent_score)
-            else:
-                self.score_handler.update_regular_score(match, player, player_score, opponent_score)
-            
-            # Логика определения победителя матча и сохранения перенесена в ScoreHandler.
-            # Вызывается внутри update_regular_score/update_tiebreak_score -> check_set_win 
-            # -> _check_and_set_match_winner.
-
-            if match.winner: # Проверяем, определен ли победитель матча в ScoreHandler
-                # Если победитель определен, значит матч завершен.
-                # ID игроков уже установлены в объекте match ранее.
-                self.repository.save_finished_match(match)
-                self.logger.info(f"Match finished and saved: {match.match_uid}. Winner: {match.winner}")
-                return match.to_final_dto()
-
-            return match.to_live_dto()
-        except Exception as e:
-            self.logger.error(f"Error updating score: {e}", exc_info=True)
-            # Возвращаем DTO с актуальными (возможно, только что установленными) ID
-            return match.to_live_dto() if match else None
+        if match.is_tiebreak:
+            self.score_handler.update_tiebreak_score(match, player, player_score, opponent_score)
+        else:
+            self.score_handler.update_regular_score(match, player, player_score, opponent_score)
+        POINTS_SCORED.inc()
+        match.points_played += 1
+        self.repository.record_point(match.match_uid, player, seq=match.points_played)
 
     def reset_match_score(self, match_uuid: str) -> None:
         """Сбросить счет указанного матча."""
-        match = self.repository.get_active_match_by_uuid(match_uuid)
-        if not match:
-            self.logger.warning(f"No active match with UUID {match_uuid} to reset")
-            return
-        self.score_handler.reset_match_score(match)
-        self.logger.info(f"Match {match_uuid} reset completed")
+        with unit_of_work():
+            match = self.repository.get_active_match_by_uuid(match_uuid, for_update=True)
+            if not match:
+                self.logger.warning("No active match with UUID %s to reset", match_uuid)
+                return
+            self.score_handler.reset_match_score(match)
+            self.repository.save_active_match(match)
+            self.repository.delete_match_points(match_uuid)
+        self.logger.info("Match %s reset completed", match_uuid)
+
+    def iter_match_points(self, match_uuid: str) -> Iterator[tuple[int, str, datetime]]:
+        """Очки матча по порядку: ``(номер, "player1" | "player2", время)``."""
+        return self.repository.iter_match_points(match_uuid)
 
     def prepare_match_view_data(
         self,
@@ -102,16 +147,61 @@ class MatchService:
         try:
             completed_match = self.repository.get_completed_match_by_uuid(match_uuid)
             if completed_match:
-                self.logger.debug(f"Found completed match {match_uuid} in database")
+                self.logger.debug("Found completed match %s in database", match_uuid)
                 return completed_match
             return None
         except Exception as e:
-            self.logger.error(f"Error retrieving completed match {match_uuid}: {e}")
+            self.logger.error("Error retrieving completed match %s: %s", match_uuid, e)
             return None
 
+    def get_head_to_head(self, name1: str, name2: str) -> HeadToHeadDTO | None:
+        """Получить итоги личных встреч двух игроков (None, если одного из них нет)."""
+        return self.repository.get_head_to_head(name1, name2)
+
+    def get_leaderboard(self, limit: int = 20) -> tuple[tuple, list[RatingDTO]]:
+        """Получить таблицу рейтинга и её версию.
+
+        Строки кешируются до смены версии (новый матч, другая формула или пересчёт
+        таблиц по истории), поэтому повторные просмотры стоят одного запроса версии по первичному ключу.
+
+        Returns:
+            (версия таблицы, строки таблицы)
+        """
+        version = self.repository.ratings_version()
+        entries = self.cached_leaderboard(version, limit)
+        if entries is None:
+            entries = self.repository.get_leaderboard(limit)
+            self.store_leaderboard(version, limit, entries)
+        return version, entries
+
+    def cached_leaderboard(self, version: tuple, limit: int) -> list[RatingDTO] | None:
+        """Строки таблицы рейтинга из кеша, если они есть для этой версии и ``limit``."""
+        cached = self._leaderboard_cache
+        if cached is not None and cached[0] == (version, limit):
+            return cached[1]
+        return None
+
+    def store_leaderboard(self, version: tuple, limit: int, entries: list[RatingDTO]) -> None:
+        """Кеширует строки таблицы рейтинга версии ``version`` (вытесняя предыдущие)."""
+        self._leaderboard_cache = ((version, limit), entries)
+
+    def get_player_stats(self, name: str) -> PlayerStatsDTO | None:
+        """Получить накопленную статистику игрока по имени."""
+        return self.repository.get_player_stats(name)
+
     def prepare_completed_match_view_data(self, completed_match: dict) -> dict:
-        """Подготовить данные для отображения завершенного матча."""
+        """Подготовить данные для отображения завершенного матча.
+
+        Сеты и геймы берутся из структурированного счёта (``set_scores``): выигранные
+        сеты каждого игрока и геймы последнего сета.
+        """
         try:
+            set_scores = completed_match.get("set_scores") or []
+            sets_won = [
+                sum(1 for p1, p2, *_ in set_scores if p1 > p2),
+                sum(1 for p1, p2, *_ in set_scores if p2 > p1),
+            ]
+            last_set_games = list(set_scores[-1][:2]) if set_scores else [0, 0]
             return {
                 "match_uuid": completed_match.get("match_uid", ""),
                 "player_one_name": completed_match.get("player_one_name", "N/A"),
@@ -120,14 +210,15 @@ class MatchService:
                 "final_score": completed_match.get("final_score", "Данные недоступны"),
                 "completed_at": completed_match.get("completed_at", ""),
                 "info": f"Матч завершен. Победитель: {completed_match.get('winner', 'N/A')}",
+                "set_scores": set_scores,
                 "score": {
-                    "sets": [0, 0],  # Данные сетов можно извлечь из final_score если нужно
-                    "games": [0, 0],
+                    "sets": sets_won,
+                    "games": last_set_games,
                     "points": ["0", "0"]
                 }
             }
         except Exception as e:
-            self.logger.error(f"Error preparing completed match view data: {e}")
+            self.logger.error("Error preparing completed match view data: %s", e)
             return {
                 "match_uuid": completed_match.get("match_uid", "") if completed_match else "",
                 "player_one_name": "N/A",
@@ -136,3 +227,18 @@ class MatchService:
                 "error": "Ошибка при подготовке данных матча",
                 "score": {"sets": [0, 0], "games": [0, 0], "points": ["0", "0"]}
             }
+
+
+# Единый экземпляр сервиса процесса; создаётся при первом запросе, а не при импорте
+_match_service: MatchService | None = None
+_match_service_lock = threading.Lock()
+
+
+def get_match_service() -> MatchService:
+    """Возвращает общий экземпляр MatchService, создавая его при первом вызове."""
+    global _match_service
+    if _match_service is None:
+        with _match_service_lock:
+            if _match_service is None:
+                _match_service = MatchService()
+    return _match_service
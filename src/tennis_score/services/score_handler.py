@@ -24,7 +24,7 @@ class ScoreHandler:
         if player_score.get("sets", 0) >= sets_to_win:
             match.set_winner(player_key)
             self.logger.info(
-                f"Player {player_key} has won the match with {player_score.get('sets', 0)} sets."
+                "Player %s has won the match with %s sets.", player_key, player_score.get('sets', 0)
             )
 
     def update_regular_score(
@@ -46,13 +46,15 @@ class ScoreHandler:
         opponent_points = opponent_score["points"]
         
         self.logger.debug(
-            f"Updating regular score: player {player} has {match.score_values[score]} points, "
-            f"opponent has {match.score_values[opponent_points]} points"
+            "Updating regular score: player %s has %s points, opponent has %s points",
+            player,
+            match.score_values[score],
+            match.score_values[opponent_points],
         )
 
         if player_score["advantage"]:
             # Игрок с преимуществом набирает еще одно очко = выигрывает гейм
-            self.logger.info(f"Player {player} with advantage scores a point and wins the game")
+            self.logger.info("Player %s with advantage scores a point and wins the game", player)
             player_score["advantage"] = False
             opponent_score["advantage"] = False
             player_score["games"] += 1
@@ -65,22 +67,22 @@ class ScoreHandler:
             old_points = match.score_values[score]
             player_score["points"] += 1
             new_points = match.score_values[player_score["points"]]
-            self.logger.debug(f"Player {player} scores: {old_points} -> {new_points}")
+            self.logger.debug("Player %s scores: %s -> %s", player, old_points, new_points)
         elif score == len(match.score_values) - 1:
             # Игрок имеет 40 очков
             if opponent_points == len(match.score_values) - 1:
                 # Соперник тоже имеет 40 очков
                 if opponent_score["advantage"]:
                     # Соперник имел преимущество, теперь оно снимается (равенство)
-                    self.logger.info(f"Player {player} scores: advantage removed, now DEUCE")
+                    self.logger.info("Player %s scores: advantage removed, now DEUCE", player)
                     opponent_score["advantage"] = False
                 else:
                     # Игрок получает преимущество
-                    self.logger.info(f"Player {player} scores and gets ADVANTAGE")
+                    self.logger.info("Player %s scores and gets ADVANTAGE", player)
                     player_score["advantage"] = True
             else:
                 # Соперник имеет меньше 40 очков, игрок выигрывает гейм
-                self.logger.info(f"Player {player} scores at 40 and wins the game")
+                self.logger.info("Player %s scores at 40 and wins the game", player)
                 player_score["games"] += 1
                 player_score["points"] = 0
                 opponent_score["points"] = 0
@@ -105,13 +107,15 @@ class ScoreHandler:
         """
         # Добавляем подробное логирование 
         self.logger.debug(
-            f"Updating tiebreak: player {player} has {player_score['tiebreak_points']} points, "
-            f"opponent has {opponent_score['tiebreak_points']} points"
+            "Updating tiebreak: player %s has %s points, opponent has %s points",
+            player,
+            player_score['tiebreak_points'],
+            opponent_score['tiebreak_points'],
         )
         
         player_score["tiebreak_points"] += 1
         points = player_score["tiebreak_points"]
-        self.logger.debug(f"Player {player} scores in tiebreak: now {points} points")
+        self.logger.debug("Player %s scores in tiebreak: now %s points", player, points)
         
         # Проверка победы: 7 очков и преимущество в 2
         win_condition = (
@@ -123,8 +127,12 @@ class ScoreHandler:
             p_score = player_score["tiebreak_points"]
             o_score = opponent_score["tiebreak_points"]
             self.logger.info(
-                f"Player {player} wins tiebreak and set. Score: {p_score}-{o_score}. "
-                f"Total sets for {player}: {player_score.get('sets',0)}"
+                "Player %s wins tiebreak and set. Score: %s-%s. Total sets for %s: %s",
+                player,
+                p_score,
+                o_score,
+                player,
+                player_score.get('sets', 0),
             )
 
             # Записываем счет сета в историю перед сбросом
@@ -170,7 +178,7 @@ class ScoreHandler:
             opponent_score: счет соперника
         """
         self.logger.debug(
-            f"Checking set win: games {player_score['games']}-{opponent_score['games']}"
+            "Checking set win: games %s-%s", player_score['games'], opponent_score['games']
         )
         
         pg = player_score["games"]
@@ -186,7 +194,7 @@ class ScoreHandler:
 
         if set_won:
             self.logger.info(
-                f"Player {player_key} won set with score {pg}-{og}"
+                "Player %s won set with score %s-%s", player_key, pg, og
             )
             # Записываем счет сета в историю перед сбросом
             if player_key == "player1":
@@ -234,4 +242,5 @@ class ScoreHandler:
         }
         match.is_tiebreak = False
         match.winner = None
+        match.points_played = 0
         self.logger.info("Match score reset to initial state")
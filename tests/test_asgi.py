@@ -0,0 +1,209 @@
+"""ASGI-приложение: перевод ``scope`` в ``environ``, чтение тела, отправка ответа и маршрутизация."""
+
+import json
+import unittest
+from unittest import mock
+
+from src.tennis_score.core import asgi
+from src.tennis_score.core.asgi import AsgiApplication
+from src.tennis_score.core.asgi_environ import build_environ, read_body, send_response
+from src.tennis_score.core.response import make_response
+from src.tennis_score.core.unit_of_work import current_unit_of_work
+
+
+def http_scope(path: str = "/", method: str = "GET", headers=(), **scope) -> dict:
+    """``scope`` HTTP-запроса ASGI."""
+    return {"type": "http", "method": method, "path": path, "headers": list(headers), **scope}
+
+
+def receiver(*chunks: bytes, disconnect: bool = False):
+    """``receive`` с телом из порций ``chunks``."""
+    messages = [{"type": "http.request", "body": chunk, "more_body": True} for chunk in chunks]
+    messages[-1]["more_body"] = False
+    if disconnect:
+        messages[-1]["more_body"] = True
+        messages.append({"type": "http.disconnect"})
+
+    async def receive():
+        return messages.pop(0) if messages else {"type": "http.disconnect"}
+
+    return receive
+
+
+class Orchestrator:
+    """Рендерит ответ контроллера как JSON с шаблоном и контекстом вместо HTML."""
+
+    def respond(self, route: dict):
+        """Статус, заголовки и тело ответа контроллера."""
+        content = json.dumps({"template": route["template"], "context": route["context"]}, default=str)
+        return route["status"], route["headers"], [content.encode()]
+
+
+class BuildEnvironTest(unittest.TestCase):
+    """``build_environ`` строит окружение WSGI по ``scope``."""
+
+    def test_request_fields(self):
+        scope = http_scope(
+            "/matches",
+            query_string=b"page=2&filter=%D0%B0",
+            root_path="/app",
+            server=("tennis.local", 8000),
+            client=("10.0.0.1", 51000),
+            scheme="https",
+            http_version="2",
+        )
+        environ = build_environ(scope, b"a=1")
+        self.assertEqual(environ["REQUEST_METHOD"], "GET")
+        self.assertEqual(environ["PATH_INFO"], "/matches")
+        self.assertEqual(environ["SCRIPT_NAME"], "/app")
+        self.assertEqual(environ["QUERY_STRING"], "page=2&filter=%D0%B0")
+        self.assertEqual((environ["SERVER_NAME"], environ["SERVER_PORT"]), ("tennis.local", "8000"))
+        self.assertEqual(environ["SERVER_PROTOCOL"], "HTTP/2")
+        self.assertEqual(environ["REMOTE_ADDR"], "10.0.0.1")
+        self.assertEqual(environ["wsgi.url_scheme"], "https")
+        self.assertEqual(environ["CONTENT_LENGTH"], "3")
+        self.assertEqual(environ["wsgi.input"].read(), b"a=1")
+
+    def test_defaults(self):
+        environ = build_environ(http_scope())
+        self.assertEqual((environ["SERVER_NAME"], environ["SERVER_PORT"]), ("localhost", "80"))
+        self.assertEqual(environ["QUERY_STRING"], "")
+        self.assertEqual(environ["CONTENT_LENGTH"], "0")
+
+    def test_headers(self):
+        headers = [
+            (b"content-type", b"application/json"),
+            (b"content-length", b"999"),
+            (b"x-forwarded-for", b"1.2.3.4"),
+            (b"accept", b"text/html"),
+            (b"accept", b"application/json"),
+        ]
+        environ = build_environ(http_scope(headers=headers), b"{}")
+        self.assertEqual(environ["CONTENT_TYPE"], "application/json")
+        # Длина — по фактически прочитанному телу, а не по заголовку
+        self.assertEqual(environ["CONTENT_LENGTH"], "2")
+        self.assertNotIn("HTTP_CONTENT_TYPE", environ)
+        self.assertEqual(environ["HTTP_X_FORWARDED_FOR"], "1.2.3.4")
+        self.assertEqual(environ["HTTP_ACCEPT"], "text/html,application/json")
+
+
+class BodyTest(unittest.IsolatedAsyncioTestCase):
+    """Чтение тела с лимитом и отправка ответа сообщениями ASGI."""
+
+    async def test_read_body(self):
+        self.assertEqual(await read_body(receiver(b"a=", b"1", b"&b=2"), 100), b"a=1&b=2")
+        self.assertEqual(await read_body(receiver(b"a=1", disconnect=True), 100), b"a=1")
+
+    async def test_read_body_stops_after_limit(self):
+        receive = receiver(b"x" * 8, b"x" * 8, b"rest")
+        self.assertEqual(await read_body(receive, 10), b"x" * 11)
+        # Остаток тела не читается
+        self.assertEqual(await receive(), {"type": "http.request", "body": b"rest", "more_body": False})
+
+    async def test_send_response_streams_chunks(self):
+        sent = []
+        closed = []
+
+        class Body:
+            """Тело ответа с ``close``, как у потокового рендеринга."""
+
+            def __iter__(self):
+                """Порции тела, включая пустую."""
+                return iter([b"<ul>", b"", b"</ul>"])
+
+            def close(self):
+                """Отмечает закрытие тела."""
+                closed.append(True)
+
+        async def send(message):
+            sent.append(message)
+
+        start = {"type": "http.response.start", "status": 201, "headers": [(b"content-type", b"text/html")]}
+        for blocking in (False, True):
+            with self.subTest(blocking=blocking):
+                sent.clear()
+                await send_response(send, "201 Created", [("Content-Type", "text/html")], Body(), blocking)
+                self.assertEqual(
+                    sent,
+                    [
+                        start,
+                        {"type": "http.response.body", "body": b"<ul>", "more_body": True},
+                        {"type": "http.response.body", "body": b"</ul>", "more_body": True},
+                        {"type": "http.response.body", "body": b"", "more_body": False},
+                    ],
+                )
+        self.assertEqual(closed, [True, True])
+
+
+class AsgiApplicationTest(unittest.IsolatedAsyncioTestCase):
+    """Асинхронные маршруты вызываются корутинами, остальные — в пуле потоков."""
+
+    def setUp(self):
+        self.calls = []
+        self.app = AsgiApplication(Orchestrator(), async_routes={("/leaderboard", "GET"): self.leaderboard})
+
+    async def leaderboard(self, params: dict) -> dict:
+        """Асинхронный контроллер, запоминающий параметры."""
+        self.calls.append(params)
+        return make_response("leaderboard.html", {"limit": params.get("limit")})
+
+    async def request(self, path: str, method: str = "GET", body: bytes = b"", **scope):
+        sent = []
+
+        async def send(message):
+            sent.append(message)
+
+        await self.app(http_scope(path, method, **scope), receiver(body), send)
+        payload = b"".join(message.get("body", b"") for message in sent[1:])
+        return sent[0]["status"], json.loads(payload)
+
+    async def test_async_route(self):
+        status, payload = await self.request("/leaderboard", query_string=b"limit=5")
+        self.assertEqual(status, 200)
+        self.assertEqual(payload, {"template": "leaderboard.html", "context": {"limit": ["5"]}})
+        self.assertEqual(self.calls, [{"limit": ["5"]}])
+
+    async def test_sync_route_in_thread(self):
+        status, payload = await self.request("/")
+        self.assertEqual((status, payload["template"]), (200, "index.html"))
+        with self.assertLogs("core.routing", "WARNING"):
+            self.assertEqual((await self.request("/missing"))[0], 404)
+
+    async def test_rejected_body(self):
+        headers = [(b"content-type", b"text/plain")]
+        with self.assertLogs("core.routing", "WARNING"):
+            status, payload = await self.request("/new-match", "POST", b"a=1", headers=headers)
+        self.assertEqual((status, payload["template"]), (415, "error.html"))
+
+    async def test_sync_route_unit_of_work(self):
+        events = []
+
+        def route_request(path, method, environ):
+            uow = current_unit_of_work.get()
+            uow.after_commit(lambda: events.append("commit"))
+            uow.after_rollback(lambda: events.append("rollback"))
+            return make_response(None, status=path.strip("/"))
+
+        with mock.patch.object(asgi, "route_request", route_request):
+            self.assertEqual((await self.request("/200 OK"))[0], 200)
+            self.assertEqual((await self.request("/500 Internal Server Error"))[0], 500)
+        self.assertEqual(events, ["commit", "rollback"])
+
+    async def test_lifespan(self):
+        # Без асинхронных маршрутов при остановке нечего закрывать
+        app = AsgiApplication(Orchestrator(), async_routes={})
+        messages = [{"type": "lifespan.startup"}, {"type": "lifespan.shutdown"}]
+        sent = []
+
+        async def receive():
+            return messages.pop(0)
+
+        async def send(message):
+            sent.append(message["type"])
+
+        await app({"type": "lifespan"}, receive, send)
+        self.assertEqual(sent, ["lifespan.startup.complete", "lifespan.shutdown.complete"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,141 @@
+"""Движок SQLite: база в памяти и файл в WAL, создание схемы, пул и upsert-помощники."""
+
+import os
+import tempfile
+import threading
+import unittest
+from unittest import mock
+
+from sqlalchemy import inspect, select, text
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import sessionmaker
+
+from src.tennis_score.model.orm_models import Base, PlayerORM, PlayerRatingORM, TableRevisionORM
+from src.tennis_score.repositories.engine import (
+    create_db_engine,
+    insert_missing,
+    is_sqlite_memory,
+    pool_capacity,
+    upsert_increment,
+)
+
+
+class DbUrlTest(unittest.TestCase):
+    """Разбор URL и ёмкость пула."""
+
+    def test_is_sqlite_memory(self):
+        for url in ("sqlite://", "sqlite:///:memory:", "sqlite:///file:db?mode=memory&uri=true"):
+            with self.subTest(url=url):
+                self.assertTrue(is_sqlite_memory(url))
+        for url in ("sqlite:///tennis.db", "postgresql://user@localhost/tennis"):
+            with self.subTest(url=url):
+                self.assertFalse(is_sqlite_memory(url))
+
+    def test_pool_capacity(self):
+        with mock.patch.dict(os.environ, {"DB_POOL_SIZE": "3", "DB_MAX_OVERFLOW": "2"}):
+            self.assertEqual(pool_capacity("postgresql://user@localhost/tennis"), 5)
+            self.assertEqual(pool_capacity("sqlite:///tennis.db"), 5)
+            self.assertEqual(pool_capacity("sqlite://"), 1)
+
+
+class MemoryEngineTest(unittest.TestCase):
+    """``sqlite://``: схема по ``Base.metadata`` и одна база на все потоки."""
+
+    def setUp(self):
+        self.engine = create_db_engine("sqlite://")
+        self.addCleanup(self.engine.dispose)
+        self.Session = sessionmaker(bind=self.engine)
+
+    def test_schema_created(self):
+        self.assertLessEqual(set(Base.metadata.tables), set(inspect(self.engine).get_table_names()))
+
+    def test_foreign_keys_enabled(self):
+        with self.engine.connect() as connection:
+            self.assertEqual(connection.execute(text("PRAGMA foreign_keys")).scalar(), 1)
+
+    def test_other_thread_sees_same_database(self):
+        with self.Session.begin() as session:
+            session.add(PlayerORM(name="Надаль"))
+
+        names = []
+
+        def read():
+            with self.Session() as session:
+                names.extend(session.scalars(select(PlayerORM.name)))
+
+        thread = threading.Thread(target=read)
+        thread.start()
+        thread.join()
+        self.assertEqual(names, ["Надаль"])
+
+    def test_single_connection(self):
+        self.assertEqual(self.engine.pool.size(), 1)
+        self.assertEqual(self.engine.pool._max_overflow, 0)
+
+
+class FileEngineTest(unittest.TestCase):
+    """``sqlite:///путь.db``: файл в режиме WAL, схема создаётся один раз."""
+
+    def setUp(self):
+        db_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(db_dir.cleanup)
+        self.url = f"sqlite:///{os.path.join(db_dir.name, 'tennis.db')}"
+
+    def make_engine(self):
+        engine = create_db_engine(self.url)
+        self.addCleanup(engine.dispose)
+        return engine
+
+    def test_wal_and_pragmas(self):
+        with self.make_engine().connect() as connection:
+            self.assertEqual(connection.execute(text("PRAGMA journal_mode")).scalar(), "wal")
+            self.assertEqual(connection.execute(text("PRAGMA foreign_keys")).scalar(), 1)
+            self.assertEqual(connection.execute(text("PRAGMA synchronous")).scalar(), 1)  # NORMAL
+
+    def test_data_survives_new_engine(self):
+        engine = self.make_engine()
+        self.assertIn("players", inspect(engine).get_table_names())
+        with sessionmaker(bind=engine).begin() as session:
+            session.add(PlayerORM(name="Федерер"))
+        engine.dispose()
+
+        # Повторное создание схемы не трогает существующие таблицы
+        with sessionmaker(bind=self.make_engine())() as session:
+            self.assertEqual(session.query(PlayerORM.name).scalar(), "Федерер")
+
+
+class UpsertTest(unittest.TestCase):
+    """``insert_missing`` и ``upsert_increment`` через ``ON CONFLICT`` в SQLite."""
+
+    def setUp(self):
+        engine = create_db_engine("sqlite://")
+        self.addCleanup(engine.dispose)
+        self.Session = sessionmaker(bind=engine)
+
+    def revision(self, table_name: str) -> int | None:
+        with self.Session() as session:
+            row = session.get(TableRevisionORM, table_name)
+            return row.revision if row else None
+
+    def test_insert_missing_keeps_existing_row(self):
+        key = {"table_name": "player_ratings"}
+        with self.Session.begin() as session:
+            insert_missing(session, TableRevisionORM, key, {"revision": 3})
+            insert_missing(session, TableRevisionORM, key, {"revision": 7})
+        self.assertEqual(self.revision("player_ratings"), 3)
+
+    def test_upsert_increment(self):
+        key = {"table_name": "player_stats"}
+        with self.Session.begin() as session:
+            upsert_increment(session, TableRevisionORM, key, {"revision": 1})
+            upsert_increment(session, TableRevisionORM, key, {"revision": 2})
+            upsert_increment(session, TableRevisionORM, key, {"revision": 0})
+        self.assertEqual(self.revision("player_stats"), 3)
+
+    def test_foreign_key_violation(self):
+        with self.assertRaises(IntegrityError), self.Session.begin() as session:
+            session.add(PlayerRatingORM(player_id=999, rating=1500.0))
+
+
+if __name__ == "__main__":
+    unittest.main()
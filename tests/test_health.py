@@ -0,0 +1,112 @@
+"""Пробы ``/healthz`` и ``/readyz``: ответы, кеширование и таймаут проверок готовности."""
+
+import json
+import threading
+import unittest
+
+from src.tennis_score.core.middleware.health import HealthMiddleware, ReadinessCheck
+
+
+def app(environ, start_response):
+    """Приложение за middleware проб."""
+    start_response("200 OK", [("Content-Type", "text/plain")])
+    return [b"app"]
+
+
+class HealthTestCase(unittest.TestCase):
+    """Вызов ``HealthMiddleware`` с заданными проверками готовности."""
+
+    def make(self, checks: dict, **options) -> HealthMiddleware:
+        readiness = ReadinessCheck(checks, **options)
+        self.addCleanup(readiness._executor.shutdown, wait=True)
+        return HealthMiddleware(app, readiness=readiness)
+
+    @staticmethod
+    def call(middleware, path: str, method: str = "GET") -> tuple[str, dict, bytes]:
+        response = {}
+
+        def start_response(status, headers, exc_info=None):
+            response["status"] = status
+            response["headers"] = dict(headers)
+
+        body = b"".join(middleware({"PATH_INFO": path, "REQUEST_METHOD": method}, start_response))
+        return response["status"], response["headers"], body
+
+
+class HealthzTest(HealthTestCase):
+    """Проба живости не выполняет проверок."""
+
+    def test_healthz(self):
+        calls = []
+        middleware = self.make({"database": lambda: calls.append(1)})
+        status, headers, body = self.call(middleware, "/healthz")
+        self.assertEqual((status, body), ("200 OK", b"ok"))
+        self.assertEqual(headers["Cache-Control"], "no-store")
+        self.assertEqual(calls, [])
+
+    def test_head_has_no_body(self):
+        status, headers, body = self.call(self.make({}), "/healthz", "HEAD")
+        self.assertEqual(status, "200 OK")
+        self.assertEqual(headers["Content-Length"], "2")
+        self.assertEqual(body, b"")
+
+    def test_other_paths_reach_app(self):
+        self.assertEqual(self.call(self.make({}), "/matches")[2], b"app")
+
+
+class ReadyzTest(HealthTestCase):
+    """Проба готовности: результат проверок, кеш на ``cache_ttl`` и ``timeout``."""
+
+    def test_ready(self):
+        middleware = self.make({"database": lambda: None, "active_matches": lambda: 3})
+        status, headers, body = self.call(middleware, "/readyz")
+        self.assertEqual(status, "200 OK")
+        self.assertEqual(headers["Content-Type"], "application/json")
+        payload = json.loads(body)
+        self.assertEqual(payload["status"], "ready")
+        self.assertTrue(payload["checks"]["database"]["ok"])
+        self.assertEqual(payload["checks"]["active_matches"]["value"], 3)
+
+    def test_failed_check_returns_503(self):
+        def database():
+            raise ConnectionError("connection refused")
+
+        middleware = self.make({"database": database, "active_matches": lambda: 0})
+        with self.assertLogs("core.health", "WARNING"):
+            status, _, body = self.call(middleware, "/readyz")
+        self.assertEqual(status, "503 Service Unavailable")
+        payload = json.loads(body)
+        self.assertEqual(payload["status"], "unavailable")
+        self.assertEqual(payload["checks"]["database"], {"ok": False, "error": "connection refused"})
+        self.assertTrue(payload["checks"]["active_matches"]["ok"])
+
+    def test_result_cached_for_ttl(self):
+        calls = []
+        middleware = self.make({"database": lambda: calls.append(1)}, cache_ttl=60)
+        for _ in range(5):
+            self.assertEqual(self.call(middleware, "/readyz")[0], "200 OK")
+        self.assertEqual(len(calls), 1)
+
+    def test_expired_cache_rechecks(self):
+        calls = []
+        middleware = self.make({"database": lambda: calls.append(1)}, cache_ttl=0)
+        for _ in range(3):
+            self.call(middleware, "/readyz")
+        self.assertEqual(len(calls), 3)
+
+    def test_slow_check_times_out(self):
+        release = threading.Event()
+        self.addCleanup(release.set)
+        middleware = self.make({"database": lambda: release.wait(5)}, timeout=0.05, cache_ttl=60)
+        status, _, body = self.call(middleware, "/readyz")
+        self.assertEqual(status, "503 Service Unavailable")
+        self.assertIn("timeout", json.loads(body)["checks"])
+
+        # Проверка продолжается в фоне, и её результат достаётся следующей пробе
+        release.set()
+        middleware.readiness.timeout = 5
+        self.assertEqual(self.call(middleware, "/readyz")[0], "200 OK")
+
+
+if __name__ == "__main__":
+    unittest.main()
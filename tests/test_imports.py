@@ -0,0 +1,38 @@
+"""Модули слоёв импортируются по отдельности, без обязательного порядка импорта пакетов."""
+
+import os
+import subprocess
+import sys
+import unittest
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+MODULES = (
+    "src.tennis_score.core",
+    "src.tennis_score.core.metrics",
+    "src.tennis_score.repositories.orm_repository",
+    "src.tennis_score.repositories.point_buffer",
+    "src.tennis_score.services.match_service",
+    "src.tennis_score.controllers",
+    "src.tennis_score.manage",
+)
+
+
+class StandaloneImportTest(unittest.TestCase):
+    """Каждый модуль импортируется первым в чистом интерпретаторе (циклов импорта нет)."""
+
+    def test_modules_import_standalone(self):
+        for module in MODULES:
+            with self.subTest(module=module):
+                result = subprocess.run(
+                    [sys.executable, "-c", f"import {module}"],
+                    cwd=ROOT_DIR,
+                    capture_output=True,
+                    text=True,
+                    env={**os.environ, "LOG_FILE": ""},
+                )
+                self.assertEqual(result.returncode, 0, result.stderr)
+
+
+if __name__ == "__main__":
+    unittest.main()
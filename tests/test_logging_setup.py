@@ -0,0 +1,104 @@
+"""Неблокирующее логирование: прореживание DEBUG, отложенное форматирование, фоновая запись."""
+
+import io
+import logging
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from src.tennis_score import logging_setup
+from src.tennis_score.logging_setup import (
+    DebugSamplingFilter,
+    DeferredQueueHandler,
+    setup_logging,
+    stop_logging,
+)
+
+
+def make_record(level: int = logging.DEBUG, name: str = "service", msg: str = "msg", args=()):
+    """Запись журнала логгера ``name``."""
+    return logging.LogRecord(name, level, __file__, 1, msg, args, None)
+
+
+class DebugSamplingFilterTest(unittest.TestCase):
+    """``DebugSamplingFilter`` пропускает часть DEBUG-записей и все записи INFO и выше."""
+
+    def test_info_always_passes(self):
+        debug_filter = DebugSamplingFilter(sample_every=10, max_per_second=1)
+        self.assertTrue(all(debug_filter.filter(make_record(logging.INFO)) for _ in range(100)))
+        self.assertEqual(debug_filter.dropped, 0)
+
+    def test_sampling_per_logger(self):
+        debug_filter = DebugSamplingFilter(sample_every=3)
+        passed = [debug_filter.filter(make_record()) for _ in range(9)]
+        self.assertEqual(passed.count(True), 3)
+        # Счётчик свой у каждого логгера: первая запись другого логгера проходит
+        self.assertTrue(debug_filter.filter(make_record(name="repository")))
+        self.assertEqual(debug_filter.dropped, 6)
+
+    def test_rate_limit(self):
+        with mock.patch.object(logging_setup.time, "monotonic", return_value=100.0):
+            debug_filter = DebugSamplingFilter(max_per_second=5)
+            passed = [debug_filter.filter(make_record()) for _ in range(8)]
+        self.assertEqual(passed, [True] * 5 + [False] * 3)
+        # Через секунду корзина снова полна
+        with mock.patch.object(logging_setup.time, "monotonic", return_value=101.0):
+            self.assertTrue(debug_filter.filter(make_record()))
+
+
+class DeferredQueueHandlerTest(unittest.TestCase):
+    """Сообщение собирается в рабочем потоке только для изменяемых аргументов."""
+
+    def setUp(self):
+        self.handler = DeferredQueueHandler(None)
+
+    def test_immutable_args_are_deferred(self):
+        record = self.handler.prepare(make_record(msg="Матч %s: %d", args=("uuid", 3)))
+        self.assertEqual(record.args, ("uuid", 3))
+        self.assertEqual(record.getMessage(), "Матч uuid: 3")
+
+    def test_mutable_args_are_formatted_now(self):
+        points = [1, 2]
+        record = self.handler.prepare(make_record(msg="Очки %s", args=(points,)))
+        points.append(3)
+        self.assertIsNone(record.args)
+        self.assertEqual(record.getMessage(), "Очки [1, 2]")
+
+
+class SetupLoggingTest(unittest.TestCase):
+    """``setup_logging`` пишет записи в консоль и файл фоновым потоком."""
+
+    def setUp(self):
+        root = logging.getLogger()
+        handlers, level = root.handlers[:], root.level
+        self.addCleanup(root.setLevel, level)
+        self.addCleanup(setattr, root, "handlers", handlers)
+        self.addCleanup(stop_logging)
+        log_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(log_dir.cleanup)
+        self.log_file = os.path.join(log_dir.name, "app.log")
+        self.console = io.StringIO()
+
+    def test_records_written_by_listener(self):
+        with mock.patch("sys.stdout", self.console):
+            setup_logging("INFO", self.log_file)
+        self.assertIsNotNone(logging_setup.log_queue())
+        logging.getLogger("service.match").info("Матч %s сохранён", "abc")
+        logging.getLogger("service.match").debug("не попадёт: уровень INFO")
+        stop_logging()
+        self.assertIsNone(logging_setup.log_queue())
+        with open(self.log_file, encoding="utf-8") as f:
+            content = f.read()
+        self.assertIn("Матч abc сохранён", content)
+        self.assertNotIn("не попадёт", content)
+        self.assertIn("Матч abc сохранён", self.console.getvalue())
+
+    def test_empty_log_file_disables_file(self):
+        with mock.patch("sys.stdout", self.console):
+            listener = setup_logging("INFO", "")
+        self.assertEqual([type(h) for h in listener.handlers], [logging.StreamHandler])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,211 @@
+"""Учёт памяти: глубокий размер контейнеров, реестр, снимки tracemalloc и ``/admin/memory``."""
+
+import json
+import sys
+import tracemalloc
+import unittest
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from src.tennis_score.core.memory import (
+    MemoryRegistry,
+    TracemallocSnapshots,
+    deep_sizeof,
+    session_stats,
+)
+from src.tennis_score.core.middleware.memory import MemoryMiddleware
+from src.tennis_score.model.orm_models import Base, PlayerORM
+
+TOKEN = "secret"
+
+
+def app(environ, start_response):
+    """Приложение за middleware учёта памяти."""
+    start_response("200 OK", [("Content-Type", "text/plain")])
+    return [b"app"]
+
+
+class DeepSizeofTest(unittest.TestCase):
+    """``deep_sizeof`` суммирует достижимые объекты, каждый один раз."""
+
+    def test_includes_nested_objects(self):
+        payload = ["x" * 1000, "y" * 1000]
+        size, truncated = deep_sizeof({"items": payload})
+        self.assertFalse(truncated)
+        self.assertGreaterEqual(size, sys.getsizeof(payload) + 2000)
+
+    def test_shared_object_counted_once(self):
+        text = "z" * 10_000
+        single, _ = deep_sizeof([text])
+        double, _ = deep_sizeof([text, text])
+        self.assertLess(double - single, 100)
+
+    def test_skips_functions_and_modules(self):
+        shared = [deep_sizeof, sys, DeepSizeofTest]
+        self.assertEqual(deep_sizeof(shared)[0], sys.getsizeof(shared))
+
+    def test_limit(self):
+        size, truncated = deep_sizeof([[i] for i in range(1000)], limit=10)
+        self.assertTrue(truncated)
+        self.assertGreater(size, 0)
+
+
+class MemoryRegistryTest(unittest.TestCase):
+    """Отчёт реестра: записи, размер и ошибки источников."""
+
+    def test_report(self):
+        registry = MemoryRegistry()
+        cache = {"a": "x" * 1000, "b": "y" * 1000}
+        registry.track("cache", lambda: cache)
+        registry.track("pending", lambda: None)
+        registry.track("pairs", lambda: [(1, 2), (3, 4), (5, 6)], lambda pairs: len(pairs) * 2)
+        registry.track("broken", lambda: 1 / 0)
+        report = registry.report()
+        self.assertEqual(list(report), ["broken", "cache", "pairs", "pending"])
+        self.assertEqual(report["cache"]["entries"], 2)
+        self.assertGreaterEqual(report["cache"]["bytes"], 2000)
+        self.assertEqual(report["pending"], {"entries": 0, "bytes": 0})
+        self.assertEqual(report["pairs"]["entries"], 6)
+        self.assertEqual(report["broken"], {"error": "division by zero"})
+
+    def test_track_replaces_source(self):
+        registry = MemoryRegistry()
+        registry.track("cache", lambda: [1])
+        registry.track("cache", lambda: [1, 2, 3])
+        self.assertEqual(registry.report()["cache"]["entries"], 3)
+
+    def test_session_stats(self):
+        engine = create_engine("sqlite://")
+        self.addCleanup(engine.dispose)
+        Base.metadata.create_all(engine)
+        before = session_stats()
+        # Identity map держит объекты по слабым ссылкам
+        players = [PlayerORM(name="A"), PlayerORM(name="B")]
+        with Session(engine) as session:
+            session.add_all(players)
+            session.flush()
+            stats = session_stats()
+        self.assertEqual(stats["sessions"], before["sessions"] + 1)
+        self.assertEqual(stats["identity_map_objects"], before["identity_map_objects"] + 2)
+
+
+class TracemallocTestCase(unittest.TestCase):
+    """Возвращает трассировку tracemalloc в исходное состояние после теста."""
+
+    def setUp(self):
+        if tracemalloc.is_tracing():
+            self.skipTest("tracemalloc уже включён")
+        self.addCleanup(tracemalloc.stop)
+
+
+class TracemallocSnapshotsTest(TracemallocTestCase):
+    """Снимки по запросу и сравнение двух снимков."""
+
+    def test_take_requires_tracing(self):
+        with self.assertRaisesRegex(ValueError, "not started"):
+            TracemallocSnapshots().take()
+
+    def test_diff_shows_growth(self):
+        snapshots = TracemallocSnapshots()
+        with self.assertLogs("core.memory", "INFO"):
+            self.assertEqual(snapshots.start()["id"], 1)
+            retained = [bytes(1000) for _ in range(1000)]
+            snapshots.take()
+        diff = snapshots.diff()
+        self.assertEqual((diff["from"], diff["to"]), (1, 2))
+        self.assertGreater(diff["size_diff_bytes"], 900_000)
+        self.assertTrue(diff["top"][0]["location"].startswith(__file__))
+        by_file = snapshots.diff(group="filename", top=1)
+        self.assertEqual(by_file["top"][0]["location"], __file__)
+        del retained
+
+    def test_keeps_last_snapshots(self):
+        snapshots = TracemallocSnapshots(max_snapshots=2)
+        with self.assertLogs("core.memory", "INFO"):
+            snapshots.start()
+            snapshots.take()
+            snapshots.take()
+        self.assertEqual([s["id"] for s in snapshots.snapshots()], [2, 3])
+        with self.assertRaisesRegex(ValueError, "Unknown snapshot 1"):
+            snapshots.diff(1, 3)
+
+    def test_diff_errors(self):
+        snapshots = TracemallocSnapshots()
+        with self.assertLogs("core.memory", "INFO"):
+            snapshots.start()
+        with self.assertRaisesRegex(ValueError, "At least two snapshots"):
+            snapshots.diff()
+        with self.assertRaisesRegex(ValueError, "Unknown group"):
+            snapshots.diff(group="traceback")
+
+
+class MemoryMiddlewareTest(TracemallocTestCase):
+    """``/admin/memory``: доступ по токену, отчёт и действия с tracemalloc."""
+
+    def setUp(self):
+        super().setUp()
+        self.memory = MemoryMiddleware(
+            app, TracemallocSnapshots(), pool_status=lambda: {"size": 5}, admin_token=TOKEN
+        )
+
+    def call(self, method: str = "GET", query: str = "", path: str = "/admin/memory", **environ):
+        response = {}
+
+        def start_response(status, headers, exc_info=None):
+            response["status"] = status
+            response["headers"] = dict(headers)
+
+        environ = {"PATH_INFO": path, "REQUEST_METHOD": method, "QUERY_STRING": query, **environ}
+        body = b"".join(self.memory(environ, start_response))
+        return response["status"], response["headers"], body
+
+    def admin(self, method: str = "GET", query: str = "") -> tuple[str, dict]:
+        status, _, body = self.call(method, query, HTTP_AUTHORIZATION=f"Bearer {TOKEN}")
+        return status, json.loads(body)
+
+    def test_access(self):
+        self.assertEqual(self.call(path="/matches")[2], b"app")
+        status, headers, _ = self.call()
+        self.assertEqual(status, "401 Unauthorized")
+        self.assertEqual(headers["WWW-Authenticate"], "Bearer")
+        self.memory.admin_token = ""
+        self.assertEqual(self.call(HTTP_AUTHORIZATION=f"Bearer {TOKEN}")[0], "404 Not Found")
+
+    def test_report(self):
+        status, report = self.admin()
+        self.assertEqual(status, "200 OK")
+        self.assertEqual(report["db_pool"], {"size": 5})
+        self.assertIn("containers", report)
+        self.assertIn("sessions", report["sqlalchemy"])
+        self.assertFalse(report["tracemalloc"]["tracing"])
+
+    def test_broken_pool_status(self):
+        def pool_status():
+            raise RuntimeError("pool closed")
+
+        self.memory.pool_status = pool_status
+        self.assertEqual(self.admin()[1]["db_pool"], {"error": "pool closed"})
+
+    def test_tracemalloc_actions(self):
+        with self.assertLogs("core.memory", "INFO"):
+            self.assertEqual(self.admin("POST", "action=start&frames=2")[1]["id"], 1)
+            self.assertEqual(self.admin("POST", "action=snapshot")[1]["id"], 2)
+            status, diff = self.admin("POST", "action=diff&group=filename&top=3")
+            self.assertEqual(status, "200 OK")
+            self.assertEqual((diff["from"], diff["to"], diff["group"]), (1, 2, "filename"))
+            self.assertLessEqual(len(diff["top"]), 3)
+            self.assertEqual(self.admin()[1]["tracemalloc"]["frames"], 2)
+            self.assertFalse(self.admin("POST", "action=stop")[1]["tracing"])
+
+    def test_bad_requests(self):
+        for query in ("action=explode", "action=snapshot", "action=start&frames=many"):
+            with self.subTest(query=query):
+                status, payload = self.admin("POST", query)
+                self.assertEqual(status, "400 Bad Request")
+                self.assertIn("error", payload)
+        self.assertEqual(self.admin("PUT")[0], "405 Method Not Allowed")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,80 @@
+"""Замер длительности запроса ``MetricsMiddleware`` для готового и потокового тела."""
+
+import unittest
+from unittest import mock
+
+from src.tennis_score.core.middleware import metrics as metrics_middleware
+from src.tennis_score.core.middleware.metrics import MetricsMiddleware
+
+
+class FileWrapper:
+    """Двойник ``wsgi.file_wrapper`` сервера."""
+
+    def __init__(self, f, block_size=8192):
+        self.f = f
+
+
+class MetricsMiddlewareTest(unittest.TestCase):
+    """Длительность наблюдается после отдачи тела, а не при возврате из приложения."""
+
+    def setUp(self):
+        for name in ("HTTP_REQUEST_DURATION", "HTTP_REQUESTS"):
+            patcher = mock.patch.object(metrics_middleware, name)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.duration = metrics_middleware.HTTP_REQUEST_DURATION
+
+    def call(self, app, environ=None):
+        environ = {"REQUEST_METHOD": "GET", "PATH_INFO": "/matches", **(environ or {})}
+        return MetricsMiddleware(app, route_paths=["/matches"])(environ, lambda *args: None)
+
+    def test_streamed_body_observed_on_close(self):
+        def app(environ, start_response):
+            start_response("200 OK", [])
+            yield b"chunk"
+
+        result = self.call(app)
+        self.duration.observe.assert_not_called()
+        self.assertEqual(list(result), [b"chunk"])
+        result.close()
+        self.duration.observe.assert_called_once()
+        self.assertEqual(self.duration.observe.call_args.args[1], ("/matches", "GET"))
+
+    def test_list_body_observed_immediately(self):
+        def app(environ, start_response):
+            start_response("200 OK", [])
+            return [b"page"]
+
+        self.assertEqual(self.call(app), [b"page"])
+        self.duration.observe.assert_called_once()
+
+    def test_file_wrapper_is_not_wrapped(self):
+        wrapped = FileWrapper(None)
+
+        def app(environ, start_response):
+            start_response("200 OK", [])
+            return wrapped
+
+        self.assertIs(self.call(app, {"wsgi.file_wrapper": FileWrapper}), wrapped)
+        self.duration.observe.assert_called_once()
+
+    def test_unknown_method_label(self):
+        def app(environ, start_response):
+            start_response("405 Method Not Allowed", [])
+            return [b""]
+
+        self.call(app, {"REQUEST_METHOD": "X-RANDOM-1234"})
+        self.assertEqual(self.duration.observe.call_args.args[1], ("/matches", "other"))
+        metrics_middleware.HTTP_REQUESTS.inc.assert_called_once_with(("/matches", "other", "405"))
+
+    def test_exception_observed(self):
+        def app(environ, start_response):
+            raise RuntimeError("boom")
+
+        with self.assertRaises(RuntimeError):
+            self.call(app)
+        self.duration.observe.assert_called_once()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,44 @@
+"""Цепочка миграций Alembic: одна голова, у каждой ревизии один потомок."""
+
+import os
+import re
+import unittest
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+VERSIONS_DIR = os.path.join(ROOT_DIR, "alembic", "versions")
+
+REVISION_RE = re.compile(r"^revision: str = '(\w+)'$", re.MULTILINE)
+DOWN_REVISION_RE = re.compile(r"^down_revision: Union\[str, None\] = (?:'(\w+)'|None)$", re.MULTILINE)
+REVISES_RE = re.compile(r"^Revises: ?(\w*)$", re.MULTILINE)
+
+
+def read_revisions() -> dict[str, str | None]:
+    """Ревизия -> предыдущая ревизия по файлам ``alembic/versions``."""
+    revisions = {}
+    for name in sorted(os.listdir(VERSIONS_DIR)):
+        if not name.endswith(".py"):
+            continue
+        with open(os.path.join(VERSIONS_DIR, name), encoding="utf-8") as f:
+            source = f.read()
+        revision = REVISION_RE.search(source).group(1)
+        down_revision = DOWN_REVISION_RE.search(source).group(1)
+        # Строка "Revises:" в описании должна совпадать с down_revision
+        assert REVISES_RE.search(source).group(1) == (down_revision or ""), name
+        revisions[revision] = down_revision
+    return revisions
+
+
+class MigrationChainTest(unittest.TestCase):
+    """``alembic upgrade head`` требует единственной головы."""
+
+    def test_linear_history(self):
+        revisions = read_revisions()
+        parents = [down for down in revisions.values() if down is not None]
+        self.assertEqual(len(parents), len(set(parents)), "у ревизии несколько потомков")
+        self.assertEqual(len(set(revisions) - set(parents)), 1, "несколько голов")
+        self.assertEqual(list(revisions.values()).count(None), 1)
+        self.assertLessEqual(set(parents), set(revisions))
+
+
+if __name__ == "__main__":
+    unittest.main()
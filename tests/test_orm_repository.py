@@ -0,0 +1,159 @@
+"""Сохранение завершённого матча: очки буфера и активный матч при фиксации и откате."""
+
+import contextlib
+import os
+import unittest
+from unittest import mock
+
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+from src.tennis_score.core.unit_of_work import unit_of_work
+from src.tennis_score.model.orm_models import Base, MatchORM, MatchPointORM, PlayerRatingORM
+from src.tennis_score.model.rating import elo
+from src.tennis_score.repositories.engine import insert_missing
+from src.tennis_score.repositories.orm_repository import OrmMatchRepository
+
+
+class SaveFinishedMatchTest(unittest.TestCase):
+    """``OrmMatchRepository.save_finished_match`` с активными матчами в памяти процесса."""
+
+    POINTS = 48
+
+    def setUp(self):
+        with mock.patch.dict(os.environ, {"POINT_FLUSH_INTERVAL": "0", "ACTIVE_MATCH_STORE": "memory"}):
+            self.repository = OrmMatchRepository("sqlite://")
+        Base.metadata.create_all(self.repository.engine)
+        self.match = self.repository.create_match("Alice", "Bob")
+        for _ in range(self.POINTS):
+            self.repository.record_point(self.match.match_uid, "player1")
+
+    def tearDown(self):
+        self.repository.engine.dispose()
+
+    def count(self, model) -> int:
+        with self.repository.Session() as session:
+            return session.query(model).count()
+
+    def failing_add_match(self, **kwargs):
+        """Ошибка БД внутри ``_get_session``: единица работы запроса помечается неудачной."""
+        with self.repository._get_session() as session:
+            session.execute(text("SELECT * FROM missing_table"))
+
+    def test_commit_writes_points_and_releases_match(self):
+        with unit_of_work():
+            self.repository.save_finished_match(self.match)
+            # До фиксации запроса матч остаётся активным
+            self.assertIsNotNone(self.repository.get_active_match_by_uuid(self.match.match_uid))
+        self.assertEqual(self.count(MatchPointORM), self.POINTS)
+        self.assertEqual(self.count(MatchORM), 1)
+        self.assertIsNone(self.repository.get_active_match_by_uuid(self.match.match_uid))
+        self.assertEqual(self.repository.point_buffer.take(None), [])
+
+    def test_failed_request_keeps_points_and_match(self):
+        # Как в сервисе: ошибка перехватывается и запрос отвечает 200, но единица работы
+        # уже помечена неудачной, и транзакция запроса откатывается
+        with (
+            mock.patch.object(self.repository, "add_match", self.failing_add_match),
+            unit_of_work(),
+            self.assertLogs("repository", "ERROR"),
+            contextlib.suppress(OperationalError),
+        ):
+            self.repository.save_finished_match(self.match)
+        self.assertEqual(self.count(MatchPointORM), 0)
+        self.assertEqual(self.count(MatchORM), 0)
+        self.assertIsNotNone(self.repository.get_active_match_by_uuid(self.match.match_uid))
+
+        # Очки вернулись в буфер: повторное сохранение записывает их все по порядку
+        self.repository.save_finished_match(self.match)
+        self.assertEqual(self.count(MatchPointORM), self.POINTS)
+        seqs = [seq for seq, _, _ in self.repository.iter_match_points(self.match.match_uid)]
+        self.assertEqual(seqs, list(range(1, self.POINTS + 1)))
+        self.assertIsNone(self.repository.get_active_match_by_uuid(self.match.match_uid))
+
+
+class IterMatchPointsTest(unittest.TestCase):
+    """Чтение журнала очков дозаписывает буфер в транзакции запроса."""
+
+    POINTS = 12
+
+    def setUp(self):
+        with mock.patch.dict(os.environ, {"POINT_FLUSH_INTERVAL": "0", "ACTIVE_MATCH_STORE": "memory"}):
+            self.repository = OrmMatchRepository("sqlite://")
+        self.addCleanup(self.repository.engine.dispose)
+        self.match_uuid = self.repository.create_match("Alice", "Bob").match_uid
+        for _ in range(self.POINTS):
+            self.repository.record_point(self.match_uuid, "player1")
+
+    def seqs(self) -> list[int]:
+        return [seq for seq, _, _ in self.repository.iter_match_points(self.match_uuid)]
+
+    def test_rolled_back_request_requeues_points(self):
+        with unit_of_work() as uow:
+            self.assertEqual(self.seqs(), list(range(1, self.POINTS + 1)))
+            uow.mark_failed()
+        with self.repository.Session() as session:
+            self.assertEqual(session.query(MatchPointORM).count(), 0)
+        # Очки вернулись в буфер и записываются при следующем чтении
+        self.assertEqual(self.seqs(), list(range(1, self.POINTS + 1)))
+        self.assertEqual(self.repository.point_buffer.take(None), [])
+
+
+class ApplyRatingsTest(unittest.TestCase):
+    """Рейтинги первого и следующих матчей игрока."""
+
+    def setUp(self):
+        self.repository = OrmMatchRepository("sqlite://")
+        self.addCleanup(self.repository.engine.dispose)
+        self.alice = self.repository.get_or_create_player_by_name("Alice")
+        self.bob = self.repository.get_or_create_player_by_name("Bob")
+
+    def apply(self, winner_id: int | None) -> dict[int, tuple[float, int]]:
+        with self.repository._get_session() as session:
+            self.repository._apply_ratings(session, self.alice, self.bob, winner_id)
+        with self.repository.Session() as session:
+            return {row.player_id: (row.rating, row.rated_matches) for row in session.query(PlayerRatingORM)}
+
+    def test_first_match_creates_rows(self):
+        ratings = self.apply(self.alice)
+        expected = elo.update(elo.initial, elo.initial, True)
+        self.assertEqual(ratings, {self.alice: (expected[0], 1), self.bob: (expected[1], 1)})
+
+    def test_next_match_updates_rows(self):
+        first = self.apply(self.alice)
+        ratings = self.apply(self.bob)
+        expected = elo.update(first[self.alice][0], first[self.bob][0], False)
+        self.assertEqual(ratings, {self.alice: (expected[0], 2), self.bob: (expected[1], 2)})
+
+    def test_insert_missing_keeps_existing_row(self):
+        self.apply(self.alice)
+        with self.repository._get_session() as session:
+            insert_missing(session, PlayerRatingORM, {"player_id": self.alice}, {"rating": 0.0})
+        with self.repository.Session() as session:
+            self.assertEqual(session.get(PlayerRatingORM, self.alice).rated_matches, 1)
+
+    def test_rating_changes_bump_ratings_version(self):
+        self.assertEqual(self.repository.ratings_version(), (elo.version, 0))
+        self.apply(self.alice)
+        self.assertEqual(self.repository.ratings_version(), (elo.version, 1))
+        # Матч без победителя рейтинги не меняет
+        self.apply(None)
+        self.assertEqual(self.repository.ratings_version(), (elo.version, 1))
+        self.repository.recompute_ratings()
+        self.assertEqual(self.repository.ratings_version(), (elo.version, 2))
+        self.repository.rebuild_player_stats()
+        self.assertEqual(self.repository.ratings_version(), (elo.version, 3))
+
+    def test_rolled_back_match_keeps_ratings_version(self):
+        with (
+            self.assertLogs("repository", "ERROR"),
+            contextlib.suppress(RuntimeError),
+            self.repository._get_session() as session,
+        ):
+            self.repository._apply_ratings(session, self.alice, self.bob, self.alice)
+            raise RuntimeError("откат транзакции матча")
+        self.assertEqual(self.repository.ratings_version(), (elo.version, 0))
+
+
+if __name__ == "__main__":
+    unittest.main()
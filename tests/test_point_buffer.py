@@ -0,0 +1,50 @@
+"""Буфер очков: возврат строк после неудачной записи и остановка при выходе."""
+
+import unittest
+
+from src.tennis_score.core.metrics import POINT_LOG_DROPPED
+from src.tennis_score.repositories.point_buffer import PointBuffer
+
+
+class PointBufferTest(unittest.TestCase):
+    """``PointBuffer`` без фонового потока (``flush_interval=0``)."""
+
+    def setUp(self):
+        self.written: list[list[dict]] = []
+        self.fail = False
+        self.buffer = PointBuffer(self.write, flush_interval=0)
+
+    def write(self, rows: list[dict]) -> None:
+        if self.fail:
+            raise RuntimeError("БД недоступна")
+        self.written.append(rows)
+
+    def test_failed_flush_keeps_rows_in_order(self):
+        self.buffer.append("m1", False)
+        self.fail = True
+        with self.assertRaises(RuntimeError):
+            self.buffer.flush()
+        self.buffer.append("m1", True)
+        self.fail = False
+        self.assertEqual(self.buffer.flush("m1"), 2)
+        self.assertEqual([row["seq"] for row in self.written[0]], [1, 2])
+
+    def test_close_writes_remaining_rows(self):
+        self.buffer.append("m1", False)
+        self.buffer.close()
+        self.assertEqual(len(self.written), 1)
+
+    def test_close_does_not_log_failed_write(self):
+        # close вызывается из atexit, когда обработчики журнала могут быть уже закрыты
+        for _ in range(3):
+            self.buffer.append("m1", False)
+        self.fail = True
+        dropped = POINT_LOG_DROPPED.value()
+        with self.assertNoLogs("repository.points"):
+            self.buffer.close()
+        self.assertEqual(POINT_LOG_DROPPED.value(), dropped + 3)
+        self.assertEqual(self.buffer.take(None), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
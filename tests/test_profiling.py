@@ -0,0 +1,177 @@
+"""Сэмплирующий профилировщик: снимки стеков, выбор запросов и эндпоинт ``/admin/profiler``."""
+
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+import unittest
+
+from src.tennis_score.core.middleware.profiling import ProfilingMiddleware
+from src.tennis_score.core.profiling import StackSampler, collapse_stack, route_file_name
+
+TOKEN = "secret"
+
+
+def busy_wait(stop: threading.Event) -> None:
+    """Занятый цикл, который профилировщик застаёт в стеке."""
+    while not stop.is_set():
+        sum(range(100))
+
+
+def app(environ, start_response):
+    """Приложение с потоковым телом: профилирование длится до ``close``."""
+    start_response("200 OK", [("Content-Type", "text/plain")])
+    yield b"ok"
+
+
+class StackSamplerTest(unittest.TestCase):
+    """``StackSampler`` снимает стеки только зарегистрированных потоков."""
+
+    def test_collapse_stack(self):
+        stack = collapse_stack(sys._getframe())
+        self.assertTrue(stack.endswith(f"{__name__}:StackSamplerTest.test_collapse_stack"))
+        self.assertEqual(collapse_stack(sys._getframe(), max_depth=1).count(";"), 0)
+
+    def test_route_file_name(self):
+        self.assertEqual(route_file_name("/match-score"), "match-score")
+        self.assertEqual(route_file_name("/admin/memory"), "admin_memory")
+        self.assertEqual(route_file_name("/"), "index")
+
+    def test_samples_registered_thread(self):
+        sampler = StackSampler(interval=0.001)
+        stop = threading.Event()
+        started = threading.Event()
+
+        def request():
+            ident = sampler.begin("/matches")
+            started.set()
+            try:
+                busy_wait(stop)
+            finally:
+                sampler.end(ident)
+
+        thread = threading.Thread(target=request)
+        thread.start()
+        started.wait()
+        deadline = time.monotonic() + 5
+        while not sampler.snapshot() and time.monotonic() < deadline:
+            time.sleep(0.01)
+        stop.set()
+        thread.join()
+
+        stacks = sampler.snapshot()["/matches"]
+        self.assertTrue(any(f"{__name__}:busy_wait" in stack for stack in stacks))
+        summary = sampler.summary()["/matches"]
+        self.assertEqual(summary["requests"], 1)
+        self.assertEqual(summary["samples"], sum(stacks.values()))
+
+        sampler.reset()
+        self.assertEqual((sampler.snapshot(), sampler.summary()), ({}, {}))
+
+    def test_dump(self):
+        sampler = StackSampler()
+        sampler.stacks["/"]["main:run;main:handle"] = 3
+        sampler.stacks["/"]["main:run"] = 1
+        with tempfile.TemporaryDirectory() as directory, self.assertLogs("core.profiling", "INFO"):
+            (path,) = sampler.dump(directory)
+            self.assertEqual(os.path.basename(path), f"index.{os.getpid()}.collapsed")
+            with open(path, encoding="utf-8") as f:
+                self.assertEqual(f.read(), "main:run;main:handle 3\nmain:run 1\n")
+
+
+class ProfilingMiddlewareTest(unittest.TestCase):
+    """Выбор профилируемых запросов и управление через ``/admin/profiler``."""
+
+    def setUp(self):
+        self.sampler = StackSampler(interval=0.001)
+        output_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(output_dir.cleanup)
+        self.output_dir = output_dir.name
+        self.profiling = ProfilingMiddleware(
+            app,
+            self.sampler,
+            sample_rate=0,
+            output_dir=self.output_dir,
+            route_paths=("/", "/matches", "/match-score"),
+            admin_token=TOKEN,
+        )
+
+    def call(self, path: str, method: str = "GET", query: str = "", **environ) -> tuple[str, bytes]:
+        response = {}
+
+        def start_response(status, headers, exc_info=None):
+            response["status"] = status
+
+        environ = {"PATH_INFO": path, "REQUEST_METHOD": method, "QUERY_STRING": query, **environ}
+        result = self.profiling(environ, start_response)
+        body = b"".join(result)
+        if hasattr(result, "close"):
+            result.close()
+        return response["status"], body
+
+    def admin(self, method: str = "GET", query: str = "") -> tuple[str, dict]:
+        status, body = self.call("/admin/profiler", method, query, HTTP_AUTHORIZATION=f"Bearer {TOKEN}")
+        return status, json.loads(body)
+
+    def test_disabled_by_default(self):
+        self.call("/matches")
+        self.assertEqual(self.sampler.requests, {})
+
+    def test_trigger_header_requires_token(self):
+        self.call("/matches", HTTP_X_PROFILE="1")
+        self.assertEqual(self.sampler.requests, {})
+        self.call("/matches", HTTP_X_PROFILE="1", HTTP_AUTHORIZATION=f"Bearer {TOKEN}")
+        self.assertEqual(self.sampler.requests, {"/matches": 1})
+        # Поток перестаёт профилироваться после close() тела
+        self.assertEqual(self.sampler._active, {})
+
+    def test_routes_and_sample_rate(self):
+        self.profiling.enabled = True
+        self.profiling.routes = frozenset({"/match-score"})
+        self.profiling.sample_rate = 2
+        for path in ("/match-score", "/matches", "/matches", "/unknown/path", "/unknown/path"):
+            self.call(path)
+        self.assertEqual(self.sampler.requests, {"/match-score": 1, "/matches": 1, "other": 1})
+
+    def test_control_requires_token(self):
+        self.assertEqual(self.call("/admin/profiler")[0], "401 Unauthorized")
+        wrong = self.call("/admin/profiler", HTTP_AUTHORIZATION="Bearer wrong")
+        self.assertEqual(wrong[0], "401 Unauthorized")
+        self.profiling.admin_token = ""
+        status = self.call("/admin/profiler", HTTP_AUTHORIZATION=f"Bearer {TOKEN}")[0]
+        self.assertEqual(status, "404 Not Found")
+
+    def test_control_changes_settings(self):
+        status, payload = self.admin()
+        self.assertEqual(status, "200 OK")
+        self.assertFalse(payload["enabled"])
+
+        with self.assertLogs("core.profiling", "INFO"):
+            status, payload = self.admin("POST", "enabled=1&sample_rate=50&routes=/matches,/match-score")
+        self.assertEqual(status, "200 OK")
+        self.assertTrue(payload["enabled"])
+        self.assertEqual(payload["sample_rate"], 50)
+        self.assertEqual(payload["routes"], ["/match-score", "/matches"])
+        self.call("/matches")
+        self.assertEqual(self.sampler.requests, {"/matches": 1})
+
+    def test_disable_dumps_stacks(self):
+        self.profiling.enabled = True
+        self.sampler.stacks["/matches"]["main:run"] = 1
+        with self.assertLogs("core.profiling", "INFO"):
+            self.admin("POST", "enabled=0")
+        self.assertEqual(os.listdir(self.output_dir), [f"matches.{os.getpid()}.collapsed"])
+
+    def test_control_rejects_bad_params(self):
+        for query in ("action=explode", "sample_rate=-1", "sample_rate=often"):
+            with self.subTest(query=query):
+                status, payload = self.admin("POST", query)
+                self.assertEqual(status, "400 Bad Request")
+                self.assertIn("error", payload)
+        self.assertEqual(self.admin("DELETE")[0], "405 Method Not Allowed")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,39 @@
+"""Замер времени SQL-операторов на движке с ``instrument_engine``."""
+
+import contextlib
+import unittest
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import OperationalError
+
+from src.tennis_score.core.metrics import DB_QUERIES
+from src.tennis_score.core.query_tracking import instrument_engine
+
+
+class InstrumentEngineTest(unittest.TestCase):
+    """Стек отметок времени в ``conn.info`` при успешных и упавших операторах."""
+
+    def setUp(self):
+        self.engine = create_engine("sqlite://")
+        self.addCleanup(self.engine.dispose)
+        instrument_engine(self.engine)
+
+    def test_statement_counted_and_stack_empty(self):
+        queries = DB_QUERIES.value()
+        with self.engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+            self.assertEqual(conn.info["query_start_time"], [])
+        self.assertEqual(DB_QUERIES.value(), queries + 1)
+
+    def test_failed_statement_pops_start_time(self):
+        with self.engine.connect() as conn:
+            for _ in range(3):
+                with contextlib.suppress(OperationalError):
+                    conn.execute(text("SELECT * FROM missing_table"))
+            self.assertEqual(conn.info["query_start_time"], [])
+            conn.execute(text("SELECT 1"))
+            self.assertEqual(conn.info["query_start_time"], [])
+
+
+if __name__ == "__main__":
+    unittest.main()
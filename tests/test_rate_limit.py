@@ -0,0 +1,152 @@
+"""Ограничение частоты по IP (429) и сброс нагрузки по конкурентности (503)."""
+
+import unittest
+from unittest import mock
+
+from src.tennis_score.core.middleware import rate_limit
+from src.tennis_score.core.middleware.rate_limit import RateLimitMiddleware
+
+
+def app(environ, start_response):
+    """Приложение за ограничителем."""
+    start_response("200 OK", [("Content-Type", "text/plain")])
+    return [b"ok"]
+
+
+def streamed_app(environ, start_response):
+    """Приложение с потоковым телом: слот занят до ``close``."""
+    start_response("200 OK", [("Content-Type", "text/plain")])
+    yield b"ok"
+
+
+class RateLimitTestCase(unittest.TestCase):
+    """Управляемые часы ``time.monotonic`` ограничителя."""
+
+    def setUp(self):
+        self.now = 1000.0
+        patcher = mock.patch.object(rate_limit.time, "monotonic", lambda: self.now)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    @staticmethod
+    def call(middleware, path: str = "/matches", remote_addr: str = "10.0.0.1", **environ):
+        response = {}
+
+        def start_response(status, headers, exc_info=None):
+            response["status"] = status
+            response["headers"] = dict(headers)
+
+        environ = {"PATH_INFO": path, "REQUEST_METHOD": "GET", "REMOTE_ADDR": remote_addr, **environ}
+        result = middleware(environ, start_response)
+        return response, result
+
+
+class TokenBucketTest(RateLimitTestCase):
+    """Token bucket на адрес клиента."""
+
+    def status(self, middleware, **kwargs) -> str:
+        response, result = self.call(middleware, **kwargs)
+        list(result)
+        return response["status"]
+
+    def test_burst_then_429_with_retry_after(self):
+        middleware = RateLimitMiddleware(app, rate=2, burst=3)
+        self.assertEqual([self.status(middleware) for _ in range(3)], ["200 OK"] * 3)
+        response, result = self.call(middleware)
+        self.assertEqual(response["status"], "429 Too Many Requests")
+        self.assertEqual(response["headers"]["Retry-After"], "1")
+        self.assertEqual(list(result), [b"429 Too Many Requests"])
+
+    def test_retry_after_rounds_up(self):
+        middleware = RateLimitMiddleware(app, rate=0.25, burst=1)
+        self.status(middleware)
+        response, _ = self.call(middleware)
+        self.assertEqual(response["headers"]["Retry-After"], "4")
+
+    def test_tokens_refill(self):
+        middleware = RateLimitMiddleware(app, rate=2, burst=2)
+        self.status(middleware)
+        self.status(middleware)
+        self.assertEqual(self.status(middleware), "429 Too Many Requests")
+        self.now += 0.5
+        self.assertEqual(self.status(middleware), "200 OK")
+        self.assertEqual(self.status(middleware), "429 Too Many Requests")
+
+    def test_clients_limited_separately(self):
+        middleware = RateLimitMiddleware(app, rate=1, burst=1)
+        self.assertEqual(self.status(middleware, remote_addr="10.0.0.1"), "200 OK")
+        self.assertEqual(self.status(middleware, remote_addr="10.0.0.1"), "429 Too Many Requests")
+        self.assertEqual(self.status(middleware, remote_addr="10.0.0.2"), "200 OK")
+
+    def test_exempt_paths_and_zero_rate(self):
+        middleware = RateLimitMiddleware(app, rate=1, burst=1)
+        for _ in range(5):
+            self.assertEqual(self.status(middleware, path="/static/css/style.css"), "200 OK")
+            self.assertEqual(self.status(middleware, path="/metrics"), "200 OK")
+        unlimited = RateLimitMiddleware(app, rate=0, burst=1)
+        self.assertEqual([self.status(unlimited) for _ in range(5)], ["200 OK"] * 5)
+
+    def test_idle_buckets_expire(self):
+        middleware = RateLimitMiddleware(app, rate=1, burst=1, idle_ttl=60, max_clients=2)
+        for client in ("10.0.0.1", "10.0.0.2", "10.0.0.3"):
+            self.status(middleware, remote_addr=client)
+        self.assertEqual(list(middleware._buckets), ["10.0.0.2", "10.0.0.3"])
+        self.now += 61
+        self.status(middleware, remote_addr="10.0.0.4")
+        self.assertEqual(list(middleware._buckets), ["10.0.0.4"])
+
+
+class ClientIpTest(RateLimitTestCase):
+    """Адрес клиента из ``X-Forwarded-For`` только за доверенными прокси."""
+
+    def test_forwarded_for_ignored_by_default(self):
+        middleware = RateLimitMiddleware(app)
+        environ = {"REMOTE_ADDR": "10.0.0.1", "HTTP_X_FORWARDED_FOR": "1.2.3.4"}
+        self.assertEqual(middleware.client_ip(environ), "10.0.0.1")
+
+    def test_trusted_proxy_entry(self):
+        middleware = RateLimitMiddleware(app, proxy_hops=1)
+        # Левую запись прислал клиент, правую добавил nginx
+        environ = {"REMOTE_ADDR": "172.18.0.5", "HTTP_X_FORWARDED_FOR": "6.6.6.6, 1.2.3.4"}
+        self.assertEqual(middleware.client_ip(environ), "1.2.3.4")
+        self.assertEqual(middleware.client_ip({"REMOTE_ADDR": "172.18.0.5"}), "172.18.0.5")
+
+    def test_spoofed_header_does_not_bypass_limit(self):
+        middleware = RateLimitMiddleware(app, rate=1, burst=1, proxy_hops=1)
+        for spoofed in ("6.6.6.1", "6.6.6.2"):
+            response, _ = self.call(middleware, HTTP_X_FORWARDED_FOR=f"{spoofed}, 1.2.3.4")
+        self.assertEqual(response["status"], "429 Too Many Requests")
+
+
+class LoadSheddingTest(RateLimitTestCase):
+    """Лимит одновременно выполняемых запросов."""
+
+    def test_overload_returns_503_until_body_closed(self):
+        middleware = RateLimitMiddleware(streamed_app, rate=0, max_concurrent=1)
+        first, body = self.call(middleware)
+        self.assertEqual(list(body), [b"ok"])
+        self.assertEqual(first["status"], "200 OK")
+
+        # Тело прочитано, но сервер ещё не вызвал close: слот занят
+        response, _ = self.call(middleware)
+        self.assertEqual(response["status"], "503 Service Unavailable")
+        self.assertEqual(response["headers"]["Retry-After"], "1")
+
+        body.close()
+        response, body = self.call(middleware)
+        self.assertEqual(list(body), [b"ok"])
+        self.assertEqual(response["status"], "200 OK")
+
+    def test_slot_released_on_error(self):
+        def failing_app(environ, start_response):
+            raise RuntimeError("boom")
+
+        middleware = RateLimitMiddleware(failing_app, rate=0, max_concurrent=1)
+        for _ in range(2):
+            with self.assertRaises(RuntimeError):
+                self.call(middleware)
+        self.assertEqual(middleware._in_flight, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
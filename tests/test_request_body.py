@@ -0,0 +1,150 @@
+"""Ограниченный разбор тела POST: 413/415/400, формы и JSON в виде ``parse_qs``."""
+
+import io
+import json
+import unittest
+from urllib.parse import parse_qs
+
+from src.tennis_score.core.request_body import (
+    BodyTooLargeError,
+    RequestBodyError,
+    TooManyFieldsError,
+    UnsupportedMediaTypeError,
+    parse_body,
+    parse_form,
+)
+from src.tennis_score.core.router import RoutesHandler
+
+
+def post_environ(body: bytes, content_type: str = "application/x-www-form-urlencoded", **environ) -> dict:
+    """Окружение POST-запроса с телом ``body`` и его ``Content-Length``."""
+    return {
+        "REQUEST_METHOD": "POST",
+        "CONTENT_TYPE": content_type,
+        "CONTENT_LENGTH": str(len(body)),
+        "wsgi.input": io.BytesIO(body),
+        **environ,
+    }
+
+
+class ParseFormTest(unittest.TestCase):
+    """Разбор формы совпадает с ``parse_qs`` при любой нарезке на порции."""
+
+    def test_matches_parse_qs(self):
+        body = b"player1=%D0%98%D0%B2%D0%B0%D0%BD+%D0%9F.&player2=Bob&empty=&flag&tags=a&tags=b"
+        expected = parse_qs(body.decode())
+        self.assertEqual(parse_body(post_environ(body)), expected)
+        for size in (1, 3, 7):
+            with self.subTest(chunk_size=size):
+                chunks = [body[i:i + size] for i in range(0, len(body), size)]
+                self.assertEqual(parse_form(chunks), expected)
+
+    def test_too_many_fields(self):
+        body = "&".join(f"f{i}=1" for i in range(6)).encode()
+        self.assertEqual(len(parse_body(post_environ(body), max_fields=6)), 6)
+        with self.assertRaises(TooManyFieldsError) as cm:
+            parse_body(post_environ(body), max_fields=5)
+        self.assertEqual(cm.exception.status, "413 Payload Too Large")
+
+
+class BodySizeTest(unittest.TestCase):
+    """Лимит размера по ``Content-Length`` и по фактически прочитанным байтам."""
+
+    def test_declared_length_over_limit_rejected_without_reading(self):
+        environ = post_environ(b"a=1", CONTENT_LENGTH="1000")
+        with self.assertRaises(BodyTooLargeError) as cm:
+            parse_body(environ, max_size=100)
+        self.assertEqual(cm.exception.status, "413 Payload Too Large")
+        self.assertEqual(environ["wsgi.input"].tell(), 0)
+
+    def test_unbounded_stream_over_limit(self):
+        environ = post_environ(b"a=" + b"x" * 200, CONTENT_LENGTH="", **{"wsgi.input_terminated": True})
+        with self.assertRaises(BodyTooLargeError):
+            parse_body(environ, max_size=100)
+
+    def test_missing_length_without_terminated_input_is_empty(self):
+        environ = post_environ(b"a=1", CONTENT_LENGTH="")
+        self.assertEqual(parse_body(environ), {})
+        environ = post_environ(b"a=1", CONTENT_LENGTH="", **{"wsgi.input_terminated": True})
+        self.assertEqual(parse_body(environ), {"a": ["1"]})
+
+    def test_invalid_content_length(self):
+        for value in ("abc", "-1"):
+            with self.subTest(value=value), self.assertRaises(RequestBodyError) as cm:
+                parse_body(post_environ(b"a=1", CONTENT_LENGTH=value))
+            self.assertEqual(cm.exception.status, "400 Bad Request")
+
+
+class ParseJsonTest(unittest.TestCase):
+    """JSON-объект приводится к виду ``parse_qs``; прочие типы тела отклоняются."""
+
+    def test_json_object(self):
+        body = json.dumps(
+            {"player1": "Иван", "set": 2, "tiebreak": True, "skip": None, "tags": ["a", 1], "meta": {"k": 1}},
+            ensure_ascii=False,
+        ).encode()
+        params = parse_body(post_environ(body, "application/json; charset=utf-8"))
+        expected = {
+            "player1": ["Иван"],
+            "set": ["2"],
+            "tiebreak": ["true"],
+            "tags": ["a", "1"],
+            "meta": ['{"k": 1}'],
+        }
+        self.assertEqual(params, expected)
+
+    def test_json_suffix_and_empty_body(self):
+        self.assertEqual(parse_body(post_environ(b'{"a": "1"}', "application/vnd.api+json")), {"a": ["1"]})
+        self.assertEqual(parse_body(post_environ(b"", "application/json")), {})
+
+    def test_invalid_json(self):
+        for body in (b"{", b"[1, 2]", b'"text"'):
+            with self.subTest(body=body), self.assertRaises(RequestBodyError) as cm:
+                parse_body(post_environ(body, "application/json"))
+            self.assertEqual(cm.exception.status, "400 Bad Request")
+
+    def test_too_many_keys(self):
+        body = json.dumps({f"k{i}": i for i in range(3)}).encode()
+        with self.assertRaises(TooManyFieldsError):
+            parse_body(post_environ(body, "application/json"), max_fields=2)
+
+    def test_unsupported_media_type(self):
+        with self.assertRaises(UnsupportedMediaTypeError) as cm:
+            parse_body(post_environ(b"<a/>", "text/xml"))
+        self.assertEqual(cm.exception.status, "415 Unsupported Media Type")
+
+
+class RoutesHandlerBodyTest(unittest.TestCase):
+    """``RoutesHandler`` отвечает страницей ошибки со статусом исключения, не вызывая контроллер."""
+
+    def setUp(self):
+        self.calls = []
+        routes = {("/new-match", "POST"): self.controller}
+        self.handler = RoutesHandler(routes, max_body_size=100, max_fields=5)
+
+    def controller(self, params):
+        """Контроллер, запоминающий полученные параметры."""
+        self.calls.append(params)
+        return {"status": "200 OK"}
+
+    def test_valid_body_reaches_controller(self):
+        environ = post_environ(b'{"player1": "A", "player2": "B"}', "application/json")
+        self.assertEqual(self.handler.route_request("/new-match", "POST", environ)["status"], "200 OK")
+        self.assertEqual(self.calls, [{"player1": ["A"], "player2": ["B"]}])
+
+    def test_rejected_body_status(self):
+        cases = {
+            "413 Payload Too Large": post_environ(b"a=" + b"x" * 200),
+            "415 Unsupported Media Type": post_environ(b"a=1", "text/plain"),
+            "400 Bad Request": post_environ(b"{", "application/json"),
+        }
+        for status, environ in cases.items():
+            with self.subTest(status=status), self.assertLogs("core.routing", "WARNING"):
+                response = self.handler.route_request("/new-match", "POST", environ)
+            self.assertEqual(response["status"], status)
+            self.assertEqual(response["template"], "error.html")
+        self.assertEqual(self.calls, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,94 @@
+"""Настройки waitress: TOML-файл, переменные окружения и ошибки проверки."""
+
+import os
+import tempfile
+import unittest
+
+from waitress.adjustments import Adjustments
+
+from src.tennis_score.core.metrics import SERVER_SETTINGS
+from src.tennis_score.server_config import ServerConfig
+
+
+class ServerConfigTest(unittest.TestCase):
+    """``ServerConfig.load`` с файлом во временном каталоге и заданным окружением."""
+
+    def setUp(self):
+        config_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(config_dir.cleanup)
+        self.path = os.path.join(config_dir.name, "waitress.toml")
+
+    def write(self, content: str) -> str:
+        with open(self.path, "w", encoding="utf-8") as f:
+            f.write(content)
+        return self.path
+
+    def test_defaults(self):
+        config = ServerConfig.load(environ={})
+        self.assertEqual(config.threads, Adjustments.threads)
+        self.assertEqual((config.host, config.port), ("0.0.0.0", 8080))
+
+    def test_file_and_environment(self):
+        self.write("[waitress]\nthreads = 8\nconnection_limit = 200\nasyncore_use_poll = true\n")
+        environ = {"WEB_THREADS": "16", "WEB_PORT": "", "WEB_ASYNCORE_USE_POLL": "off"}
+        config = ServerConfig.load(environ={"WEB_CONFIG": self.path, **environ})
+        # Окружение важнее файла, пустая переменная не задаёт настройку
+        self.assertEqual(config.threads, 16)
+        self.assertEqual(config.connection_limit, 200)
+        self.assertEqual(config.port, 8080)
+        self.assertFalse(config.asyncore_use_poll)
+
+    def test_unknown_setting_in_file(self):
+        self.write("[waitress]\nthreads = 4\nworkers = 2\n")
+        with self.assertRaisesRegex(ValueError, "Unknown waitress settings .*: workers"):
+            ServerConfig.load(self.path, environ={})
+
+    def test_invalid_types(self):
+        cases = (
+            ({"WEB_THREADS": "many"}, "threads must be int"),
+            ({"WEB_ASYNCORE_USE_POLL": "maybe"}, "asyncore_use_poll must be bool"),
+        )
+        for environ, message in cases:
+            with self.subTest(environ=environ), self.assertRaisesRegex(ValueError, message):
+                ServerConfig.load(environ=environ)
+        self.write("[waitress]\nthreads = true\n")
+        with self.assertRaisesRegex(ValueError, "threads must be int"):
+            ServerConfig.load(self.path, environ={})
+
+    def test_validation_collects_all_errors(self):
+        environ = {"WEB_THREADS": "0", "WEB_PORT": "70000", "WEB_OUTBUF_HIGH_WATERMARK": "1"}
+        with self.assertRaises(ValueError) as cm:
+            ServerConfig.load(environ=environ)
+        message = str(cm.exception)
+        self.assertIn("threads must be positive", message)
+        self.assertIn("port must be in 0..65535", message)
+        self.assertIn("outbuf_high_watermark must not be less than outbuf_overflow", message)
+
+    def test_select_fd_limit(self):
+        environ = {"WEB_CONNECTION_LIMIT": "2000", "WEB_ASYNCORE_USE_POLL": "no"}
+        with self.assertRaisesRegex(ValueError, "requires asyncore_use_poll"):
+            ServerConfig.load(environ=environ)
+        config = ServerConfig.load(environ={**environ, "WEB_ASYNCORE_USE_POLL": "yes"})
+        self.assertEqual(config.connection_limit, 2000)
+
+    def test_connection_limit_below_threads_warns(self):
+        with self.assertLogs("server.config", "WARNING"):
+            ServerConfig.load(environ={"WEB_THREADS": "8", "WEB_CONNECTION_LIMIT": "4"})
+
+    def test_server_kwargs_without_address(self):
+        config = ServerConfig(threads=6)
+        self.assertEqual(config.serve_kwargs()["threads"], 6)
+        self.assertNotIn("host", config.server_kwargs())
+        self.assertNotIn("port", config.server_kwargs())
+
+    def test_report(self):
+        config = ServerConfig(threads=12)
+        with self.assertLogs("server.config", "INFO") as logs:
+            config.report(db_pool_capacity=10, workers=2)
+        self.assertTrue(any("до 20 на все процессы" in line for line in logs.output))
+        self.assertTrue(any("threads=12 больше соединений пула БД (10)" in line for line in logs.output))
+        self.assertIn('tennis_server_setting{setting="threads"} 12', SERVER_SETTINGS.collect())
+
+
+if __name__ == "__main__":
+    unittest.main()
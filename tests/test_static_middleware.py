@@ -0,0 +1,208 @@
+"""Отдача статики ``StaticMiddleware``: валидаторы, условные и Range-запросы, отпечатанные URL."""
+
+import os
+import re
+import tempfile
+import unittest
+from email.utils import formatdate
+
+from src.tennis_score.core.middleware.static import IMMUTABLE_CACHE_CONTROL, StaticMiddleware
+from src.tennis_score.core.template import TemplateRenderer
+
+STYLE = b"body { color: #222; }\n"
+BIG = bytes(range(256)) * 4  # крупнее max_inline_size — отдаётся с диска
+
+
+class FileWrapper:
+    """Двойник ``wsgi.file_wrapper`` сервера."""
+
+    def __init__(self, f, block_size=8192):
+        self.f = f
+
+    def __iter__(self):
+        """Отдаёт файл одним блоком и закрывает его."""
+        try:
+            yield self.f.read()
+        finally:
+            self.f.close()
+
+
+class StaticTestCase(unittest.TestCase):
+    """Временная статическая директория и вызов middleware."""
+
+    def setUp(self):
+        static_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(static_dir.cleanup)
+        self.static_dir = static_dir.name
+        self.write("css/style.css", STYLE)
+        self.write("big.bin", BIG)
+        self.static = StaticMiddleware(self.app, static_dir=self.static_dir, max_inline_size=512)
+
+    def write(self, rel_path: str, content: bytes) -> None:
+        path = os.path.join(self.static_dir, rel_path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb") as f:
+            f.write(content)
+
+    @staticmethod
+    def app(environ, start_response):
+        start_response("200 OK", [("Content-Type", "text/plain")])
+        return [b"app"]
+
+    def get(self, path: str, method: str = "GET", **headers) -> tuple[str, dict, bytes]:
+        response = {}
+
+        def start_response(status, response_headers, exc_info=None):
+            response["status"] = status
+            response["headers"] = dict(response_headers)
+
+        environ = {"PATH_INFO": path, "REQUEST_METHOD": method, **headers}
+        result = self.static(environ, start_response)
+        body = b"".join(result)
+        if hasattr(result, "close"):
+            result.close()
+        return response["status"], response["headers"], body
+
+
+class StaticMiddlewareTest(StaticTestCase):
+    """Ответы на обычные, условные и Range-запросы."""
+
+    def test_serves_file_with_validators(self):
+        status, headers, body = self.get("/static/css/style.css")
+        self.assertEqual(status, "200 OK")
+        self.assertEqual(body, STYLE)
+        self.assertEqual(headers["Content-Type"], "text/css; charset=utf-8")
+        self.assertEqual(headers["Content-Length"], str(len(STYLE)))
+        self.assertEqual(headers["Cache-Control"], "public, max-age=86400")
+        self.assertTrue(headers["ETag"].startswith('"'))
+        self.assertIn("Last-Modified", headers)
+
+    def test_other_paths_and_methods_reach_app(self):
+        self.assertEqual(self.get("/matches")[2], b"app")
+        self.assertEqual(self.get("/static/missing.css")[2], b"app")
+        self.assertEqual(self.get("/static/css/style.css", "POST")[2], b"app")
+
+    def test_head_has_headers_without_body(self):
+        status, headers, body = self.get("/static/css/style.css", "HEAD")
+        self.assertEqual(status, "200 OK")
+        self.assertEqual(headers["Content-Length"], str(len(STYLE)))
+        self.assertEqual(body, b"")
+
+    def test_if_none_match_returns_304(self):
+        etag = self.get("/static/css/style.css")[1]["ETag"]
+        for header in (etag, f"W/{etag}", f'"other", {etag}', "*"):
+            with self.subTest(header=header):
+                status, headers, body = self.get("/static/css/style.css", HTTP_IF_NONE_MATCH=header)
+                self.assertEqual(status, "304 Not Modified")
+                self.assertEqual(headers["ETag"], etag)
+                self.assertEqual(body, b"")
+        self.assertEqual(self.get("/static/css/style.css", HTTP_IF_NONE_MATCH='"other"')[0], "200 OK")
+
+    def test_if_modified_since(self):
+        last_modified = self.get("/static/css/style.css")[1]["Last-Modified"]
+        status = self.get("/static/css/style.css", HTTP_IF_MODIFIED_SINCE=last_modified)[0]
+        self.assertEqual(status, "304 Not Modified")
+        stale = formatdate(0, usegmt=True)
+        self.assertEqual(self.get("/static/css/style.css", HTTP_IF_MODIFIED_SINCE=stale)[0], "200 OK")
+        self.assertEqual(self.get("/static/css/style.css", HTTP_IF_MODIFIED_SINCE="вчера")[0], "200 OK")
+
+    def test_range_requests(self):
+        cases = {
+            "bytes=0-3": (0, 3),
+            "bytes=5-": (5, len(STYLE) - 1),
+            "bytes=-4": (len(STYLE) - 4, len(STYLE) - 1),
+            "bytes=2-1000": (2, len(STYLE) - 1),
+        }
+        for header, (start, end) in cases.items():
+            with self.subTest(header=header):
+                status, headers, body = self.get("/static/css/style.css", HTTP_RANGE=header)
+                self.assertEqual(status, "206 Partial Content")
+                self.assertEqual(headers["Content-Range"], f"bytes {start}-{end}/{len(STYLE)}")
+                self.assertEqual(body, STYLE[start:end + 1])
+                self.assertEqual(headers["Content-Length"], str(end - start + 1))
+
+    def test_unsupported_range_returns_whole_file(self):
+        for header in ("bytes=0-1,4-5", "items=0-1", "bytes=a-b"):
+            with self.subTest(header=header):
+                status, _, body = self.get("/static/css/style.css", HTTP_RANGE=header)
+                self.assertEqual(status, "200 OK")
+                self.assertEqual(body, STYLE)
+
+    def test_unsatisfiable_range_returns_416(self):
+        for header in (f"bytes={len(STYLE)}-", "bytes=5-2", "bytes=-0"):
+            with self.subTest(header=header):
+                status, headers, body = self.get("/static/css/style.css", HTTP_RANGE=header)
+                self.assertEqual(status, "416 Range Not Satisfiable")
+                self.assertEqual(headers["Content-Range"], f"bytes */{len(STYLE)}")
+                self.assertEqual(body, b"")
+
+    def test_if_range(self):
+        headers = self.get("/static/css/style.css")[1]
+        for validator in (headers["ETag"], headers["Last-Modified"]):
+            with self.subTest(validator=validator):
+                status = self.get("/static/css/style.css", HTTP_RANGE="bytes=0-3", HTTP_IF_RANGE=validator)[0]
+                self.assertEqual(status, "206 Partial Content")
+        # Файл изменился: вместо диапазона отдаётся весь файл
+        status, _, body = self.get("/static/css/style.css", HTTP_RANGE="bytes=0-3", HTTP_IF_RANGE='"old"')
+        self.assertEqual(status, "200 OK")
+        self.assertEqual(body, STYLE)
+
+    def test_large_file_from_disk(self):
+        self.assertIsNone(self.static.files["big.bin"].content)
+        status, headers, body = self.get("/static/big.bin", **{"wsgi.file_wrapper": FileWrapper})
+        self.assertEqual(status, "200 OK")
+        self.assertEqual(headers["Content-Type"], "application/octet-stream")
+        self.assertEqual(body, BIG)
+
+        status, _, body = self.get("/static/big.bin", HTTP_RANGE="bytes=100-899")
+        self.assertEqual(status, "206 Partial Content")
+        self.assertEqual(body, BIG[100:900])
+
+
+class AssetFingerprintTest(StaticTestCase):
+    """``asset_url`` и отдача файлов по URL с хешем содержимого."""
+
+    def test_asset_url_contains_content_hash(self):
+        url = self.static.asset_url("css/style.css")
+        self.assertRegex(url, r"^/static/css/style\.[0-9a-f]{12}\.css$")
+        self.assertEqual(self.static.asset_url("/css/style.css"), url)
+
+    def test_unknown_asset_keeps_plain_url(self):
+        self.assertEqual(self.static.asset_url("css/missing.css"), "/static/css/missing.css")
+
+    def test_fingerprinted_url_is_immutable(self):
+        status, headers, body = self.get(self.static.asset_url("css/style.css"))
+        self.assertEqual(status, "200 OK")
+        self.assertEqual(body, STYLE)
+        self.assertEqual(headers["Cache-Control"], IMMUTABLE_CACHE_CONTROL)
+        # Обычный URL того же файла кешируется на ограниченное время
+        self.assertEqual(self.get("/static/css/style.css")[1]["Cache-Control"], "public, max-age=86400")
+
+    def test_stale_fingerprint_not_served(self):
+        self.assertEqual(self.get("/static/css/style.000000000000.css")[2], b"app")
+
+    def test_changed_content_changes_url(self):
+        old_url = self.static.asset_url("css/style.css")
+        self.write("css/style.css", STYLE + b"a { color: red; }\n")
+        self.static.reload()
+        new_url = self.static.asset_url("css/style.css")
+        self.assertNotEqual(new_url, old_url)
+        self.assertEqual(self.get(new_url)[0], "200 OK")
+        self.assertEqual(self.get(old_url)[2], b"app")
+
+    def test_auto_reload_picks_up_changes(self):
+        static = StaticMiddleware(self.app, static_dir=self.static_dir, auto_reload=True, reload_interval=0)
+        old_url = static.asset_url("css/style.css")
+        self.write("css/style.css", b"body { margin: 0; }\n")
+        self.assertNotEqual(static.asset_url("css/style.css"), old_url)
+
+    def test_templates_get_fingerprinted_urls(self):
+        renderer = TemplateRenderer(self.static_dir, cache_size=0)
+        self.write("page.html", b"<link href=\"{{ asset_url('css/style.css') }}\">")
+        self.assertEqual(renderer.render("page.html"), b'<link href="/static/css/style.css">')
+        renderer.env.globals["asset_url"] = self.static.asset_url
+        self.assertTrue(re.search(rb"style\.[0-9a-f]{12}\.css", renderer.render("page.html")))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,72 @@
+"""Потоковый рендеринг шаблонов: порции и ошибка посреди страницы."""
+
+import io
+import os
+import tempfile
+import unittest
+from wsgiref.handlers import SimpleHandler
+
+from src.tennis_score.core.template import TemplateRenderer
+
+TEMPLATES = {
+    "rows.html": "<ul>{% for item in items %}<li>{{ item }}</li>{% endfor %}</ul>",
+    "broken.html": "<ul>{% for item in items %}<li>{{ item }}</li>{% endfor %}</ul>{{ fail() }}",
+}
+
+
+def fail():
+    """Функция шаблона, падающая после того, как часть страницы уже отрендерена."""
+    raise RuntimeError("ошибка посреди страницы")
+
+
+class TemplateStreamTest(unittest.TestCase):
+    """``TemplateRenderer.stream`` на шаблонах во временном каталоге."""
+
+    CHUNK = 200
+
+    def setUp(self):
+        templates_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(templates_dir.cleanup)
+        for name, source in TEMPLATES.items():
+            with open(os.path.join(templates_dir.name, name), "w", encoding="utf-8") as f:
+                f.write(source)
+        self.renderer = TemplateRenderer(templates_dir.name, stream_chunk_size=self.CHUNK, cache_size=0)
+        self.context = {"items": [f"игрок {i}" for i in range(100)], "fail": fail}
+
+    def test_chunks_match_render(self):
+        chunks = list(self.renderer.stream("rows.html", self.context))
+        self.assertGreater(len(chunks), 1)
+        self.assertEqual(b"".join(chunks), self.renderer.render("rows.html", self.context))
+        # Все порции, кроме последней, не меньше stream_chunk_size символов
+        for chunk in chunks[:-1]:
+            self.assertGreaterEqual(len(chunk.decode()), self.CHUNK)
+
+    def test_missing_template_fails_before_first_chunk(self):
+        with self.assertRaises(Exception):  # noqa: B017 — TemplateNotFound, до отправки заголовков
+            self.renderer.stream("missing.html")
+
+    def test_error_mid_render_is_raised_after_chunks(self):
+        chunks = self.renderer.stream("broken.html", self.context)
+        self.assertTrue(next(chunks).startswith(b"<ul>"))
+        with self.assertLogs("core.template", "ERROR"), self.assertRaises(RuntimeError):
+            list(chunks)
+
+    def test_server_cuts_response_after_headers(self):
+        def app(environ, start_response):
+            start_response("200 OK", [("Content-Type", "text/html; charset=utf-8")])
+            return self.renderer.stream("broken.html", self.context)
+
+        stdout, stderr = io.BytesIO(), io.StringIO()
+        environ = {"REQUEST_METHOD": "GET", "SERVER_PROTOCOL": "HTTP/1.1"}
+        handler = SimpleHandler(io.BytesIO(), stdout, stderr, environ)
+        with self.assertLogs("core.template", "ERROR"):
+            handler.run(app)
+        response = stdout.getvalue()
+        # Статус уже отправлен: сервер не подменяет ответ страницей 500, а обрывает тело
+        self.assertTrue(response.startswith(b"HTTP/1.0 200 OK"))
+        self.assertNotIn(b"</ul>", response)
+        self.assertIn("RuntimeError", stderr.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,164 @@
+"""Фиксация, откат и обработчики исхода транзакции единицы работы запроса."""
+
+import unittest
+
+from sqlalchemy import Integer, String, create_engine, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from src.tennis_score.core.middleware.unit_of_work import UnitOfWorkMiddleware
+from src.tennis_score.core.unit_of_work import RequestUnitOfWork, current_unit_of_work, unit_of_work
+
+
+class Base(DeclarativeBase):
+    """Модели тестовой базы."""
+
+
+class Item(Base):
+    """Строка, которую запрос записывает в транзакции."""
+
+    __tablename__ = "items"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    name: Mapped[str] = mapped_column(String(50))
+
+
+class UnitOfWorkTestCase(unittest.TestCase):
+    """База SQLite в памяти и журнал вызванных обработчиков."""
+
+    def setUp(self):
+        engine = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+        Base.metadata.create_all(engine)
+        self.Session = sessionmaker(bind=engine)
+        self.events: list[str] = []
+        self.addCleanup(engine.dispose)
+
+    def names(self) -> list[str]:
+        with self.Session() as session:
+            return list(session.scalars(select(Item.name).order_by(Item.id)))
+
+    def register(self, uow: RequestUnitOfWork) -> None:
+        uow.after_commit(lambda: self.events.append("commit"))
+        uow.after_rollback(lambda: self.events.append("rollback"))
+
+
+class RequestUnitOfWorkTest(UnitOfWorkTestCase):
+    """``RequestUnitOfWork.finish`` и ``unit_of_work()``."""
+
+    def test_commit_runs_after_commit(self):
+        uow = RequestUnitOfWork()
+        uow.session(self.Session).add(Item(id=1, name="saved"))
+        self.register(uow)
+        uow.finish(commit=True)
+        self.assertEqual(self.names(), ["saved"])
+        self.assertEqual(self.events, ["commit"])
+
+    def test_rollback_runs_after_rollback(self):
+        uow = RequestUnitOfWork()
+        uow.session(self.Session).add(Item(id=1, name="discarded"))
+        self.register(uow)
+        uow.finish(commit=False)
+        self.assertEqual(self.names(), [])
+        self.assertEqual(self.events, ["rollback"])
+
+    def test_failed_unit_of_work_rolls_back(self):
+        uow = RequestUnitOfWork()
+        uow.session(self.Session).add(Item(id=1, name="discarded"))
+        self.register(uow)
+        uow.mark_failed()
+        uow.finish(commit=True)
+        self.assertEqual(self.names(), [])
+        self.assertEqual(self.events, ["rollback"])
+
+    def test_commit_error_runs_after_rollback(self):
+        with self.Session.begin() as session:
+            session.add(Item(id=1, name="existing"))
+        uow = RequestUnitOfWork()
+        # Дубликат первичного ключа обнаружится только при фиксации
+        uow.session(self.Session).add(Item(id=1, name="duplicate"))
+        self.register(uow)
+        with self.assertRaises(IntegrityError):
+            uow.finish(commit=True)
+        self.assertEqual(self.names(), ["existing"])
+        self.assertEqual(self.events, ["rollback"])
+
+    def test_callback_error_does_not_stop_others(self):
+        uow = RequestUnitOfWork()
+        uow.after_commit(lambda: 1 / 0)
+        self.register(uow)
+        with self.assertLogs("core.uow", "ERROR"):
+            uow.finish(commit=True)
+        self.assertEqual(self.events, ["commit"])
+
+    def test_nested_unit_of_work_defers_to_outer(self):
+        with unit_of_work() as outer:
+            with unit_of_work() as inner:
+                self.assertIs(inner, outer)
+                inner.session(self.Session).add(Item(id=1, name="saved"))
+                self.register(inner)
+            self.assertEqual(self.events, [])
+        self.assertEqual(self.names(), ["saved"])
+        self.assertEqual(self.events, ["commit"])
+
+
+class UnitOfWorkMiddlewareTest(UnitOfWorkTestCase):
+    """Исход транзакции по ответу приложения."""
+
+    def make_app(self, status: str = "200 OK", error: Exception | None = None):
+        def app(environ, start_response):
+            uow = current_unit_of_work.get()
+            uow.session(self.Session).add(Item(id=1, name="written"))
+            self.register(uow)
+            if error is not None:
+                raise error
+            start_response(status, [("Content-Type", "text/plain")])
+            return [b"ok"]
+
+        return UnitOfWorkMiddleware(app)
+
+    def call(self, app):
+        environ = {"REQUEST_METHOD": "POST", "PATH_INFO": "/match-score"}
+        return app(environ, lambda status, headers, exc_info=None: None)
+
+    def test_success_commits(self):
+        self.assertEqual(self.call(self.make_app()), [b"ok"])
+        self.assertEqual(self.names(), ["written"])
+        self.assertEqual(self.events, ["commit"])
+
+    def test_server_error_status_rolls_back(self):
+        self.call(self.make_app("500 Internal Server Error"))
+        self.assertEqual(self.names(), [])
+        self.assertEqual(self.events, ["rollback"])
+
+    def test_exception_rolls_back(self):
+        with self.assertRaises(RuntimeError):
+            self.call(self.make_app(error=RuntimeError("boom")))
+        self.assertEqual(self.names(), [])
+        self.assertEqual(self.events, ["rollback"])
+
+    def test_failed_unit_of_work_rolls_back(self):
+        def app(environ, start_response):
+            uow = current_unit_of_work.get()
+            uow.session(self.Session).add(Item(id=1, name="written"))
+            self.register(uow)
+            # Так помечает единицу работы репозиторий, перехвативший ошибку БД
+            uow.mark_failed()
+            start_response("200 OK", [])
+            return [b""]
+
+        self.call(UnitOfWorkMiddleware(app))
+        self.assertEqual(self.names(), [])
+        self.assertEqual(self.events, ["rollback"])
+
+    def test_commit_error_propagates_and_rolls_back(self):
+        with self.Session.begin() as session:
+            session.add(Item(id=1, name="existing"))
+        with self.assertRaises(IntegrityError):
+            self.call(self.make_app())
+        self.assertEqual(self.names(), ["existing"])
+        self.assertEqual(self.events, ["rollback"])
+
+
+if __name__ == "__main__":
+    unittest.main()